@@ -0,0 +1,145 @@
+from bisect import bisect_right, insort
+from array import array
+from models.csdf_model.compiled_csdf import CompiledCSDFGraph
+from simulation.traces import SimMemoryOccupancyInterval
+
+"""
+Analytic (simulation-free) evaluation of CSDF graph buffers for the ASAP schedule on a single processor.
+For a single processor, the ASAP schedule is the actors firing order, and buffers sizes and occupancy
+follow from the rate sequences and the firing order:
+ - every buffer is occupied (first-in, last-out) from the first to the last firing of any actor,
+   that reads or writes the buffer;
+ - max number of tokens, stored in a buffer, is the max of the running sum
+   of tokens, produced and consumed by the firings.
+The firing order is derived by the same rule, as in the simulation (see simulate_execution_asap()):
+the next actor to fire is the first ready actor that follows the last fired actor in circular order.
+The evaluation yields the same results as simulation with MaxStoredTokensReducer and OccupancyIntervalReducer,
+but does not create simulation platform, trace and per-firing descriptions
+"""
+
+
+def eval_asap_buffers_analytic(compiled_csdfg: CompiledCSDFGraph, max_samples=1):
+    """
+    Evaluate CSDF graph buffers for the ASAP schedule on a single processor
+    :param compiled_csdfg: CSDF graph, compiled with (naive) buffers
+    :param max_samples: maximum number of input samples to process
+    :return: tuple (exec_order, max_tokens_per_mem_name, occupancy_intervals_per_mem_name), where
+        - exec_order (list) is the list of ids of actors in the firing order;
+        - max_tokens_per_mem_name (dict) is a dictionary, where key = buffer name,
+            value = max number of tokens, ever stored in the buffer;
+        - occupancy_intervals_per_mem_name (dict) is a dictionary, where key = buffer name,
+            value = list with a single (first-in, last-out) occupancy interval (SimMemoryOccupancyInterval)
+        Buffers are listed in the order of their first access. Buffers that are never accessed are not listed
+    """
+    cg = compiled_csdfg
+    actors_num = cg.actors_num
+    actor_phases = cg.actor_phases
+    prod_seqs = cg.prod_seqs
+    cons_seqs = cg.cons_seqs
+    channel_buf = cg.channel_buf
+    if -1 in channel_buf:
+        raise Exception("Analytic buffers evaluation error: a channel of CSDF graph " + cg.name +
+                        " is not stored in any buffer")
+
+    # (buffer id, channel id) of input/output channels of every actor
+    inputs_per_actor = [[(channel_buf[channel_id], channel_id) for channel_id in cg.get_input_channel_ids(actor_id)]
+                        for actor_id in range(actors_num)]
+    outputs_per_actor = [[(channel_buf[channel_id], channel_id) for channel_id in cg.get_output_channel_ids(actor_id)]
+                         for actor_id in range(actors_num)]
+    consumers_per_buffer = cg.get_buffer_consumers()
+    affected_actors_per_actor = []
+    for actor_id in range(actors_num):
+        affected_actor_ids = {actor_id}
+        for buf_id, channel_id in inputs_per_actor[actor_id] + outputs_per_actor[actor_id]:
+            affected_actor_ids.update(consumers_per_buffer[buf_id])
+        affected_actors_per_actor.append(sorted(affected_actor_ids))
+
+    stored_tokens = [0 for _ in range(cg.buffers_num)]
+    max_tokens = [0 for _ in range(cg.buffers_num)]
+    phase_per_actor = [0 for _ in range(actors_num)]
+    max_phases_per_actor = [actor_phases[actor_id] * max_samples for actor_id in range(actors_num)]
+
+    def is_actor_ready(actor_id):
+        phase = phase_per_actor[actor_id]
+        if phase >= max_phases_per_actor[actor_id]:
+            return False
+        phase = phase % actor_phases[actor_id]
+        for buf_id, channel_id in inputs_per_actor[actor_id]:
+            if stored_tokens[buf_id] < cons_seqs[channel_id][phase]:
+                return False
+        return True
+
+    is_ready_per_actor = [is_actor_ready(actor_id) for actor_id in range(actors_num)]
+    ready_actor_ids = [actor_id for actor_id in range(actors_num) if is_ready_per_actor[actor_id]]
+
+    # firing order
+    exec_order = array('i')
+    last_actor_id = -1
+    while ready_actor_ids:
+        next_ready_id = bisect_right(ready_actor_ids, last_actor_id)
+        actor_id = ready_actor_ids[next_ready_id] if next_ready_id < len(ready_actor_ids) else ready_actor_ids[0]
+
+        # fire actor: consume input data, produce output data
+        phase = phase_per_actor[actor_id] % actor_phases[actor_id]
+        for buf_id, channel_id in inputs_per_actor[actor_id]:
+            stored_tokens[buf_id] -= cons_seqs[channel_id][phase]
+        for buf_id, channel_id in outputs_per_actor[actor_id]:
+            stored_tokens[buf_id] += prod_seqs[channel_id][phase]
+            if stored_tokens[buf_id] > max_tokens[buf_id]:
+                max_tokens[buf_id] = stored_tokens[buf_id]
+        phase_per_actor[actor_id] += 1
+        exec_order.append(actor_id)
+        last_actor_id = actor_id
+
+        # update ready actors
+        for affected_actor_id in affected_actors_per_actor[actor_id]:
+            ready = is_actor_ready(affected_actor_id)
+            if ready != is_ready_per_actor[affected_actor_id]:
+                is_ready_per_actor[affected_actor_id] = ready
+                if ready:
+                    insort(ready_actor_ids, affected_actor_id)
+                else:
+                    del ready_actor_ids[bisect_right(ready_actor_ids, affected_actor_id) - 1]
+
+    # first and last firing step of every actor
+    first_step_per_actor = [-1 for _ in range(actors_num)]
+    last_step_per_actor = [-1 for _ in range(actors_num)]
+    for step in range(len(exec_order)):
+        actor_id = exec_order[step]
+        if first_step_per_actor[actor_id] == -1:
+            first_step_per_actor[actor_id] = step
+        last_step_per_actor[actor_id] = step
+
+    # buffers in the order of their first access: buffers, first accessed by the same firing,
+    # are accessed in the order of the actor input channels, followed by the actor output channels
+    accessed_buffers = []
+    visited = bytearray(cg.buffers_num)
+    for actor_id in sorted(range(actors_num), key=first_step_per_actor.__getitem__):
+        if first_step_per_actor[actor_id] == -1:
+            continue
+        for buf_id, channel_id in inputs_per_actor[actor_id] + outputs_per_actor[actor_id]:
+            if not visited[buf_id]:
+                visited[buf_id] = 1
+                accessed_buffers.append(buf_id)
+
+    # occupancy interval of every buffer: from the first to the last firing of the buffer readers and writers
+    start_step_per_buffer = [-1 for _ in range(cg.buffers_num)]
+    end_step_per_buffer = [-1 for _ in range(cg.buffers_num)]
+    for channel_id in range(cg.channels_num):
+        buf_id = channel_buf[channel_id]
+        for actor_id in (cg.channel_src[channel_id], cg.channel_dst[channel_id]):
+            if first_step_per_actor[actor_id] == -1:
+                continue
+            if start_step_per_buffer[buf_id] == -1 or first_step_per_actor[actor_id] < start_step_per_buffer[buf_id]:
+                start_step_per_buffer[buf_id] = first_step_per_actor[actor_id]
+            end_step_per_buffer[buf_id] = max(end_step_per_buffer[buf_id], last_step_per_actor[actor_id])
+
+    max_tokens_per_mem_name = {}
+    occupancy_intervals_per_mem_name = {}
+    for buf_id in accessed_buffers:
+        buf_name = cg.buf_names[buf_id]
+        max_tokens_per_mem_name[buf_name] = max_tokens[buf_id]
+        occupancy_intervals_per_mem_name[buf_name] = [SimMemoryOccupancyInterval(start_step_per_buffer[buf_id],
+                                                                                 end_step_per_buffer[buf_id],
+                                                                                 max_tokens[buf_id])]
+    return list(exec_order), max_tokens_per_mem_name, occupancy_intervals_per_mem_name
@@ -0,0 +1,146 @@
+from models.data_buffers import CSDFGDataBuffer
+
+"""
+Offset-based (arena) memory planning. Instead of reusing memory at the granularity of whole buffers
+(see buf_reuse_from_simulation.py), where every buffer has the size of its largest user, every memory
+(e.g., naive CSDF buffer) is placed at its own offset in a single memory arena. Memories with overlapping
+occupancy intervals are placed at non-overlapping address ranges, while memories with non-overlapping occupancy
+intervals can share any part of the arena. The memories are placed one by one, and every memory is placed into the
+smallest gap between the already placed memories, that overlap with it in time and that fits the memory
+(or after all such memories, if no gap fits). The memories are placed in the order, defined by the strategy:
+ - "greedy_by_size": memories are placed from the largest to the smallest;
+ - "greedy_by_breadth": memories are placed in the order of the breadth (total size of all memories, occupied
+   at the same step) of their most occupied step, from the largest breadth to the smallest,
+   and from the largest to the smallest memory within the same breadth
+"""
+ARENA_STRATEGIES = ["greedy_by_size", "greedy_by_breadth"]
+DEFAULT_ARENA_STRATEGY = "greedy_by_size"
+
+
+def plan_arena_offsets(occupancy_intervals_per_mem_name: {},
+                       max_tokens_per_mem_name: {},
+                       strategy=DEFAULT_ARENA_STRATEGY):
+    """
+    Place memories at offsets in a single memory arena
+    :param occupancy_intervals_per_mem_name: dictionary, where key = memory name, value = list of
+        memory occupancy intervals (SimMemoryOccupancyInterval) in the application schedule
+    :param max_tokens_per_mem_name: dictionary, where key = memory name,
+        value = max number of tokens, ever stored in the memory
+    :param strategy: order, in which memories are placed in the arena (see ARENA_STRATEGIES)
+    :return: tuple (arena_size, offset_per_mem_name), where arena_size is the size of the arena (in tokens),
+        offset_per_mem_name is a dictionary, where key = memory name, value = offset of the memory
+        in the arena (in tokens)
+    """
+    if strategy not in ARENA_STRATEGIES:
+        raise Exception("Arena planning error: unknown strategy " + str(strategy) +
+                        ". Select from " + str(ARENA_STRATEGIES))
+
+    memory_names = [key for key in occupancy_intervals_per_mem_name.keys()]
+    size_per_mem = [max_tokens_per_mem_name.get(memory_name, 0) for memory_name in memory_names]
+    intervals_per_mem = [[(interval.start_step, interval.end_step) for interval in
+                          occupancy_intervals_per_mem_name[memory_name]] for memory_name in memory_names]
+
+    mem_ids = range(len(memory_names))
+    if strategy == "greedy_by_size":
+        placement_order = sorted(mem_ids, key=lambda mem_id: -size_per_mem[mem_id])
+    else:
+        breadth_per_mem = _get_max_breadth_per_mem(intervals_per_mem, size_per_mem)
+        placement_order = sorted(mem_ids, key=lambda mem_id: (-breadth_per_mem[mem_id], -size_per_mem[mem_id]))
+
+    # placed memories: tuples (offset, end offset, memory id)
+    placed = []
+    offset_per_mem = [0 for _ in mem_ids]
+    arena_size = 0
+    for mem_id in placement_order:
+        mem_size = size_per_mem[mem_id]
+        if mem_size <= 0:
+            continue
+        # address ranges of the placed memories, that overlap with the memory in time
+        busy_ranges = sorted((offset, end) for offset, end, placed_mem_id in placed
+                             if _intervals_overlap(intervals_per_mem[mem_id], intervals_per_mem[placed_mem_id]))
+        # smallest gap that fits the memory
+        best_offset = None
+        best_gap = None
+        gap_start = 0
+        for offset, end in busy_ranges:
+            gap = offset - gap_start
+            if mem_size <= gap and (best_gap is None or gap < best_gap):
+                best_offset = gap_start
+                best_gap = gap
+            gap_start = max(gap_start, end)
+        if best_offset is None:
+            best_offset = gap_start
+
+        offset_per_mem[mem_id] = best_offset
+        placed.append((best_offset, best_offset + mem_size, mem_id))
+        arena_size = max(arena_size, best_offset + mem_size)
+
+    offset_per_mem_name = {memory_name: offset_per_mem[mem_id] for mem_id, memory_name in enumerate(memory_names)}
+    return arena_size, offset_per_mem_name
+
+
+def build_csdfg_arena_buffers(occupancy_intervals_per_mem_name: {},
+                              max_tokens_per_mem_name: {},
+                              old_csdf_buffers,
+                              strategy=DEFAULT_ARENA_STRATEGY):
+    """
+    Store CSDF graph FIFO channels in a single memory arena, using results of simulation
+    (e.g. derived by OccupancyIntervalReducer and MaxStoredTokensReducer during simulation)
+    :param occupancy_intervals_per_mem_name: dictionary, where key = memory (old CSDF buffer) name,
+        value = list of memory occupancy intervals (SimMemoryOccupancyInterval) in the ASAP schedule
+    :param max_tokens_per_mem_name: dictionary, where key = memory (old CSDF buffer) name,
+        value = max number of tokens, ever stored in the memory
+    :param old_csdf_buffers: old (not-reused) CSDF graph buffers, that were used to create simulation
+    :param strategy: order, in which memories are placed in the arena (see ARENA_STRATEGIES)
+    :return: list with a single CSDF buffer (arena), that stores all the channels of the old CSDF buffers,
+        where i-th channel is stored at offset_per_channel[i] of the arena
+    """
+    arena_size, offset_per_mem_name = plan_arena_offsets(occupancy_intervals_per_mem_name,
+                                                         max_tokens_per_mem_name,
+                                                         strategy)
+    arena = CSDFGDataBuffer("B0", arena_size)
+    for old_csdf_buf in old_csdf_buffers:
+        offset = offset_per_mem_name.get(old_csdf_buf.name, 0)
+        for channel in old_csdf_buf.channels:
+            arena.channels.append(channel)
+            arena.offset_per_channel.append(offset)
+    return [arena]
+
+
+def _get_max_breadth_per_mem(intervals_per_mem: [], size_per_mem: []):
+    """
+    Get breadth of the most occupied step of every memory, where breadth of a step is the total size of
+    all memories, occupied at the step
+    """
+    # breadth changes only at the starts of the occupancy intervals and after their ends
+    steps = sorted(set(start for intervals in intervals_per_mem for start, end in intervals) |
+                   set(end + 1 for intervals in intervals_per_mem for start, end in intervals))
+    step_ids = {step: step_id for step_id, step in enumerate(steps)}
+    breadth_delta = [0 for _ in steps]
+    for intervals, size in zip(intervals_per_mem, size_per_mem):
+        for start, end in intervals:
+            breadth_delta[step_ids[start]] += size
+            breadth_delta[step_ids[end + 1]] -= size
+    breadth_per_step = []
+    breadth = 0
+    for delta in breadth_delta:
+        breadth += delta
+        breadth_per_step.append(breadth)
+
+    max_breadth_per_mem = []
+    for intervals in intervals_per_mem:
+        max_breadth = 0
+        for start, end in intervals:
+            for step_id in range(step_ids[start], step_ids[end + 1]):
+                max_breadth = max(max_breadth, breadth_per_step[step_id])
+        max_breadth_per_mem.append(max_breadth)
+    return max_breadth_per_mem
+
+
+def _intervals_overlap(intervals1, intervals2):
+    """ Check if any of two lists of (inclusive) occupancy intervals overlap"""
+    for start1, end1 in intervals1:
+        for start2, end2 in intervals2:
+            if start1 <= end2 and start2 <= end1:
+                return True
+    return False
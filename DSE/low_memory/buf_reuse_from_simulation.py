@@ -1,3 +1,4 @@
+from heapq import heappush, heappop
 from simulation.traces import SimTrace
 from models.data_buffers import DataBuffer, CSDFGDataBuffer
 
@@ -9,6 +10,16 @@ def reuse_buffers_among_csdf(csdf_buffers_per_csdf: [CSDFGDataBuffer],
                              csdf_model_names: [str]):
     """
     Reuse buffers among multiple CSDF models
+    A shared buffer is reusable for storage of a (new) CSDF buffer if
+    it does not store other CSDF buffer of the same CSDF (prevent extra reuse within CSDF):
+    all reuse within one CSDF should be regulated before in a separate algorithm.
+    Among the reusable shared buffers, the CSDF buffer is stored in the first shared buffer, that is large enough
+    to store the CSDF buffer, or, if there is no such buffer, in the first largest shared buffer. If there are
+    no reusable (non-empty) shared buffers, a new shared buffer is created.
+    Every shared buffer keeps a bitmask of ids of CSDF models, which channels it stores, so that reusability
+    of a shared buffer is checked by a single bitwise AND, and the best reusable buffer is found in a max segment tree
+    over sizes of the reusable shared buffers. The tree is only rebuilt when the CSDF models of the stored CSDF buffer
+    change (i.e., once per CSDF model)
     :param csdf_buffers_per_csdf: csdf buffers per CSDF model
     :param csdf_model_names: names of CSDF models
     :return: buffers reused among all the CSDF models
@@ -17,25 +28,6 @@ def reuse_buffers_among_csdf(csdf_buffers_per_csdf: [CSDFGDataBuffer],
     # :param sim_traces: array of simulation traces where
     #     sim_traces[i] is a trace of csdf_buffers[i], len(sim_traces)=len(csdf_buffers)
 
-    def is_reusable(shared_buf, buf):
-        """ Check if shared buffer is reusable for storage of a (new) CSDF buffer
-        shared buffer is reusable for storage of a (new) CSDF buffer if
-        it does not store other CSDF buffer of the same CSDF (prevent extra reuse within CSDF)
-        all reuse within one CSDF should be regulated before in a separate algorithm
-        """
-        for shared_buf_channel in shared_buf.channels:
-            for buf_channel in buf.channels:
-                if channel_to_csdf_model_id[shared_buf_channel] == channel_to_csdf_model_id[buf_channel]:
-                    return False
-        return True
-
-    def find_reusable_shared_buffers(buf):
-        reuse_buffers = []
-        for shared_buf in shared_csdf_buffers:
-            if is_reusable(shared_buf, buf):
-                reuse_buffers.append(shared_buf)
-        return reuse_buffers
-
     def get_channel_to_csdf_model_id():
         ch_to_csdf_model_id = {}
         model_id = 0
@@ -46,39 +38,74 @@ def reuse_buffers_among_csdf(csdf_buffers_per_csdf: [CSDFGDataBuffer],
             model_id += 1
         return ch_to_csdf_model_id
 
-    def find_best_reusable_shared_buffer(buf, reuse_shared_buffers):
-        min_cost = buf.size
-        best_buffer = None
-        for shared_buf in reuse_shared_buffers:
-            cost = max(buf.size - shared_buf.size, 0)
-            if cost < min_cost:
-                min_cost = cost
-                best_buffer = shared_buf
-        return best_buffer
+    def get_csdf_models_mask(buf):
+        """ Get bitmask of ids of CSDF models, which channels are stored in the buffer"""
+        mask = 0
+        for channel in buf.channels:
+            mask |= 1 << channel_to_csdf_model_id[channel]
+        return mask
+
+    def build_reusable_buf_sizes(mask):
+        """ Build segment tree over sizes of shared buffers, reusable for CSDF buffers with CSDF models mask"""
+        reusable_buf_sizes = _MaxSegmentTree(max_shared_buffers)
+        for shared_buf_id, shared_buf in enumerate(shared_csdf_buffers):
+            if shared_buf_masks[shared_buf_id] & mask == 0:
+                reusable_buf_sizes.set(shared_buf_id, shared_buf.size)
+        return reusable_buf_sizes
+
+    def find_best_reusable_shared_buffer(buf):
+        """
+        Find id of the first reusable shared buffer, large enough to store the buffer,
+        or of the first largest (non-empty) reusable shared buffer, or -1 if there is no such buffer
+        """
+        if buf.size <= 0:
+            return -1
+        shared_buf_id = reusable_buf_sizes.find_first(buf.size)
+        if shared_buf_id == -1 and reusable_buf_sizes.max() > 0:
+            shared_buf_id = reusable_buf_sizes.find_first(reusable_buf_sizes.max())
+        return shared_buf_id
 
     #############
     # main script
     shared_csdf_buffers = []
+    # bitmask of ids of CSDF models, which channels are stored in every shared buffer
+    shared_buf_masks = []
+    max_shared_buffers = sum(len(csdf_buffers) for csdf_buffers in csdf_buffers_per_csdf)
     channel_to_csdf_model_id = get_channel_to_csdf_model_id()
+    reusable_buf_sizes = None
+    reusable_mask = None
     for csdf_buf in csdf_buffers_per_csdf:
         for buffer in csdf_buf:
-            r_shared_buf = find_reusable_shared_buffers(buffer)
-            if len(r_shared_buf) == 0:
+            mask = get_csdf_models_mask(buffer)
+            if mask != reusable_mask:
+                reusable_buf_sizes = build_reusable_buf_sizes(mask)
+                reusable_mask = mask
+
+            shared_buf_id = find_best_reusable_shared_buffer(buffer)
+            if shared_buf_id == -1:
                 # create new shared buffer, copied from current buffer
                 name = "B" + str(len(shared_csdf_buffers))
                 shared_csdf_buffer = CSDFGDataBuffer(name, buffer.size)
+                shared_buf_id = len(shared_csdf_buffers)
                 shared_csdf_buffers.append(shared_csdf_buffer)
+                shared_buf_masks.append(0)
             else:
-                shared_csdf_buffer = find_best_reusable_shared_buffer(buffer, r_shared_buf)
+                shared_csdf_buffer = shared_csdf_buffers[shared_buf_id]
             # reuse buffer to store channels
             for ch in buffer.channels:
                 shared_csdf_buffer.channels.append(ch)
                 ch_csdf_model_id = channel_to_csdf_model_id[ch]
                 ch_csdf_model_name = csdf_model_names[ch_csdf_model_id]
                 shared_csdf_buffer.csdf_model_name_per_channel.append(ch_csdf_model_name)
+            # memory arenas of different CSDF models share the memory, starting from the same (zero) offset
+            shared_csdf_buffer.offset_per_channel.extend(buffer.offset_per_channel)
             # update buffer size
             shared_csdf_buffer.size = max(shared_csdf_buffer.size, buffer.size)
 
+            # the shared buffer now stores a CSDF buffer with the current mask and is no longer reusable for it
+            shared_buf_masks[shared_buf_id] |= mask
+            reusable_buf_sizes.set(shared_buf_id, _MaxSegmentTree.EMPTY)
+
     return shared_csdf_buffers
 
 #######################################
@@ -94,8 +121,19 @@ def minimize_csdfg_buf_sizes(sim_trace: SimTrace, csdf_naive_buffers):
     (intermediate) data tensor
     :return:
     """
-    for buf in csdf_naive_buffers:
-        buf.size = sim_trace.get_max_stored_tokens(buf.name)
+    set_csdfg_buf_sizes(csdf_naive_buffers, sim_trace.get_max_stored_tokens_per_mem_name())
+
+
+def set_csdfg_buf_sizes(csdf_buffers, max_tokens_per_mem_name: {}):
+    """
+    Set CSDFG buffer sizes to max number of tokens, ever stored in the buffers
+    :param csdf_buffers: CSDF buffers
+    :param max_tokens_per_mem_name: dictionary, where key = memory (buffer) name, value = max number of tokens,
+        ever stored in the memory (e.g. derived by MaxStoredTokensReducer during simulation).
+        Buffers, not present in the dictionary, are never used and get size 0
+    """
+    for buf in csdf_buffers:
+        buf.size = max_tokens_per_mem_name.get(buf.name, 0)
 
 
 ######################################
@@ -111,29 +149,65 @@ def build_csdfg_reuse_buffers_from_sim_trace(sim_trace: SimTrace, old_csdf_buffe
     :param mapping: mapping of CNN layers/CSDF actors onto platform processors.
     CSDF buffers cannot be reused among CNN layers mapped onto different processors
     """
-    def __find_generic_reuse_buf_by_user(user_name):
-        for buf in generic_reuse_buf:
-            if user_name in buf.users:
-                return buf
+    asap_schedule = sim_trace.get_asap_schedule()
+    occupancy_intervals_per_mem_name = sim_trace.generate_memory_occupancy_intervals_per_memory_first_in_last_out(asap_schedule)
+    max_tokens_per_mem_name = sim_trace.get_max_stored_tokens_per_mem_name()
+    return build_csdfg_reuse_buffers(occupancy_intervals_per_mem_name, max_tokens_per_mem_name,
+                                     old_csdf_buffers, mapping)
 
-    def __find_csdfg_reuse_buf_by_name(name):
-        for buf in csdfg_reuse_buffers:
-            if buf.name == name:
-                return buf
-        return None
 
-    generic_reuse_buf = build_reuse_buffers_from_sim_trace(sim_trace, mapping)
+def build_csdfg_reuse_buffers(occupancy_intervals_per_mem_name: {},
+                              max_tokens_per_mem_name: {},
+                              old_csdf_buffers,
+                              mapping=None,
+                              reuse_buffers_builder=None):
+    """
+    Get  mapping of CSDF FIFO channels onto reuse CSDF graph buffers, using results of simulation
+    (e.g. derived by OccupancyIntervalReducer and MaxStoredTokensReducer during simulation)
+    :param occupancy_intervals_per_mem_name: dictionary, where key = memory (old CSDF buffer) name,
+        value = list of memory occupancy intervals (SimMemoryOccupancyInterval) in the ASAP schedule
+    :param max_tokens_per_mem_name: dictionary, where key = memory (old CSDF buffer) name,
+        value = max number of tokens, ever stored in the memory
+    :param old_csdf_buffers: old (not-reused) CSDF graph buffers, that were used to create simulation
+    :param mapping: mapping of CNN layers/CSDF actors onto platform processors.
+    CSDF buffers cannot be reused among CNN layers mapped onto different processors
+    :param reuse_buffers_builder: (optional) function (occupancy_intervals_per_mem_name, max_tokens_per_mem_name,
+        mapping, actor_ids_per_mem_name) -> generic reuse buffers, e.g. build_optimal_reuse_buffers() in
+        optimal_buf_reuse.py. If None, build_reuse_buffers() is used
+    """
+    def __get_actor_ids_per_mem_name():
+        # ids of source and destination actors of the (first) channel, stored in every old CSDF buffer
+        actor_ids_per_mem_name = {}
+        for old_buf in old_csdf_buffers:
+            if old_buf.channels and old_buf.name not in actor_ids_per_mem_name:
+                actor_ids_per_mem_name[old_buf.name] = (old_buf.channels[0].src_id, old_buf.channels[0].dst_id)
+        return actor_ids_per_mem_name
+
+    if reuse_buffers_builder is None:
+        reuse_buffers_builder = build_reuse_buffers
+
+    generic_reuse_buf = reuse_buffers_builder(occupancy_intervals_per_mem_name, max_tokens_per_mem_name,
+                                              mapping, __get_actor_ids_per_mem_name())
     csdfg_reuse_buffers = []
+    # dictionary, where key = user (memory) name, value = (first) generic reuse buffer, used by the user
+    generic_reuse_buf_per_user = {}
+    for buf in generic_reuse_buf:
+        for user_name in buf.users:
+            if user_name not in generic_reuse_buf_per_user:
+                generic_reuse_buf_per_user[user_name] = buf
+    # dictionary, where key = name of CSDF reuse buffer, value = CSDF reuse buffer
+    csdfg_reuse_buf_per_name = {}
 
     for old_csdf_buf in old_csdf_buffers:
-        reuse_buf = __find_generic_reuse_buf_by_user(old_csdf_buf.name)
+        reuse_buf = generic_reuse_buf_per_user.get(old_csdf_buf.name)
         if reuse_buf is None:
             print("NONE reuse buf for: ", old_csdf_buf.name)
-        csdfg_reuse_buf = __find_csdfg_reuse_buf_by_name(reuse_buf.name)
+        csdfg_reuse_buf = csdfg_reuse_buf_per_name.get(reuse_buf.name)
 
         if csdfg_reuse_buf is None:
             csdfg_reuse_buf = CSDFGDataBuffer(reuse_buf.name, reuse_buf.size)
             csdfg_reuse_buffers.append(csdfg_reuse_buf)
+            csdfg_reuse_buf_per_name[csdfg_reuse_buf.name] = csdfg_reuse_buf
 
         for channel in old_csdf_buf.channels:
             csdfg_reuse_buf.channels.append(channel)
@@ -144,13 +218,62 @@ def build_csdfg_reuse_buffers_from_sim_trace(sim_trace: SimTrace, old_csdf_buffe
 # generic buffers reuse
 
 
-def build_reuse_buffers_from_sim_trace(sim_trace: SimTrace, mapping=None):
+def build_reuse_buffers_from_sim_trace(sim_trace: SimTrace, mapping=None, actor_ids_per_mem_name=None):
     """
     Build a set of reused data buffers, using application simulation trace
     :param sim_trace: (SimTrace) simulation trace
     :param mapping: mapping of CNN layers/CSDF actors onto platform processors.
     CSDF buffers cannot be reused among CNN layers mapped onto different processors
+    :param actor_ids_per_mem_name: (optional) dictionary, where key = memory name,
+        value = tuple (src_actor_id, dst_actor_id) of ids of actors, that write and read the memory.
+        If None, or if a memory is not in the dictionary, actor ids are derived from the memory name
+    :return: a set of DataBuffers, reused among application tasks"""
+    asap_schedule = sim_trace.get_asap_schedule()
+    occupancy_intervals_per_mem_name = sim_trace.generate_memory_occupancy_intervals_per_memory_first_in_last_out(asap_schedule)
+    max_tokens_per_mem_name = sim_trace.get_max_stored_tokens_per_mem_name()
+    return build_reuse_buffers(occupancy_intervals_per_mem_name, max_tokens_per_mem_name,
+                               mapping, actor_ids_per_mem_name)
+
+
+def build_reuse_buffers(occupancy_intervals_per_mem_name: {},
+                        max_tokens_per_mem_name: {},
+                        mapping=None,
+                        actor_ids_per_mem_name=None):
+    """
+    Build a set of reused data buffers, using results of application simulation.
+    Every memory is stored in a buffer, where all other memories, stored in the buffer, have
+    non-overlapping occupancy intervals and are mapped on the same processor. Among such buffers, the memory is
+    stored in the first created buffer, that is large enough to store the memory, or, if there is
+    no such buffer, in the first created largest buffer. If there are no such buffers, a new buffer is created.
+    If every memory has a single occupancy interval, and memories are sorted by the start of their
+    occupancy intervals (e.g., first-in, last-out intervals, derived from simulation or analytic evaluation), the
+    buffers are found in O(n log n) time (see _build_reuse_buffers_sorted()), otherwise every buffer
+    is checked against every memory (see _build_reuse_buffers_greedy()). Both ways yield the same buffers
+    :param occupancy_intervals_per_mem_name: dictionary, where key = memory name, value = list of
+        memory occupancy intervals (SimMemoryOccupancyInterval) in the application schedule.
+        Memories are reused in the order of the dictionary keys
+    :param max_tokens_per_mem_name: dictionary, where key = memory name,
+        value = max number of tokens, ever stored in the memory
+    :param mapping: mapping of CNN layers/CSDF actors onto platform processors.
+    CSDF buffers cannot be reused among CNN layers mapped onto different processors
+    :param actor_ids_per_mem_name: (optional) dictionary, where key = memory name,
+        value = tuple (src_actor_id, dst_actor_id) of ids of actors, that write and read the memory.
+        If None, or if a memory is not in the dictionary, actor ids are derived from the memory name
     :return: a set of DataBuffers, reused among application tasks"""
+    if _sorted_by_single_interval_start(occupancy_intervals_per_mem_name):
+        return _build_reuse_buffers_sorted(occupancy_intervals_per_mem_name, max_tokens_per_mem_name,
+                                           mapping, actor_ids_per_mem_name)
+    return _build_reuse_buffers_greedy(occupancy_intervals_per_mem_name, max_tokens_per_mem_name,
+                                       mapping, actor_ids_per_mem_name)
+
+
+def _build_reuse_buffers_greedy(occupancy_intervals_per_mem_name: {},
+                                max_tokens_per_mem_name: {},
+                                mapping=None,
+                                actor_ids_per_mem_name=None):
+    """
+    Build a set of reused data buffers (see build_reuse_buffers()), checking every buffer for every memory
+    """
 
     def find_reusable_buffers(mem_name):
         """ Find all buffers that can be reused for memory with specified name"""
@@ -193,20 +316,15 @@ def build_reuse_buffers_from_sim_trace(sim_trace: SimTrace, mapping=None):
 
         return True
 
-    def get_src_and_dst_actor_id_from_mem_name(mem_name):
-        """ TODO: refactoring!"""
-        actor_ids_str = mem_name.replace("a", "").split("_")
-        actor_ids_int = [int(layer_id) for layer_id in actor_ids_str]
-        return actor_ids_int[0], actor_ids_int[1]
-
     def is_storing_other_mem_mapped_on_a_different_proc(buf, mem_name):
         if mapping is None:
             return False
 
-        mem_src_actor, mem_dst_actor = get_src_and_dst_actor_id_from_mem_name(mem_name)
+        mem_src_actor, mem_dst_actor = _get_src_and_dst_actor_id_from_mem_name(mem_name, actor_ids_per_mem_name)
 
         for stored_memory_name in buf.users:
-            stored_mem_src_actor, stored_mem_dst_actor = get_src_and_dst_actor_id_from_mem_name(stored_memory_name)
+            stored_mem_src_actor, stored_mem_dst_actor = _get_src_and_dst_actor_id_from_mem_name(stored_memory_name,
+                                                                                                 actor_ids_per_mem_name)
             if not stored_on_same_proc([mem_src_actor, mem_dst_actor, stored_mem_src_actor, stored_mem_dst_actor]):
                 return True
 
@@ -257,13 +375,11 @@ def build_reuse_buffers_from_sim_trace(sim_trace: SimTrace, mapping=None):
     #############
     # main script
 
-    asap_schedule = sim_trace.get_asap_schedule()
-    occupancy_intervals_per_mem_name = sim_trace.generate_memory_occupancy_intervals_per_memory_first_in_last_out(asap_schedule)
     memory_names = [key for key in occupancy_intervals_per_mem_name.keys()]
     buffers = []
 
     for memory_name in memory_names:
-        mem_size = sim_trace.get_max_stored_tokens(memory_name)
+        mem_size = max_tokens_per_mem_name.get(memory_name, 0)
         reusable_buffers = find_reusable_buffers(memory_name)
         # no reusable buffers found
         if len(reusable_buffers) == 0:
@@ -280,6 +396,160 @@ def build_reuse_buffers_from_sim_trace(sim_trace: SimTrace, mapping=None):
 
     return buffers
 
+
+def _build_reuse_buffers_sorted(occupancy_intervals_per_mem_name: {},
+                                max_tokens_per_mem_name: {},
+                                mapping=None,
+                                actor_ids_per_mem_name=None):
+    """
+    Build a set of reused data buffers (see build_reuse_buffers()) for memories, that have a single
+    occupancy interval each and are sorted by the start of their occupancy intervals.
+    For such memories, a buffer can store a new memory if and only if all the memories, already stored in the buffer,
+    end before the new memory starts. Thus, every buffer is described by the end of the last memory it stores
+    (free-from step): busy buffers are kept in a heap, sorted by their free-from step, and
+    the buffers, released before the new memory starts, remain free until they are reused. The first free buffer,
+    that is large enough to store the new memory (or the first largest free buffer) is found in a max segment tree
+    over the free buffers sizes. Buffers are grouped by processors: buffers of a processor only store memories,
+    which source and destination actors are mapped on this processor. A memory, which source and destination actors
+    are mapped on different processors, is stored in a separate buffer
+    """
+    memory_names = [key for key in occupancy_intervals_per_mem_name.keys()]
+    proc_per_mem_name = get_proc_per_mem_name(memory_names, mapping, actor_ids_per_mem_name)
+    memories_per_proc = {}
+    for memory_name in memory_names:
+        proc_id = proc_per_mem_name[memory_name]
+        memories_per_proc[proc_id] = memories_per_proc.get(proc_id, 0) + 1
+
+    buffers = []
+    # dictionary, where key = processor id, value = tuple (buffers, busy buffers heap, free buffers sizes) of
+    # the processor. Buffers of a processor are listed in the order of their creation
+    buffers_per_proc = {}
+
+    for memory_name in memory_names:
+        mem_size = max_tokens_per_mem_name.get(memory_name, 0)
+        occupancy_interval = occupancy_intervals_per_mem_name[memory_name][0]
+        proc_id = proc_per_mem_name[memory_name]
+        reuse_buf = None
+        if proc_id is not DIFFERENT_PROCS:
+            if proc_id not in buffers_per_proc:
+                buffers_per_proc[proc_id] = ([], [], _MaxSegmentTree(memories_per_proc[proc_id]))
+            proc_buffers, busy_buffers, free_buf_sizes = buffers_per_proc[proc_id]
+
+            # release buffers, which memories end before the new memory starts
+            while busy_buffers and busy_buffers[0][0] < occupancy_interval.start_step:
+                _, buf_id = heappop(busy_buffers)
+                free_buf_sizes.set(buf_id, proc_buffers[buf_id].size)
+
+            # first free buffer, large enough to store the memory, or first largest free buffer
+            buf_id = free_buf_sizes.find_first(mem_size)
+            if buf_id == -1:
+                buf_id = free_buf_sizes.find_first(free_buf_sizes.max())
+            if buf_id != -1:
+                reuse_buf = proc_buffers[buf_id]
+                reuse_buf.size = max(reuse_buf.size, mem_size)
+                free_buf_sizes.set(buf_id, _MaxSegmentTree.EMPTY)
+
+        # no reusable buffers found
+        if reuse_buf is None:
+            # create new buffer with size = memory size
+            buf_name = "B" + str(len(buffers))
+            reuse_buf = DataBuffer(buf_name, mem_size)
+            buffers.append(reuse_buf)
+            if proc_id is not DIFFERENT_PROCS:
+                buf_id = len(proc_buffers)
+                proc_buffers.append(reuse_buf)
+
+        reuse_buf.assign(memory_name)
+        if proc_id is not DIFFERENT_PROCS:
+            heappush(busy_buffers, (occupancy_interval.end_step, buf_id))
+
+    return buffers
+
+
+def _sorted_by_single_interval_start(occupancy_intervals_per_mem_name: {}):
+    """
+    Check if every memory has a single occupancy interval and memories are sorted
+    by the start of their occupancy intervals
+    """
+    prev_start_step = None
+    for occupancy_intervals in occupancy_intervals_per_mem_name.values():
+        if len(occupancy_intervals) != 1:
+            return False
+        occupancy_interval = occupancy_intervals[0]
+        if occupancy_interval.end_step < occupancy_interval.start_step:
+            return False
+        if prev_start_step is not None and occupancy_interval.start_step < prev_start_step:
+            return False
+        prev_start_step = occupancy_interval.start_step
+    return True
+
+
+# processor of a memory, which source and destination actors are mapped on different processors
+DIFFERENT_PROCS = object()
+
+
+def get_proc_per_mem_name(memory_names, mapping, actor_ids_per_mem_name):
+    """
+    Get processor of every memory: id of the processor, where source and destination actors of the memory are mapped,
+    or DIFFERENT_PROCS if the actors are mapped on different processors. If mapping is None, all memories
+    are assigned to processor None. Actors, missing in the mapping, are assumed to be mapped on processor None
+    """
+    if mapping is None:
+        return {memory_name: None for memory_name in memory_names}
+    proc_per_actor = {}
+    for proc_id in range(len(mapping)):
+        for actor_id in mapping[proc_id]:
+            if actor_id not in proc_per_actor:
+                proc_per_actor[actor_id] = proc_id
+    proc_per_mem_name = {}
+    for memory_name in memory_names:
+        src_actor_id, dst_actor_id = _get_src_and_dst_actor_id_from_mem_name(memory_name, actor_ids_per_mem_name)
+        src_proc, dst_proc = proc_per_actor.get(src_actor_id), proc_per_actor.get(dst_actor_id)
+        proc_per_mem_name[memory_name] = src_proc if src_proc == dst_proc else DIFFERENT_PROCS
+    return proc_per_mem_name
+
+
+def _get_src_and_dst_actor_id_from_mem_name(mem_name, actor_ids_per_mem_name=None):
+    if actor_ids_per_mem_name is not None and mem_name in actor_ids_per_mem_name:
+        return actor_ids_per_mem_name[mem_name]
+    actor_ids_str = mem_name.replace("a", "").split("_")
+    actor_ids_int = [int(layer_id) for layer_id in actor_ids_str]
+    return actor_ids_int[0], actor_ids_int[1]
+
+
+class _MaxSegmentTree:
+    """
+    Segment tree over a fixed number of (non-negative) values, that finds the first value,
+    not less than a threshold, in O(log n) time. Empty positions hold the EMPTY value
+    """
+    EMPTY = -1
+
+    def __init__(self, capacity):
+        self.__leaves = 1
+        while self.__leaves < capacity:
+            self.__leaves *= 2
+        self.__tree = [self.EMPTY for _ in range(2 * self.__leaves)]
+
+    def set(self, position, value):
+        node = position + self.__leaves
+        self.__tree[node] = value
+        node //= 2
+        while node > 0:
+            self.__tree[node] = max(self.__tree[2 * node], self.__tree[2 * node + 1])
+            node //= 2
+
+    def max(self):
+        return self.__tree[1]
+
+    def find_first(self, threshold):
+        """ Find the first position, which value is >= threshold, or -1 if all positions are empty or below threshold"""
+        if threshold == self.EMPTY or self.__tree[1] < threshold:
+            return -1
+        node = 1
+        while node < self.__leaves:
+            node = 2 * node if self.__tree[2 * node] >= threshold else 2 * node + 1
+        return node - self.__leaves
+
 """
 def build_reuse_buffers_from_sim_trace(sim_trace: SimTrace):
     Build a set of reused data buffers, using application simulation trace
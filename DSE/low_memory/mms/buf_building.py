@@ -1,20 +1,45 @@
-from DSE.low_memory.dp_by_parts import reset_phases
 from converters.dnn_to_csdf import dnn_to_csfd_one_to_one
-from DSE.low_memory.dp_by_parts import annotate_layers_with_phases
+from converters.csdf_fragments import CSDFFragments
 from simulation.csdf_simulation import simulate_execution_asap
 from models.csdf_model.csdf import check_csdfg_consistency
-from DSE.low_memory.buf_reuse_from_simulation import build_csdfg_reuse_buffers_from_sim_trace, minimize_csdfg_buf_sizes, \
+from simulation.sim_reducers import MaxStoredTokensReducer, OccupancyIntervalReducer
+from models.csdf_model.compiled_csdf import CompiledCSDFGraph
+from DSE.low_memory.analytic_buf_eval import eval_asap_buffers_analytic
+from DSE.low_memory.arena_planning import build_csdfg_arena_buffers
+from DSE.low_memory.optimal_buf_reuse import build_optimal_reuse_buffers, reuse_buffers_among_csdf_optimal
+from DSE.low_memory.buf_reuse_from_simulation import build_csdfg_reuse_buffers, set_csdfg_buf_sizes, \
     reuse_buffers_among_csdf
 from models.data_buffers import build_naive_csdfg_buffers
 from DSE.low_memory.mms.phases_derivation import get_phases_per_layer, get_phases_per_layer_per_partition, \
     get_phases_per_layer_per_dnn, get_phases_per_layer_per_partition_per_dnn
+from DSE.low_memory.dp_by_parts import get_max_phases_per_layer
 from DSE.scheduling.mms_dnn_inf_model_schedule import MMSDNNInfModelSchedule, csdf_sim_trace_schedule_to_dnn_schedule,\
     copy_dnn_schedule
 
 """
 The module builds MMS (max-memory-save) buffers that employ reuse of data within (data-processing-by-parts)
-and among (buffers reuse) different layers of DNN(s), used by a DNN-based application
+and among (buffers reuse) different layers of DNN(s), used by a DNN-based application.
+Buffers building does not modify the DNN(s): phases of DNN layers are passed to the DNN-to-CSDF conversion,
+so one (read-only) DNN model can be shared by concurrent buffers evaluations
 """
+
+# buffers evaluation modes:
+#  - "analytic": buffers are evaluated from the rate sequences and the firing order of CSDF actors
+#     (see analytic_buf_eval.py), without simulation;
+#  - "simulation": buffers are evaluated by simulation of the CSDF graph execution;
+#  - "verify": buffers are evaluated by simulation and checked against the analytic evaluation
+BUF_EVAL_MODES = ["analytic", "simulation", "verify"]
+DEFAULT_BUF_EVAL_MODE = "analytic"
+# memory planners:
+#  - "buffers": data of CSDF channels is stored in buffers, reused among channels with non-overlapping
+#     occupancy intervals, where every buffer has the size of its largest channel (see buf_reuse_from_simulation.py);
+#  - "buffers_optimal": same as "buffers", but channels are distributed among buffers (and buffers among DNNs)
+#     with minimum total size of the buffers, found by a time-limited branch-and-bound search for small graphs,
+#     and by the "buffers" planner otherwise (see optimal_buf_reuse.py);
+#  - "arena_greedy_by_size", "arena_greedy_by_breadth": data of every CSDF channel is stored at its own offset
+#     in a single memory arena per CSDF graph, placed with the respective strategy (see arena_planning.py)
+MEMORY_PLANNERS = ["buffers", "buffers_optimal", "arena_greedy_by_size", "arena_greedy_by_breadth"]
+DEFAULT_MEMORY_PLANNER = "buffers"
 ###########
 # Interface
 
@@ -23,7 +48,8 @@ def get_mms_buffers_and_schedule(dnns: [],
                                  partitions_per_dnn: [],
                                  dp_encoding: [],
                                  generate_schedule=False,
-                                 verbose=False):
+                                 verbose=False,
+                                 memory_planner=None):
     """
     Get MMS buffers for a DNN-based application, using a one or multiple of DNNs,
         where every DNN is possibly executed as a set of pipelined partitions
@@ -39,6 +65,7 @@ def get_mms_buffers_and_schedule(dnns: [],
     :param generate_schedule: (flag) if yes, actual per-partition-per dnn schedule is generated. Otherwise,
         null-schedule is returned
     :param verbose: print details of buffers generation
+    :param memory_planner: memory planner (see MEMORY_PLANNERS). If None, DEFAULT_MEMORY_PLANNER is used
     :return: list of MMS (data processing by parts + buffers reuse) CSDF buffers, used by the application,
         and schedule, required for the application to be executed with proposed buffers
     """
@@ -61,7 +88,8 @@ def get_mms_buffers_and_schedule(dnns: [],
         if not is_pipelined:
             single_dnn = dnns[0]
             phases = get_phases_per_layer(single_dnn, dp_encoding)
-            buffers, schedule = get_mms_buffers_no_pipeline(single_dnn, phases, generate_schedule)
+            buffers, schedule = get_mms_buffers_no_pipeline(single_dnn, phases, generate_schedule,
+                                                            memory_planner=memory_planner)
             # format schedule
             return buffers, schedule
 
@@ -69,7 +97,8 @@ def get_mms_buffers_and_schedule(dnns: [],
         else:
             single_dnn_partitions = partitions_per_dnn[0]
             phases = get_phases_per_layer_per_partition(single_dnn_partitions, dp_encoding)
-            buffers, schedule = get_mms_buffers_pipelined(single_dnn_partitions, phases, dnns[0].name, generate_schedule)
+            buffers, schedule = get_mms_buffers_pipelined(single_dnn_partitions, phases, dnns[0].name, generate_schedule,
+                                                          memory_planner=memory_planner)
             return buffers, schedule
 
     # multi-dnn applications
@@ -77,7 +106,7 @@ def get_mms_buffers_and_schedule(dnns: [],
         # no pipeline parallelism is exploited
         if not is_pipelined:
             phases = get_phases_per_layer_per_dnn(dnns, dp_encoding)
-            buffers, schedule = get_mms_buffers_multi(dnns, phases, generate_schedule)
+            buffers, schedule = get_mms_buffers_multi(dnns, phases, generate_schedule, memory_planner=memory_planner)
             return buffers, schedule
         # pipeline parallelism is exploited
         else:
@@ -85,7 +114,8 @@ def get_mms_buffers_and_schedule(dnns: [],
             buffers, schedule = get_mms_buffers_multi_pipelined(partitions_per_dnn,
                                                                 phases,
                                                                 [dnn.name for dnn in dnns],
-                                                                generate_schedule)
+                                                                generate_schedule,
+                                                                memory_planner=memory_planner)
             return buffers, schedule
 
 
@@ -124,11 +154,110 @@ def are_single_dnn_partitions(partitions_per_dnn: []):
     return True
 
 
+def build_csdf_reuse_buffers(csdf, csdf_buffers, buf_eval_mode=None, memory_planner=None):
+    """
+    Evaluate (ASAP, single processor) execution of a CSDF graph with naive buffers, minimize the naive buffers
+    and build buffers, reused within the CSDF graph
+    :param csdf: CSDF graph
+    :param csdf_buffers: naive (non-reused) CSDF graph buffers. The buffers sizes are minimized
+    :param buf_eval_mode: buffers evaluation mode (see BUF_EVAL_MODES). If None, DEFAULT_BUF_EVAL_MODE is used
+    :param memory_planner: memory planner (see MEMORY_PLANNERS). If None, DEFAULT_MEMORY_PLANNER is used
+    :return: execution order of the CSDF graph actors (list of actor ids) and list of CSDF buffers,
+        reused within the CSDF graph
+    """
+    if buf_eval_mode is None:
+        buf_eval_mode = DEFAULT_BUF_EVAL_MODE
+    if buf_eval_mode not in BUF_EVAL_MODES:
+        raise Exception("MMS buffers derivation error: unknown buffers evaluation mode " + str(buf_eval_mode))
+    if memory_planner is None:
+        memory_planner = DEFAULT_MEMORY_PLANNER
+    if memory_planner not in MEMORY_PLANNERS:
+        raise Exception("MMS buffers derivation error: unknown memory planner " + str(memory_planner))
+
+    compiled_csdf = CompiledCSDFGraph(csdf, csdf_buffers)
+    if buf_eval_mode == "analytic":
+        exec_order, max_tokens_per_mem_name, occupancy_intervals_per_mem_name = \
+            eval_asap_buffers_analytic(compiled_csdf)
+    else:
+        exec_order, max_tokens_per_mem_name, occupancy_intervals_per_mem_name = \
+            eval_asap_buffers_simulation(csdf, csdf_buffers, compiled_csdf)
+        if buf_eval_mode == "verify":
+            analytic_eval = eval_asap_buffers_analytic(compiled_csdf)
+            check_asap_buffers_eval(csdf, (exec_order, max_tokens_per_mem_name, occupancy_intervals_per_mem_name),
+                                    analytic_eval)
+
+    set_csdfg_buf_sizes(csdf_buffers, max_tokens_per_mem_name)
+    if memory_planner == "buffers":
+        reuse_csdf_buffers = build_csdfg_reuse_buffers(occupancy_intervals_per_mem_name,
+                                                       max_tokens_per_mem_name,
+                                                       csdf_buffers)
+    elif memory_planner == "buffers_optimal":
+        reuse_csdf_buffers = build_csdfg_reuse_buffers(occupancy_intervals_per_mem_name,
+                                                       max_tokens_per_mem_name,
+                                                       csdf_buffers,
+                                                       reuse_buffers_builder=build_optimal_reuse_buffers)
+    else:
+        reuse_csdf_buffers = build_csdfg_arena_buffers(occupancy_intervals_per_mem_name,
+                                                       max_tokens_per_mem_name,
+                                                       csdf_buffers,
+                                                       strategy=memory_planner.replace("arena_", "", 1))
+    return exec_order, reuse_csdf_buffers
+
+
+def eval_asap_buffers_simulation(csdf, csdf_buffers, compiled_csdf=None):
+    """
+    Evaluate CSDF graph buffers for the ASAP schedule on a single processor, using simulation.
+    The memory access trace is not stored: buffers sizes and occupancy intervals are derived by
+    online reducers during the simulation
+    :param csdf: CSDF graph
+    :param csdf_buffers: naive (non-reused) CSDF graph buffers
+    :param compiled_csdf: (optional) CSDF graph, compiled with csdf_buffers
+    :return: tuple (exec_order, max_tokens_per_mem_name, occupancy_intervals_per_mem_name),
+        see eval_asap_buffers_analytic()
+    """
+    max_tokens_reducer = MaxStoredTokensReducer()
+    occupancy_reducer = OccupancyIntervalReducer()
+    sim_trace = simulate_execution_asap(csdf, csdf_buffers,
+                                        max_samples=1,
+                                        proc_num=1,
+                                        trace_memory_access=False,
+                                        verbose=False,
+                                        compiled_csdfg=compiled_csdf,
+                                        reducers=[max_tokens_reducer, occupancy_reducer])
+    exec_order = csdf_sim_trace_schedule_to_dnn_schedule(sim_trace.get_asap_schedule())
+    return exec_order, max_tokens_reducer.max_tokens_per_mem_name, occupancy_reducer.get_occupancy_intervals_per_memory()
+
+
+def check_asap_buffers_eval(csdf, sim_eval, analytic_eval):
+    """
+    Check that analytic buffers evaluation matches the simulation
+    :param csdf: CSDF graph
+    :param sim_eval: results of eval_asap_buffers_simulation()
+    :param analytic_eval: results of eval_asap_buffers_analytic()
+    """
+    def __intervals_desc(occupancy_intervals_per_mem_name):
+        return [(mem_name, [(interval.start_step, interval.end_step, interval.max_tokens) for interval in intervals])
+                for mem_name, intervals in occupancy_intervals_per_mem_name.items()]
+
+    sim_exec_order, sim_max_tokens, sim_intervals = sim_eval
+    analytic_exec_order, analytic_max_tokens, analytic_intervals = analytic_eval
+    if list(sim_exec_order) != list(analytic_exec_order):
+        raise Exception("MMS buffers verification error: analytic execution order of CSDF graph " +
+                        csdf.name + " does not match the simulation")
+    if list(sim_max_tokens.items()) != list(analytic_max_tokens.items()):
+        raise Exception("MMS buffers verification error: analytic buffers sizes of CSDF graph " +
+                        csdf.name + " do not match the simulation")
+    if __intervals_desc(sim_intervals) != __intervals_desc(analytic_intervals):
+        raise Exception("MMS buffers verification error: analytic buffers occupancy of CSDF graph " +
+                        csdf.name + " does not match the simulation")
+
+
 ##########################################
 # single dnn with no pipeline parallelism
 
 
-def get_mms_buffers_no_pipeline(dnn, phases_per_layer: {}, generate_schedule=False):
+def get_mms_buffers_no_pipeline(dnn, phases_per_layer: {}, generate_schedule=False, csdf_fragments=None,
+                                memory_planner=None):
     """
     Get buffers with data processing by parts and buffers reuse for a single-DNN application
     where memory reused within and among dnns and no pipeline parallelism is exploited
@@ -137,36 +266,31 @@ def get_mms_buffers_no_pipeline(dnn, phases_per_layer: {}, generate_schedule=Fal
         value (int) = number of phases, performed by the layer
     :param generate_schedule: (flag) if yes, actual per-partition-per dnn schedule is generated. Otherwise,
         null-schedule is returned
+    :param csdf_fragments: (optional) prebuilt CSDF fragments of the DNN (see build_csdf_fragments()).
+        If specified, CSDF graph of the DNN is assembled from the fragments
+    :param memory_planner: memory planner (see MEMORY_PLANNERS). If None, DEFAULT_MEMORY_PLANNER is used
     :return: list of CSDF buffers, used by the application, and schedule (object of MMSDNNInfModelSchedule class),
         required for the application to be executed with proposed buffers. If generate_schedule flag is False.
         schedule is None.
     """
-    annotate_layers_with_phases(dnn, phases_per_layer)
-    annotate_with_sim_time(dnn)
-
-    csdf = dnn_to_csfd_one_to_one(dnn)
+    if csdf_fragments is not None:
+        csdf = csdf_fragments.assemble(phases_per_layer)
+    else:
+        csdf = dnn_to_csfd_one_to_one(dnn,
+                                      phases_per_layer=phases_per_layer,
+                                      time_per_layer=get_sim_time_per_layer(dnn, phases_per_layer))
     consistency = check_csdfg_consistency(csdf, verbose=True)
 
     # build naive (non-reuse) buffers
     csdf_buffers = build_naive_csdfg_buffers(csdf)
-    sim_trace = simulate_execution_asap(csdf, csdf_buffers,
-                                        max_samples=1,
-                                        proc_num=1,
-                                        trace_memory_access=True,
-                                        verbose=False)
-    sim_trace.sort_tasks_by_start_time()
-    minimize_csdfg_buf_sizes(sim_trace, csdf_buffers)
-    reuse_dp_csdf_buffers = build_csdfg_reuse_buffers_from_sim_trace(sim_trace, csdf_buffers)
+    exec_order, reuse_dp_csdf_buffers = build_csdf_reuse_buffers(csdf, csdf_buffers, memory_planner=memory_planner)
     associate_buffers_with_csdf_model(reuse_dp_csdf_buffers, dnn.name)
 
-    reset_phases(dnn)
-
     # CSDF model schedule (execution order of actors within CSDF model)
     schedule = None
     if generate_schedule:
         schedule = MMSDNNInfModelSchedule([dnn.name])
-        sim_trace_schedule = sim_trace.get_asap_schedule()
-        dnn_schedule = csdf_sim_trace_schedule_to_dnn_schedule(sim_trace_schedule)
+        dnn_schedule = exec_order
         schedule.append_dnn_partition_schedule(dnn.name, dnn.name, dnn_schedule)
 
     return reuse_dp_csdf_buffers, schedule
@@ -179,7 +303,9 @@ def get_mms_buffers_no_pipeline(dnn, phases_per_layer: {}, generate_schedule=Fal
 def get_mms_buffers_pipelined(dnn_partitions,
                               phases_per_layer_per_partition: {},
                               dnn_name: str,
-                              generate_schedule=False):
+                              generate_schedule=False,
+                              csdf_fragments_per_partition=None,
+                              memory_planner=None):
     """
     Get buffers with data processing by parts and buffers reuse for a single-DNN application
     where memory reused within and among dnns and no pipeline parallelism is exploited
@@ -192,6 +318,9 @@ def get_mms_buffers_pipelined(dnn_partitions,
     :param dnn_name: name of the DNN
     :param generate_schedule: (flag) if yes, actual per-partition-per dnn schedule is generated. Otherwise,
         null-schedule is returned
+    :param csdf_fragments_per_partition: (optional) list of prebuilt CSDF fragments of every DNN partition
+        (see build_csdf_fragments()). If specified, CSDF graphs of the partitions are assembled from the fragments
+    :param memory_planner: memory planner (see MEMORY_PLANNERS). If None, DEFAULT_MEMORY_PLANNER is used
     :return: list of CSDF buffers, used by the application, and schedule (object of MMSDNNInfModelSchedule class),
         required for the application to be executed with proposed buffers. If generate_schedule flag is False.
         schedule is None.
@@ -202,28 +331,24 @@ def get_mms_buffers_pipelined(dnn_partitions,
 
     schedule = MMSDNNInfModelSchedule([dnn_name])
 
-    for partition in dnn_partitions:
-        annotate_layers_with_phases(partition, phases_per_layer_per_partition[partition.name])
-        annotate_with_sim_time(partition)
-
-        csdf = dnn_to_csfd_one_to_one(partition)
+    for partition_id in range(len(dnn_partitions)):
+        partition = dnn_partitions[partition_id]
+        phases_per_layer = phases_per_layer_per_partition[partition.name]
+        if csdf_fragments_per_partition is not None:
+            csdf = csdf_fragments_per_partition[partition_id].assemble(phases_per_layer)
+        else:
+            csdf = dnn_to_csfd_one_to_one(partition,
+                                          phases_per_layer=phases_per_layer,
+                                          time_per_layer=get_sim_time_per_layer(partition, phases_per_layer))
         consistency = check_csdfg_consistency(csdf, verbose=True)
 
         # build naive (non-reuse) buffers
         csdf_buffers = build_naive_csdfg_buffers(csdf)
-        sim_trace = simulate_execution_asap(csdf, csdf_buffers,
-                                            max_samples=1,
-                                            proc_num=1,
-                                            trace_memory_access=True,
-                                            verbose=False)
-        sim_trace.sort_tasks_by_start_time()
-        minimize_csdfg_buf_sizes(sim_trace, csdf_buffers)
-        reuse_csdf_buffers = build_csdfg_reuse_buffers_from_sim_trace(sim_trace, csdf_buffers)
+        exec_order, reuse_csdf_buffers = build_csdf_reuse_buffers(csdf, csdf_buffers, memory_planner=memory_planner)
         csdf_buffers_per_partition.append(reuse_csdf_buffers)
 
         if generate_schedule:
-            sim_trace_partition_schedule = sim_trace.get_asap_schedule()
-            partition_schedule = csdf_sim_trace_schedule_to_dnn_schedule(sim_trace_partition_schedule)
+            partition_schedule = exec_order
             schedule.append_dnn_partition_schedule(dnn_name, partition.name, partition_schedule)
 
     # NOTE: buffers CANNOT be reused among different partitions executed on different processors!
@@ -237,10 +362,6 @@ def get_mms_buffers_pipelined(dnn_partitions,
 
     associate_buffers_with_csdf_model(dp_reuse_buffers, dnn_name)
 
-    # reset number of phases per partition
-    for partition in dnn_partitions:
-        reset_phases(partition)
-
     if not generate_schedule:
         schedule = None
 
@@ -250,7 +371,7 @@ def get_mms_buffers_pipelined(dnn_partitions,
 ########################################
 # multi-dnn with no pipeline parallelism
 
-def get_mms_buffers_multi(dnns, phases_per_layer_per_dnn: {}, generate_schedule=False):
+def get_mms_buffers_multi(dnns, phases_per_layer_per_dnn: {}, generate_schedule=False, memory_planner=None):
     """
     Get buffers with data processing by parts and buffers reuse for a multi-CNN application
     where memory reused within and among dnns and no pipeline parallelism is exploited
@@ -260,6 +381,7 @@ def get_mms_buffers_multi(dnns, phases_per_layer_per_dnn: {}, generate_schedule=
         value (int) = number of phases, performed by the layer
     :param generate_schedule: (flag) if yes, actual per-partition-per dnn schedule is generated. Otherwise,
         null-schedule is returned
+    :param memory_planner: memory planner (see MEMORY_PLANNERS). If None, DEFAULT_MEMORY_PLANNER is used
     :return: list of CSDF buffers, used by the application, and schedule (object of MMSDNNInfModelSchedule class),
         required for the application to be executed with proposed buffers. If generate_schedule flag is False.
         schedule is None.
@@ -271,13 +393,14 @@ def get_mms_buffers_multi(dnns, phases_per_layer_per_dnn: {}, generate_schedule=
     for dnn in dnns:
         csdf_buffers, dnn_schedule = get_mms_buffers_no_pipeline(dnn,
                                                                  phases_per_layer_per_dnn[dnn.name],
-                                                                 generate_schedule)
+                                                                 generate_schedule,
+                                                                 memory_planner=memory_planner)
         buffers_per_dnn.append(csdf_buffers)
         if generate_schedule:
             copy_dnn_schedule(dnn.name, dnn_schedule, schedule)
 
     # reuse buffers among dnn (csdf)
-    shared_buffers = reuse_buffers_among_csdf(buffers_per_dnn, [dnn.name for dnn in dnns])
+    shared_buffers = reuse_buffers_among_dnns(buffers_per_dnn, [dnn.name for dnn in dnns], memory_planner)
     set_auto_buffer_names(shared_buffers)
 
     if not generate_schedule:
@@ -292,7 +415,9 @@ def get_mms_buffers_multi(dnns, phases_per_layer_per_dnn: {}, generate_schedule=
 def get_mms_buffers_multi_pipelined(partitions_per_dnn: [],
                                     phases_per_layer_per_partition_per_dnn: [],
                                     dnn_names: [str],
-                                    generate_schedule=False):
+                                    generate_schedule=False,
+                                    csdf_fragments_per_partition_per_dnn=None,
+                                    memory_planner=None):
     """
     Get buffers with data processing by parts and buffers reuse for a multi-CNN application
         where memory reused within and among dnns and pipeline parallelism is exploited
@@ -305,6 +430,10 @@ def get_mms_buffers_multi_pipelined(partitions_per_dnn: [],
     :param dnn_names: list of DNN names for DNN partitions
         :param generate_schedule: (flag) if yes, actual per-partition-per dnn schedule is generated. Otherwise,
         null-schedule is returned
+    :param csdf_fragments_per_partition_per_dnn: (optional) prebuilt CSDF fragments of every partition
+        of every DNN (see build_csdf_fragments_per_partition_per_dnn()). If specified, CSDF graphs of the
+        partitions are assembled from the fragments
+    :param memory_planner: memory planner (see MEMORY_PLANNERS). If None, DEFAULT_MEMORY_PLANNER is used
     :return: list of CSDF buffers, used by the application, and schedule,
         required for the application to be executed with proposed buffers
     """
@@ -316,6 +445,9 @@ def get_mms_buffers_multi_pipelined(partitions_per_dnn: [],
         partitions = partitions_per_dnn[dnn_id]
         dnn_name = dnn_names[dnn_id]
         phases_per_layer_per_partition = phases_per_layer_per_partition_per_dnn[dnn_id]
+        csdf_fragments_per_partition = None
+        if csdf_fragments_per_partition_per_dnn is not None:
+            csdf_fragments_per_partition = csdf_fragments_per_partition_per_dnn[dnn_id]
 
         # single-partition dnn (executed sequentially)
         if len(partitions) == 1:
@@ -323,21 +455,26 @@ def get_mms_buffers_multi_pipelined(partitions_per_dnn: [],
             phases_per_layer = phases_per_layer_per_partition[single_partition.name]
             dnn_buffers, dnn_schedule = get_mms_buffers_no_pipeline(single_partition,
                                                                     phases_per_layer,
-                                                                    generate_schedule)
+                                                                    generate_schedule,
+                                                                    None if csdf_fragments_per_partition is None
+                                                                    else csdf_fragments_per_partition[0],
+                                                                    memory_planner=memory_planner)
 
         # multi-partition dnn (executed as a pipeline)
         else:
             dnn_buffers, dnn_schedule = get_mms_buffers_pipelined(partitions,
                                                                   phases_per_layer_per_partition,
                                                                   dnn_names[dnn_id],
-                                                                  generate_schedule)
+                                                                  generate_schedule,
+                                                                  csdf_fragments_per_partition,
+                                                                  memory_planner=memory_planner)
         buffers_per_dnn.append(dnn_buffers)
 
         if generate_schedule:
             copy_dnn_schedule(dnn_name, dnn_schedule, schedule)
 
     # reuse buffers among dnns (csdf)
-    shared_buffers = reuse_buffers_among_csdf(buffers_per_dnn, dnn_names)
+    shared_buffers = reuse_buffers_among_dnns(buffers_per_dnn, dnn_names, memory_planner)
     set_auto_buffer_names(shared_buffers)
 
     if not generate_schedule:
@@ -349,13 +486,79 @@ def get_mms_buffers_multi_pipelined(partitions_per_dnn: [],
 # helper functions
 
 
-def annotate_with_sim_time(dnn):
+def reuse_buffers_among_dnns(buffers_per_dnn: [], dnn_names: [str], memory_planner=None):
+    """
+    Reuse buffers among DNNs (CSDF models)
+    :param buffers_per_dnn: CSDF buffers, reused within every DNN
+    :param dnn_names: names of the DNNs
+    :param memory_planner: memory planner (see MEMORY_PLANNERS). If None, DEFAULT_MEMORY_PLANNER is used
+    :return: buffers, reused among the DNNs
+    """
+    if memory_planner == "buffers_optimal":
+        return reuse_buffers_among_csdf_optimal(buffers_per_dnn, dnn_names)
+    return reuse_buffers_among_csdf(buffers_per_dnn, dnn_names)
+
+
+def get_sim_time_per_layer(dnn, phases_per_layer: {}):
     """
-    Annotate layers with fake time to simulate their schedule
+    Get fake time of layers to simulate their schedule
     # NOTE: this is NECESSARY for timed simulation!
+    :param dnn: dnn
+    :param phases_per_layer: dictionary where key (str) = name of a DNN layer,
+        value (int) = number of phases, performed by the layer
+    :return: dictionary where key (str) = name of a DNN layer, value = fake execution time of the layer
     """
+    time_per_layer = {}
     for layer in dnn.get_layers():
-        layer.time_eval = max(layer.phases, 1)
+        layer_phases = phases_per_layer[layer.name] if layer.name in phases_per_layer else layer.phases
+        time_per_layer[layer.name] = get_sim_layer_time(layer, layer_phases)
+    return time_per_layer
+
+
+def get_sim_layer_time(layer, layer_phases: int):
+    """
+    Get fake time of a layer to simulate its schedule (see get_sim_time_per_layer())
+    :param layer: DNN layer
+    :param layer_phases: number of phases, performed by the layer
+    :return: fake execution time of the layer
+    """
+    return max(layer_phases, 1)
+
+
+def build_csdf_fragments(dnn, max_phases_per_layer=None):
+    """
+    Build CSDF fragments of a DNN, used to assemble CSDF graphs of the DNN during MMS buffers building
+    :param dnn: DNN
+    :param max_phases_per_layer: maximum number of phases per DNN layer.
+        If unspecified (is None), is computed automatically
+    :return: CSDF fragments of the DNN (see CSDFFragments)
+    """
+    if max_phases_per_layer is None:
+        max_phases_per_layer = get_max_phases_per_layer(dnn)
+    return CSDFFragments(dnn, max_phases_per_layer, time_per_layer_phases=get_sim_layer_time)
+
+
+def build_csdf_fragments_per_partition_per_dnn(partitions_per_dnn: [],
+                                               max_phases_per_layer_per_partition_per_dnn=None):
+    """
+    Build CSDF fragments of every partition of every DNN
+    :param partitions_per_dnn: list [partitions_1, partitions_2, ..., partitionsN] where
+        partitions_i is a list of partitions (sub-networks) of a DNN, N is the total number of DNNs
+    :param max_phases_per_layer_per_partition_per_dnn: maximum number of phases per layer per partition per DNN.
+        If unspecified (is None), is computed automatically
+    :return: list [fragments_1, fragments_2, ..., fragmentsN] where fragments_i is a list with
+        CSDF fragments of every partition of i-th DNN
+    """
+    csdf_fragments_per_partition_per_dnn = []
+    for dnn_id in range(len(partitions_per_dnn)):
+        csdf_fragments_per_partition = []
+        for partition in partitions_per_dnn[dnn_id]:
+            max_phases_per_layer = None
+            if max_phases_per_layer_per_partition_per_dnn is not None:
+                max_phases_per_layer = max_phases_per_layer_per_partition_per_dnn[dnn_id][partition.name]
+            csdf_fragments_per_partition.append(build_csdf_fragments(partition, max_phases_per_layer))
+        csdf_fragments_per_partition_per_dnn.append(csdf_fragments_per_partition)
+    return csdf_fragments_per_partition_per_dnn
 
 
 def set_auto_buffer_names(csdf_buffers):
@@ -4,8 +4,9 @@ from models.dnn_model.transformation.external_ios_processor import external_ios_
 import traceback
 from util import print_stage
 from models.app_model.MMSDNNInferenceModel import MMSDNNInferenceModel
-from DSE.low_memory.mms.buf_building import get_mms_buffers_and_schedule
-from DSE.low_memory.mms.phases_derivation import dp_encoding_to_phases_num
+from DSE.low_memory.mms.buf_building import get_mms_buffers_and_schedule, get_sim_time_per_layer
+from DSE.low_memory.mms.phases_derivation import dp_encoding_to_phases_num,\
+    get_phases_per_layer_per_partition_per_dnn
 from converters.data_buffers_converter import csdf_reuse_buf_to_generic_dnn_buf
 from models.dnn_model.dnn import DNN
 
@@ -14,7 +15,20 @@ def build_final_app(app_name: str,
                     dnns: [DNN],
                     dnn_pipeline_mappings: [],
                     dp_encoding: [bool],
-                    verbose=True):
+                    verbose=True,
+                    memory_planner=None):
+    """
+    Build final model of a DNN-based application
+    :param app_name: name of the application
+    :param dnns: DNN(s) used by the application
+    :param dnn_pipeline_mappings: mapping of every DNN (None for DNNs, executed with no pipeline parallelism)
+    :param dp_encoding: data processing by parts, encoded in a binary string
+    :param verbose: print details
+    :param memory_planner: memory planner (see MEMORY_PLANNERS in buf_building.py). If None, the default
+        planner is used. With an arena planner, the application buffers are memory arenas,
+        that specify offset of every user (see ArenaDataBuffer)
+    :return: final application model (MMSDNNInferenceModel) or None, if the model could not be built
+    """
     # parse config
     stage = "Parsing application configuration"
 
@@ -45,7 +59,8 @@ def build_final_app(app_name: str,
                                                                   partitions_per_dnn,
                                                                   dp_encoding,
                                                                   generate_schedule=True,
-                                                                  verbose=False)
+                                                                  verbose=False,
+                                                                  memory_planner=memory_planner)
 
         stage = "Creating DNN buffers description"
         print_stage(stage, verbose)
@@ -53,6 +68,17 @@ def build_final_app(app_name: str,
         # for buf in generic_dnn_buffers:
         #    buf.print_details()
 
+        stage = "Annotating dnn layers with time, used to derive the schedule"
+        print_stage(stage, verbose)
+        phases_per_layer_per_partition_per_dnn = get_phases_per_layer_per_partition_per_dnn(partitions_per_dnn,
+                                                                                            dp_encoding)
+        for dnn_id in range(len(partitions_per_dnn)):
+            for partition in partitions_per_dnn[dnn_id]:
+                phases_per_layer = phases_per_layer_per_partition_per_dnn[dnn_id][partition.name]
+                time_per_layer = get_sim_time_per_layer(partition, phases_per_layer)
+                for layer in partition.get_layers():
+                    layer.time_eval = time_per_layer[layer.name]
+
         stage = "Creating final model"
         print_stage(stage, verbose)
         app_model = MMSDNNInferenceModel(app_name,
@@ -2,16 +2,54 @@ import random
 import sys
 
 
+def generate_random_genes(layers_num: int, dp_by_parts_init_probability=0.5, precision_bits=16) -> int:
+    """
+    Generate random genes (bitset) for a chromosome, where every gene is set to 1
+    with probability dp_by_parts_init_probability, independently of other genes.
+    Instead of rolling a dice for every gene, the bitset is built from precision_bits random
+    bitsets, combined with bitwise AND/OR in accordance with the binary expansion of the probability
+    :param layers_num: number of genes (layers) in the chromosome
+    :param dp_by_parts_init_probability: float number 0 <=x <= 1: probability with which
+        (every) layer li in the dnn processes data by parts
+    :param precision_bits: number of bits in the binary expansion of the probability
+    :return: (int) random genes
+    """
+    if layers_num <= 0:
+        return 0
+    all_genes = (1 << layers_num) - 1
+    scaled_probability = int(round(dp_by_parts_init_probability * (1 << precision_bits)))
+    if scaled_probability <= 0:
+        return 0
+    if scaled_probability >= (1 << precision_bits):
+        return all_genes
+
+    # skip trailing zero bits of the expansion: AND with empty bitset is an empty bitset
+    while scaled_probability & 1 == 0:
+        scaled_probability >>= 1
+        precision_bits -= 1
+
+    genes = 0
+    for bit_id in range(precision_bits):
+        random_genes = random.getrandbits(layers_num)
+        if (scaled_probability >> bit_id) & 1:
+            genes |= random_genes
+        else:
+            genes &= random_genes
+    return genes
+
+
 class MMSChromosome:
     """
     Chromosome that represents DP (data processing by parts) within CNN
     """
+    __slots__ = ("layers_num", "genes", "time_loss", "buf_size", "needs_eval")
+
     def __init__(self, layers_num):
         self.layers_num = layers_num
-        # list of boolean flags of len = len(self.layers_num)
-        # each i-th flag = True/False determines whether layer li of dnn
-        # processes data by parts (True) or not (False)
-        self.dp_by_parts = [False for _ in range(self.layers_num)]
+        # bitset (int) of len = self.layers_num, where
+        # each i-th bit = 1/0 determines whether layer li of dnn
+        # processes data by parts (1) or not (0)
+        self.genes = 0
         # chromosome is characterised with loss of time, caused
         # by using data processing by parts as well as by
         # total size of buffers (in MegaBytes)
@@ -20,10 +58,9 @@ class MMSChromosome:
         # estimated and assigned to the chromosome during GA
         self.time_loss = sys.maxsize
         self.buf_size = sys.maxsize
-
-        # related dnn/partitions per dnn
-        self.dnn = None
-        self.partitions_per_dnn = None
+        # (flag) True if the chromosome was changed (created, mutated or obtained by crossover)
+        # after its fitness (time loss and buffers size) was evaluated
+        self.needs_eval = True
 
     def init_random(self, dp_by_parts_init_probability=0.5):
         """
@@ -33,26 +70,93 @@ class MMSChromosome:
         processes data by parts or not. By default, = 0.5 (probability of
         randomly choosing from two possibilities: processing by parts or no processing by parts)
         """
-        for layer_id in range(self.layers_num):
-            # roll a dice: should the layer process data by parts?
-            random_chance = random.uniform(0, 1)  # Random float x, 0 <= x < 1
-            if random_chance <= dp_by_parts_init_probability:
-                # the layer processes data by parts
-                self.dp_by_parts[layer_id] = True
-            else:
-                # the layer does not process data by parts
-                self.dp_by_parts[layer_id] = False
+        self.genes = generate_random_genes(self.layers_num, dp_by_parts_init_probability)
+        self.needs_eval = True
 
     def mutate(self):
         random_layer_id = random.randint(0, self.layers_num - 1)  # get random layer
-        self.dp_by_parts[random_layer_id] = not self.dp_by_parts[random_layer_id]
+        self.genes ^= 1 << random_layer_id
+        self.needs_eval = True
         # print("Mutate: layer ", random_layer_id, "processing by parts inverted")
 
     def clean(self):
-        self.dp_by_parts = [False for _ in range(self.layers_num)]
+        self.genes = 0
+        self.needs_eval = True
+
+    def crossover(self, other):
+        """
+        Crossover: create a child chromosome, that takes first half of genes from this chromosome
+        and second half of genes from other chromosome
+        :param other: other parent chromosome
+        :return: child chromosome
+        """
+        child_chromosome = MMSChromosome(self.layers_num)
+        # genes of first parent: range1 = [0, (layers_num / 2 - 1)]
+        first_half_mask = (1 << int(self.layers_num / 2)) - 1
+        # genes of second parent: range2 = [(layers_num / 2), layers_num - 1]
+        child_chromosome.genes = (self.genes & first_half_mask) | (other.genes & ~first_half_mask)
+        return child_chromosome
+
+    def copy(self):
+        """
+        Create a copy of the chromosome, annotated with the same fitness
+        :return: copy of the chromosome
+        """
+        chromosome_copy = MMSChromosome(self.layers_num)
+        chromosome_copy.genes = self.genes
+        chromosome_copy.time_loss = self.time_loss
+        chromosome_copy.buf_size = self.buf_size
+        chromosome_copy.needs_eval = self.needs_eval
+        return chromosome_copy
+
+    def processes_by_parts(self, layer_id):
+        """
+        Check if layer processes data by parts
+        :param layer_id: layer id (index of the layer gene) in the chromosome
+        :return: True if layer processes data by parts and False otherwise
+        """
+        return (self.genes >> layer_id) & 1 == 1
+
+    @property
+    def dp_by_parts(self):
+        """
+        list of boolean flags of len = len(self.layers_num)
+        each i-th flag = True/False determines whether layer li of dnn
+        processes data by parts (True) or not (False)
+        """
+        genes = self.genes
+        return [(genes >> layer_id) & 1 == 1 for layer_id in range(self.layers_num)]
+
+    @dp_by_parts.setter
+    def dp_by_parts(self, dp_by_parts: []):
+        genes = 0
+        for layer_id in range(len(dp_by_parts)):
+            if dp_by_parts[layer_id]:
+                genes |= 1 << layer_id
+        self.genes = genes
+        self.needs_eval = True
+
+    def set_fitness(self, buf_size, time_loss):
+        """
+        Annotate chromosome with evaluated fitness
+        :param buf_size: total size of buffers (in MegaBytes)
+        :param time_loss: loss of time (in ms), caused by data processing by parts
+        """
+        self.buf_size = buf_size
+        self.time_loss = time_loss
+        self.needs_eval = False
+
+    def get_genotype_key(self):
+        """
+        Get chromosome genotype (dp by parts flags), packed into an integer, where
+        i-th bit = 1 if i-th layer processes data by parts and 0 otherwise.
+        Chromosomes with equal genotypes have equal fitness
+        :return: (int) chromosome genotype
+        """
+        return self.genes
 
     def __str__(self):
-        max_phases = len([dp for dp in self.dp_by_parts if dp is True])
+        max_phases = bin(self.genes).count("1")
         return "{layers with phases: " + str(max_phases) + \
                ", time_loss: " + str(self.time_loss) \
                + ", buf_size " + str(self.buf_size) + "}"
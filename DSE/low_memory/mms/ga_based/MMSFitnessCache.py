@@ -0,0 +1,148 @@
+import hashlib
+import os
+import sqlite3
+
+
+class MMSFitnessCache:
+    """
+    Cache of MMS chromosomes fitness (buffers size and time loss), where every fitness
+    is accessed by the chromosome genotype. The cache is used by MMS GA to avoid repeated evaluation
+    of chromosomes with the same genotype: such chromosomes are often obtained by crossover of similar
+    parents or by mutations that flip a gene back.
+    Optionally, the cache is persisted in a local SQLite file, so that GA reruns for the same
+    application reuse fitness of already evaluated genotypes.
+
+    :param app_key: (str) hash of the application structure (see get_app_structure_key()).
+        Genotypes are only comparable within the same application, so every cached record is
+        associated with the application key
+    :param db_path: path to SQLite file, where the cache is persisted. If None, the cache is kept in memory only
+    """
+    def __init__(self, app_key: str, db_path=None):
+        self.app_key = app_key
+        self.db_path = db_path
+        # dictionary, where key (int) = genotype (dp by parts flags, packed into an integer),
+        # value = tuple (buf_size, time_loss)
+        self.__fitness = {}
+        # records that are not yet saved in the SQLite file
+        self.__unsaved_records = []
+        self.__db = None
+
+        # statistics (hits and misses since the last reset of the counters)
+        self.hits = 0
+        self.misses = 0
+
+        if self.db_path is not None:
+            self.__open_db()
+
+    def lookup(self, genotype_key: int):
+        """
+        Find fitness of a genotype in the cache
+        :param genotype_key: genotype (dp by parts flags, packed into an integer)
+        :return: tuple (buf_size, time_loss) if genotype is found in the cache and None otherwise
+        """
+        fitness = self.__fitness.get(genotype_key)
+        if fitness is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return fitness
+
+    def store(self, genotype_key: int, buf_size, time_loss):
+        """
+        Store fitness of a genotype in the cache
+        :param genotype_key: genotype (dp by parts flags, packed into an integer)
+        :param buf_size: buffers size (in MB)
+        :param time_loss: time loss (in ms)
+        """
+        if genotype_key in self.__fitness:
+            return
+        self.__fitness[genotype_key] = (buf_size, time_loss)
+        if self.__db is not None:
+            self.__unsaved_records.append((self.app_key, genotype_key_to_str(genotype_key), buf_size, time_loss))
+
+    def flush(self):
+        """ Save all new records in the SQLite file (if the cache is persisted)"""
+        if self.__db is not None and len(self.__unsaved_records) > 0:
+            self.__db.executemany("INSERT OR IGNORE INTO fitness VALUES (?, ?, ?, ?)", self.__unsaved_records)
+            self.__db.commit()
+            self.__unsaved_records = []
+
+    def close(self):
+        """ Save all new records and close the SQLite file (if the cache is persisted)"""
+        self.flush()
+        if self.__db is not None:
+            self.__db.close()
+            self.__db = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def reset_counters(self):
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.__fitness)
+
+    def __str__(self):
+        return "{records: " + str(len(self.__fitness)) + ", hits: " + str(self.hits) + \
+               ", misses: " + str(self.misses) + "}"
+
+    def __open_db(self):
+        db_dir = os.path.dirname(os.path.abspath(self.db_path))
+        if not os.path.exists(db_dir):
+            os.makedirs(db_dir)
+        self.__db = sqlite3.connect(self.db_path)
+        self.__db.execute("CREATE TABLE IF NOT EXISTS fitness ("
+                          "app_key TEXT NOT NULL, "
+                          "genotype TEXT NOT NULL, "
+                          "buf_size REAL NOT NULL, "
+                          "time_loss REAL NOT NULL, "
+                          "PRIMARY KEY (app_key, genotype))")
+        self.__db.commit()
+        # load all records, evaluated for the same application
+        rows = self.__db.execute("SELECT genotype, buf_size, time_loss FROM fitness WHERE app_key = ?",
+                                 (self.app_key,))
+        for genotype_str, buf_size, time_loss in rows:
+            self.__fitness[genotype_key_from_str(genotype_str)] = (buf_size, time_loss)
+
+    def __getstate__(self):
+        # the cache is only used by the main GA process: worker processes get an empty cache
+        return {"app_key": self.app_key, "db_path": None}
+
+    def __setstate__(self, state):
+        self.__init__(state["app_key"], state["db_path"])
+
+
+def genotype_key_to_str(genotype_key: int) -> str:
+    return format(genotype_key, "x")
+
+
+def genotype_key_from_str(genotype_str: str) -> int:
+    return int(genotype_str, 16)
+
+
+def get_app_structure_key(partitions_per_dnn: [], *eval_params) -> str:
+    """
+    Compute hash of DNN-based application structure. Two applications with the same structure
+    have the same fitness for the same chromosome genotype
+    :param partitions_per_dnn: list [partitions_1, partitions_2, ..., partitionsN] where
+        partitions_i is a list of partitions (sub-networks) of a DNN, N is the total number of DNNs
+    :param eval_params: parameters of chromosomes evaluation (e.g., data token size), that affect fitness
+    :return: (str) hash of the application structure
+    """
+    app_desc = [str(param) for param in eval_params]
+    for partitions in partitions_per_dnn:
+        app_desc.append("dnn")
+        for partition in partitions:
+            app_desc.append("partition " + str(partition.name))
+            for layer in partition.get_layers():
+                app_desc.append(str([layer.id, layer.name, layer.op, layer.subop, layer.fs, layer.stride,
+                                     layer.ifm, layer.ih, layer.iw, layer.ofm, layer.oh, layer.ow,
+                                     layer.pads, layer.built_in]))
+            for connection in partition.get_connections():
+                app_desc.append(str([connection.src.id, connection.dst.id]))
+    return hashlib.sha1("\n".join(app_desc).encode("utf-8")).hexdigest()
@@ -0,0 +1,127 @@
+from bisect import bisect_left, bisect_right
+
+
+class MMSParetoArchive:
+    """
+    Incrementally maintained pareto-front of MMS chromosomes, characterized by
+    buffers size and time loss (the smaller, the better). Follows the semantics of
+    select_pareto(): a chromosome is a pareto point if no other chromosome has both smaller
+    buffers size and smaller time loss, and among the points with the same fitness only
+    the first inserted point is kept.
+
+    Pareto points are grouped by buffers size. The groups are sorted by buffers size, and the
+    points within every group are sorted by time loss. In such a front, min and max time loss of
+    the groups do not increase with buffers size, so that a new point is checked for dominance
+    with a binary search, and the points, dominated by the new point, are found in a few
+    first groups after the new point.
+
+    The groups and the points within every group are kept in plain Python lists: a point is found in
+    O(log n) time, but inserting or deleting a point (or a group) shifts the following list items, which takes
+    O(n) time in the worst case (a memmove of n references). For pareto fronts of MMS GA (tens to hundreds of
+    points) the shift is cheaper than the bookkeeping of a balanced tree, so no sorted container is used.
+
+    The archive stores snapshots (copies) of the inserted chromosomes, so that further
+    changes (e.g. mutation) of the inserted chromosomes do not affect the archive.
+    """
+    def __init__(self):
+        # sorted list of (distinct) buffers sizes of pareto points
+        self.__buf_sizes = []
+        # groups of pareto points: i-th group corresponds to the i-th buffers size
+        # and is a tuple (time_losses, points), where time_losses is a sorted
+        # list of points time loss, and points is a list of (insertion_id, chromosome)
+        self.__groups = []
+        self.__inserted_points = 0
+        # number of pareto points in the archive
+        self.__points_num = 0
+
+    def insert(self, chromosome):
+        """
+        Insert chromosome into the archive
+        :param chromosome: MMS chromosome, annotated with fitness (buffers size and time loss)
+        :return: True if chromosome is a new pareto point and False otherwise
+        """
+        buf_size = chromosome.buf_size
+        time_loss = chromosome.time_loss
+        if self.is_dominated(buf_size, time_loss):
+            return False
+
+        group_id = bisect_left(self.__buf_sizes, buf_size)
+
+        if group_id < len(self.__buf_sizes) and self.__buf_sizes[group_id] == buf_size:
+            time_losses, points = self.__groups[group_id]
+            point_id = bisect_left(time_losses, time_loss)
+            # avoid duplicates
+            if point_id < len(time_losses) and time_losses[point_id] == time_loss:
+                return False
+            time_losses.insert(point_id, time_loss)
+            points.insert(point_id, (self.__inserted_points, chromosome.copy()))
+        else:
+            self.__buf_sizes.insert(group_id, buf_size)
+            self.__groups.insert(group_id, ([time_loss], [(self.__inserted_points, chromosome.copy())]))
+        self.__inserted_points += 1
+        self.__points_num += 1
+
+        # remove points, dominated by the chromosome: points with larger buffers size and larger time loss
+        next_group_id = group_id + 1
+        while next_group_id < len(self.__groups):
+            time_losses, points = self.__groups[next_group_id]
+            if not time_losses[-1] > time_loss:
+                break
+            first_dominated_id = bisect_right(time_losses, time_loss)
+            self.__points_num -= len(time_losses) - first_dominated_id
+            if first_dominated_id == 0:
+                del self.__buf_sizes[next_group_id]
+                del self.__groups[next_group_id]
+            else:
+                del time_losses[first_dominated_id:]
+                del points[first_dominated_id:]
+                next_group_id += 1
+        return True
+
+    def is_dominated(self, buf_size, time_loss):
+        """
+        Check if a point is dominated by the archive, i.e., if the archive has a point with both smaller
+        buffers size and smaller time loss. A dominated point is never inserted into the archive. Points
+        are only removed from the archive by points, that dominate them, so a dominated point
+        remains dominated after further insertions
+        :param buf_size: buffers size of the point
+        :param time_loss: time loss of the point
+        :return: True if the point is dominated and False otherwise
+        """
+        group_id = bisect_left(self.__buf_sizes, buf_size)
+        # min time loss among points with smaller buffers size
+        # is the min time loss in the group with the largest buffers size below buf_size
+        return group_id > 0 and self.__groups[group_id - 1][0][0] < time_loss
+
+    def insert_all(self, chromosomes):
+        """
+        Insert chromosomes into the archive (in the order of chromosomes)
+        :param chromosomes: list of MMS chromosomes, annotated with fitness
+        """
+        for chromosome in chromosomes:
+            self.insert(chromosome)
+
+    def get_pareto(self):
+        """
+        Get pareto front
+        :return: list of pareto points (MMS chromosomes), in the order of their insertion
+        """
+        points = []
+        for time_losses, group_points in self.__groups:
+            points.extend(group_points)
+        points.sort(key=lambda point: point[0])
+        return [point[1] for point in points]
+
+    def get_pareto_sorted(self):
+        """
+        Get pareto front, sorted by buffers size
+        :return: list of pareto points (MMS chromosomes), sorted by buffers size and, among the points with
+            the same buffers size, by time loss
+        """
+        points = []
+        for time_losses, group_points in self.__groups:
+            points.extend(point[1] for point in group_points)
+        return points
+
+    def __len__(self):
+        return self.__points_num
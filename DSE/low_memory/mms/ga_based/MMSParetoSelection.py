@@ -1,15 +1,46 @@
-
 def select_pareto(chromosomes):
     """ Select pareto-front from MMS chromosomes,
+    A chromosome is a pareto point if no other chromosome has both smaller buffers size
+    and smaller time loss. Among pareto points with the same fitness, only the first one is selected.
+    The pareto points are selected with sort-and-sweep in O(n log n), and returned in the input order
     :param chromosomes: list of MMS chromosomes
     """
+    # chromosomes ids, sorted by buffers size
+    sorted_ids = sorted(range(len(chromosomes)), key=lambda chromosome_id: chromosomes[chromosome_id].buf_size)
+    is_pareto = [False for _ in range(len(chromosomes))]
+
+    # min time loss among all chromosomes with smaller buffers size
+    min_time_loss = None
+    group_start = 0
+    while group_start < len(sorted_ids):
+        # group of chromosomes with the same buffers size
+        group_buf_size = chromosomes[sorted_ids[group_start]].buf_size
+        group_end = group_start
+        group_min_time_loss = None
+        while group_end < len(sorted_ids) and chromosomes[sorted_ids[group_end]].buf_size == group_buf_size:
+            chromosome_id = sorted_ids[group_end]
+            time_loss = chromosomes[chromosome_id].time_loss
+            # chromosome is not dominated
+            if min_time_loss is None or not min_time_loss < time_loss:
+                is_pareto[chromosome_id] = True
+            if group_min_time_loss is None or time_loss < group_min_time_loss:
+                group_min_time_loss = time_loss
+            group_end += 1
+
+        if min_time_loss is None or group_min_time_loss < min_time_loss:
+            min_time_loss = group_min_time_loss
+        group_start = group_end
+
     pareto = []
+    # avoid duplicates
+    pareto_fitness = set()
     for chromosome_id in range(len(chromosomes)):
-        is_pareto = is_pareto_point(chromosome_id, chromosomes)
-        if is_pareto:
-            # avoid duplicates
-            if not contains_point_with_the_same_fitness(pareto, chromosomes[chromosome_id]):
-                pareto.append(chromosomes[chromosome_id])
+        if is_pareto[chromosome_id]:
+            chromosome = chromosomes[chromosome_id]
+            fitness = (chromosome.buf_size, chromosome.time_loss)
+            if fitness not in pareto_fitness:
+                pareto_fitness.add(fitness)
+                pareto.append(chromosome)
 
     # print("pareto points num/points num:", len(pareto), "/", len(chromosomes))
 
@@ -0,0 +1,36 @@
+"""
+Helpers for evaluating the whole population of MMS chromosomes at once.
+The population is treated as a bit matrix of shape [population size x layers_num],
+where every row is the genes bitset (int) of one MMS chromosome, and every column
+corresponds to one DNN layer. Columns with equal weight are grouped into one bitset, so
+that a weighted sum over the genes of a row costs one popcount per group of columns
+"""
+
+
+def get_genes_mask_per_weight(weight_per_gene: []) -> {}:
+    """
+    Group genes (columns of the population bit matrix) by their weight
+    :param weight_per_gene: list of (int) weights, where i-th weight corresponds to i-th gene
+    :return: dictionary, where key = weight, value = bitset of genes with this weight.
+        Genes with zero weight are omitted
+    """
+    genes_mask_per_weight = {}
+    for gene_id in range(len(weight_per_gene)):
+        weight = weight_per_gene[gene_id]
+        if weight != 0:
+            genes_mask_per_weight[weight] = genes_mask_per_weight.get(weight, 0) | (1 << gene_id)
+    return genes_mask_per_weight
+
+
+def dot_genes(genes: int, genes_mask_per_weight: {}) -> int:
+    """
+    Compute dot product of genes (bitset) and a weights vector
+    :param genes: genes bitset
+    :param genes_mask_per_weight: weights vector, grouped by weight (see get_genes_mask_per_weight())
+    :return: sum of weights of genes, set to 1
+    """
+    dot = 0
+    for weight, mask in genes_mask_per_weight.items():
+        dot += weight * bin(genes & mask).count("1")
+    return dot
+
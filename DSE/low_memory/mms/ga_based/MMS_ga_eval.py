@@ -1,6 +1,9 @@
 from models.dnn_model.dnn import DNN
+from util import mega
 from eval.memory.csdf_model_mem_eval import eval_csdf_buffers_memory_mb
 from DSE.low_memory.mms.buf_building import get_mms_buffers_no_pipeline, get_mms_buffers_multi_pipelined
+from DSE.low_memory.mms.ga_based.MMSPopulation import dot_genes
+from DSE.low_memory.mms.phases_derivation import get_phases_per_layer, get_phases_per_layer_per_partition_per_dnn
 
 ############################
 # Eval functions for MMS-GA
@@ -42,18 +45,56 @@ def eval_chromosome_time_loss_ms_multi_pipeline(phases_per_layer_per_partition_p
     return delay
 
 
-def eval_dnn_buffers_size_mb(dnn: DNN, phases_per_layer, data_token_size=4):
+def eval_chromosome_time_loss_ms_closed_form(genes: int, extra_phases_mask_per_weight: {},
+                                             delay_per_phase_ms=0.0005):
+    """
+    Compute time loss (delay), caused by data processing by parts: the smaller, the better.
+    Unlike eval_chromosome_time_loss_ms(), does not require phases per layer, and
+    computes time loss as delay_per_phase_ms * sum_i(gene_i * (max_phases_i - 1))
+    :param genes: MMS chromosome genes (bitset)
+    :param extra_phases_mask_per_weight: max extra phases (max phases - 1) per gene, grouped
+        by number of extra phases (see MMSPopulation.get_genes_mask_per_weight())
+    :param delay_per_phase_ms: sync. delay per one extra phase
+    :return: delay in ms
+    """
+    extra_phases = dot_genes(genes, extra_phases_mask_per_weight)
+    delay = extra_phases * delay_per_phase_ms
+    return delay
+
+
+def eval_population_time_loss_ms(population: [], extra_phases_mask_per_weight: {}, delay_per_phase_ms=0.0005):
+    """
+    Compute time loss (delay), caused by data processing by parts, for every chromosome in the population
+    as a dot product of the population bit matrix and the vector of max extra phases per gene
+    :param population: population of MMS chromosomes
+    :param extra_phases_mask_per_weight: max extra phases (max phases - 1) per gene, grouped
+        by number of extra phases (see MMSPopulation.get_genes_mask_per_weight())
+    :param delay_per_phase_ms: sync. delay per one extra phase
+    :return: list of time loss (in ms) per chromosome
+    """
+    return [eval_chromosome_time_loss_ms_closed_form(chromosome.genes, extra_phases_mask_per_weight,
+                                                     delay_per_phase_ms)
+            for chromosome in population]
+
+
+def eval_dnn_buffers_size_mb(dnn: DNN, phases_per_layer, data_token_size=4, csdf_fragments=None,
+                             memory_planner=None):
     """
     Eval DNN memory in megabytes with max-mem-save (DP + reuse) memory reduction: the smaller, the better
     :param dnn: DNN to eval buffers of
     :param phases_per_layer: dictionary where key = name of layer in the DNN, value=
     number of phases performed by every layer of a DNN
     :param data_token_size: size of one data token (in Bytes)
+    :param csdf_fragments: (optional) prebuilt CSDF fragments of the DNN (see build_csdf_fragments())
+    :param memory_planner: memory planner (see MEMORY_PLANNERS in buf_building.py). If None, the default
+        planner is used. With an arena planner, size of the memory arenas is evaluated
     :return: size of DNN buffers (in MB)
     """
 
     # build buffers
-    mms_csdf_buffers = get_mms_buffers_no_pipeline(dnn, phases_per_layer)
+    mms_csdf_buffers, mms_csdf_schedule = get_mms_buffers_no_pipeline(dnn, phases_per_layer,
+                                                                      csdf_fragments=csdf_fragments,
+                                                                      memory_planner=memory_planner)
 
     # eval buffers size
     buf_size = eval_csdf_buffers_memory_mb(mms_csdf_buffers, data_token_size)
@@ -63,7 +104,9 @@ def eval_dnn_buffers_size_mb(dnn: DNN, phases_per_layer, data_token_size=4):
 def eval_dnn_buffers_size_multi_pipelined_mb(partitions_per_dnn: [],
                                              phases_per_layer_per_partition_per_dnn: [],
                                              dnn_names: [str],
-                                             data_token_size=4):
+                                             data_token_size=4,
+                                             csdf_fragments_per_partition_per_dnn=None,
+                                             memory_planner=None):
     """
     Eval DNN memory in megabytes with max-mem-save (DP + reuse) memory reduction: the smaller, the better
     :param partitions_per_dnn: list [partitions_1, partitions_2, ..., partitionsN] where
@@ -74,15 +117,122 @@ def eval_dnn_buffers_size_multi_pipelined_mb(partitions_per_dnn: [],
     with phases (values) per dnn layer (keys)
     :param dnn_names: name per dnn
     :param data_token_size: size of one data token (in Bytes)
+    :param csdf_fragments_per_partition_per_dnn: (optional) prebuilt CSDF fragments of every partition
+        of every DNN (see build_csdf_fragments_per_partition_per_dnn())
+    :param memory_planner: memory planner (see MEMORY_PLANNERS in buf_building.py). If None, the default
+        planner is used. With an arena planner, size of the memory arenas is evaluated
     :return: size of DNN buffers (in MB)
     """
 
     # build buffers
-    mms_csdf_buffers, mms_csdf_schedule = get_mms_buffers_multi_pipelined(partitions_per_dnn,
-                                                                          phases_per_layer_per_partition_per_dnn,
-                                                                          dnn_names)
+    mms_csdf_buffers, mms_csdf_schedule = get_mms_buffers_multi_pipelined(
+        partitions_per_dnn,
+        phases_per_layer_per_partition_per_dnn,
+        dnn_names,
+        csdf_fragments_per_partition_per_dnn=csdf_fragments_per_partition_per_dnn,
+        memory_planner=memory_planner)
 
     # eval buffers size
     buf_size = eval_csdf_buffers_memory_mb(mms_csdf_buffers, data_token_size)
     return buf_size
 
+
+def eval_genes_buffers_size_mb(genes: int, dnn: DNN, max_phases_per_layer=None, data_token_size=4,
+                               csdf_fragments=None, memory_planner=None):
+    """
+    Eval DNN memory in megabytes with max-mem-save (DP + reuse) memory reduction for MMS chromosome genes
+    :param genes: MMS chromosome genes (bitset), where i-th bit encodes data processing by parts
+        in the i-th DNN layer
+    :param dnn: DNN to eval buffers of
+    :param max_phases_per_layer: maximum number of phases per DNN layer
+        if unspecified (is None), is computed automatically
+    :param data_token_size: size of one data token (in Bytes)
+    :param csdf_fragments: (optional) prebuilt CSDF fragments of the DNN (see build_csdf_fragments()).
+        If specified, CSDF graph of the DNN is assembled from the fragments
+    :param memory_planner: memory planner (see MEMORY_PLANNERS in buf_building.py). If None, the default
+        planner is used. With an arena planner, size of the memory arenas is evaluated
+    :return: size of DNN buffers (in MB)
+    """
+    dp_encoding = genes_to_dp_encoding(genes, len(dnn.get_layers()))
+    phases_per_layer = get_phases_per_layer(dnn, dp_encoding, max_phases_per_layer)
+    return eval_dnn_buffers_size_mb(dnn, phases_per_layer, data_token_size, csdf_fragments, memory_planner)
+
+
+def eval_genes_buffers_size_multi_pipelined_mb(genes: int,
+                                               partitions_per_dnn: [],
+                                               max_phases_per_layer_per_partition_per_dnn=None,
+                                               dnn_names=None,
+                                               data_token_size=4,
+                                               csdf_fragments_per_partition_per_dnn=None,
+                                               memory_planner=None):
+    """
+    Eval memory of a (multi-dnn, pipelined) application in megabytes with max-mem-save (DP + reuse)
+    memory reduction for MMS chromosome genes
+    :param genes: MMS chromosome genes (bitset), where i-th bit encodes data processing by parts
+        in the i-th layer of the application
+    :param partitions_per_dnn: list [partitions_1, partitions_2, ..., partitionsN] where
+    partitions_i is a list of partitions of a DNN, N is the total number of DNNs
+    :param max_phases_per_layer_per_partition_per_dnn: maximum number of phases per partition per DNN
+        if unspecified (is None), is computed automatically
+    :param dnn_names: name per dnn. If None, dnns are named dnn0, dnn1, ...
+    :param data_token_size: size of one data token (in Bytes)
+    :param csdf_fragments_per_partition_per_dnn: (optional) prebuilt CSDF fragments of every partition
+        of every DNN (see build_csdf_fragments_per_partition_per_dnn()). If specified, CSDF graphs
+        of the partitions are assembled from the fragments
+    :param memory_planner: memory planner (see MEMORY_PLANNERS in buf_building.py). If None, the default
+        planner is used. With an arena planner, size of the memory arenas is evaluated
+    :return: size of DNN buffers (in MB)
+    """
+    layers_num = 0
+    for partitions in partitions_per_dnn:
+        for partition in partitions:
+            layers_num += len(partition.get_layers())
+    if dnn_names is None:
+        dnn_names = ["dnn" + str(dnn_id) for dnn_id in range(len(partitions_per_dnn))]
+
+    dp_encoding = genes_to_dp_encoding(genes, layers_num)
+    phases_per_layer_per_partition_per_dnn = get_phases_per_layer_per_partition_per_dnn(
+        partitions_per_dnn, dp_encoding, max_phases_per_layer_per_partition_per_dnn)
+    return eval_dnn_buffers_size_multi_pipelined_mb(partitions_per_dnn,
+                                                    phases_per_layer_per_partition_per_dnn,
+                                                    dnn_names,
+                                                    data_token_size,
+                                                    csdf_fragments_per_partition_per_dnn,
+                                                    memory_planner)
+
+
+def eval_genes_buffers_size_lower_bound_multi_pipelined_mb(genes: int,
+                                                           partitions_per_dnn: [],
+                                                           csdf_fragments_per_partition_per_dnn: [],
+                                                           data_token_size=4):
+    """
+    Eval a lower bound on memory of a (multi-dnn, pipelined) application in megabytes with max-mem-save (DP + reuse)
+    memory reduction for MMS chromosome genes, without buffers building (see
+    CSDFFragments.get_buffers_size_lower_bound()). Buffers of DNN partitions are not reused among the partitions,
+    and buffers of every DNN are stored in different buffers, shared among the DNNs. Thus, the application memory
+    is at least the max (over DNNs) sum of the partitions lower bounds
+    :param genes: MMS chromosome genes (bitset), where i-th bit encodes data processing by parts
+        in the i-th layer of the application
+    :param partitions_per_dnn: list [partitions_1, partitions_2, ..., partitionsN] where
+    partitions_i is a list of partitions of a DNN, N is the total number of DNNs
+    :param csdf_fragments_per_partition_per_dnn: prebuilt CSDF fragments of every partition
+        of every DNN (see build_csdf_fragments_per_partition_per_dnn())
+    :param data_token_size: size of one data token (in Bytes)
+    :return: lower bound on size of the application buffers (in MB)
+    """
+    lower_bound = 0
+    layer_id_in_chromosome = 0
+    for partitions, csdf_fragments_per_partition in zip(partitions_per_dnn, csdf_fragments_per_partition_per_dnn):
+        dnn_lower_bound = 0
+        for partition, csdf_fragments in zip(partitions, csdf_fragments_per_partition):
+            layers_num = len(partition.get_layers())
+            states = [(genes >> (layer_id_in_chromosome + layer_id)) & 1 for layer_id in range(layers_num)]
+            dnn_lower_bound += csdf_fragments.get_buffers_size_lower_bound(states)
+            layer_id_in_chromosome += layers_num
+        lower_bound = max(lower_bound, dnn_lower_bound)
+    return (lower_bound * data_token_size) / float(mega())
+
+
+def genes_to_dp_encoding(genes: int, layers_num: int) -> [bool]:
+    """ Convert MMS chromosome genes (bitset) into data processing by parts encoding (list of flags)"""
+    return [(genes >> layer_id) & 1 == 1 for layer_id in range(layers_num)]
@@ -0,0 +1,75 @@
+import json
+import os
+import random
+from DSE.low_memory.mms.ga_based.MMSChromosome import MMSChromosome
+
+"""
+Checkpoints of MMS GA: intermediate GA state, periodically saved during long GA runs,
+so that the GA can be resumed after a crash or preemption. A checkpoint is a compact
+.json file with population (genotypes and fitness), pareto front found across all epochs,
+GA counters and state of the random numbers generator
+"""
+
+CHECKPOINT_VERSION = 1
+
+
+def save_checkpoint(checkpoint: {}, path):
+    """
+    Save GA checkpoint in a .json file. The file is written atomically: the checkpoint is first
+    written into a temporary file, which then replaces the (previous) checkpoint file
+    :param checkpoint: GA checkpoint (dictionary)
+    :param path: path to checkpoint file
+    """
+    checkpoint_dir = os.path.dirname(os.path.abspath(path))
+    if not os.path.exists(checkpoint_dir):
+        os.makedirs(checkpoint_dir)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w') as file:
+        json.dump(checkpoint, file, separators=(",", ":"))
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, path)
+
+
+def load_checkpoint(path):
+    """
+    Load GA checkpoint from a .json file
+    :param path: path to checkpoint file
+    :return: GA checkpoint (dictionary)
+    """
+    with open(path, 'r') as file:
+        checkpoint = json.load(file)
+    if checkpoint.get("version") != CHECKPOINT_VERSION:
+        raise Exception("GA checkpoint loading error: unsupported checkpoint version " +
+                        str(checkpoint.get("version")) + " in " + str(path))
+    return checkpoint
+
+
+def chromosome_to_checkpoint(chromosome: MMSChromosome):
+    """
+    Represent evaluated MMS chromosome as a compact list [genes (hex), buf_size, time_loss]
+    """
+    return [format(chromosome.genes, "x"), chromosome.buf_size, chromosome.time_loss]
+
+
+def chromosome_from_checkpoint(chromosome_desc: [], layers_num):
+    """
+    Restore evaluated MMS chromosome from its compact representation (see chromosome_to_checkpoint())
+    """
+    chromosome = MMSChromosome(layers_num)
+    genes_str, buf_size, time_loss = chromosome_desc
+    chromosome.genes = int(genes_str, 16)
+    chromosome.set_fitness(buf_size, time_loss)
+    return chromosome
+
+
+def random_state_to_checkpoint():
+    """ Get state of the random numbers generator as a json-serializable list"""
+    version, internal_state, gauss_next = random.getstate()
+    return [version, list(internal_state), gauss_next]
+
+
+def random_state_from_checkpoint(random_state: []):
+    """ Restore state of the random numbers generator from a list (see random_state_to_checkpoint())"""
+    version, internal_state, gauss_next = random_state
+    random.setstate((version, tuple(internal_state), gauss_next))
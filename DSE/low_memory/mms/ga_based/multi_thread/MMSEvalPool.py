@@ -0,0 +1,100 @@
+import math
+from multiprocessing import Pool
+
+# evaluation function, resident in a worker process. Installed once per worker by the pool initializer
+_worker_eval_func = None
+
+
+def _init_worker(eval_func):
+    global _worker_eval_func
+    _worker_eval_func = eval_func
+
+
+def _eval_in_worker(item):
+    return _worker_eval_func(item)
+
+
+class MMSEvalPool:
+    """
+    Long-lived pool of worker processes, used by MMS GA to evaluate chromosomes in parallel.
+    The pool is created once per GA run (lazily, at the first evaluation), shared among GA initialization
+    and all GA epochs, and is shut down at the end of the GA.
+    The pool can be used as a context manager: on normal exit, the workers are closed and joined;
+    on exception, the workers are terminated.
+
+    :param processes: number of parallel worker processes
+    :param tasks_per_process: number of chunks, submitted to every worker process per evaluation.
+        More chunks give better load balancing, fewer chunks give less inter-process communication
+    :param eval_func: evaluation function (see evaluate()), sent to every worker process once, when the
+        worker is started. The function (e.g., a partial with the application model) stays resident
+        in the worker, so that evaluation tasks only carry the evaluated items
+    """
+    def __init__(self, processes=1, tasks_per_process=4, eval_func=None):
+        self.processes = max(processes, 1)
+        self.tasks_per_process = max(tasks_per_process, 1)
+        self.eval_func = eval_func
+        self.__pool = None
+
+    def open(self):
+        """ Start worker processes (if not started yet)"""
+        if self.__pool is None:
+            if self.eval_func is None:
+                self.__pool = Pool(processes=self.processes)
+            else:
+                self.__pool = Pool(processes=self.processes, initializer=_init_worker, initargs=(self.eval_func,))
+
+    def is_open(self):
+        return self.__pool is not None
+
+    def map(self, func, items: []):
+        """
+        Apply function to every item in parallel. All items are submitted to the pool at once
+        :param func: function to apply
+        :param items: list of items
+        :return: list of results, in the order of items
+        """
+        if len(items) == 0:
+            return []
+        self.open()
+        chunksize = max(math.ceil(len(items) / (self.processes * self.tasks_per_process)), 1)
+        return self.__pool.map(func, items, chunksize)
+
+    def evaluate(self, items: []):
+        """
+        Apply evaluation function (resident in worker processes) to every item in parallel
+        :param items: list of items
+        :return: list of results, in the order of items
+        """
+        if self.eval_func is None:
+            raise Exception("MMS evaluation pool error: evaluation function is not specified")
+        return self.map(_eval_in_worker, items)
+
+    def close(self):
+        """ Shut down worker processes, after all submitted tasks are finished"""
+        if self.__pool is not None:
+            self.__pool.close()
+            self.__pool.join()
+            self.__pool = None
+
+    def terminate(self):
+        """ Shut down worker processes immediately"""
+        if self.__pool is not None:
+            self.__pool.terminate()
+            self.__pool.join()
+            self.__pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.terminate()
+        return False
+
+    def __getstate__(self):
+        # worker processes cannot be shared with other processes
+        state = self.__dict__.copy()
+        state["_MMSEvalPool__pool"] = None
+        return state
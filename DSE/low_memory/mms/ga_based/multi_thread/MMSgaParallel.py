@@ -1,14 +1,16 @@
-import math
-
 from DSE.low_memory.mms.ga_based.MMSChromosome import MMSChromosome
 from models.dnn_model.dnn import DNN
 from DSE.low_memory.dp_by_parts import get_max_phases_per_layer # , eval_thr_loss, reset_phases
-from DSE.low_memory.mms.ga_based.MMS_ga_eval import eval_chromosome_time_loss_ms, eval_dnn_buffers_size_mb
-from DSE.low_memory.mms.ga_based.MMSParetoSelection import select_pareto, merge_pareto_fronts
+from DSE.low_memory.mms.ga_based.MMS_ga_eval import eval_population_time_loss_ms, eval_genes_buffers_size_mb
+from DSE.low_memory.mms.phases_derivation import get_max_extra_phases_per_gene
+from DSE.low_memory.mms.ga_based.MMSParetoArchive import MMSParetoArchive
+from DSE.low_memory.mms.ga_based.multi_thread.MMSEvalPool import MMSEvalPool
+from DSE.low_memory.mms.buf_building import build_csdf_fragments, DEFAULT_MEMORY_PLANNER
+from DSE.low_memory.mms.ga_based.MMSPopulation import get_genes_mask_per_weight
+from DSE.low_memory.mms.ga_based.MMSFitnessCache import MMSFitnessCache, get_app_structure_key
+from functools import partial
 import random
-import copy
 import time
-from multiprocessing import Pool
 
 
 class MMSgaParallel:
@@ -36,6 +38,11 @@ class MMSgaParallel:
             representing DP within the CNN is annotated with loss of throughput (caused by processing data
             by parts, the smaller, the better) and buffer sizes (the smaller, the better)
             If this flag is False, the best chromosome from the pareto front is returned
+        :param memory_planner: memory planner (see MEMORY_PLANNERS in buf_building.py), used to evaluate
+            buffers size of chromosomes. If None, the default planner is used
+        :param fitness_cache_path: path to SQLite file, where fitness of evaluated chromosomes is
+            stored and reused among GA runs for the same DNN. If None, fitness of evaluated
+            chromosomes is only reused within the GA run
         """
     def __init__(self, dnn: DNN, epochs=10,
                  population_start_size=100, selection_percent=50, mutation_probability=0,
@@ -43,12 +50,21 @@ class MMSgaParallel:
                  dp_by_parts_init_probability=0.5, data_token_size=4,
                  parr_threads=1,
                  verbose=True,
-                 return_pareto=True):
+                 return_pareto=True,
+                 memory_planner=None,
+                 fitness_cache_path=None):
         self.dnn = dnn
 
         # parallel processing
         self.parr_threads = parr_threads
-        self.dnn_copies = [copy.deepcopy(self.dnn) for thr in range(self.parr_threads)]
+        # fitness of already evaluated chromosomes, accessed by chromosome genotype. Buffers of a single DNN
+        # are evaluated differently from buffers of a (single-partition) multi-DNN application,
+        # so the records are not shared with MMSgaParallelMultiPipeline
+        eval_params = ["single dnn", data_token_size]
+        if memory_planner not in (None, DEFAULT_MEMORY_PLANNER):
+            eval_params.append(memory_planner)
+        self.app_key = get_app_structure_key([[dnn]], *eval_params)
+        self.fitness_cache = MMSFitnessCache(self.app_key, fitness_cache_path)
 
         self.layers_num = len(self.dnn.get_layers())
 
@@ -64,6 +80,24 @@ class MMSgaParallel:
 
         # meta-data
         self.max_phases_per_layer = get_max_phases_per_layer(dnn)
+        # max extra phases per gene, grouped by number of extra phases
+        self.extra_phases_mask_per_weight = get_genes_mask_per_weight(
+            get_max_extra_phases_per_gene(dnn, self.max_phases_per_layer))
+        self.memory_planner = memory_planner
+
+        # buffers size evaluation function: maps chromosome genes to buffers size of the dnn
+        # CSDF fragments of the dnn for both states (one phase, max phases) of every layer,
+        # from which CSDF graphs of chromosomes are assembled
+        self.csdf_fragments = build_csdf_fragments(dnn, self.max_phases_per_layer)
+        self.buf_size_eval_func = partial(eval_genes_buffers_size_mb,
+                                          dnn=self.dnn,
+                                          max_phases_per_layer=self.max_phases_per_layer,
+                                          data_token_size=self.data_token_size,
+                                          csdf_fragments=self.csdf_fragments,
+                                          memory_planner=self.memory_planner)
+        # pool of worker processes, shared among all GA epochs. The dnn (and its CSDF fragments) is sent
+        # to every worker once (with the evaluation function), evaluation tasks only carry chromosome genes
+        self.eval_pool = MMSEvalPool(self.parr_threads, eval_func=self.buf_size_eval_func)
         self.population = []
         self.selected_offspring = []
 
@@ -76,7 +110,7 @@ class MMSgaParallel:
         # new
         # pareto front found across all epochs
         self.return_pareto = return_pareto
-        self.pareto_across_dse = []
+        self.pareto_across_dse = MMSParetoArchive()
 
     """ GA initialization"""
 
@@ -114,12 +148,9 @@ class MMSgaParallel:
 
         # if 1. best time for population improves for >= no_improvement_epochs ...
         cur = self.population[0]
-        cur.dnn = self.dnn
         # chromosome is already annotated
-        # buf_size_mb, time_loss_ms = self.compute_fitness(cur)
-        # annotate_chromosome_with_fitness(cur, buf_size_mb, time_loss_ms)
         cur_buf_size = cur.buf_size
-        best = cur
+        best = cur.copy()
         best_buf_size = cur_buf_size
         no_improvement_epochs = 0
 
@@ -141,7 +172,7 @@ class MMSgaParallel:
             if cur_buf_size < best_buf_size:
                 if self.verbose:
                     print("epoch", cur_epoch, " cur buffers size ", cur_buf_size, " < ", "best buffers size", best_buf_size, "best result reset to")
-                best = cur
+                best = cur.copy()
                 best_buf_size = cur_buf_size
                 if self.verbose:
                     best.print_short()
@@ -172,8 +203,8 @@ class MMSgaParallel:
                 # return results
                 if self.return_pareto:
                     # sort pareto by buffer size in descending order
-                    self.pareto_across_dse = sorted(self.pareto_across_dse, key=lambda x: x.buf_size, reverse=False)
-                    return self.pareto_across_dse
+                    pareto = sorted(self.pareto_across_dse.get_pareto(), key=lambda x: x.buf_size, reverse=False)
+                    return pareto
                 else:
                     return best
 
@@ -195,8 +226,8 @@ class MMSgaParallel:
         # return results
         if self.return_pareto:
             # sort pareto by buffer size in descending order
-            self.pareto_across_dse = sorted(self.pareto_across_dse, key=lambda x: x.buf_size, reverse=False)
-            return self.pareto_across_dse
+            pareto = sorted(self.pareto_across_dse.get_pareto(), key=lambda x: x.buf_size, reverse=False)
+            return pareto
         else:
             return best
 
@@ -234,83 +265,73 @@ class MMSgaParallel:
         self.update_pareto_front()
 
     def update_pareto_front(self):
-        current_pareto = select_pareto(self.population)
-        self.pareto_across_dse = merge_pareto_fronts(self.pareto_across_dse, current_pareto)
+        self.pareto_across_dse.insert_all(self.population)
 
     """
     Evaluation of chromosome in terms of fitness function (time loss and buffers size)
     """
 
     def annotate_chromosomes_with_fitness_parr(self):
-        """ Parallel evaluation: self.parr_threads (specified as GA input) are used to perform evaluation"""
-        # split chromosomes in batches
-        batch_size = self.parr_threads
-        chromosomes_num = len(self.population)
-        batches_num = math.ceil(chromosomes_num/batch_size)
-
-        # chromosomes are processed in parallel batches
-        batches = self.generate_chromosomes_batches(chromosomes_num, batches_num, batch_size)
+        """ Parallel evaluation: self.parr_threads (specified as GA input) are used to perform evaluation.
+        Only chromosomes that were changed (created, mutated or obtained by crossover) since their last
+        evaluation are evaluated. Fitness of chromosomes with genotypes, evaluated earlier, is taken from
+        the fitness cache. The remaining chromosomes (one per genotype) are submitted to the (long-lived)
+        evaluation pool at once"""
+        # chromosomes to evaluate, one per unique genotype
+        chromosomes_to_eval = []
+        # dictionary, where key = genotype, value = list of changed chromosomes with this genotype
+        chromosomes_per_genotype = {}
+
+        for chromosome in self.population:
+            if chromosome.needs_eval:
+                genotype_key = chromosome.get_genotype_key()
+                if genotype_key in chromosomes_per_genotype:
+                    chromosomes_per_genotype[genotype_key].append(chromosome)
+                    continue
+
+                cached_fitness = self.fitness_cache.lookup(genotype_key)
+                if cached_fitness is not None:
+                    buf_size_mb, time_loss_ms = cached_fitness
+                    chromosome.set_fitness(buf_size_mb, time_loss_ms)
+                else:
+                    chromosomes_per_genotype[genotype_key] = [chromosome]
+                    chromosomes_to_eval.append(chromosome)
 
         if self.verbose:
-            print("eval ", chromosomes_num, "chromosomes in", len(batches), "parallel batches",
-                  len(batches[0]), "chromosomes each (",
-                  len(batches[-1]), " chromosomes in the last batch)")
+            print("eval ", len(chromosomes_to_eval), "/", len(self.population), "chromosomes on",
+                  self.parr_threads, "parallel processes")
 
-        # evaluate fitness per batch (in parallel)
-        fitness_per_batch = []
-        for batch in batches:
-            batch_fitness = self.compute_batch_fitness(batch)
-            fitness_per_batch.append(batch_fitness)
+        # evaluate buffers size (in parallel)
+        population_buf_size = self.eval_pool.evaluate([chromosome.genes for chromosome in chromosomes_to_eval])
+        # evaluate time loss (closed-form, for all chromosomes at once)
+        population_time_loss = eval_population_time_loss_ms(chromosomes_to_eval, self.extra_phases_mask_per_weight)
 
         # annotate every chromosome with fitness
-        chromosome_id = 0
-        for batch_fitness in fitness_per_batch:
-            for chromosome_fitness in batch_fitness:
-                buf_size_mb, time_loss_ms = chromosome_fitness
-                self.population[chromosome_id].buf_size = buf_size_mb
-                self.population[chromosome_id].time_loss = time_loss_ms
-                chromosome_id += 1
-
-    def compute_batch_fitness(self, chromosomes_batch):
-
-        # create parallel threads pool
-        pool = Pool(processes=len(chromosomes_batch))
-        # map the eval function to the batches (eval chromosomes per-batch in parallel)
-        batch_fitness = pool.map(self.compute_fitness, chromosomes_batch)
-        return batch_fitness
-
-    def generate_chromosomes_batches(self, chromosomes_num, batches_num, batch_size):
-        batches = []
-
-        # generate batches
-        for i in range(batches_num):
-            batch_start_id = i*batch_size
-            batch_end_id = min((i+1)*batch_size, chromosomes_num)
-            chromosomes_batch = self.population[batch_start_id:batch_end_id]
-            batches.append(chromosomes_batch)
-
-        # annotate chromosomes with respective dnn copy
-        for batch in batches:
-            for chromosome_id in range(len(batch)):
-                batch[chromosome_id].dnn = self.dnn_copies[chromosome_id]
-
-        return batches
-
-    def compute_fitness(self, chromosome):
+        for chromosome, buf_size_mb, time_loss_ms in zip(chromosomes_to_eval, population_buf_size,
+                                                         population_time_loss):
+            genotype_key = chromosome.get_genotype_key()
+            self.fitness_cache.store(genotype_key, buf_size_mb, time_loss_ms)
+            for same_genotype_chromosome in chromosomes_per_genotype[genotype_key]:
+                same_genotype_chromosome.set_fitness(buf_size_mb, time_loss_ms)
+
+        # save new fitness records (if the cache is persisted)
+        self.fitness_cache.flush()
+
+    def close_eval_pool(self):
+        """ Shut down worker processes, used to evaluate chromosomes"""
+        self.eval_pool.close()
+
+    def compute_buf_size(self, chromosome):
         """
-        Evaluate chromosome in terms of throughput loss and buffers size
-        :param chromosome: MMS chromosome to be evaluated, annotated with dnn
-        :return: buf_size_mb, time_loss_ms where
-            buf_size_mb (float) is the dnn buffers size (in megabytes)
-            time_loss_ms (float) is the latency loss (delay) caused by data processing by parts
+        Evaluate chromosome in terms of buffers size. Time loss, caused by data processing by parts, is
+        evaluated separately (see eval_population_time_loss_ms()), because it does not require the DNN buffers
+        :param chromosome: MMS chromosome to be evaluated
+        :return: buf_size_mb (float): the dnn buffers size (in megabytes)
         """
-
-        phases_per_layer = get_phases_per_layer(chromosome.dnn, chromosome, self.max_phases_per_layer)
-        time_loss_ms = eval_chromosome_time_loss_ms(phases_per_layer)
-        buf_size_mb = eval_dnn_buffers_size_mb(chromosome.dnn, phases_per_layer, self.data_token_size)
+        buf_size_mb = self.buf_size_eval_func(chromosome.genes)
 
         # return evaluation
-        return buf_size_mb, time_loss_ms
+        return buf_size_mb
 
     """
     GA operators
@@ -355,42 +376,5 @@ class MMSgaParallel:
         """
         Crossover: exchange halves of parent chromosomes chromosome1 and chromosome2
         """
-        child_chromosome = MMSChromosome(chromosome1.layers_num)
-        # genes of first parent: range1 = [0, (layers_num / 2)]
-        for layer_id in range(0, int(chromosome1.layers_num / 2)):
-            child_chromosome.dp_by_parts[layer_id] = chromosome1.dp_by_parts[layer_id]
-        # genes of second parent: range1 = [0, (layers_num / 2 - 1)]
-        for layer_id in range(int(chromosome1.layers_num / 2), chromosome1.layers_num):
-            child_chromosome.dp_by_parts[layer_id] = chromosome2.dp_by_parts[layer_id]
+        child_chromosome = chromosome1.crossover(chromosome2)
         return child_chromosome
-
-
-def get_phases_per_layer(dnn: DNN, chromosome: MMSChromosome, max_phases_per_layer):
-    """
-    Determine number of phases performed by every DNN layer with respective MMS chromosome
-    :param dnn: DNN
-    :param chromosome: MMS chromosome
-    :param max_phases_per_layer: dictionary where key = name of layer within the dnn,
-    value = maximum number of phases that can be ever performed by this layer
-    :return: phases_per_layer: dictionary where key = name of layer within the dnn,
-    value =number of phases that are performed by this layer according to MMSChromosome
-    """
-    layers = dnn.get_layers()
-    phases_per_layer = {}
-    for layer_id in range(chromosome.layers_num):
-        layer = layers[layer_id]
-        dp_by_parts_flag = chromosome.dp_by_parts[layer_id]
-        # data processing by parts
-        if dp_by_parts_flag is True:
-            phases_per_layer[layer.name] = max_phases_per_layer[layer.name]
-        else:
-            # no data processing by parts
-            phases_per_layer[layer.name] = 1
-    return phases_per_layer
-
-
-def annotate_chromosome_with_fitness(chromosome, buf_size_mb, time_loss_ms):
-    """ Annotate chromosome with fitness function: with time loss and buffers size"""
-    chromosome.time_loss = time_loss_ms
-    chromosome.buf_size = buf_size_mb
-    print("chromosome buf size:", buf_size_mb, ", time loss: ", time_loss_ms)
@@ -1,17 +1,18 @@
-import math
-
 from DSE.low_memory.mms.ga_based.MMSChromosome import MMSChromosome
-from models.dnn_model.dnn import DNN
-from DSE.low_memory.dp_by_parts import get_max_phases_per_layer # , eval_thr_loss, reset_phases
-from DSE.low_memory.mms.ga_based.MMS_ga_eval import eval_chromosome_time_loss_ms_multi_pipeline,\
-    eval_dnn_buffers_size_multi_pipelined_mb
-from DSE.low_memory.mms.ga_based.MMSParetoSelection import select_pareto, merge_pareto_fronts
+from DSE.low_memory.mms.ga_based.MMS_ga_eval import eval_population_time_loss_ms,\
+    eval_genes_buffers_size_multi_pipelined_mb, eval_genes_buffers_size_lower_bound_multi_pipelined_mb
+from DSE.low_memory.mms.ga_based.MMSParetoArchive import MMSParetoArchive
 from DSE.low_memory.mms.phases_derivation import get_max_phases_per_layer_per_partition_per_dnn
-from DSE.low_memory.mms.phases_derivation import get_phases_per_layer_per_partition_per_dnn
+from DSE.low_memory.mms.phases_derivation import get_max_extra_phases_per_gene_multi_pipeline
+from DSE.low_memory.mms.ga_based.multi_thread.MMSEvalPool import MMSEvalPool
+from DSE.low_memory.mms.buf_building import build_csdf_fragments_per_partition_per_dnn, DEFAULT_MEMORY_PLANNER
+from DSE.low_memory.mms.ga_based.MMSPopulation import get_genes_mask_per_weight
+from DSE.low_memory.mms.ga_based.MMSFitnessCache import MMSFitnessCache, get_app_structure_key
+from DSE.low_memory.mms.ga_based.mms_ga_checkpoint import CHECKPOINT_VERSION, save_checkpoint,\
+    chromosome_to_checkpoint, chromosome_from_checkpoint, random_state_to_checkpoint, random_state_from_checkpoint
+from functools import partial
 import random
-import copy
 import time
-from multiprocessing import Pool
 
 
 class MMSgaParallelMultiPipeline:
@@ -39,6 +40,21 @@ class MMSgaParallelMultiPipeline:
             representing DP within the CNN is annotated with loss of throughput (caused by processing data
             by parts, the smaller, the better) and buffer sizes (the smaller, the better)
             If this flag is False, the best chromosome from the pareto front is returned
+        :param memory_planner: memory planner (see MEMORY_PLANNERS in buf_building.py), used to evaluate
+            buffers size of chromosomes. If None, the default planner is used
+        :param prune_dominated: (flag) if True, buffers size of a new chromosome is not evaluated, and the chromosome
+            is discarded, if the chromosome is surely not selected at the next GA iteration and is surely
+            dominated by the pareto front, found across all epochs. Both conditions are checked for a lower bound
+            on the chromosome buffers size, derived without buffers building, and the (exact) chromosome time loss.
+            Pruning does not change the GA results. The number of skipped evaluations is reported for every epoch
+        :param fitness_cache_path: path to SQLite file, where fitness of evaluated chromosomes is
+            stored and reused among GA runs for the same application. If None, fitness of evaluated
+            chromosomes is only reused within the GA run
+        :param checkpoint_path: path to .json file, where GA state is periodically saved (see mms_ga_checkpoint).
+            If None, GA state is not saved
+        :param checkpoint_epochs: save GA state every checkpoint_epochs epochs (if > 0)
+        :param checkpoint_seconds: save GA state if more than checkpoint_seconds seconds
+            passed since the last save (if not None)
         """
     def __init__(self, partitions_per_dnn: [], epochs=10,
                  population_start_size=100, selection_percent=50, mutation_probability=0,
@@ -46,7 +62,13 @@ class MMSgaParallelMultiPipeline:
                  dp_by_parts_init_probability=0.5, data_token_size=4,
                  parr_threads=1,
                  verbose=True,
-                 return_pareto=True):
+                 return_pareto=True,
+                 memory_planner=None,
+                 prune_dominated=False,
+                 fitness_cache_path=None,
+                 checkpoint_path=None,
+                 checkpoint_epochs=1,
+                 checkpoint_seconds=None):
 
         # multi-dnn-specific
         self.partitions_per_dnn = partitions_per_dnn
@@ -58,7 +80,14 @@ class MMSgaParallelMultiPipeline:
 
         # parallel processing
         self.parr_threads = parr_threads
-        self.partitions_per_dnn_copies = [copy.deepcopy(self.partitions_per_dnn) for thr in range(self.parr_threads)]
+        # fitness of already evaluated chromosomes, accessed by chromosome genotype
+        # fitness also depends on the memory planner. The default planner is not a part of the key,
+        # so that caches and checkpoints, saved before the memory planners were introduced, remain valid
+        eval_params = [data_token_size]
+        if memory_planner not in (None, DEFAULT_MEMORY_PLANNER):
+            eval_params.append(memory_planner)
+        self.app_key = get_app_structure_key(self.partitions_per_dnn, *eval_params)
+        self.fitness_cache = MMSFitnessCache(self.app_key, fitness_cache_path)
 
         # standard GA parameters
         self.population_start_size = population_start_size
@@ -75,16 +104,61 @@ class MMSgaParallelMultiPipeline:
         # meta-data
         # max phases in every layer of every partition of every dnn
         self.max_phases_per_layer_per_partition_per_dnn = get_max_phases_per_layer_per_partition_per_dnn(partitions_per_dnn)
+        # max extra phases per gene, grouped by number of extra phases
+        self.extra_phases_mask_per_weight = get_genes_mask_per_weight(
+            get_max_extra_phases_per_gene_multi_pipeline(partitions_per_dnn,
+                                                         self.max_phases_per_layer_per_partition_per_dnn))
+        self.memory_planner = memory_planner
+
+        # buffers size evaluation function: maps chromosome genes to buffers size of the application
+        # CSDF fragments of every partition for both states (one phase, max phases) of every layer,
+        # from which CSDF graphs of chromosomes are assembled
+        self.csdf_fragments_per_partition_per_dnn = build_csdf_fragments_per_partition_per_dnn(
+            partitions_per_dnn, self.max_phases_per_layer_per_partition_per_dnn)
+        self.buf_size_eval_func = partial(eval_genes_buffers_size_multi_pipelined_mb,
+                                          partitions_per_dnn=self.partitions_per_dnn,
+                                          max_phases_per_layer_per_partition_per_dnn=self.max_phases_per_layer_per_partition_per_dnn,
+                                          dnn_names=["dnn" + str(dnn_id) for dnn_id in range(self.dnns_num)],
+                                          data_token_size=self.data_token_size,
+                                          csdf_fragments_per_partition_per_dnn=self.csdf_fragments_per_partition_per_dnn,
+                                          memory_planner=self.memory_planner)
+        # pool of worker processes, shared among all GA epochs. The application model (and its CSDF fragments)
+        # is sent to every worker once (with the evaluation function), evaluation tasks only carry chromosome genes
+        self.eval_pool = MMSEvalPool(self.parr_threads, eval_func=self.buf_size_eval_func)
+        # lower bound on buffers size: maps chromosome genes to lower bound on buffers size of the application
+        self.prune_dominated = prune_dominated
+        self.buf_size_lower_bound_func = partial(eval_genes_buffers_size_lower_bound_multi_pipelined_mb,
+                                                 partitions_per_dnn=self.partitions_per_dnn,
+                                                 csdf_fragments_per_partition_per_dnn=self.csdf_fragments_per_partition_per_dnn,
+                                                 data_token_size=self.data_token_size)
 
         self.population = []
         self.selected_offspring = []
+        # number of chromosomes, discarded from the current population without evaluation (see prune_dominated)
+        self.discarded_chromosomes = 0
+        # number of skipped buffers size evaluations per GA iteration (see prune_dominated)
+        self.skipped_evals_per_epoch = []
 
         self.verbose = verbose
 
         # new
         # pareto front found across all epochs
         self.return_pareto = return_pareto
-        self.pareto_across_dse = []
+        self.pareto_across_dse = MMSParetoArchive()
+
+        # GA execution state
+        self.cur_epoch = 0
+        self.no_improvement_epochs = 0
+        self.best = None
+        # (flag) True if GA has met a stop condition
+        self.finished = False
+
+        # checkpoints
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_epochs = checkpoint_epochs
+        self.checkpoint_seconds = checkpoint_seconds
+        self.last_checkpoint_epoch = None
+        self.last_checkpoint_time = time.time()
 
     """ GA initialization"""
 
@@ -110,6 +184,7 @@ class MMSgaParallelMultiPipeline:
         init_end_time = time.time()
         if self.verbose:
             print("init time:", time_elapsed_str(init_start_time, init_end_time))
+            print("fitness cache:", self.fitness_cache.hits, "hits,", self.fitness_cache.misses, "misses")
 
     def generate_random_chromosome(self):
         random_chromosome = MMSChromosome(self.layers_num)
@@ -121,50 +196,54 @@ class MMSgaParallelMultiPipeline:
     def run(self):
         """ run GA"""
         if self.verbose:
-            print("START GA, epochs = ", self.epochs, ", init_offspring: ", self.population_start_size,
-                  ", selection:", self.selection_percent, "%", ", mutation probability:", self.mutation_probability)
-        cur_epoch = 0
+            if self.cur_epoch == 0:
+                print("START GA, epochs = ", self.epochs, ", init_offspring: ", self.population_start_size,
+                      ", selection:", self.selection_percent, "%", ", mutation probability:",
+                      self.mutation_probability)
+            else:
+                print("RESUME GA FROM EPOCH", self.cur_epoch, ", epochs = ", self.epochs)
         cur_mem = 0
         # we are going to iteratively select top selection_percent chromosomes of current population ...
-        chromosomes_to_select = int(len(self.population) * self.selection_percent / 100)
+        chromosomes_to_select = int((len(self.population) + self.discarded_chromosomes) * self.selection_percent / 100)
 
         # if 1. best time for population improves for >= no_improvement_epochs ...
         cur = self.population[0]
-        cur.partitions_per_dnn = self.partitions_per_dnn
         # chromosome is already annotated
-        # buf_size_mb, time_loss_ms = self.compute_fitness(cur)
-        # annotate_chromosome_with_fitness(cur, buf_size_mb, time_loss_ms)
         cur_buf_size = cur.buf_size
-        best = cur
-        best_buf_size = cur_buf_size
-        no_improvement_epochs = 0
+        if self.best is None:
+            self.best = cur.copy()
+        best_buf_size = self.best.buf_size
 
         # ga-start timer
         ga_start_time = time.time()
 
         # ... and 2. there is something to select, and 3. done epochs < max_epochs,
-        while chromosomes_to_select > 0 and cur_epoch < self.epochs:
+        while not self.finished and chromosomes_to_select > 0 and self.cur_epoch < self.epochs:
+            # save GA state, reached after the previous epoch
+            self.save_checkpoint_if_needed()
+
             # epoch-start timer
             epoch_start_time = time.time()
 
             self.make_iteration(chromosomes_to_select)
-            chromosomes_to_select = int(len(self.population) * self.selection_percent / 100)
-            cur_epoch = cur_epoch + 1
+            chromosomes_to_select = int((len(self.population) + self.discarded_chromosomes) * self.selection_percent / 100)
+            self.cur_epoch = self.cur_epoch + 1
+            cur_epoch = self.cur_epoch
             # population is annotated and sorted during selection so that
             # the first chromosome always corresponds to the best result
             cur = self.population[0]
             cur_buf_size = cur.buf_size
-            best_buf_size = best.buf_size
+            best_buf_size = self.best.buf_size
             improved = False
 
             if cur_buf_size < best_buf_size:
                 if self.verbose:
                     print("epoch", cur_epoch, " cur buffers size ", cur_buf_size, " < ",
                           "best buffers size", best_buf_size, "best result reset to")
-                best = cur
+                self.best = cur.copy()
                 best_buf_size = cur_buf_size
                 if self.verbose:
-                    best.print_short()
+                    self.best.print_short()
                 improved = True
 
             # epoch-end timer
@@ -173,26 +252,34 @@ class MMSgaParallelMultiPipeline:
             if self.verbose:
                 print("EPOCH: ", cur_epoch, "epoch best memory: ", cur_buf_size, "GA best memory: ", best_buf_size)
                 print("population size", len(self.population))
+                print("fitness cache:", self.fitness_cache.hits, "hits,", self.fitness_cache.misses, "misses")
+                if self.prune_dominated:
+                    print("skipped evaluations:", self.skipped_evals_per_epoch[-1], ", discarded chromosomes:",
+                          self.discarded_chromosomes)
                 print("epoch time:", time_elapsed_str(epoch_start_time, epoch_end_time),
                       "; GA time:", time_elapsed_str(ga_start_time, epoch_end_time))
 
             if improved:
-                no_improvement_epochs = 0
+                self.no_improvement_epochs = 0
             else:
-                no_improvement_epochs = no_improvement_epochs + 1
+                self.no_improvement_epochs = self.no_improvement_epochs + 1
 
-            if no_improvement_epochs == self.max_no_improvement_epochs:
+            if self.no_improvement_epochs == self.max_no_improvement_epochs:
                 if self.verbose:
                     print("ALGORITHM FINISHED ON EPOCH", cur_epoch, " ,NO IMPROVEMENT FOR", self.max_no_improvement_epochs, "EPOCHS")
 
                 if self.verbose:
-                    best.print_short()
+                    self.best.print_short()
+
+                # save final GA state
+                self.finished = True
+                self.save_checkpoint_if_needed(final=True)
 
                 # return results
                 if self.return_pareto:
-                    return self.pareto_across_dse
+                    return self.pareto_across_dse.get_pareto()
                 else:
-                    return best
+                    return self.best
 
             if chromosomes_to_select == 0:
                 if self.verbose:
@@ -202,18 +289,22 @@ class MMSgaParallelMultiPipeline:
                 if self.verbose:
                     print("ALGORITHM FINISHED, MAX EPOCHS: ", cur_epoch, " ACHIEVED: ")
 
+        # save final GA state
+        self.finished = True
+        self.save_checkpoint_if_needed(final=True)
+
         if self.verbose:
             print("ALGORITHM FINISHED WITH ACHIEVED BUFFERS SIZE", best_buf_size)
         if self.verbose:
-            best.print_short()
-            fin_eval = best.buf_size
+            self.best.print_short()
+            fin_eval = self.best.buf_size
             if self.verbose:
                 print("fin best buffers size: ", fin_eval)
         # return results
         if self.return_pareto:
-            return self.pareto_across_dse
+            return self.pareto_across_dse.get_pareto()
         else:
-            return best
+            return self.best
 
     def make_iteration(self, chromosomes_to_select):
         """
@@ -223,6 +314,8 @@ class MMSgaParallelMultiPipeline:
        - set current population = selected chromosomes + their children
        - mutate mutation_percent of population with probability = mutation_probability
         """
+        self.fitness_cache.reset_counters()
+
         # select top chromosomes_to_select from current population
         self.select(chromosomes_to_select)
 
@@ -239,8 +332,12 @@ class MMSgaParallelMultiPipeline:
         # make mutation_percent of the population more diverse by mutating them
         self.mutate()
 
-        # estimate fitness of chromosomes
-        self.annotate_chromosomes_with_fitness_parr()
+        # estimate fitness of chromosomes. With pruning, chromosomes, that are surely not selected
+        # at the next iteration and are surely dominated, are discarded
+        next_chromosomes_to_select = None
+        if self.prune_dominated:
+            next_chromosomes_to_select = int(len(self.population) * self.selection_percent / 100)
+        self.annotate_chromosomes_with_fitness_parr(next_chromosomes_to_select=next_chromosomes_to_select)
 
         # sort chromosomes by memory cost (descending)
         self.population = sorted(self.population, key=lambda x: x.buf_size, reverse=False)
@@ -249,94 +346,193 @@ class MMSgaParallelMultiPipeline:
         self.update_pareto_front()
 
     def update_pareto_front(self):
-        current_pareto = select_pareto(self.population)
-        self.pareto_across_dse = merge_pareto_fronts(self.pareto_across_dse, current_pareto)
+        self.pareto_across_dse.insert_all(self.population)
+
+    def save_checkpoint_if_needed(self, final=False):
+        """ Save GA state into checkpoint file every self.checkpoint_epochs epochs or
+        every self.checkpoint_seconds seconds
+        :param final: (flag) if True, GA state, reached after the last GA epoch, is saved
+            regardless of the checkpoints period
+        """
+        if self.checkpoint_path is None or (self.last_checkpoint_epoch == self.cur_epoch and not final):
+            return
+        epochs_due = self.checkpoint_epochs is not None and self.checkpoint_epochs > 0 and \
+            self.cur_epoch % self.checkpoint_epochs == 0
+        seconds_due = self.checkpoint_seconds is not None and \
+            time.time() - self.last_checkpoint_time >= self.checkpoint_seconds
+        if final or epochs_due or seconds_due:
+            save_checkpoint(self.get_checkpoint(), self.checkpoint_path)
+            self.last_checkpoint_epoch = self.cur_epoch
+            self.last_checkpoint_time = time.time()
+            if self.verbose:
+                print("GA state at epoch", self.cur_epoch, "saved in", self.checkpoint_path)
+
+    def get_checkpoint(self):
+        """
+        Get GA state, reached after self.cur_epoch epochs, as a checkpoint (dictionary)
+        """
+        checkpoint = {
+            "version": CHECKPOINT_VERSION,
+            "app_key": self.app_key,
+            "layers_num": self.layers_num,
+            "epoch": self.cur_epoch,
+            "no_improvement_epochs": self.no_improvement_epochs,
+            "finished": self.finished,
+            "discarded_chromosomes": self.discarded_chromosomes,
+            "best": None if self.best is None else chromosome_to_checkpoint(self.best),
+            "population": [chromosome_to_checkpoint(chromosome) for chromosome in self.population],
+            "pareto": [chromosome_to_checkpoint(chromosome) for chromosome in self.pareto_across_dse.get_pareto()],
+            "random_state": random_state_to_checkpoint()
+        }
+        return checkpoint
+
+    def restore_from_checkpoint(self, checkpoint: {}):
+        """
+        Restore GA state from a checkpoint. Chromosomes, stored in the checkpoint are not re-evaluated
+        :param checkpoint: GA checkpoint (see get_checkpoint())
+        """
+        if checkpoint["app_key"] != self.app_key or checkpoint["layers_num"] != self.layers_num:
+            raise Exception("GA checkpoint restoring error: checkpoint was created for another application")
+
+        self.cur_epoch = checkpoint["epoch"]
+        self.no_improvement_epochs = checkpoint["no_improvement_epochs"]
+        self.finished = checkpoint.get("finished", False)
+        self.discarded_chromosomes = checkpoint.get("discarded_chromosomes", 0)
+        self.best = None
+        if checkpoint["best"] is not None:
+            self.best = chromosome_from_checkpoint(checkpoint["best"], self.layers_num)
+        self.population = [chromosome_from_checkpoint(chromosome_desc, self.layers_num)
+                           for chromosome_desc in checkpoint["population"]]
+        self.pareto_across_dse = MMSParetoArchive()
+        self.pareto_across_dse.insert_all([chromosome_from_checkpoint(chromosome_desc, self.layers_num)
+                                           for chromosome_desc in checkpoint["pareto"]])
+        random_state_from_checkpoint(checkpoint["random_state"])
+
+        # restored state is already saved
+        self.last_checkpoint_epoch = self.cur_epoch
+        self.last_checkpoint_time = time.time()
+
+        if self.verbose:
+            print("GA state restored from checkpoint at epoch", self.cur_epoch)
 
     """
     Evaluation of chromosome in terms of fitness function (time loss and buffers size)
     """
 
-    def annotate_chromosomes_with_fitness_parr(self, print_batches=False):
-        """ Parallel evaluation: self.parr_threads (specified as GA input) are used to perform evaluation"""
-        # split chromosomes in batches
-        batch_size = self.parr_threads
-        chromosomes_num = len(self.population)
-        batches_num = math.ceil(chromosomes_num/batch_size)
-
-        # chromosomes are processed in parallel batches
-        batches = self.generate_chromosomes_batches(chromosomes_num, batches_num, batch_size)
+    def annotate_chromosomes_with_fitness_parr(self, print_batches=False, next_chromosomes_to_select=None):
+        """ Parallel evaluation: self.parr_threads (specified as GA input) are used to perform evaluation.
+        Only chromosomes that were changed (created, mutated or obtained by crossover) since their last
+        evaluation are evaluated. Fitness of chromosomes with genotypes, evaluated earlier, is taken from
+        the fitness cache. The remaining chromosomes (one per genotype) are submitted to the (long-lived)
+        evaluation pool at once
+        :param print_batches: (flag) print number of evaluated chromosomes
+        :param next_chromosomes_to_select: number of chromosomes, selected from the population at the next
+            GA iteration. If specified, chromosomes, that are surely not selected and surely dominated,
+            are discarded from the population without evaluation (see prune_dominated)
+        """
+        # chromosomes to evaluate, one per unique genotype
+        chromosomes_to_eval = []
+        # dictionary, where key = genotype, value = list of changed chromosomes with this genotype
+        chromosomes_per_genotype = {}
+
+        for chromosome in self.population:
+            if chromosome.needs_eval:
+                genotype_key = chromosome.get_genotype_key()
+                if genotype_key in chromosomes_per_genotype:
+                    chromosomes_per_genotype[genotype_key].append(chromosome)
+                    continue
+
+                cached_fitness = self.fitness_cache.lookup(genotype_key)
+                if cached_fitness is not None:
+                    buf_size_mb, time_loss_ms = cached_fitness
+                    chromosome.set_fitness(buf_size_mb, time_loss_ms)
+                else:
+                    chromosomes_per_genotype[genotype_key] = [chromosome]
+                    chromosomes_to_eval.append(chromosome)
 
         if print_batches:
             if self.verbose:
-                print("eval ", chromosomes_num, "chromosomes in", len(batches), "parallel batches",
-                      len(batches[0]), "chromosomes each (",
-                      len(batches[-1]), " chromosomes in the last batch)")
+                print("eval ", len(chromosomes_to_eval), "/", len(self.population), "chromosomes on",
+                      self.parr_threads, "parallel processes")
+
+        # evaluate time loss (closed-form, for all chromosomes at once)
+        population_time_loss = eval_population_time_loss_ms(chromosomes_to_eval, self.extra_phases_mask_per_weight)
 
-        # evaluate fitness per batch (in parallel)
-        fitness_per_batch = []
-        for batch in batches:
-            batch_fitness = self.compute_batch_fitness(batch)
-            fitness_per_batch.append(batch_fitness)
+        self.discarded_chromosomes = 0
+        if next_chromosomes_to_select is not None:
+            chromosomes_to_eval, population_time_loss = self.discard_dominated_chromosomes(
+                chromosomes_to_eval, population_time_loss, chromosomes_per_genotype, next_chromosomes_to_select)
+
+        # evaluate buffers size (in parallel)
+        population_buf_size = self.eval_pool.evaluate([chromosome.genes for chromosome in chromosomes_to_eval])
 
         # annotate every chromosome with fitness
-        chromosome_id = 0
-        for batch_fitness in fitness_per_batch:
-            for chromosome_fitness in batch_fitness:
-                buf_size_mb, time_loss_ms = chromosome_fitness
-                self.population[chromosome_id].buf_size = buf_size_mb
-                self.population[chromosome_id].time_loss = time_loss_ms
-                chromosome_id += 1
-
-    def compute_batch_fitness(self, chromosomes_batch):
-        # create parallel threads pool
-        pool = Pool(processes=len(chromosomes_batch))
-        # map the eval function to the batches (eval chromosomes per-batch in parallel)
-        batch_fitness = pool.map(self.compute_fitness, chromosomes_batch)
-        # close pool
-        pool.close()
-        # wait for threads pool to finish
-        pool.join()
-
-        return batch_fitness
-
-    def generate_chromosomes_batches(self, chromosomes_num, batches_num, batch_size):
-        batches = []
-
-        # generate batches
-        for i in range(batches_num):
-            batch_start_id = i*batch_size
-            batch_end_id = min((i+1)*batch_size, chromosomes_num)
-            chromosomes_batch = self.population[batch_start_id:batch_end_id]
-            batches.append(chromosomes_batch)
-
-        # annotate chromosomes with respective dnn copy
-        for batch in batches:
-            for chromosome_id in range(len(batch)):
-                batch[chromosome_id].partitions_per_dnn = self.partitions_per_dnn_copies[chromosome_id]
-
-        return batches
-
-    def compute_fitness(self, chromosome):
+        for chromosome, buf_size_mb, time_loss_ms in zip(chromosomes_to_eval, population_buf_size,
+                                                         population_time_loss):
+            genotype_key = chromosome.get_genotype_key()
+            self.fitness_cache.store(genotype_key, buf_size_mb, time_loss_ms)
+            for same_genotype_chromosome in chromosomes_per_genotype[genotype_key]:
+                same_genotype_chromosome.set_fitness(buf_size_mb, time_loss_ms)
+
+        # save new fitness records (if the cache is persisted)
+        self.fitness_cache.flush()
+
+    def discard_dominated_chromosomes(self, chromosomes_to_eval: [], population_time_loss: [],
+                                      chromosomes_per_genotype: {}, next_chromosomes_to_select: int):
         """
-        Evaluate chromosome in terms of throughput loss and buffers size
-        :param chromosome: MMS chromosome to be evaluated, annotated with dnn
-        :return: buf_size_mb, time_loss_ms where
-            buf_size_mb (float) is the dnn buffers size (in megabytes)
-            time_loss_ms (float) is the latency loss (delay) caused by data processing by parts
+        Discard chromosomes, that are surely not selected at the next GA iteration and surely dominated by the
+        pareto front, found across all epochs, from the population. A chromosome is surely not selected, if
+        the lower bound on its buffers size is larger than buffers size of the next_chromosomes_to_select-th best
+        chromosome among the (already evaluated) chromosomes of the population. A chromosome is surely dominated,
+        if the pareto front dominates the lower bound on its buffers size with its time loss
+        :param chromosomes_to_eval: chromosomes to evaluate, one per unique genotype
+        :param population_time_loss: time loss of every chromosome to evaluate
+        :param chromosomes_per_genotype: dictionary, where key = genotype, value = list of chromosomes
+            of the population with this genotype
+        :param next_chromosomes_to_select: number of chromosomes, selected at the next GA iteration
+        :return: chromosomes to evaluate and their time loss, left after discarding
         """
-
-        phases_per_layer_per_partition_per_dnn = get_phases_per_layer_per_partition_per_dnn(self.partitions_per_dnn,
-                                                                                            chromosome.dp_by_parts,
-                                                                                            self.max_phases_per_layer_per_partition_per_dnn)
-
-        time_loss_ms = eval_chromosome_time_loss_ms_multi_pipeline(phases_per_layer_per_partition_per_dnn)
-        buf_size_mb = eval_dnn_buffers_size_multi_pipelined_mb(self.partitions_per_dnn,
-                                                               phases_per_layer_per_partition_per_dnn,
-                                                               ["dnn" + str(dnn_id) for dnn_id in range(self.dnns_num)],
-                                                               self.data_token_size)
-
-        # return evaluation
-        return buf_size_mb, time_loss_ms
+        evaluated_buf_sizes = sorted(chromosome.buf_size for chromosome in self.population
+                                     if not chromosome.needs_eval)
+        skipped_evals = 0
+        if 0 < next_chromosomes_to_select <= len(evaluated_buf_sizes):
+            selection_cutoff = evaluated_buf_sizes[next_chromosomes_to_select - 1]
+            kept_chromosomes = []
+            kept_time_loss = []
+            discarded_chromosome_ids = set()
+            for chromosome, time_loss_ms in zip(chromosomes_to_eval, population_time_loss):
+                buf_size_lower_bound_mb = self.buf_size_lower_bound_func(chromosome.genes)
+                if buf_size_lower_bound_mb > selection_cutoff and \
+                        self.pareto_across_dse.is_dominated(buf_size_lower_bound_mb, time_loss_ms):
+                    skipped_evals += 1
+                    for same_genotype_chromosome in chromosomes_per_genotype[chromosome.get_genotype_key()]:
+                        discarded_chromosome_ids.add(id(same_genotype_chromosome))
+                else:
+                    kept_chromosomes.append(chromosome)
+                    kept_time_loss.append(time_loss_ms)
+            if discarded_chromosome_ids:
+                self.population = [chromosome for chromosome in self.population
+                                   if id(chromosome) not in discarded_chromosome_ids]
+                self.discarded_chromosomes = len(discarded_chromosome_ids)
+            chromosomes_to_eval = kept_chromosomes
+            population_time_loss = kept_time_loss
+
+        self.skipped_evals_per_epoch.append(skipped_evals)
+        return chromosomes_to_eval, population_time_loss
+
+    def close_eval_pool(self):
+        """ Shut down worker processes, used to evaluate chromosomes"""
+        self.eval_pool.close()
+
+    def compute_buf_size(self, chromosome):
+        """
+        Evaluate chromosome in terms of buffers size. Time loss, caused by data processing by parts, is
+        evaluated separately (see eval_population_time_loss_ms()), because it does not require the DNN buffers
+        :param chromosome: MMS chromosome to be evaluated
+        :return: buf_size_mb (float): the dnn buffers size (in megabytes)
+        """
+        buf_size_mb = self.buf_size_eval_func(chromosome.genes)
+        return buf_size_mb
 
     """
     GA operators
@@ -381,47 +577,10 @@ class MMSgaParallelMultiPipeline:
         """
         Crossover: exchange halves of parent chromosomes chromosome1 and chromosome2
         """
-        child_chromosome = MMSChromosome(chromosome1.layers_num)
-        # genes of first parent: range1 = [0, (layers_num / 2)]
-        for layer_id in range(0, int(chromosome1.layers_num / 2)):
-            child_chromosome.dp_by_parts[layer_id] = chromosome1.dp_by_parts[layer_id]
-        # genes of second parent: range1 = [0, (layers_num / 2 - 1)]
-        for layer_id in range(int(chromosome1.layers_num / 2), chromosome1.layers_num):
-            child_chromosome.dp_by_parts[layer_id] = chromosome2.dp_by_parts[layer_id]
+        child_chromosome = chromosome1.crossover(chromosome2)
         return child_chromosome
 
 
-def get_phases_per_layer(dnn: DNN, chromosome: MMSChromosome, max_phases_per_layer):
-    """
-    Determine number of phases performed by every DNN layer with respective MMS chromosome
-    :param dnn: DNN
-    :param chromosome: MMS chromosome
-    :param max_phases_per_layer: dictionary where key = name of layer within the dnn,
-    value = maximum number of phases that can be ever performed by this layer
-    :return: phases_per_layer: dictionary where key = name of layer within the dnn,
-    value =number of phases that are performed by this layer according to MMSChromosome
-    """
-    layers = dnn.get_layers()
-    phases_per_layer = {}
-    for layer_id in range(chromosome.layers_num):
-        layer = layers[layer_id]
-        dp_by_parts_flag = chromosome.dp_by_parts[layer_id]
-        # data processing by parts
-        if dp_by_parts_flag is True:
-            phases_per_layer[layer.name] = max_phases_per_layer[layer.name]
-        else:
-            # no data processing by parts
-            phases_per_layer[layer.name] = 1
-    return phases_per_layer
-
-
-def annotate_chromosome_with_fitness(chromosome, buf_size_mb, time_loss_ms):
-    """ Annotate chromosome with fitness function: with time loss and buffers size"""
-    chromosome.time_loss = time_loss_ms
-    chromosome.buf_size = buf_size_mb
-    print("chromosome buf size:", buf_size_mb, ", time loss: ", time_loss_ms)
-
-
 def time_elapsed(start_time, end_time):
     hours, rem = divmod(end_time - start_time, 3600)
     minutes, seconds = divmod(rem, 60)
@@ -3,7 +3,12 @@ def run_ga_parallel_multi(json_dnn_paths,
                           json_ga_conf_path,
                           parr_threads,
                           output_file_path,
-                          verbose=True):
+                          verbose=True,
+                          fitness_cache_path=None,
+                          checkpoint_path=None,
+                          checkpoint_epochs=1,
+                          checkpoint_seconds=None,
+                          resume=False):
     """
     Run max memory save (mms) GA with support for multi-dnn and pipelined applications
     :param json_dnn_paths: list of paths to DNN models saved in .json format
@@ -13,6 +18,15 @@ def run_ga_parallel_multi(json_dnn_paths,
     :param output_file_path: path to output json file, where the
      pareto-front of MMS-GA chromosomes, delivered by MMS-GA will be saved
     :param verbose: print GA execution details into console
+    :param fitness_cache_path: path to SQLite file, where fitness of evaluated MMS-GA chromosomes
+     is stored, so that GA reruns for the same application skip already evaluated chromosomes.
+     If None, fitness of evaluated chromosomes is not stored between GA runs
+    :param checkpoint_path: path to .json file, where GA state is periodically saved.
+     If None, GA state is not saved
+    :param checkpoint_epochs: save GA state every checkpoint_epochs epochs
+    :param checkpoint_seconds: save GA state every checkpoint_seconds seconds (if not None)
+    :param resume: (flag) if True and checkpoint file exists, GA is resumed from
+     the GA state, saved in the checkpoint file
     """
     from converters.json_converters.json_app_config_parser import parse_json_dnns,\
         parse_json_mappings, partition_dnns_with_mapping
@@ -22,6 +36,8 @@ def run_ga_parallel_multi(json_dnn_paths,
     import traceback
     from util import print_to_stderr
     from DSE.low_memory.mms.ga_based.multi_thread.MMSgaParallelMultiPipeline import MMSgaParallelMultiPipeline
+    from DSE.low_memory.mms.ga_based.mms_ga_checkpoint import load_checkpoint
+    import os
 
     stage = "DNNs parsing"
     try:
@@ -56,16 +72,32 @@ def run_ga_parallel_multi(json_dnn_paths,
                                         conf["dp_by_parts_init_probability"],
                                         conf["data_token_size"],
                                         parr_threads,
-                                        verbose)
-
-        stage = "GA initialization with first population"
-        ga.init_with_random_population()
-
-        # for chromosome in ga.population:
-        #    chromosome.print_long()
-
-        stage = "GA execution"
-        pareto_front = ga.run()
+                                        verbose,
+                                        memory_planner=conf["memory_planner"],
+                                        prune_dominated=conf["prune_dominated"],
+                                        fitness_cache_path=fitness_cache_path,
+                                        checkpoint_path=checkpoint_path,
+                                        checkpoint_epochs=checkpoint_epochs,
+                                        checkpoint_seconds=checkpoint_seconds)
+
+        # worker processes are created once and shared by GA initialization and all GA epochs.
+        # They are shut down when the GA is finished or interrupted by an exception.
+        # The fitness cache file is closed in both cases as well
+        with ga.eval_pool, ga.fitness_cache:
+            if resume and checkpoint_path is not None and os.path.exists(checkpoint_path):
+                stage = "GA initialization from checkpoint"
+                ga.restore_from_checkpoint(load_checkpoint(checkpoint_path))
+            else:
+                if resume and verbose:
+                    print("GA checkpoint", checkpoint_path, "not found, GA is started from scratch")
+                stage = "GA initialization with first population"
+                ga.init_with_random_population()
+
+            # for chromosome in ga.population:
+            #    chromosome.print_long()
+
+            stage = "GA execution"
+            pareto_front = ga.run()
         if verbose:
             print("GA returned pareto front of", len(pareto_front), "elements, with min-buffers chromosome:")
 
@@ -83,7 +115,7 @@ def run_ga_parallel_multi(json_dnn_paths,
         print(traceback.format_exc())
 
 
-def run_ga(json_dnn_path, json_ga_conf_path, parr_threads, output_file_path):
+def run_ga(json_dnn_path, json_ga_conf_path, parr_threads, output_file_path, fitness_cache_path=None):
     """
     Run max memory save (mms) GA
     :param json_dnn_path: path to DNN model saved in .json format
@@ -91,6 +123,9 @@ def run_ga(json_dnn_path, json_ga_conf_path, parr_threads, output_file_path):
     :param parr_threads: parallel CPU threads to run GA on
     :param output_file_path: path to output json file, where the
      pareto-front of MMS-GA chromosomes, delivered by MMS-GA will be saved
+    :param fitness_cache_path: path to SQLite file, where fitness of evaluated MMS-GA chromosomes
+     is stored, so that GA reruns for the same DNN skip already evaluated chromosomes.
+     If None, fitness of evaluated chromosomes is not stored between GA runs
     """
     from converters.json_converters.json_to_dnn import parse_json_dnn
     from converters.json_converters.json_mms_ga_conf_parser import parse_mms_ga_conf
@@ -119,16 +154,22 @@ def run_ga(json_dnn_path, json_ga_conf_path, parr_threads, output_file_path):
                            conf["dp_by_parts_init_probability"],
                            conf["data_token_size"],
                            parr_threads,
-                           conf["verbose"])
-
-        stage = "GA initialization with first population"
-        ga.init_with_random_population()
-
-        # for chromosome in ga.population:
-        #    chromosome.print_long()
-
-        stage = "GA execution"
-        pareto_front = ga.run()
+                           conf["verbose"],
+                           memory_planner=conf["memory_planner"],
+                           fitness_cache_path=fitness_cache_path)
+
+        # worker processes are created once and shared by GA initialization and all GA epochs.
+        # They are shut down when the GA is finished or interrupted by an exception.
+        # The fitness cache file is closed in both cases as well
+        with ga.eval_pool, ga.fitness_cache:
+            stage = "GA initialization with first population"
+            ga.init_with_random_population()
+
+            # for chromosome in ga.population:
+            #    chromosome.print_long()
+
+            stage = "GA execution"
+            pareto_front = ga.run()
 
         # print("GA returned pareto front of", len(pareto_front), "elements, with min-buffers chromosome:")
         # best (in terms of buffers sizes) chromosome
@@ -209,8 +209,7 @@ class MMSga:
         buf_size_mb = eval_dnn_buffers_size_mb(self.dnn, phases_per_layer, self.data_token_size)
 
         # annotate chromosome
-        chromosome.time_loss = time_loss_ms
-        chromosome.buf_size = buf_size_mb
+        chromosome.set_fitness(buf_size_mb, time_loss_ms)
 
     def mutate(self):
         """
@@ -239,13 +238,7 @@ class MMSga:
         """
         Crossover: exchange halves of parent chromosomes chromosome1 and chromosome2
         """
-        child_chromosome = MMSChromosome(chromosome1.layers_num)
-        # genes of first parent: range1 = [0, (layers_num / 2)]
-        for layer_id in range(0, int(chromosome1.layers_num / 2)):
-            child_chromosome.dp_by_parts[layer_id] = chromosome1.dp_by_parts[layer_id]
-        # genes of second parent: range1 = [0, (layers_num / 2 - 1)]
-        for layer_id in range(int(chromosome1.layers_num / 2), chromosome1.layers_num):
-            child_chromosome.dp_by_parts[layer_id] = chromosome2.dp_by_parts[layer_id]
+        child_chromosome = chromosome1.crossover(chromosome2)
         return child_chromosome
 
 
@@ -263,7 +256,7 @@ def get_phases_per_layer(dnn: DNN, chromosome: MMSChromosome, max_phases_per_lay
     phases_per_layer = {}
     for layer_id in range(chromosome.layers_num):
         layer = layers[layer_id]
-        dp_by_parts_flag = chromosome.dp_by_parts[layer_id]
+        dp_by_parts_flag = chromosome.processes_by_parts(layer_id)
         # data processing by parts
         if dp_by_parts_flag is True:
             phases_per_layer[layer.name] = max_phases_per_layer[layer.name]
@@ -226,8 +226,7 @@ class MMSgaMulti:
                                                                self.data_token_size)
 
         # annotate chromosome
-        chromosome.time_loss = time_loss_ms
-        chromosome.buf_size = buf_size_mb
+        chromosome.set_fitness(buf_size_mb, time_loss_ms)
 
     def mutate(self):
         """
@@ -256,13 +255,7 @@ class MMSgaMulti:
         """
         Crossover: exchange halves of parent chromosomes chromosome1 and chromosome2
         """
-        child_chromosome = MMSChromosome(chromosome1.layers_num)
-        # genes of first parent: range1 = [0, (layers_num / 2)]
-        for layer_id in range(0, int(chromosome1.layers_num / 2)):
-            child_chromosome.dp_by_parts[layer_id] = chromosome1.dp_by_parts[layer_id]
-        # genes of second parent: range1 = [0, (layers_num / 2 - 1)]
-        for layer_id in range(int(chromosome1.layers_num / 2), chromosome1.layers_num):
-            child_chromosome.dp_by_parts[layer_id] = chromosome2.dp_by_parts[layer_id]
+        child_chromosome = chromosome1.crossover(chromosome2)
         return child_chromosome
 
 
@@ -286,7 +279,7 @@ def get_phases_per_layer_per_partition_per_dnn(partitions_per_dnn: [],
             max_ph_per_dnn_per_partition = max_ph_per_dnn[partition.name]
             ph_per_dnn_per_partition = {}
             for layer in partition.get_layers():
-                dp_by_parts_flag = chromosome.dp_by_parts[layer_id_in_chromosome]
+                dp_by_parts_flag = chromosome.processes_by_parts(layer_id_in_chromosome)
                 # data processing by parts
                 if dp_by_parts_flag is True:
                     ph_per_dnn_per_partition[layer.name] = max_ph_per_dnn_per_partition[layer.name]
@@ -192,6 +192,50 @@ def get_phases_per_layer_per_partition_per_dnn(partitions_per_dnn: [],
     return phases_per_layer_per_partition_per_dnn
 
 
+def get_max_extra_phases_per_gene(dnn: DNN, max_phases_per_layer=None) -> [int]:
+    """
+    Determine maximum number of extra phases (max phases - 1), performed by every layer of a DNN,
+    in the order of layers in the data processing by parts encoding
+    :param dnn: DNN
+    :param max_phases_per_layer: maximum number of phases per DNN layer
+        if unspecified (is None), is computed automatically
+    :return: list of (int) max extra phases, where i-th element corresponds to the i-th encoding element
+    """
+    if max_phases_per_layer is None:
+        max_phases = get_max_phases_per_layer(dnn)
+    else:
+        max_phases = max_phases_per_layer
+
+    extra_phases_per_gene = []
+    for layer in dnn.get_layers():
+        extra_phases_per_gene.append(max(max_phases[layer.name] - 1, 0))
+    return extra_phases_per_gene
+
+
+def get_max_extra_phases_per_gene_multi_pipeline(partitions_per_dnn: [],
+                                                 max_phases_per_layer_per_partition_per_dnn=None) -> [int]:
+    """
+    Determine maximum number of extra phases (max phases - 1), performed by every layer of every
+    DNN partition, in the order of layers in the data processing by parts encoding
+    :param partitions_per_dnn: list of pipelined partitions per dnn
+    :param max_phases_per_layer_per_partition_per_dnn: maximum number of phases per partition per DNN
+        if unspecified (is None), is computed automatically
+    :return: list of (int) max extra phases, where i-th element corresponds to the i-th encoding element
+    """
+    if max_phases_per_layer_per_partition_per_dnn is None:
+        max_phases = get_max_phases_per_layer_per_partition_per_dnn(partitions_per_dnn)
+    else:
+        max_phases = max_phases_per_layer_per_partition_per_dnn
+
+    extra_phases_per_gene = []
+    for dnn_id in range(len(partitions_per_dnn)):
+        for partition in partitions_per_dnn[dnn_id]:
+            max_ph_per_dnn_per_partition = max_phases[dnn_id][partition.name]
+            for layer in partition.get_layers():
+                extra_phases_per_gene.append(max(max_ph_per_dnn_per_partition[layer.name] - 1, 0))
+    return extra_phases_per_gene
+
+
 def dp_encoding_to_phases_num(dp_encoding: [bool], dnns: [DNN]):
     """
     Convert dp encoding into the number of phases, performed by ever DNN layer
@@ -0,0 +1,332 @@
+import time
+from bisect import bisect_left
+from models.data_buffers import DataBuffer, CSDFGDataBuffer
+from DSE.low_memory.buf_reuse_from_simulation import build_reuse_buffers, reuse_buffers_among_csdf, \
+    get_proc_per_mem_name, DIFFERENT_PROCS
+from DSE.low_memory.arena_planning import _intervals_overlap
+
+"""
+Optimal (minimum total size) buffers reuse for small instances. The greedy buffers reuse
+(see buf_reuse_from_simulation.py) stores every memory in the first best-fit buffer, in the order of the memories.
+Here, memories are distributed among buffers by a branch-and-bound search, that finds the minimum total size of
+buffers, where every buffer has the size of its largest memory, and memories, that conflict (e.g., have overlapping
+occupancy intervals, are mapped on different processors or belong to the same CSDF model) are never stored in
+the same buffer. The search is limited in time and in the number of memories: if the search does not find a
+solution, smaller than the greedy solution, the greedy solution is returned.
+"""
+# max time (in seconds) of one search
+DEFAULT_TIME_LIMIT_S = 1.0
+# max number of memories, for which the search is performed
+DEFAULT_MAX_MEMORIES = 64
+
+
+def build_optimal_reuse_buffers(occupancy_intervals_per_mem_name: {},
+                                max_tokens_per_mem_name: {},
+                                mapping=None,
+                                actor_ids_per_mem_name=None,
+                                time_limit_s=DEFAULT_TIME_LIMIT_S,
+                                max_memories=DEFAULT_MAX_MEMORIES):
+    """
+    Build a set of reused data buffers with minimum total size, using results of application simulation.
+    Memories can share a buffer if they have non-overlapping occupancy intervals and are mapped on the same processor
+    (see build_reuse_buffers() in buf_reuse_from_simulation.py). Memories of different processors never share
+    buffers, so the search is performed for every processor separately
+    :param occupancy_intervals_per_mem_name: dictionary, where key = memory name, value = list of
+        memory occupancy intervals (SimMemoryOccupancyInterval) in the application schedule
+    :param max_tokens_per_mem_name: dictionary, where key = memory name,
+        value = max number of tokens, ever stored in the memory
+    :param mapping: mapping of CNN layers/CSDF actors onto platform processors.
+    CSDF buffers cannot be reused among CNN layers mapped onto different processors
+    :param actor_ids_per_mem_name: (optional) dictionary, where key = memory name,
+        value = tuple (src_actor_id, dst_actor_id) of ids of actors, that write and read the memory.
+        If None, or if a memory is not in the dictionary, actor ids are derived from the memory name
+    :param time_limit_s: max time (in seconds) of the search
+    :param max_memories: max number of memories, for which the search is performed
+    :return: a set of DataBuffers, reused among application tasks
+    """
+    greedy_buffers = build_reuse_buffers(occupancy_intervals_per_mem_name, max_tokens_per_mem_name,
+                                         mapping, actor_ids_per_mem_name)
+    memory_names = [key for key in occupancy_intervals_per_mem_name.keys()]
+    if len(memory_names) > max_memories:
+        return greedy_buffers
+
+    sizes = [max_tokens_per_mem_name.get(memory_name, 0) for memory_name in memory_names]
+    intervals_per_mem = [[(interval.start_step, interval.end_step) for interval in
+                          occupancy_intervals_per_mem_name[memory_name]] for memory_name in memory_names]
+    proc_per_mem_name = get_proc_per_mem_name(memory_names, mapping, actor_ids_per_mem_name)
+    greedy_buf_id_per_mem_name = {}
+    for buf_id, buf in enumerate(greedy_buffers):
+        for user_name in buf.users:
+            greedy_buf_id_per_mem_name[user_name] = buf_id
+
+    # memories of every processor. Memories, mapped on different processors, are stored in separate buffers
+    mem_ids_per_proc = {}
+    for mem_id, memory_name in enumerate(memory_names):
+        proc_id = proc_per_mem_name[memory_name]
+        if proc_id is not DIFFERENT_PROCS:
+            mem_ids_per_proc.setdefault(proc_id, []).append(mem_id)
+
+    deadline = time.perf_counter() + time_limit_s
+    # (global) buffer id per memory
+    buf_per_mem = [None for _ in memory_names]
+    buffers_num = 0
+    for mem_ids in mem_ids_per_proc.values():
+        conflicts = [set(local_id2 for local_id2, mem_id2 in enumerate(mem_ids)
+                         if mem_id2 != mem_id and _intervals_overlap(intervals_per_mem[mem_id],
+                                                                     intervals_per_mem[mem_id2]))
+                     for mem_id in mem_ids]
+        cliques = _get_interval_cliques([intervals_per_mem[mem_id] for mem_id in mem_ids])
+        initial_buf_per_mem = [greedy_buf_id_per_mem_name[memory_names[mem_id]] for mem_id in mem_ids]
+        local_buf_per_mem, _, _ = solve_min_total_buffers_size([sizes[mem_id] for mem_id in mem_ids],
+                                                               conflicts,
+                                                               cliques,
+                                                               initial_buf_per_mem,
+                                                               deadline - time.perf_counter())
+        for local_id, mem_id in enumerate(mem_ids):
+            buf_per_mem[mem_id] = buffers_num + local_buf_per_mem[local_id]
+        buffers_num += max(local_buf_per_mem) + 1
+    for mem_id in range(len(memory_names)):
+        if buf_per_mem[mem_id] is None:
+            buf_per_mem[mem_id] = buffers_num
+            buffers_num += 1
+
+    if _get_total_size(sizes, buf_per_mem) >= sum(buf.size for buf in greedy_buffers):
+        return greedy_buffers
+
+    buffers = []
+    buffer_per_buf_id = {}
+    for mem_id, memory_name in enumerate(memory_names):
+        buffer = buffer_per_buf_id.get(buf_per_mem[mem_id])
+        if buffer is None:
+            buffer = DataBuffer("B" + str(len(buffers)), 0)
+            buffers.append(buffer)
+            buffer_per_buf_id[buf_per_mem[mem_id]] = buffer
+        buffer.size = max(buffer.size, sizes[mem_id])
+        buffer.assign(memory_name)
+    return buffers
+
+
+def reuse_buffers_among_csdf_optimal(csdf_buffers_per_csdf: [CSDFGDataBuffer],
+                                     csdf_model_names: [str],
+                                     time_limit_s=DEFAULT_TIME_LIMIT_S,
+                                     max_memories=DEFAULT_MAX_MEMORIES):
+    """
+    Reuse buffers among multiple CSDF models with minimum total size of the shared buffers.
+    CSDF buffers can share a buffer if they do not store channels of the same CSDF model
+    (see reuse_buffers_among_csdf() in buf_reuse_from_simulation.py)
+    :param csdf_buffers_per_csdf: csdf buffers per CSDF model
+    :param csdf_model_names: names of CSDF models
+    :param time_limit_s: max time (in seconds) of the search
+    :param max_memories: max number of CSDF buffers, for which the search is performed
+    :return: buffers reused among all the CSDF models
+    """
+    greedy_buffers = reuse_buffers_among_csdf(csdf_buffers_per_csdf, csdf_model_names)
+    csdf_buffers = [buf for csdf_buffers in csdf_buffers_per_csdf for buf in csdf_buffers]
+    if len(csdf_buffers) > max_memories:
+        return greedy_buffers
+
+    channel_to_csdf_model_id = {}
+    for model_id, csdf_buffers_of_model in enumerate(csdf_buffers_per_csdf):
+        for buf in csdf_buffers_of_model:
+            for channel in buf.channels:
+                channel_to_csdf_model_id[channel] = model_id
+    csdf_model_ids_per_buf = [set(channel_to_csdf_model_id[channel] for channel in buf.channels)
+                              for buf in csdf_buffers]
+
+    sizes = [buf.size for buf in csdf_buffers]
+    conflicts = [set(buf_id2 for buf_id2 in range(len(csdf_buffers)) if buf_id2 != buf_id and
+                     csdf_model_ids_per_buf[buf_id] & csdf_model_ids_per_buf[buf_id2])
+                 for buf_id in range(len(csdf_buffers))]
+    # buffers, storing channels of the same CSDF model, are pairwise conflicting
+    cliques = [[buf_id for buf_id in range(len(csdf_buffers)) if model_id in csdf_model_ids_per_buf[buf_id]]
+               for model_id in range(len(csdf_buffers_per_csdf))]
+    shared_buf_per_buf, total_size, _ = solve_min_total_buffers_size(sizes, conflicts, cliques,
+                                                                     time_limit_s=time_limit_s)
+    if total_size >= sum(buf.size for buf in greedy_buffers):
+        return greedy_buffers
+
+    shared_csdf_buffers = []
+    shared_csdf_buffer_per_id = {}
+    for buf_id, buffer in enumerate(csdf_buffers):
+        shared_csdf_buffer = shared_csdf_buffer_per_id.get(shared_buf_per_buf[buf_id])
+        if shared_csdf_buffer is None:
+            shared_csdf_buffer = CSDFGDataBuffer("B" + str(len(shared_csdf_buffers)), 0)
+            shared_csdf_buffers.append(shared_csdf_buffer)
+            shared_csdf_buffer_per_id[shared_buf_per_buf[buf_id]] = shared_csdf_buffer
+        for ch in buffer.channels:
+            shared_csdf_buffer.channels.append(ch)
+            shared_csdf_buffer.csdf_model_name_per_channel.append(csdf_model_names[channel_to_csdf_model_id[ch]])
+        shared_csdf_buffer.offset_per_channel.extend(buffer.offset_per_channel)
+        shared_csdf_buffer.size = max(shared_csdf_buffer.size, buffer.size)
+    return shared_csdf_buffers
+
+
+def solve_min_total_buffers_size(sizes: [],
+                                 conflicts: [],
+                                 cliques: [],
+                                 initial_buf_per_mem=None,
+                                 time_limit_s=DEFAULT_TIME_LIMIT_S):
+    """
+    Distribute memories among buffers, so that conflicting memories are never stored in the same buffer, and
+    the total size of buffers (where size of a buffer is the size of its largest memory) is minimal.
+    Memories are distributed by a depth-first branch-and-bound search. Memories are assigned in the order of
+    decreasing size, so that every buffer gets its size from the memory, that opens the buffer, and storing
+    a memory in an already opened buffer is free. Every partial solution is pruned by the lower bound, derived
+    from cliques of pairwise conflicting memories: the memories of a clique are stored in different buffers,
+    so if a clique has more memories than there are opened buffers, its smallest not yet assigned memories
+    open new buffers. Opened buffers, that conflict with the same not yet assigned memories, are interchangeable,
+    so only the first of them is tried for every memory
+    :param sizes: list of sizes of memories
+    :param conflicts: list, where element i is a set of ids of memories, that cannot share a buffer with memory i
+    :param cliques: list of cliques, where every clique is a list of ids of pairwise conflicting memories
+    :param initial_buf_per_mem: (optional) initial solution: list, where element i is id of buffer,
+        that stores memory i. If None, the initial solution is found by a first-fit decreasing heuristic
+    :param time_limit_s: max time (in seconds) of the search. When the time is over, the best found solution
+        is returned
+    :return: tuple (buf_per_mem, total_size, optimal), where buf_per_mem is a list, where element i is id of the buffer,
+        storing memory i (buffers have ids 0, 1, ...), total_size is the total size of buffers and
+        optimal is a flag, that is True if the solution is proven to be optimal
+    """
+    mems_num = len(sizes)
+    if mems_num == 0:
+        return [], 0, True
+    order = sorted(range(mems_num), key=lambda mem_id: -sizes[mem_id])
+    pos_per_mem = [0 for _ in range(mems_num)]
+    for pos, mem_id in enumerate(order):
+        pos_per_mem[mem_id] = pos
+    conflicts_mask = [0 for _ in range(mems_num)]
+    for mem_id in range(mems_num):
+        for conflicting_mem_id in conflicts[mem_id]:
+            conflicts_mask[mem_id] |= 1 << pos_per_mem[conflicting_mem_id]
+            conflicts_mask[conflicting_mem_id] |= 1 << pos_per_mem[mem_id]
+
+    # every clique: positions of its memories in the assignment order and
+    # total sizes of its memories starting from every position
+    cliques_pos = []
+    cliques_tail_sizes = []
+    for clique in cliques:
+        clique_pos = sorted(set(pos_per_mem[mem_id] for mem_id in clique))
+        tail_sizes = [0 for _ in range(len(clique_pos) + 1)]
+        for i in range(len(clique_pos) - 1, -1, -1):
+            tail_sizes[i] = tail_sizes[i + 1] + sizes[order[clique_pos[i]]]
+        cliques_pos.append(clique_pos)
+        cliques_tail_sizes.append(tail_sizes)
+
+    best_buf_per_mem = _first_fit_decreasing(sizes, order, conflicts_mask, pos_per_mem)
+    best_total_size = _get_total_size(sizes, best_buf_per_mem)
+    if initial_buf_per_mem is not None and _get_total_size(sizes, initial_buf_per_mem) < best_total_size:
+        best_buf_per_mem = _normalize_buf_ids(initial_buf_per_mem)
+        best_total_size = _get_total_size(sizes, best_buf_per_mem)
+
+    deadline = time.perf_counter() + time_limit_s
+    timed_out = False
+    visited_nodes = 0
+    # positions of memories in every opened buffer (bitmask) and union of their conflicts
+    buf_members = []
+    buf_conflicts = []
+    buf_per_pos = [0 for _ in range(mems_num)]
+
+    def lower_bound(pos, total_size):
+        bound = total_size
+        opened_buffers = len(buf_members)
+        for clique_pos, tail_sizes in zip(cliques_pos, cliques_tail_sizes):
+            extra_buffers = len(clique_pos) - opened_buffers
+            if extra_buffers > 0:
+                unassigned = len(clique_pos) - bisect_left(clique_pos, pos)
+                extra_buffers = min(extra_buffers, unassigned)
+                bound = max(bound, total_size + tail_sizes[len(clique_pos) - extra_buffers])
+        return bound
+
+    def branch(pos, total_size):
+        nonlocal best_buf_per_mem, best_total_size, timed_out, visited_nodes
+        visited_nodes += 1
+        if visited_nodes % 256 == 0 and time.perf_counter() > deadline:
+            timed_out = True
+        if timed_out:
+            return
+        if pos == mems_num:
+            if total_size < best_total_size:
+                best_total_size = total_size
+                best_buf_per_mem = [0 for _ in range(mems_num)]
+                for mem_pos in range(mems_num):
+                    best_buf_per_mem[order[mem_pos]] = buf_per_pos[mem_pos]
+            return
+        if lower_bound(pos, total_size) >= best_total_size:
+            return
+
+        mem_id = order[pos]
+        mem_bit = 1 << pos
+        unassigned_mask = ~((mem_bit << 1) - 1)
+        # store memory in an opened buffer
+        tried_buf_conflicts = set()
+        for buf_id in range(len(buf_members)):
+            if buf_members[buf_id] & conflicts_mask[mem_id]:
+                continue
+            future_conflicts = buf_conflicts[buf_id] & unassigned_mask
+            if future_conflicts in tried_buf_conflicts:
+                continue
+            tried_buf_conflicts.add(future_conflicts)
+            old_buf_conflicts = buf_conflicts[buf_id]
+            buf_members[buf_id] |= mem_bit
+            buf_conflicts[buf_id] |= conflicts_mask[mem_id]
+            buf_per_pos[pos] = buf_id
+            branch(pos + 1, total_size)
+            buf_members[buf_id] ^= mem_bit
+            buf_conflicts[buf_id] = old_buf_conflicts
+
+        # open new buffer
+        buf_members.append(mem_bit)
+        buf_conflicts.append(conflicts_mask[mem_id])
+        buf_per_pos[pos] = len(buf_members) - 1
+        branch(pos + 1, total_size + sizes[mem_id])
+        buf_members.pop()
+        buf_conflicts.pop()
+
+    branch(0, 0)
+    return _normalize_buf_ids(best_buf_per_mem), best_total_size, not timed_out
+
+
+def _first_fit_decreasing(sizes, order, conflicts_mask, pos_per_mem):
+    """ Store every memory (in the order of decreasing size) in the first buffer, that has no conflicting memories"""
+    buf_per_mem = [0 for _ in sizes]
+    buf_members = []
+    for mem_id in order:
+        mem_bit = 1 << pos_per_mem[mem_id]
+        for buf_id in range(len(buf_members) + 1):
+            if buf_id == len(buf_members):
+                buf_members.append(0)
+            if buf_members[buf_id] & conflicts_mask[mem_id] == 0:
+                buf_members[buf_id] |= mem_bit
+                buf_per_mem[mem_id] = buf_id
+                break
+    return buf_per_mem
+
+
+def _get_total_size(sizes, buf_per_mem):
+    """ Get total size of buffers, where size of a buffer is the size of its largest memory"""
+    size_per_buf = {}
+    for mem_id, buf_id in enumerate(buf_per_mem):
+        size_per_buf[buf_id] = max(size_per_buf.get(buf_id, 0), sizes[mem_id])
+    return sum(size_per_buf.values())
+
+
+def _normalize_buf_ids(buf_per_mem):
+    """ Renumber buffers 0, 1, ... in the order of their first memory"""
+    new_id_per_buf = {}
+    for buf_id in buf_per_mem:
+        if buf_id not in new_id_per_buf:
+            new_id_per_buf[buf_id] = len(new_id_per_buf)
+    return [new_id_per_buf[buf_id] for buf_id in buf_per_mem]
+
+
+def _get_interval_cliques(intervals_per_mem: []):
+    """
+    Get cliques of memories with overlapping (inclusive) occupancy intervals: for every start of an occupancy
+    interval, memories, occupied at this step, are pairwise overlapping
+    """
+    cliques = set()
+    for start_step in set(start for intervals in intervals_per_mem for start, end in intervals):
+        clique = tuple(mem_id for mem_id, intervals in enumerate(intervals_per_mem)
+                       if any(start <= start_step <= end for start, end in intervals))
+        cliques.add(clique)
+    return [list(clique) for clique in sorted(cliques)]
@@ -45,8 +45,10 @@ def csdf_sim_trace_schedule_to_dnn_schedule(sim_trace_schedule: [SimJob]):
     """
     layers_exec_order = []
     for job in sim_trace_schedule:
-        csdf_actor_name = job.task
-        csdf_actor_id = int(csdf_actor_name.replace("a", ""))
+        csdf_actor_id = job.task_id
+        # job without actor id: derive actor id from actor name
+        if csdf_actor_id == -1:
+            csdf_actor_id = int(job.task.replace("a", ""))
         dnn_layer_id = csdf_actor_id
         layers_exec_order.append(dnn_layer_id)
     return layers_exec_order
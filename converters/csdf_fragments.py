@@ -0,0 +1,221 @@
+from models.csdf_model.csdf import CSDFGraph, CSDFFIFOChannel
+from models.dnn_model.dnn import DNN
+from converters.dnn_to_csdf import dnn_to_csfd_one_to_one, create_csdf_actor, compute_channel_sequences, \
+    compute_self_loop_sequences
+
+"""
+Prebuilt CSDF fragments of a DNN, used for fast DNN-to-CSDF conversion during the DSE.
+During the DSE (e.g. MMS GA), every DNN layer only takes two states: it either performs one phase
+or max phases. For every layer and for every DNN connection (edge), the fragments store the CSDF actor
+and CSDF channel(s), built (see dnn_to_csfd_one_to_one()) for every state of the layer (of the edge source
+and destination layers). Conversion of a DNN with given phases then only selects the prebuilt fragments.
+Fragments are shared by all the CSDF graphs, assembled from them, and should not be modified
+"""
+
+
+class CSDFFragments:
+    """
+    Prebuilt CSDF fragments of a DNN
+    Attributes:
+        dnn (DNN): DNN
+        max_phases_per_layer (list): max number of phases of every DNN layer (in the order of the DNN layers)
+        actors_per_layer (list): list, where i-th element is a list [one-phase actor, max-phases actor]
+            of the i-th DNN layer
+        channels_per_edge (list): list, where i-th element is a 2x2 list of channels, that represent i-th
+            DNN connection, where channels_per_edge[i][s][d] is the channel for source layer state s and
+            destination layer state d (0 = one phase, 1 = max phases)
+        self_loops_per_layer (list): list, where i-th element is a list [one-phase self-loop, max-phases self-loop]
+            of the i-th DNN layer, where self-loop is None if data does not overlap in the layer.
+            If self-loops are fused (see dnn_to_csfd_one_to_one()), all the self-loops are None
+    """
+    def __init__(self, dnn: DNN, max_phases_per_layer: {}, fuse_self_loops=True, time_per_layer_phases=None):
+        """
+        Build CSDF fragments of a DNN
+        :param dnn: DNN
+        :param max_phases_per_layer: dictionary where key (str) = name of a DNN layer,
+            value (int) = max number of phases, performed by the layer
+        :param fuse_self_loops: (flag) fuse self-loops (see dnn_to_csfd_one_to_one())
+        :param time_per_layer_phases: function (layer, layer_phases) -> execution time of the layer that
+            performs layer_phases phases. If None, layer.time_eval is used. To share fragments
+            among processes, the function should be defined at the top level of a module
+        """
+        self.dnn = dnn
+        self.fuse_self_loops = fuse_self_loops
+        self.time_per_layer_phases = time_per_layer_phases
+        layers = dnn.get_layers()
+        self.__layer_ids = {layer.name: layer_id for layer_id, layer in enumerate(layers)}
+        self.max_phases_per_layer = [max_phases_per_layer[layer.name] for layer in layers]
+
+        self.actors_per_layer = []
+        self.self_loops_per_layer = []
+        for layer_id, layer in enumerate(layers):
+            actors = [self.__build_actor(layer, phases) for phases in self.__phases_per_state(layer_id)]
+            self.actors_per_layer.append(actors)
+            self_loops = [None, None]
+            if not fuse_self_loops:
+                for state, phases in enumerate(self.__phases_per_state(layer_id)):
+                    self_loop_sequences = compute_self_loop_sequences(layer, phases)
+                    if self_loop_sequences is not None:
+                        prod_seq, cons_seq = self_loop_sequences
+                        self_loops[state] = CSDFFIFOChannel(actors[state], actors[state], prod_seq, cons_seq,
+                                                            layer.id, layer.id)
+            self.self_loops_per_layer.append(self_loops)
+
+        self.__edge_layer_ids = []
+        self.channels_per_edge = []
+        for edge in dnn.get_connections():
+            src_layer_id = self.__layer_ids[edge.src.name]
+            dst_layer_id = self.__layer_ids[edge.dst.name]
+            self.__edge_layer_ids.append((src_layer_id, dst_layer_id))
+            channels = [[None, None], [None, None]]
+            for src_state, src_phases in enumerate(self.__phases_per_state(src_layer_id)):
+                for dst_state, dst_phases in enumerate(self.__phases_per_state(dst_layer_id)):
+                    prod_seq, cons_seq = compute_channel_sequences(dnn, edge, src_phases, dst_phases)
+                    channels[src_state][dst_state] = CSDFFIFOChannel(self.actors_per_layer[src_layer_id][src_state],
+                                                                     self.actors_per_layer[dst_layer_id][dst_state],
+                                                                     prod_seq, cons_seq, edge.src.id, edge.dst.id)
+            self.channels_per_edge.append(channels)
+
+        # min number of tokens, stored in the channel(s) of every DNN connection and in every self-loop,
+        # for every state of the connection source and destination layers (see get_buffers_size_lower_bound())
+        self.__min_tokens_per_edge = [[[_get_max_rate(channel) for channel in channels_per_dst_state]
+                                       for channels_per_dst_state in channels]
+                                      for channels in self.channels_per_edge]
+        self.__min_tokens_per_self_loop = [[0 if self_loop is None else _get_max_rate(self_loop)
+                                            for self_loop in self_loops]
+                                           for self_loops in self.self_loops_per_layer]
+        # DNN connections, which channels are occupied during every firing of every layer actor
+        self.__occupied_edge_ids_per_layer = self.__get_occupied_edge_ids_per_layer()
+
+    def __phases_per_state(self, layer_id):
+        return [1, self.max_phases_per_layer[layer_id]]
+
+    def __build_actor(self, layer, layer_phases):
+        layer_time = layer.time_eval
+        if self.time_per_layer_phases is not None:
+            layer_time = self.time_per_layer_phases(layer, layer_phases)
+        return create_csdf_actor(layer, layer_phases, layer_time)
+
+    def get_layer_states(self, phases_per_layer):
+        """
+        Get states of the DNN layers
+        :param phases_per_layer: dictionary where key (str) = name of a DNN layer, value (int) = number of phases,
+            performed by the layer. If a layer is not in the dictionary, layer.phases is used
+        :return: list with state (0 = one phase, 1 = max phases) of every DNN layer
+            or None, if some of the layers performs neither one phase nor max phases
+        """
+        states = []
+        for layer_id, layer in enumerate(self.dnn.get_layers()):
+            phases = phases_per_layer.get(layer.name, layer.phases)
+            if phases == self.max_phases_per_layer[layer_id]:
+                states.append(1)
+            elif phases == 1:
+                states.append(0)
+            else:
+                return None
+        return states
+
+    def assemble(self, phases_per_layer: {}):
+        """
+        Assemble CSDF graph of the DNN from the fragments
+        :param phases_per_layer: dictionary where key (str) = name of a DNN layer, value (int) = number of phases,
+            performed by the layer. If a layer is not in the dictionary, layer.phases is used
+        :return: CSDF graph, equal to the graph, built by dnn_to_csfd_one_to_one(). If some of the layers
+            performs neither one phase nor max phases, the graph is built by dnn_to_csfd_one_to_one()
+        """
+        states = self.get_layer_states(phases_per_layer)
+        if states is None:
+            return self.__convert(phases_per_layer)
+
+        csdf = CSDFGraph(self.dnn.name)
+        for layer_id, actors in enumerate(self.actors_per_layer):
+            csdf.add_actor(actors[states[layer_id]])
+        for edge_id, (src_layer_id, dst_layer_id) in enumerate(self.__edge_layer_ids):
+            csdf.add_channel(self.channels_per_edge[edge_id][states[src_layer_id]][states[dst_layer_id]])
+        for layer_id, self_loops in enumerate(self.self_loops_per_layer):
+            self_loop = self_loops[states[layer_id]]
+            if self_loop is not None:
+                csdf.add_channel(self_loop)
+        return csdf
+
+    def get_buffers_size_lower_bound(self, states: [int]):
+        """
+        Get a lower bound on the total size (in tokens) of buffers of the CSDF graph, assembled from the fragments,
+        derived from the channel rates without simulation. Every channel stores at least the max number of tokens,
+        produced or consumed by one firing. During every firing of an actor, the channels of the actor, as well as
+        the channels from ancestors to descendants of the actor, are occupied, so that they are stored in different
+        buffers (with any buffers reuse). Thus, the total size of buffers is at least the max (over actors) sum of
+        such numbers over the channels, occupied during the actor firings
+        :param states: list with state (0 = one phase, 1 = max phases) of every DNN layer
+            (see get_layer_states())
+        :return: lower bound on the total size (in tokens) of the CSDF graph buffers
+        """
+        lower_bound = 0
+        for layer_id, edge_ids in enumerate(self.__occupied_edge_ids_per_layer):
+            tokens = self.__min_tokens_per_self_loop[layer_id][states[layer_id]]
+            for edge_id in edge_ids:
+                src_layer_id, dst_layer_id = self.__edge_layer_ids[edge_id]
+                tokens += self.__min_tokens_per_edge[edge_id][states[src_layer_id]][states[dst_layer_id]]
+            lower_bound = max(lower_bound, tokens)
+        return lower_bound
+
+    def __get_occupied_edge_ids_per_layer(self):
+        """
+        Get ids of DNN connections, which channels are occupied during every firing of every layer actor:
+        input and output connections of the layer, and connections from ancestors to descendants of the layer.
+        Ancestors of a layer start before the layer and descendants of a layer finish after the layer
+        """
+        layers_num = len(self.actors_per_layer)
+        in_edge_ids_per_layer = [[] for _ in range(layers_num)]
+        out_edge_ids_per_layer = [[] for _ in range(layers_num)]
+        for edge_id, (src_layer_id, dst_layer_id) in enumerate(self.__edge_layer_ids):
+            out_edge_ids_per_layer[src_layer_id].append(edge_id)
+            in_edge_ids_per_layer[dst_layer_id].append(edge_id)
+
+        # topological order of layers
+        in_degree = [len(in_edge_ids) for in_edge_ids in in_edge_ids_per_layer]
+        topological_order = [layer_id for layer_id in range(layers_num) if in_degree[layer_id] == 0]
+        for layer_id in topological_order:
+            for edge_id in out_edge_ids_per_layer[layer_id]:
+                dst_layer_id = self.__edge_layer_ids[edge_id][1]
+                in_degree[dst_layer_id] -= 1
+                if in_degree[dst_layer_id] == 0:
+                    topological_order.append(dst_layer_id)
+
+        # ancestors and descendants of every layer (bitmasks of layer ids)
+        ancestors = [0 for _ in range(layers_num)]
+        for layer_id in topological_order:
+            for edge_id in in_edge_ids_per_layer[layer_id]:
+                src_layer_id = self.__edge_layer_ids[edge_id][0]
+                ancestors[layer_id] |= ancestors[src_layer_id] | (1 << src_layer_id)
+        descendants = [0 for _ in range(layers_num)]
+        for layer_id in reversed(topological_order):
+            for edge_id in out_edge_ids_per_layer[layer_id]:
+                dst_layer_id = self.__edge_layer_ids[edge_id][1]
+                descendants[layer_id] |= descendants[dst_layer_id] | (1 << dst_layer_id)
+
+        occupied_edge_ids_per_layer = []
+        for layer_id in range(layers_num):
+            occupied_edge_ids = []
+            for edge_id, (src_layer_id, dst_layer_id) in enumerate(self.__edge_layer_ids):
+                if src_layer_id == layer_id or dst_layer_id == layer_id or \
+                        (ancestors[layer_id] >> src_layer_id) & 1 and (descendants[layer_id] >> dst_layer_id) & 1:
+                    occupied_edge_ids.append(edge_id)
+            occupied_edge_ids_per_layer.append(occupied_edge_ids)
+        return occupied_edge_ids_per_layer
+
+    def __convert(self, phases_per_layer: {}):
+        time_per_layer = None
+        if self.time_per_layer_phases is not None:
+            time_per_layer = {}
+            for layer in self.dnn.get_layers():
+                layer_phases = phases_per_layer.get(layer.name, layer.phases)
+                time_per_layer[layer.name] = self.time_per_layer_phases(layer, layer_phases)
+        return dnn_to_csfd_one_to_one(self.dnn, fuse_self_loops=self.fuse_self_loops,
+                                      phases_per_layer=phases_per_layer, time_per_layer=time_per_layer)
+
+
+def _get_max_rate(channel):
+    """ Get max number of tokens, produced or consumed by one firing, in a CSDF channel"""
+    return max(max((rate for rate, count in channel.prod_seq.runs()), default=0),
+               max((rate for rate, count in channel.cons_seq.runs()), default=0))
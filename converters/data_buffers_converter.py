@@ -1,4 +1,4 @@
-from models.data_buffers import DataBuffer, DNNDataBuffer, CSDFGDataBuffer
+from models.data_buffers import DataBuffer, DNNDataBuffer, CSDFGDataBuffer, ArenaDataBuffer
 from models.dnn_model.dnn import DNN
 import traceback
 from util import print_to_stderr
@@ -14,7 +14,9 @@ def csdf_buf_to_generic_buf(csdf_buf: CSDFGDataBuffer) -> DataBuffer:
     :param csdf_buf: CSDF buffer
     :return: DataBuffer, obtained from the CSDF buffer
     """
-    data_buf = DataBuffer(csdf_buf.name, csdf_buf.size)
+    csdf_buf_is_arena = len(csdf_buf.channels) > 0 and len(csdf_buf.channels) == len(csdf_buf.offset_per_channel)
+    data_buf = ArenaDataBuffer(csdf_buf.name, csdf_buf.size) if csdf_buf_is_arena \
+        else DataBuffer(csdf_buf.name, csdf_buf.size)
     csdf_buf_specifies_csdf_models_per_channel = len(csdf_buf.channels) == len(csdf_buf.csdf_model_name_per_channel)
     csdf_channel_id = 0
     for csdf_channel in csdf_buf.channels:
@@ -24,7 +26,10 @@ def csdf_buf_to_generic_buf(csdf_buf: CSDFGDataBuffer) -> DataBuffer:
         if csdf_buf_specifies_csdf_models_per_channel:
             csdf_model_name = csdf_buf.csdf_model_name_per_channel[csdf_channel_id]
         user_desc = (csdf_model_name, src_name, dst_name)
-        data_buf.assign(user_desc)
+        if csdf_buf_is_arena:
+            data_buf.assign_at(user_desc, csdf_buf.offset_per_channel[csdf_channel_id])
+        else:
+            data_buf.assign(user_desc)
         csdf_channel_id += 1
     return data_buf
 
@@ -66,8 +71,10 @@ def generic_csdf_buf_to_generic_dnn_buf(generic_csdf_buffer: DataBuffer, dnns: [
     :param dnns: dnns, that (potentially) use the generic buffer
     """
     error_prefix = "CSDF-to-DNN (generic) buffers conversion error: "
-    generic_dnn_buffer = DataBuffer(generic_csdf_buffer.name, generic_csdf_buffer.size)
-    for csdf_buf_user in generic_csdf_buffer.users:
+    is_arena = isinstance(generic_csdf_buffer, ArenaDataBuffer)
+    generic_dnn_buffer = ArenaDataBuffer(generic_csdf_buffer.name, generic_csdf_buffer.size) if is_arena \
+        else DataBuffer(generic_csdf_buffer.name, generic_csdf_buffer.size)
+    for user_id, csdf_buf_user in enumerate(generic_csdf_buffer.users):
         dnn_name, src_actor_name, dst_actor_name = csdf_buf_user
         dnn = get_dnn_by_name(dnns, dnn_name)
         if dnn is None:
@@ -80,7 +87,10 @@ def generic_csdf_buf_to_generic_dnn_buf(generic_csdf_buffer: DataBuffer, dnns: [
         if dst_layer_name is None:
             raise Exception(error_prefix + "null dst actor name!")
         dnn_buf_user = (dnn_name, src_layer_name, dst_layer_name)
-        generic_dnn_buffer.assign(dnn_buf_user)
+        if is_arena:
+            generic_dnn_buffer.assign_at(dnn_buf_user, generic_csdf_buffer.offset_per_user[user_id])
+        else:
+            generic_dnn_buffer.assign(dnn_buf_user)
     return generic_dnn_buffer
 
 
@@ -1,4 +1,5 @@
 from models.csdf_model.csdf import CSDFGraph, CSDFActor, CSDFFIFOChannel
+from models.csdf_model.rate_seq import RateSeq
 from models.dnn_model.dnn import DNN, layer_has_null_or_empty_pads
 
 """
@@ -6,127 +7,38 @@ CNN-to-CSDF conversion
 """
 
 
-def dnn_to_csfd_one_to_one(dnn: DNN, fuse_self_loops=True):
+def dnn_to_csfd_one_to_one(dnn: DNN, fuse_self_loops=True, phases_per_layer=None, time_per_layer=None):
     """
-    One-to-one DNN-to-CSDF conversion
+    One-to-one DNN-to-CSDF conversion. The conversion does not modify the DNN
     :param dnn: dnn
     :param fuse_self_loops: (flag) if True, every self-loop channel which stores reused data in CSDFG
     with respective  "main" data source channel which produces the overlapping data
-    :return: CSDF model, functionally equivalent to the DNN model
+    :param phases_per_layer: dictionary where key (str) = name of a DNN layer, value (int) = number of phases,
+        performed by the layer. If None, or if a layer is not in the dictionary, layer.phases is used
+    :param time_per_layer: dictionary where key (str) = name of a DNN layer, value = execution time
+        of the layer. If None, or if a layer is not in the dictionary, layer.time_eval is used
+    :return: CSDF model, functionally equivalent to the DNN model. Rate sequences, execution sequences
+        and execution times of the CSDF model are run-length-encoded (see RateSeq)
     """
+    def __phases(layer):
+        if phases_per_layer is not None and layer.name in phases_per_layer:
+            return phases_per_layer[layer.name]
+        return layer.phases
+
+    def __time(layer):
+        if time_per_layer is not None and layer.name in time_per_layer:
+            return time_per_layer[layer.name]
+        return layer.time_eval
+
     def __create_actors():
-        actors = []
         for layer in dnn.get_layers():
-            actor = __create_actor(layer)
+            actor = create_csdf_actor(layer, __phases(layer), __time(layer))
             csdf.add_actor(actor)
-        return actors
-
-    def __create_actor(layer):
-        actor_id = layer.id
-        exec_seq = [layer.subop for i in range(layer.phases)]
-        actor = CSDFActor("a" + str(actor_id), exec_seq)
-        actor.time_per_phase = [layer.time_eval/max(float(layer.phases), 1.0) for phase in range(layer.phases)]
-        return actor
 
     def __create_data_transfer_channels():
         for edge in dnn.get_connections():
-            src_id = edge.src.id
-            dst_id = edge.dst.id
-            # no communication happens between any op-> built-in op
-            if edge.dst.built_in:
-                prod_seq = [0 for phase in range(edge.src.phases)]
-                cons_seq = [0 for phase in range(edge.dst.phases)]
-            else:
-                prod_seq = __compute_production_sequence(edge)
-                cons_seq = __compute_consumption_sequence(edge)
-
-            if edge.dst.subop == "mul":
-                to_consume = sum(cons_seq)
-                to_produce = sum(prod_seq)
-                if to_consume != to_produce:
-                    # broadcast
-                    # print("BROADCAST", "to prod:", to_produce, "to", to_consume)
-                    # print("SRC PHASES: ", edge.src, "DST:", edge.dst)
-                    # print("SRC PHASES: ", edge.src.phases, "DST PHASES:", edge.dst.phases)
-                    cons_seq = [to_produce]
-                    for i in range(1, edge.dst.phases):
-                        cons_seq.append(0)
-
-            csdf.connect_actors_by_ids(src_id, dst_id, prod_seq, cons_seq)
-
-    def __compute_production_sequence(edge):
-        prod_seq = []
-        src_layer = edge.src
-        phase_oh = src_layer.oh
-        if src_layer.phases > 1:
-            phase_oh = 1 # max(layer.oh/layer.phases, 1)
-        for phase in range(src_layer.phases):
-            phase_rate = int(src_layer.ow * phase_oh * src_layer.ofm)
-            prod_seq.append(phase_rate)
-        return prod_seq
-
-    def __compute_consumption_sequence(edge):
-        dst_layer = edge.dst
-        # process multi-input_examples
-        layer_inputs = dnn.get_layer_input_connections(dst_layer)
-        if len(layer_inputs) > 1:
-            cons_seq = __compute_multi_input_cons_seq(edge)
-            return cons_seq
-
-        # process single-input_examples
-        cons_seq = []
-        total_lines = dst_layer.ih
-        lines_consumed = 0
-        for phase_id in range(dst_layer.phases):
-            phase_ih = dst_layer.ih
-            if dst_layer.phases > 1:
-                phase_ih = dst_layer.fs
-                if __layer_reuses_inp_data(dst_layer) and phase_id > 0: # 0 < phase_id < (layer.phases-1)
-                    phase_ih = dst_layer.stride
-                # TODO: take into account
-                """
-                # pads < 0
-                if layer_has_null_or_empty_pads(layer) and layer.stride < layer.fs and layer.oh < layer.ih:
-                    h_crop = (layer.ih-1)*layer.stride - layer.ih + layer.fs
-                    if phase_id == 0:
-                        phase_ih += int(h_crop/2)
-                    if phase_id == layer.phases-1:
-                        phase_ih -= int(h_crop/2)
-                
-                # pads > 0
-                if not layer_has_null_or_empty_pads(layer):
-                    h_extension = layer.pads[1] + layer.pads[3]
-                    if phase_id == 0:
-                        phase_ih -= layer.pads[1]
-                    if phase_id == layer.phases-1:
-                        phase_ih -= layer.pads[3]
-                """
-            # adjust phases in case of padding etc. (over-consumption)
-            if (lines_consumed + phase_ih) > total_lines:
-                phase_ih = max(total_lines - lines_consumed, 0)
-
-            # last phase
-            # adjust phases in case of padding etc. (under-consumption)
-            if phase_id == dst_layer.phases - 1:
-                if (lines_consumed + phase_ih) < total_lines:
-                    phase_ih = max(total_lines - lines_consumed, 0)
-
-            lines_consumed += phase_ih
-            phase_rate = int(dst_layer.iw * phase_ih * dst_layer.ifm)
-            cons_seq.append(phase_rate)
-        return cons_seq
-
-    def __compute_multi_input_cons_seq(edge):
-        cons_seq = []
-        src_layer = edge.src
-        dst_layer = edge.dst
-
-        for phase_id in range(dst_layer.phases):
-            phase_ih = max(int(src_layer.oh/dst_layer.phases), 1)
-            phase_rate = int(src_layer.ow * phase_ih * src_layer.ofm)
-            cons_seq.append(phase_rate)
-
-        return cons_seq
+            prod_seq, cons_seq = compute_channel_sequences(dnn, edge, __phases(edge.src), __phases(edge.dst))
+            csdf.connect_actors_by_ids(edge.src.id, edge.dst.id, prod_seq, cons_seq)
 
     def __create_self_loops(fused_self_loops: bool):
         """
@@ -134,11 +46,11 @@ def dnn_to_csfd_one_to_one(dnn: DNN, fuse_self_loops=True):
         subsequent exec. steps
         """
         for layer in dnn.get_layers():
+            self_loop_sequences = compute_self_loop_sequences(layer, __phases(layer))
             # data overlaps in layer
-            if __layer_reuses_inp_data(layer):
+            if self_loop_sequences is not None:
                 actor_id = layer.id
-                prod_seq = __self_loop_prod_seq(layer)
-                cons_seq = __self_loop_cons_seq(layer)
+                prod_seq, cons_seq = self_loop_sequences
 
                 # create self-loop as a separate channel
                 if not fused_self_loops:
@@ -183,36 +95,6 @@ def dnn_to_csfd_one_to_one(dnn: DNN, fuse_self_loops=True):
         # update main data source production rate
         # update main data source consumption rate
 
-    def __layer_reuses_inp_data(layer):
-        if layer.op not in ["conv", "pool"]:
-            return False
-        if layer.phases == 1:
-            return False
-        if layer.stride >= layer.fs:
-            return False
-        return True
-
-    def __self_loop_prod_seq(layer):
-        prod_seq = []
-        for phase in range(layer.phases-1):
-            reuse_h = layer.fs - layer.stride
-            reuse_rate = int(layer.iw * reuse_h * layer.ifm)
-            prod_seq.append(reuse_rate)
-        # reuse is not needed at the last phase
-        # thus, rate at the last phase is 0
-        prod_seq.append(0)
-        return prod_seq
-
-    def __self_loop_cons_seq(layer):
-        # nothing to reuse at the first phase
-        # thus, rate at the first phase is 0
-        cons_seq = [0]
-        for phase in range(layer.phases-1):
-            reuse_h = layer.fs - layer.stride
-            reuse_rate = int(layer.iw * reuse_h * layer.ifm)
-            cons_seq.append(reuse_rate)
-        return cons_seq
-
     # main script
     csdf = CSDFGraph(dnn.name)
     __create_actors()
@@ -222,6 +104,168 @@ def dnn_to_csfd_one_to_one(dnn: DNN, fuse_self_loops=True):
     return csdf
 
 
+def create_csdf_actor(layer, layer_phases: int, layer_time):
+    """
+    Create CSDF actor of a DNN layer
+    :param layer: DNN layer
+    :param layer_phases: number of phases, performed by the layer
+    :param layer_time: execution time of the layer
+    :return: CSDF actor
+    """
+    exec_seq = RateSeq.from_runs([(layer.subop, layer_phases)])
+    actor = CSDFActor("a" + str(layer.id), exec_seq)
+    actor.time_per_phase = RateSeq.from_runs([(layer_time/max(float(layer_phases), 1.0), layer_phases)])
+    return actor
+
+
+def compute_channel_sequences(dnn: DNN, edge, src_phases: int, dst_phases: int):
+    """
+    Compute production and consumption sequences of CSDF channel, that represents a DNN connection (edge)
+    :param dnn: DNN
+    :param edge: DNN connection
+    :param src_phases: number of phases, performed by the source layer of the connection
+    :param dst_phases: number of phases, performed by the destination layer of the connection
+    :return: tuple (prod_seq, cons_seq) of run-length-encoded production and consumption sequences
+    """
+    # no communication happens between any op-> built-in op
+    if edge.dst.built_in:
+        prod_seq = RateSeq.from_runs([(0, src_phases)])
+        cons_seq = RateSeq.from_runs([(0, dst_phases)])
+    else:
+        prod_seq = _compute_production_sequence(edge, src_phases)
+        cons_seq = _compute_consumption_sequence(dnn, edge, dst_phases)
+
+    if edge.dst.subop == "mul":
+        to_consume = cons_seq.total()
+        to_produce = prod_seq.total()
+        if to_consume != to_produce:
+            # broadcast
+            # print("BROADCAST", "to prod:", to_produce, "to", to_consume)
+            # print("SRC PHASES: ", edge.src, "DST:", edge.dst)
+            # print("SRC PHASES: ", edge.src.phases, "DST PHASES:", edge.dst.phases)
+            cons_seq = RateSeq.from_runs([(to_produce, 1), (0, dst_phases - 1)])
+    return prod_seq, cons_seq
+
+
+def compute_self_loop_sequences(layer, layer_phases: int):
+    """
+    Compute production and consumption sequences of the self-loop channel, that stores data,
+    overlapping between subsequent phases of a DNN layer
+    :param layer: DNN layer
+    :param layer_phases: number of phases, performed by the layer
+    :return: tuple (prod_seq, cons_seq) of run-length-encoded production and consumption sequences
+        if data overlaps in the layer and None otherwise
+    """
+    if not _layer_reuses_inp_data(layer, layer_phases):
+        return None
+    reuse_h = layer.fs - layer.stride
+    reuse_rate = int(layer.iw * reuse_h * layer.ifm)
+    # reuse is not needed at the last phase
+    # thus, rate at the last phase is 0
+    prod_seq = RateSeq.from_runs([(reuse_rate, layer_phases-1), (0, 1)])
+    # nothing to reuse at the first phase
+    # thus, rate at the first phase is 0
+    cons_seq = RateSeq.from_runs([(0, 1), (reuse_rate, layer_phases-1)])
+    return prod_seq, cons_seq
+
+
+def _compute_production_sequence(edge, src_phases: int):
+    src_layer = edge.src
+    phase_oh = src_layer.oh
+    if src_phases > 1:
+        phase_oh = 1 # max(layer.oh/layer.phases, 1)
+    phase_rate = int(src_layer.ow * phase_oh * src_layer.ofm)
+    return RateSeq.from_runs([(phase_rate, src_phases)])
+
+
+def _compute_consumption_sequence(dnn: DNN, edge, dst_phases: int):
+    dst_layer = edge.dst
+    # process multi-input_examples
+    layer_inputs = dnn.get_layer_input_connections(dst_layer)
+    if len(layer_inputs) > 1:
+        cons_seq = _compute_multi_input_cons_seq(edge, dst_phases)
+        return cons_seq
+
+    # process single-input_examples
+    # consumption sequence is computed per run of phases with equal number of consumed lines
+    total_lines = dst_layer.ih
+    phases = dst_phases
+    if phases == 0:
+        return RateSeq()
+    lines_runs = []
+    first_phase_ih = dst_layer.ih
+    if phases > 1:
+        first_phase_ih = dst_layer.fs
+    # adjust phases in case of padding etc. (over-consumption)
+    first_phase_ih = min(first_phase_ih, total_lines)
+    lines_runs.append((first_phase_ih, 1))
+    lines_consumed = first_phase_ih
+
+    if phases > 1:
+        phase_ih = dst_layer.stride if _layer_reuses_inp_data(dst_layer, dst_phases) else dst_layer.fs
+        # TODO: take into account
+        """
+        # pads < 0
+        if layer_has_null_or_empty_pads(layer) and layer.stride < layer.fs and layer.oh < layer.ih:
+            h_crop = (layer.ih-1)*layer.stride - layer.ih + layer.fs
+            if phase_id == 0:
+                phase_ih += int(h_crop/2)
+            if phase_id == layer.phases-1:
+                phase_ih -= int(h_crop/2)
+
+        # pads > 0
+        if not layer_has_null_or_empty_pads(layer):
+            h_extension = layer.pads[1] + layer.pads[3]
+            if phase_id == 0:
+                phase_ih -= layer.pads[1]
+            if phase_id == layer.phases-1:
+                phase_ih -= layer.pads[3]
+        """
+        phases_left = phases - 1
+        # phases that consume phase_ih lines
+        full_phases = phases_left
+        if phase_ih > 0:
+            full_phases = min(int((total_lines - lines_consumed) // phase_ih), phases_left)
+        lines_runs.append((phase_ih, full_phases))
+        lines_consumed += phase_ih * full_phases
+        phases_left -= full_phases
+        # adjust phases in case of padding etc. (over-consumption)
+        if phases_left > 0:
+            lines_runs.append((total_lines - lines_consumed, 1))
+            lines_runs.append((0, phases_left - 1))
+            lines_consumed = total_lines
+
+    # last phase
+    # adjust phases in case of padding etc. (under-consumption)
+    if lines_consumed < total_lines:
+        last_phase_ih, count = lines_runs.pop()
+        if count > 1:
+            lines_runs.append((last_phase_ih, count - 1))
+        lines_runs.append((last_phase_ih + total_lines - lines_consumed, 1))
+
+    return RateSeq.from_runs([(int(dst_layer.iw * phase_ih * dst_layer.ifm), count)
+                              for phase_ih, count in lines_runs])
+
+
+def _compute_multi_input_cons_seq(edge, dst_phases: int):
+    src_layer = edge.src
+    if dst_phases == 0:
+        return RateSeq()
+    phase_ih = max(int(src_layer.oh/dst_phases), 1)
+    phase_rate = int(src_layer.ow * phase_ih * src_layer.ofm)
+    return RateSeq.from_runs([(phase_rate, dst_phases)])
+
+
+def _layer_reuses_inp_data(layer, layer_phases: int):
+    if layer.op not in ["conv", "pool"]:
+        return False
+    if layer_phases == 1:
+        return False
+    if layer.stride >= layer.fs:
+        return False
+    return True
+
+
 class CSDFCreationError(Exception):
     """ CSDF creation error"""
 
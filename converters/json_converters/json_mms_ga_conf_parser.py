@@ -19,5 +19,7 @@ def parse_mms_ga_conf(path):
             conf_as_dict["dp_by_parts_init_probability"] = extract_or_default(conf, "dp_by_parts_init_probability", 0.5)
             conf_as_dict["data_token_size"] = extract_or_default(conf, "data_token_size", 4)
             conf_as_dict["verbose"] = extract_or_default(conf, "verbose", True)
+            conf_as_dict["memory_planner"] = extract_or_default(conf, "memory_planner", "buffers")
+            conf_as_dict["prune_dominated"] = extract_or_default(conf, "prune_dominated", False)
             return conf_as_dict
 
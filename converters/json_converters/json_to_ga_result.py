@@ -19,8 +19,7 @@ def parse_json_ga_result(path):
         # init chromosome
         chromosome = MMSChromosome(layers_num)
         chromosome.dp_by_parts = dp_by_parts
-        chromosome.time_loss = time_loss
-        chromosome.buf_size = buf_size
+        chromosome.set_fitness(buf_size, time_loss)
         # add chromosome to the list
         chromosomes.append(chromosome)
     return chromosomes
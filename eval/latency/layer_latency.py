@@ -0,0 +1,44 @@
+import copy
+from eval.latency.flops_based.layer_perf_estimator import eval_layer_latency_ms
+
+"""
+Latency of a DNN layer, processing data by parts (performing a given number of phases), estimated with one of
+the layer latency estimators:
+ - "time_eval": execution time, specified in the DNN model (layer.time_eval);
+ - "flops": FLOPs-based estimation (see flops_based/layer_perf_estimator.py), parameters: gops_per_sec;
+ - "aloha": ALOHA estimation (see aloha/layer_perf_estimator_phases.py), parameters: platform, processor;
+ - "lut": lookup-tables (see lut/layer_perf_estimator.py), parameters: lut.
+To obtain a latency function (layer, layer_phases) -> latency in ms, bind the estimator and
+its parameters with functools.partial, e.g. partial(eval_layer_phases_latency_ms, latency_model="flops",
+gops_per_sec=100)
+"""
+LATENCY_MODELS = ["time_eval", "flops", "aloha", "lut"]
+
+
+def eval_layer_phases_latency_ms(layer, layer_phases: int, latency_model="time_eval",
+                                 gops_per_sec=None, platform=None, processor=None, lut=None):
+    """
+    Eval latency in milliseconds (ms) of a DNN layer, processing data by parts. The layer is not modified
+    :param layer: DNN layer
+    :param layer_phases: number of phases, performed by the layer
+    :param latency_model: layer latency estimator (see LATENCY_MODELS)
+    :param gops_per_sec: performance of the processor in GOPs/second ("flops" latency model)
+    :param platform: ALOHA platform model ("aloha" latency model)
+    :param processor: processor of ALOHA platform model ("aloha" latency model)
+    :param lut: lookup table, built from measurements, performed on the platform ("lut" latency model)
+    :return: latency in milliseconds (ms) of all the phases of the layer
+    """
+    if latency_model == "time_eval":
+        return layer.time_eval
+    if latency_model == "flops":
+        return eval_layer_latency_ms(layer, gops_per_sec)
+    if latency_model == "aloha":
+        # ALOHA estimator of data processing by parts reads phases from the layer
+        from eval.latency.aloha.layer_perf_estimator_phases import eval_layer_perf_ms_phases
+        layer_with_phases = copy.copy(layer)
+        layer_with_phases.phases = max(layer_phases, 1)
+        return eval_layer_perf_ms_phases(layer_with_phases, platform, processor)
+    if latency_model == "lut":
+        from eval.latency.lut.layer_perf_estimator import estim_layer_lut
+        return estim_layer_lut(layer, lut)
+    raise Exception("Unknown layer latency model: " + str(latency_model) + ". Select from " + str(LATENCY_MODELS))
@@ -40,6 +40,7 @@ def main():
     from converters.json_converters.json_app_config_parser import parse_app_conf, parse_json_dnns, \
         parse_json_mappings
     from converters.json_converters.mms_final_app_to_json import mms_app_to_json
+    from converters.json_converters.json_mms_ga_conf_parser import parse_mms_ga_conf
     from fileworkers.json_fw import read_json
 
     try:
@@ -69,7 +70,12 @@ def main():
         print_stage(stage, verbose)
         dnn_mappings = parse_json_mappings(conf["json_mapping_paths"])
 
-        final_app_model = build_final_app(conf["app_name"], dnns, dnn_mappings, dp_encoding, verbose)
+        stage = "GA config parsing"
+        print_stage(stage, verbose)
+        ga_conf = parse_mms_ga_conf(conf["json_ga_conf_path"])
+
+        final_app_model = build_final_app(conf["app_name"], dnns, dnn_mappings, dp_encoding, verbose,
+                                          memory_planner=ga_conf["memory_planner"])
         # app_model.print_details()
 
         stage = "Saving final app model in JSON file (" + output_file_path + ")"
@@ -0,0 +1,120 @@
+from array import array
+from models.csdf_model.csdf import CSDFGraph
+from models.csdf_model.rate_seq import as_rate_seq
+
+"""
+Compiled (indexed) form of a CSDF graph, used by the simulation and the buffers building.
+In the compiled graph, actors, channels and buffers are referred to by integer ids
+(indexes in the respective lists of the original CSDF graph and buffers), the input/output
+channels of every actor are stored in CSR-style adjacency arrays, and the (run-length-encoded) rate sequences
+are expanded into arrays, so that the rate of every phase is accessed in constant time
+"""
+
+
+class CompiledCSDFGraph:
+    """
+    Compiled CSDF graph
+    Attributes:
+        name (str): name of the CSDF graph
+        actors_num (int), channels_num (int), buffers_num (int): number of actors, channels and buffers
+        actor_names ([str]): name of every actor
+        actor_phases (array): number of phases of every actor
+        time_per_phase ([array]): execution time of every phase of every actor
+        channel_src, channel_dst (array): ids of source and destination actors of every channel
+        prod_seqs, cons_seqs ([array]): production and consumption sequences of every channel
+        in_offsets, in_channels (array): input channels of actors (CSR): ids of input channels of actor
+            with id = a are stored in in_channels[in_offsets[a]:in_offsets[a+1]], in the order of the graph channels
+        out_offsets, out_channels (array): output channels of actors (CSR), stored as the input channels
+        buf_names ([str]): name of every buffer
+        channel_buf (array): id of the buffer, that stores data of every channel (-1 if channel has no buffer)
+    """
+    def __init__(self, csdfg: CSDFGraph, csdfg_buffers=None):
+        """
+        Compile CSDF graph
+        :param csdfg: CSDF graph
+        :param csdfg_buffers: (optional) list of CSDF graph buffers, used to store
+            data, exchanged though the CSDF graph channels. Every channel is stored in the first
+            buffer, which name is the name of the first buffer that has the channel
+        """
+        self.name = csdfg.name
+        actors = csdfg.get_actors()
+        channels = csdfg.get_channels()
+        self.actors_num = len(actors)
+        self.channels_num = len(channels)
+
+        # actors
+        self.actor_names = [actor.name for actor in actors]
+        self.actor_phases = array('i', [actor.phases for actor in actors])
+        self.time_per_phase = [as_rate_seq(actor.time_per_phase).to_array('d') for actor in actors]
+
+        # channels
+        self.channel_src = array('i', [csdfg.get_actor_id(channel.src) for channel in channels])
+        self.channel_dst = array('i', [csdfg.get_actor_id(channel.dst) for channel in channels])
+        self.prod_seqs = [channel.prod_seq.to_array('q') for channel in channels]
+        self.cons_seqs = [channel.cons_seq.to_array('q') for channel in channels]
+
+        # adjacency
+        self.in_offsets, self.in_channels = _build_csr(self.channel_dst, self.actors_num)
+        self.out_offsets, self.out_channels = _build_csr(self.channel_src, self.actors_num)
+
+        # buffers
+        self.buf_names = []
+        self.channel_buf = array('i', [-1 for _ in range(self.channels_num)])
+        if csdfg_buffers is not None:
+            self.buf_names = [csdfg_buf.name for csdfg_buf in csdfg_buffers]
+            channel_ids = {channel: channel_id for channel_id, channel in enumerate(channels)}
+            # id of the first buffer with the name
+            buf_id_per_name = {}
+            for buf_id in range(len(csdfg_buffers)):
+                if self.buf_names[buf_id] not in buf_id_per_name:
+                    buf_id_per_name[self.buf_names[buf_id]] = buf_id
+            for csdfg_buf in csdfg_buffers:
+                for channel in csdfg_buf.channels:
+                    channel_id = channel_ids.get(channel, -1)
+                    if channel_id != -1 and self.channel_buf[channel_id] == -1:
+                        self.channel_buf[channel_id] = buf_id_per_name[csdfg_buf.name]
+        self.buffers_num = len(self.buf_names)
+
+    def get_input_channel_ids(self, actor_id):
+        return self.in_channels[self.in_offsets[actor_id]:self.in_offsets[actor_id + 1]]
+
+    def get_output_channel_ids(self, actor_id):
+        return self.out_channels[self.out_offsets[actor_id]:self.out_offsets[actor_id + 1]]
+
+    def get_buffer_consumers(self):
+        """
+        Get consumers of every buffer
+        :return: list, where i-th element is a sorted list of ids of actors, that read data from buffer with id = i
+        """
+        consumers_per_buf = [set() for _ in range(self.buffers_num)]
+        for channel_id in range(self.channels_num):
+            buf_id = self.channel_buf[channel_id]
+            if buf_id != -1:
+                consumers_per_buf[buf_id].add(self.channel_dst[channel_id])
+        return [sorted(consumers) for consumers in consumers_per_buf]
+
+    def __str__(self):
+        return "{name: " + self.name + ", actors: " + str(self.actors_num) + \
+               ", FIFO channels: " + str(self.channels_num) + ", buffers: " + str(self.buffers_num) + "}"
+
+
+def _build_csr(actor_per_channel: array, actors_num: int):
+    """
+    Build CSR-style adjacency of actors and channels
+    :param actor_per_channel: id of the actor (source or destination), associated with every channel
+    :param actors_num: number of actors
+    :return: tuple (offsets, channel ids), where ids of channels, associated with actor with id = a,
+        are stored in channel_ids[offsets[a]:offsets[a+1]], in increasing order
+    """
+    offsets = array('i', [0 for _ in range(actors_num + 1)])
+    for actor_id in actor_per_channel:
+        offsets[actor_id + 1] += 1
+    for actor_id in range(actors_num):
+        offsets[actor_id + 1] += offsets[actor_id]
+    channel_ids = array('i', [0 for _ in range(len(actor_per_channel))])
+    next_position = array('i', offsets[:actors_num])
+    for channel_id in range(len(actor_per_channel)):
+        actor_id = actor_per_channel[channel_id]
+        channel_ids[next_position[actor_id]] = channel_id
+        next_position[actor_id] += 1
+    return offsets, channel_ids
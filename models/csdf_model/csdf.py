@@ -1,31 +1,47 @@
+from models.csdf_model.rate_seq import RateSeq, as_rate_seq
+
+
 class CSDFGraph:
     def __init__(self, name):
         self.name = name
         self.__channels = []
         self.__actors = []
+        # dictionary, where key = actor, value = actor id (index of the actor in the graph actors)
+        self.__actor_ids = {}
+        # input/output channels of every actor, where i-th list corresponds to the actor with id = i
+        self.__input_channels_per_actor = []
+        self.__output_channels_per_actor = []
 
     def add_actor(self, actor):
+        self.__actor_ids[actor] = len(self.__actors)
         self.__actors.append(actor)
+        self.__input_channels_per_actor.append([])
+        self.__output_channels_per_actor.append([])
 
     def connect_actors_by_ids(self, src_id, dst_id, prod_seq, cons_seq):
         src_actor = self.__actors[src_id]
         dst_actor = self.__actors[dst_id]
-        channel = CSDFFIFOChannel(src_actor, dst_actor, prod_seq, cons_seq)
+        channel = CSDFFIFOChannel(src_actor, dst_actor, prod_seq, cons_seq, src_id, dst_id)
+        self.__channels.append(channel)
+        self.__output_channels_per_actor[src_id].append(channel)
+        self.__input_channels_per_actor[dst_id].append(channel)
+
+    def add_channel(self, channel):
+        """ Add (prebuilt) FIFO channel, that connects actors of the graph"""
+        src_id = self.__actor_ids[channel.src]
+        dst_id = self.__actor_ids[channel.dst]
         self.__channels.append(channel)
+        self.__output_channels_per_actor[src_id].append(channel)
+        self.__input_channels_per_actor[dst_id].append(channel)
+
+    def get_actor_id(self, actor):
+        return self.__actor_ids[actor]
 
     def get_input_channels(self, actor):
-        channels = []
-        for channel in self.__channels:
-            if channel.dst == actor:
-                channels.append(channel)
-        return channels
+        return list(self.__input_channels_per_actor[self.__actor_ids[actor]])
 
     def get_output_channels(self, actor):
-        channels = []
-        for channel in self.__channels:
-            if channel.src == actor:
-                channels.append(channel)
-        return channels
+        return list(self.__output_channels_per_actor[self.__actor_ids[actor]])
 
     def get_actors(self):
         return self.__actors
@@ -50,11 +66,14 @@ class CSDFGraph:
 
 
 class CSDFFIFOChannel:
-    def __init__(self, src, dst, prod_seq, cons_seq):
+    def __init__(self, src, dst, prod_seq, cons_seq, src_id=-1, dst_id=-1):
         self.src = src
         self.dst = dst
-        self.prod_seq = prod_seq
-        self.cons_seq = cons_seq
+        self.prod_seq = as_rate_seq(prod_seq)
+        self.cons_seq = as_rate_seq(cons_seq)
+        # ids of source and destination actors in the CSDF graph (-1 if unknown)
+        self.src_id = src_id
+        self.dst_id = dst_id
 
     def __str__(self):
         return "{src: " + str(self.src.name) + \
@@ -67,9 +86,9 @@ class CSDFFIFOChannel:
 class CSDFActor:
     def __init__(self, name, exec_seq):
         self.name = name
-        self.exec_seq = exec_seq
-        self.phases = len(exec_seq)
-        self.time_per_phase = [0 for _ in range(self.phases)]
+        self.exec_seq = as_rate_seq(exec_seq)
+        self.phases = len(self.exec_seq)
+        self.time_per_phase = RateSeq.from_runs([(0, self.phases)])
 
     def __str__(self):
         return "{name: " + self.name +\
@@ -84,20 +103,8 @@ def exec_seq_to_short_str(exec_seq:[]):
         return "[]"
 
     short_str = "["
-
-    prev_func = exec_seq[0]
-    func_repeated = 0
-    for func in exec_seq:
-        if func == prev_func:
-            func_repeated += 1
-        else:
-            short_str += str(func_repeated) + "*" + prev_func + ";"
-            func_repeated = 1
-        prev_func = func
-
-    if func_repeated > 0:
-        short_str += str(func_repeated) + "*" + prev_func + ";"
-
+    for func, func_repeated in as_rate_seq(exec_seq).runs():
+        short_str += str(func_repeated) + "*" + func + ";"
     short_str += "]"
     return short_str
 
@@ -107,20 +114,8 @@ def rate_seq_to_short_str(rate_seq:[]):
         return "[]"
 
     short_str = "["
-
-    prev_rate = rate_seq[0]
-    rate_repeated = 0
-    for rate in rate_seq:
-        if rate == prev_rate:
-            rate_repeated += 1
-        else:
-            short_str += str(rate_repeated) + "*" + str(prev_rate) + ";"
-            rate_repeated = 1
-        prev_rate = rate
-
-    if rate_repeated > 0:
-        short_str += str(rate_repeated) + "*" + str(prev_rate) + ";"
-
+    for rate, rate_repeated in as_rate_seq(rate_seq).runs():
+        short_str += str(rate_repeated) + "*" + str(rate) + ";"
     short_str += "]"
     return short_str
 
@@ -132,10 +127,10 @@ def check_csdfg_consistency(csdfg: CSDFGraph, verbose=True):
     :return: True if csdfg is consistent and False otherwise
     """
     for channel in csdfg.get_channels():
-        if sum(channel.prod_seq) != sum(channel.cons_seq):
+        if channel.prod_seq.total() != channel.cons_seq.total():
             if verbose:
                 print("CSDF graph", csdfg.name, "is inconsistent: FIFO channel", channel, "prod rate",
-                      sum(channel.prod_seq), "!= cons rate", sum(channel.cons_seq))
+                      channel.prod_seq.total(), "!= cons rate", channel.cons_seq.total())
             return False
     return True
 
@@ -0,0 +1,121 @@
+from array import array
+from bisect import bisect_right
+
+"""
+Run-length-encoded sequences, used to represent CSDF rate sequences (production/consumption rates,
+execution sequences and execution times of actors phases). In CSDF models of DNNs, the sequences
+are long (one element per phase), but consist of a few runs of equal elements
+"""
+
+
+class RateSeq:
+    """
+    Run-length-encoded sequence
+    Attributes:
+        values (list): value of every run
+        ends (list): (exclusive) end of every run, i.e., i-th run occupies
+            elements [ends[i-1], ends[i]) of the sequence, where ends[-1] = 0
+    """
+    __slots__ = ("values", "ends", "__total")
+
+    def __init__(self, seq=None):
+        """
+        Create run-length-encoded sequence
+        :param seq: (optional) sequence (e.g. list) to encode
+        """
+        self.values = []
+        self.ends = []
+        self.__total = None
+        if seq is not None:
+            for value in seq:
+                self.append(value)
+
+    @staticmethod
+    def from_runs(runs):
+        """
+        Create run-length-encoded sequence from runs
+        :param runs: list of tuples (value, count), where value is repeated count times
+        :return: run-length-encoded sequence
+        """
+        seq = RateSeq()
+        for value, count in runs:
+            seq.append(value, count)
+        return seq
+
+    def append(self, value, count=1):
+        """
+        Append value, repeated count times, to the end of the sequence
+        """
+        if count <= 0:
+            return
+        end = self.ends[-1] if self.ends else 0
+        if self.values and self.values[-1] == value:
+            self.ends[-1] = end + count
+        else:
+            self.values.append(value)
+            self.ends.append(end + count)
+        self.__total = None
+
+    def runs(self):
+        """ Iterate over runs of the sequence: tuples (value, count)"""
+        start = 0
+        for value, end in zip(self.values, self.ends):
+            yield value, end - start
+            start = end
+
+    def total(self):
+        """ Sum of the sequence elements (for numeric sequences)"""
+        if self.__total is None:
+            self.__total = sum(value * count for value, count in self.runs())
+        return self.__total
+
+    def to_array(self, typecode):
+        """
+        Expand the sequence into an array
+        :param typecode: type code of the array (see array module)
+        :return: array with all elements of the sequence
+        """
+        expanded = array(typecode)
+        for value, count in self.runs():
+            expanded.extend(array(typecode, [value]) * count)
+        return expanded
+
+    def __len__(self):
+        return self.ends[-1] if self.ends else 0
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        length = len(self)
+        if index < 0:
+            index += length
+        if index < 0 or index >= length:
+            raise IndexError("RateSeq index out of range")
+        return self.values[bisect_right(self.ends, index)]
+
+    def __iter__(self):
+        for value, count in self.runs():
+            for _ in range(count):
+                yield value
+
+    def __eq__(self, other):
+        if isinstance(other, RateSeq):
+            return self.values == other.values and self.ends == other.ends
+        try:
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        except TypeError:
+            return False
+
+    def __repr__(self):
+        return "RateSeq(" + str([(value, count) for value, count in self.runs()]) + ")"
+
+
+def as_rate_seq(seq):
+    """
+    Get run-length-encoded form of a sequence
+    :param seq: sequence (RateSeq or any other sequence, e.g., list)
+    :return: seq if seq is a RateSeq, otherwise RateSeq, that encodes seq
+    """
+    if isinstance(seq, RateSeq):
+        return seq
+    return RateSeq(seq)
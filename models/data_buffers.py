@@ -28,6 +28,29 @@ class DataBuffer:
                 print(" ", user)
 
 
+class ArenaDataBuffer(DataBuffer):
+    """
+    Buffer (memory arena), where every user is stored at its own offset
+    Attributes:
+        offset_per_user: offset (in tokens) of every user in the buffer
+    """
+    def __init__(self, name, size):
+        super(ArenaDataBuffer, self).__init__(name, size)
+        self.type = "arena"
+        self.offset_per_user = []
+
+    def assign_at(self, user, offset):
+        self.assign(user)
+        self.offset_per_user.append(offset)
+
+    def print_details(self, print_users=True):
+        print(self)
+        if print_users:
+            print("users: ")
+            for user, offset in zip(self.users, self.offset_per_user):
+                print(" ", user, "at offset", offset)
+
+
 class CSDFGDataBuffer(DataBuffer):
     """ Buffer, that stores data of an application, represented as CSDF Graph"""
     def __init__(self, name, size):
@@ -36,6 +59,9 @@ class CSDFGDataBuffer(DataBuffer):
         self.channels = []
         # for FIFO channels reused among multiple CSDF models
         self.csdf_model_name_per_channel = []
+        # for buffers, planned as memory arenas (see DSE/low_memory/arena_planning.py):
+        # offset (in tokens) of every FIFO channel in the buffer
+        self.offset_per_channel = []
 
     def __str__(self):
         return "{name: " + self.name + ", size: " + str(self.size) + ", channels num: " + str(len(self.channels)) + "}"
@@ -62,8 +88,8 @@ def build_naive_csdfg_buffers(csdfg: CSDFGraph):
     csdfg_buf = []
     for channel in csdfg.get_channels():
         buf_name = channel.src.name + "_" + channel.dst.name
-        max_prod_rate = sum(channel.prod_seq)
-        max_cons_rate = sum(channel.cons_seq)
+        max_prod_rate = channel.prod_seq.total()
+        max_cons_rate = channel.cons_seq.total()
         buf_size = max(max_prod_rate, max_cons_rate)
         buf = CSDFGDataBuffer(buf_name, buf_size)
         buf.channels.append(channel)
@@ -16,6 +16,17 @@ def main():
 
     parser.add_argument('-t', '--threads', type=int, action='store',
                         help='number of parallel CPU threads', required=True)
+    parser.add_argument('--fitness-cache', type=str, action='store', default=None,
+                        help='path to SQLite file, where fitness of evaluated GA chromosomes is stored '
+                             'and reused by GA reruns for the same application')
+    parser.add_argument('--checkpoint', type=str, action='store', default=None,
+                        help='path to .json file, where GA state is periodically saved')
+    parser.add_argument('--checkpoint-epochs', type=int, action='store', default=1,
+                        help='save GA state every N epochs')
+    parser.add_argument('--checkpoint-seconds', type=float, action='store', default=None,
+                        help='save GA state every T seconds')
+    parser.add_argument("--resume", help="resume GA from the GA state, saved in the checkpoint file",
+                        action="store_true", default=False)
     # general flags
     parser.add_argument("--silent", help="do not provide print-out for the script steps",
                         action="store_true", default=False)
@@ -37,6 +48,10 @@ def main():
         # parse config
         conf_file = args.config
         parr_threads = args.threads
+        fitness_cache_path = args.fitness_cache
+        checkpoint_path = args.checkpoint
+        if args.resume and checkpoint_path is None:
+            raise Exception("--resume requires a checkpoint file, specified with --checkpoint")
         silent = args.silent
         verbose = not silent
 
@@ -54,7 +69,12 @@ def main():
                               conf["json_ga_conf_path"],
                               parr_threads,
                               conf["output_file_path"],
-                              verbose)
+                              verbose,
+                              fitness_cache_path,
+                              checkpoint_path,
+                              args.checkpoint_epochs,
+                              args.checkpoint_seconds,
+                              args.resume)
 
     except Exception as e:
         print("GA-based search error: " + str(e))
@@ -0,0 +1,182 @@
+import argparse
+import sys
+import traceback
+from os.path import dirname
+
+"""
+Console-interface script for the steady-state simulation of DNN-based applications, where every DNN is mapped on
+multiple processors and executed as a pipeline (DNNs with no mapping are executed on a single processor)
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Simulate DNN-based application, executed as a pipeline')
+    # required arguments
+    parser.add_argument('-c', '--config', type=str, action='store',
+                        help='path to .json application config', required=True)
+
+    parser.add_argument('-b', '--best-chromosome', type=str, action='store', default=None,
+                        help='path to best chromosome, generated using ./run_mms_selection.py '
+                             'script and saved in .json format. If not specified, the DNNs '
+                             'do not process data by parts')
+
+    parser.add_argument('-s', '--samples', type=int, action='store', default=100,
+                        help='maximum number of samples to simulate before the periodic regime is found')
+
+    parser.add_argument('--max-samples-in-flight', type=int, action='store', default=None,
+                        help='maximum number of samples, processed by a DNN at the same time. '
+                             'By default, twice the number of processors, the DNN is mapped on')
+
+    parser.add_argument('--finite', help='simulate all the samples instead of stopping once '
+                                         'the periodic regime is found',
+                        action="store_true", default=False)
+
+    parser.add_argument('--gops-per-sec', type=float, action='store', default=100,
+                        help='performance of every processor in GOPs/second, used to estimate latency of DNN layers')
+
+    parser.add_argument('-o', metavar='--output', type=str, action='store',
+                        default="./output/simulation/pipeline_simulation.json",
+                        help='Path to the output .json file to save the simulation results in.')
+
+    # general flags
+    parser.add_argument("--silent", help="do not provide print-out for the script steps",
+                        action="store_true", default=False)
+
+    # parse arguments
+    args = parser.parse_args()
+
+    # Determine current directory and add path to this
+    # directory to syspath to use other .python modules
+    this_dir = get_cur_directory()
+    sys.path.append(this_dir)
+
+    # import sub-modules
+    from util import print_stage
+    from converters.json_converters.json_app_config_parser import parse_app_conf, parse_json_dnns, \
+        parse_json_mappings
+    from fileworkers.json_fw import read_json, save_as_json
+
+    try:
+        # parse parameters
+        conf_file = args.config
+        output_file_path = args.o
+        silent = args.silent
+        verbose = not silent
+
+        # parse config
+        stage = "Parsing application configuration"
+        print_stage(stage, verbose)
+        conf = parse_app_conf(conf_file)
+
+        stage = "DNNs parsing"
+        print_stage(stage, verbose)
+        dnns = parse_json_dnns(conf["json_dnn_paths"])
+
+        stage = "DNN mappings parsing"
+        print_stage(stage, verbose)
+        dnn_mappings = parse_json_mappings(conf["json_mapping_paths"])
+
+        dp_encoding = None
+        if args.best_chromosome is not None:
+            stage = "Reading best chromosome"
+            print_stage(stage, verbose)
+            dp_encoding = read_json(args.best_chromosome)["dp_by_parts"]
+
+        stage = "Simulating DNNs"
+        print_stage(stage, verbose)
+        results = simulate_app_pipelines(dnns, dnn_mappings, dp_encoding, args.gops_per_sec, args.samples,
+                                         args.max_samples_in_flight, not args.finite, verbose)
+
+        stage = "Saving simulation results in JSON file (" + output_file_path + ")"
+        print_stage(stage, verbose)
+        save_as_json(output_file_path, {"app_name": conf["app_name"], "dnns": results})
+
+    except Exception as e:
+        print("Pipeline simulation error: " + str(e))
+        traceback.print_tb(e.__traceback__)
+
+
+def simulate_app_pipelines(dnns, dnn_mappings, dp_encoding, gops_per_sec, samples, max_samples_in_flight,
+                           steady_state, verbose):
+    """
+    Simulate every DNN of a DNN-based application, executed as a pipeline, and analyze the steady state
+    of the DNN buffers on a single processor
+    :param dnns: DNNs, used by the application
+    :param dnn_mappings: mapping of every DNN (None for DNNs, executed with no pipeline parallelism)
+    :param dp_encoding: data processing by parts of the layers of all DNNs, encoded in a binary string
+        (see DSE/low_memory/mms/phases_derivation.py). If None, no data processing by parts is performed
+    :param gops_per_sec: performance of every processor in GOPs/second
+    :param samples: maximum number of samples to simulate (see simulate_pipeline_timed())
+    :param max_samples_in_flight: maximum number of samples, processed at the same time
+        (see simulate_pipeline_timed())
+    :param steady_state: (flag) if True, the period is derived from the detected periodic regime
+    :param verbose: print details
+    :return: list of simulation results (dictionaries), one per DNN
+    """
+    from functools import partial
+    from eval.latency.layer_latency import eval_layer_phases_latency_ms
+    from simulation.timed_simulation import simulate_dnn_pipeline_timed, get_timed_time_per_layer
+    from simulation.steady_state import analyze_steady_state_asap
+    from DSE.low_memory.mms.phases_derivation import get_phases_per_layer
+    from converters.dnn_to_csdf import dnn_to_csfd_one_to_one
+    from models.data_buffers import build_naive_csdfg_buffers
+
+    layer_latency_func = partial(eval_layer_phases_latency_ms, latency_model="flops", gops_per_sec=gops_per_sec)
+    results = []
+    layer_id_in_encoding = 0
+    for dnn, mapping in zip(dnns, dnn_mappings):
+        layers_num = len(dnn.get_layers())
+        dnn_dp_encoding = None
+        if dp_encoding is not None:
+            dnn_dp_encoding = dp_encoding[layer_id_in_encoding: layer_id_in_encoding + layers_num]
+        layer_id_in_encoding += layers_num
+        if mapping is None:
+            mapping = [[layer_id for layer_id in range(layers_num)]]
+
+        result = simulate_dnn_pipeline_timed(dnn, mapping, dnn_dp_encoding, layer_latency_func, samples=samples,
+                                             max_samples_in_flight=max_samples_in_flight,
+                                             steady_state=steady_state)
+        if verbose:
+            print("  ", dnn.name, "on", len(mapping), "processors:", str(result))
+
+        # steady-state buffers requirements of the DNN, executed on a single processor
+        if dnn_dp_encoding is None:
+            phases_per_layer = {layer.name: 1 for layer in dnn.get_layers()}
+        else:
+            phases_per_layer = get_phases_per_layer(dnn, dnn_dp_encoding)
+        csdf = dnn_to_csfd_one_to_one(dnn, phases_per_layer=phases_per_layer,
+                                      time_per_layer=get_timed_time_per_layer(dnn, phases_per_layer,
+                                                                              layer_latency_func))
+        buffers_steady_state = analyze_steady_state_asap(csdf, build_naive_csdfg_buffers(csdf), max_samples=samples)
+        steady_state_buffers_tokens = None
+        transient_buffers_tokens = None
+        if buffers_steady_state is not None:
+            steady_state_buffers_tokens = sum(buffers_steady_state.max_tokens_per_mem_name.values())
+            transient_buffers_tokens = sum(buffers_steady_state.transient_max_tokens_per_mem_name.values())
+        if verbose:
+            print("  ", dnn.name, "buffers (tokens): steady state:", steady_state_buffers_tokens,
+                  "transient:", transient_buffers_tokens)
+
+        results.append({
+            "dnn": dnn.name,
+            "processors": len(mapping),
+            "latency": result.latency,
+            "period": result.period,
+            "throughput": result.get_throughput(),
+            "throughput_loss": result.get_throughput_loss(),
+            "transient_samples": result.transient_samples,
+            "period_samples": result.period_samples,
+            "utilization": result.utilization_per_processor,
+            "steady_state_buffers_tokens": steady_state_buffers_tokens,
+            "transient_buffers_tokens": transient_buffers_tokens
+        })
+    return results
+
+
+def get_cur_directory():
+    this_dir = dirname(__file__)
+    return this_dir
+
+
+if __name__ == "__main__":
+    main()
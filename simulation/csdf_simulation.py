@@ -1,6 +1,8 @@
+from bisect import bisect_right, insort
 from models.csdf_model.csdf import CSDFGraph
+from models.csdf_model.compiled_csdf import CompiledCSDFGraph
 from models.edge_platform.SimulationPlatform import SimulationPlatform, SimulationBuffer, SimulationProc
-from simulation.traces import SimTrace, SimJob, SimMemoryAccess
+from simulation.traces import SimTrace
 
 
 def simulate_execution_asap(csdfg:CSDFGraph,
@@ -8,9 +10,15 @@ def simulate_execution_asap(csdfg:CSDFGraph,
                             proc_num=1,
                             max_samples=1,
                             trace_memory_access=True,
-                            verbose=True):
+                            verbose=True,
+                            compiled_csdfg: CompiledCSDFGraph = None,
+                            reducers=None):
     """
-    Simulate execution of CSDF model where every actor is executed as soon as possible
+    Simulate execution of CSDF model where every actor is executed as soon as possible.
+    The simulation is event-driven: a (sorted) set of ready actors is maintained, and after every
+    actor firing only the actors, which readiness could have been changed by the firing (the fired actor and
+    consumers of the buffers, accessed by the fired actor), are re-checked. The next actor to fire is the first
+    ready actor that follows the last fired actor in the list of CSDF graph actors (in circular order)
     :param csdfg: CSDFGraph for simulation
     :param csdfg_buffers: list of CSDF graph buffers, used to store
         data, exchanged though the CSDF graph channels.
@@ -18,6 +26,11 @@ def simulate_execution_asap(csdfg:CSDFGraph,
     :param proc_num: number of processors to simulate execution on
     :param trace_memory_access (flag) If True, memory access will be added to the trace
     :param verbose: print details
+    :param compiled_csdfg: (optional) CSDF graph, compiled with csdfg_buffers. If None,
+        the CSDF graph is compiled by the simulation
+    :param reducers: (optional) list of online reducers (see simulation/sim_reducers.py), updated
+        with every executed job and memory access during the simulation. Reducers can be used instead of
+        the memory access trace (trace_memory_access=False) to derive the simulation results
     :return: trace (SimTrace), which describes simulation in time
     """
 
@@ -28,37 +41,53 @@ def simulate_execution_asap(csdfg:CSDFGraph,
         return None
 
     def get_next_ready_actor_id(cur_actor_id):
+        if not ready_actor_ids:
+            return -1
         # first visit all the following actors
-        for actor_id in range((cur_actor_id + 1), len(actors)):
-            if is_actor_ready(actor_id):
-                next_ready_actor_id = actor_id
-                return next_ready_actor_id
-
+        next_ready_id = bisect_right(ready_actor_ids, cur_actor_id)
+        if next_ready_id < len(ready_actor_ids):
+            return ready_actor_ids[next_ready_id]
         # if actor is not found, visit all previous actors
-        for actor_id in range(0, cur_actor_id+1):
-            if is_actor_ready(actor_id):
-                next_ready_actor_id = actor_id
-                return next_ready_actor_id
-
-        return -1
+        return ready_actor_ids[0]
 
     def is_actor_ready(actor_id):
         # actor is ready to fire, when all his input_examples buffers have enough data for actor to consume
 
-        actor = actors[actor_id]
+        phases = actor_phases[actor_id]
         phase = phase_per_actor[actor_id]
         # too many phases (for any actor)
         # if actor_id == 0 and phase >= max_src_phases:
-        if phase >= actors[actor_id].phases * max_samples:
+        if phase >= phases * max_samples:
             return False
 
-        for input_channel in csdfg.get_input_channels(actor):
-            input_buffer = channel_to_buf_mapping[input_channel]
-            cons_rate = input_channel.cons_seq[phase % actor.phases]
+        for input_channel_id in input_channels_per_actor[actor_id]:
+            input_buffer = sim_buffers[channel_buf[input_channel_id]]
+            cons_rate = cons_seqs[input_channel_id][phase % phases]
             if input_buffer.occupied < cons_rate:
                 return False
         return True
 
+    def update_ready_actors(actor_ids):
+        # re-check readiness of the actors, affected by the last actor firing
+        for actor_id in actor_ids:
+            ready = is_actor_ready(actor_id)
+            if ready != is_ready_per_actor[actor_id]:
+                is_ready_per_actor[actor_id] = ready
+                if ready:
+                    insort(ready_actor_ids, actor_id)
+                else:
+                    del ready_actor_ids[bisect_right(ready_actor_ids, actor_id) - 1]
+
+    def get_affected_actors(actor_id):
+        # actors, which readiness can change after the actor fires: the actor itself
+        # and all consumers of buffers, read and written by the actor
+        affected_actor_ids = {actor_id}
+        for channel_id in input_channels_per_actor[actor_id]:
+            affected_actor_ids.update(consumers_per_buffer[channel_buf[channel_id]])
+        for channel_id in output_channels_per_actor[actor_id]:
+            affected_actor_ids.update(consumers_per_buffer[channel_buf[channel_id]])
+        return affected_actor_ids
+
     def fire_actor(actor_id, processor):
         """
         Fire actor
@@ -70,16 +99,17 @@ def simulate_execution_asap(csdfg:CSDFGraph,
         :param processor: processor, where actors is executed
         """
         # prepare data
-        actor = actors[actor_id]
+        phases = actor_phases[actor_id]
         phase = phase_per_actor[actor_id]
-        task_desc = actor.name
-        # job_desc = ("phase " + str(max(phase - 1, 0) % actor.phases + 1) + "/" + str(actor.phases))
-        job_desc = ("phase " + str((phase % actor.phases)+1) + "/" + str(actor.phases))
+        task_desc = actor_names[actor_id]
+        # job_desc = ("phase " + str(max(phase - 1, 0) % phases + 1) + "/" + str(phases))
+        job_desc = ("phase " + str((phase % phases)+1) + "/" + str(phases))
 
         # estimate time
         start_time = trace.get_proc_time(processor.name)
-        actor_exec_time = actor.time_per_phase[phase % actor.phases]
+        actor_exec_time = time_per_phase[actor_id][phase % phases]
         end_time = start_time + actor_exec_time
+        step = trace.get_jobs_num()
 
         ###########################
         # simulate task execution
@@ -88,39 +118,44 @@ def simulate_execution_asap(csdfg:CSDFGraph,
             print("EXECUTE actor", actor_id, " start time: ", start_time)
 
         # read input_examples data
-        for input_channel in csdfg.get_input_channels(actor):
-            input_buffer = channel_to_buf_mapping[input_channel]
-            cons_rate = input_channel.cons_seq[phase % actor.phases]
+        for input_channel_id in input_channels_per_actor[actor_id]:
+            input_buffer = sim_buffers[channel_buf[input_channel_id]]
+            cons_rate = cons_seqs[input_channel_id][phase % phases]
             input_buffer.read_tokens(cons_rate)
+            for reducer in reducers:
+                reducer.on_mem_access(step, input_buffer.name, "read", cons_rate)
             if trace_memory_access:
-                mem_access = SimMemoryAccess(task_desc,
-                                             job_desc,
-                                             input_buffer.name,
-                                             "read",
-                                             cons_rate,
-                                             start_time,
-                                             end_time)
-                trace.add_mem_access(mem_access)
+                trace.add_mem_access_record(task_desc,
+                                            job_desc,
+                                            input_buffer.name,
+                                            "read",
+                                            cons_rate,
+                                            start_time,
+                                            end_time)
 
         # execute task
-        job = SimJob(task_desc, job_desc, processor.name, start_time, end_time)
-        trace.add_job(job)
+        trace.add_job_record(task_desc, job_desc, processor.name, start_time, end_time, task_id=actor_id)
+        for reducer in reducers:
+            reducer.on_job(step, task_desc, job_desc, processor.name, start_time, end_time)
         # free processor, where task was executed
         processor.free()
 
         # write output data to output channels
-        for output_channel in csdfg.get_output_channels(actor):
-            output_buffer = channel_to_buf_mapping[output_channel]
-            prod_rate = output_channel.prod_seq[phase % actor.phases]
+        for output_channel_id in output_channels_per_actor[actor_id]:
+            output_buffer = sim_buffers[channel_buf[output_channel_id]]
+            prod_rate = prod_seqs[output_channel_id][phase % phases]
             output_buffer.write_tokens(prod_rate)
+            for reducer in reducers:
+                reducer.on_mem_access(step, output_buffer.name, "write", prod_rate)
             if trace_memory_access:
-                mem_access = SimMemoryAccess(task_desc, job_desc, output_buffer.name, "write", prod_rate, start_time, end_time)
-                trace.add_mem_access(mem_access)
+                trace.add_mem_access_record(task_desc, job_desc, output_buffer.name, "write", prod_rate,
+                                            start_time, end_time)
 
         # increase actor's phase
         phase_per_actor[actor_id] = phase_per_actor[actor_id] + 1
+        update_ready_actors(affected_actors_per_actor[actor_id])
         if verbose:
-            print("actor", actor.name, " fired phase", (phase % actor.phases) + 1, "/", actor.phases)
+            print("actor", task_desc, " fired phase", (phase % phases) + 1, "/", phases)
             print(" end time: ", end_time)
 
     def schedule_next_actor(last_actor_id=-1):
@@ -130,12 +165,12 @@ def simulate_execution_asap(csdfg:CSDFGraph,
 
     def check_consistency():
         # check that every actor has executed its final phase
-        for i in range(len(actors)):
+        for i in range(actors_num):
             phases_performed = phase_per_actor[i]
-            phases_expected = actors[i].phases * max_samples
+            phases_expected = actor_phases[i] * max_samples
             if phases_performed != phases_expected:
                 if verbose:
-                    print("Sim inconsistency: actor", actors[i], "performed phases",
+                    print("Sim inconsistency: actor", csdfg.get_actors()[i], "performed phases",
                           phases_performed, "/", phases_expected, "expected")
                 return False
         return True
@@ -143,17 +178,36 @@ def simulate_execution_asap(csdfg:CSDFGraph,
     # main script
     ###################
     # prepare variables
+    if reducers is None:
+        reducers = []
     # CSDFG
-    actors = csdfg.get_actors()
-    channels = csdfg.get_channels()
-    actors_num = len(actors)
+    if compiled_csdfg is None:
+        compiled_csdfg = CompiledCSDFGraph(csdfg, csdfg_buffers)
+    actors_num = compiled_csdfg.actors_num
+    actor_names = compiled_csdfg.actor_names
+    actor_phases = compiled_csdfg.actor_phases
+    time_per_phase = compiled_csdfg.time_per_phase
+    prod_seqs = compiled_csdfg.prod_seqs
+    cons_seqs = compiled_csdfg.cons_seqs
+    # input/output channels of every actor, in the order of the CSDF graph channels
+    input_channels_per_actor = [compiled_csdfg.get_input_channel_ids(actor_id) for actor_id in range(actors_num)]
+    output_channels_per_actor = [compiled_csdfg.get_output_channel_ids(actor_id) for actor_id in range(actors_num)]
     phase_per_actor = [0 for _ in range(actors_num)]
     # platform
     platform = create_simulation_platform(csdfg_buffers, proc_num)
+    # simulation buffers: i-th simulation buffer corresponds to i-th CSDF graph buffer
     sim_buffers = platform.get_buffers()
     processors = platform.get_processors()
     # mapping of CSDFG channels onto simulation platform buffers
-    channel_to_buf_mapping = get_channel_to_sim_buf_mapping(channels, sim_buffers, csdfg_buffers)
+    channel_buf = compiled_csdfg.channel_buf
+    if -1 in channel_buf:
+        raise Exception("CSDF simulation error: a channel of CSDF graph " + csdfg.name + " is not stored in any buffer")
+    # ids of actors, that read from every buffer
+    consumers_per_buffer = compiled_csdfg.get_buffer_consumers()
+    affected_actors_per_actor = [sorted(get_affected_actors(actor_id)) for actor_id in range(actors_num)]
+    # ready actors: sorted list of ids of actors, ready to fire, and readiness flag per actor
+    is_ready_per_actor = [is_actor_ready(actor_id) for actor_id in range(actors_num)]
+    ready_actor_ids = [actor_id for actor_id in range(actors_num) if is_ready_per_actor[actor_id]]
     # trace
     trace = SimTrace()
     # check that every actor has executed its final phase
@@ -192,21 +246,23 @@ def get_channel_to_sim_buf_mapping(channels, sim_buffers, csdfg_buffers):
     :return: dictionary, where key=CSDF channel, value = simulation buffer,
     allocated to store data of the CSDF channel
     """
-    def __get_csdfg_buffer(channel):
-        for csdfg_buf in csdfg_buffers:
-            if channel in csdfg_buf.channels:
-                return csdfg_buf
-
-    def __find_sim_buf_by_name(name):
-        for sim_buf in sim_buffers:
-            if sim_buf.name == name:
-                return sim_buf
-
     # main script
+    # dictionary, where key = CSDF channel, value = (first) CSDF buffer, that stores data of the channel
+    csdfg_buf_per_channel = {}
+    for csdfg_buf in csdfg_buffers:
+        for ch in csdfg_buf.channels:
+            if ch not in csdfg_buf_per_channel:
+                csdfg_buf_per_channel[ch] = csdfg_buf
+    # dictionary, where key = buffer name, value = (first) simulation buffer with this name
+    sim_buf_per_name = {}
+    for sim_buf in sim_buffers:
+        if sim_buf.name not in sim_buf_per_name:
+            sim_buf_per_name[sim_buf.name] = sim_buf
+
     channel_to_sim_buf_mapping = {}
     for ch in channels:
-        csdfg_buffer = __get_csdfg_buffer(ch)
-        sim_buffer = __find_sim_buf_by_name(csdfg_buffer.name)
+        csdfg_buffer = csdfg_buf_per_channel[ch]
+        sim_buffer = sim_buf_per_name[csdfg_buffer.name]
         channel_to_sim_buf_mapping[ch] = sim_buffer
 
     return channel_to_sim_buf_mapping
@@ -0,0 +1,121 @@
+from simulation.traces import SimMemoryOccupancyInterval
+
+"""
+Online (streaming) reducers of simulation events. A reducer is passed to a simulation and is updated
+every time a job is executed or a memory is accessed, so that the simulation results, required by
+a DSE step (e.g. max number of tokens, ever stored in every buffer), are derived during the simulation,
+without storing the full trace of memory accesses.
+Execution steps, passed to the reducers, are the steps of the simulated schedule (ids of jobs in the
+execution order). For execution on a single processor, they are equal to the steps of the ASAP schedule,
+derived from the simulation trace (see SimTrace.get_asap_schedule())
+"""
+
+
+class SimReducer:
+    """ Online reducer of simulation events (base class)"""
+
+    def on_job(self, step: int, task: str, job: str, processor_name: str, start_time: float, end_time: float):
+        """
+        Process executed job
+        :param step: execution step of the job
+        :param task: description of task, within which the job is executed
+        :param job: description of the job
+        :param processor_name: name of the processor, where task is executed
+        :param start_time: start time of the job
+        :param end_time: end time of the job
+        """
+        pass
+
+    def on_mem_access(self, step: int, mem_name: str, action: str, tokens: int):
+        """
+        Process memory access
+        :param step: execution step of the job, which accessed the memory
+        :param mem_name: name of the memory
+        :param action: "read" or "write"
+        :param tokens: number of tokens, read or written
+        """
+        pass
+
+
+class ScheduleStepReducer(SimReducer):
+    """
+    Schedule-step index: execution step of every (task, job)
+    Attributes:
+        step_per_job (dict): dictionary, where key = tuple (task, job), value = first execution step of the job
+    """
+    def __init__(self):
+        self.step_per_job = {}
+
+    def on_job(self, step: int, task: str, job: str, processor_name: str, start_time: float, end_time: float):
+        key = (task, job)
+        if key not in self.step_per_job:
+            self.step_per_job[key] = step
+
+    def find_step(self, task, job):
+        """
+        Find execution step of job
+        :return: first execution step of the job if the job was executed, otherwise -1
+        """
+        return self.step_per_job.get((task, job), -1)
+
+
+class MaxStoredTokensReducer(SimReducer):
+    """
+    Max number of tokens, ever stored in every memory (see SimTrace.get_max_stored_tokens())
+    Attributes:
+        max_tokens_per_mem_name (dict): dictionary, where key = memory name, value = max number
+            of tokens, ever stored in the memory. Memories are stored in the order of their first access
+    """
+    def __init__(self):
+        self.max_tokens_per_mem_name = {}
+        self.__stored_tokens_per_mem_name = {}
+
+    def on_mem_access(self, step: int, mem_name: str, action: str, tokens: int):
+        stored_tokens = self.__stored_tokens_per_mem_name.get(mem_name, 0)
+        if action == "write":
+            stored_tokens += tokens
+        if action == "read":
+            stored_tokens -= tokens
+        self.__stored_tokens_per_mem_name[mem_name] = stored_tokens
+        self.max_tokens_per_mem_name[mem_name] = max(self.max_tokens_per_mem_name.get(mem_name, 0), stored_tokens)
+
+    def get_max_stored_tokens(self, mem_name):
+        """ Get maximum amount of tokens, ever stored in the memory"""
+        return self.max_tokens_per_mem_name.get(mem_name, 0)
+
+
+class OccupancyIntervalReducer(SimReducer):
+    """
+    First-in, last-out memory occupancy intervals: a single occupancy interval per memory
+    (see SimTrace.generate_memory_occupancy_intervals_per_memory_first_in_last_out())
+    Attributes:
+        interval_per_mem_name (dict): dictionary, where key = memory name,
+            value (SimMemoryOccupancyInterval) = occupancy interval of the memory.
+            Memories are stored in the order of their first access
+    """
+    def __init__(self):
+        self.interval_per_mem_name = {}
+        self.__stored_tokens_per_mem_name = {}
+
+    def on_mem_access(self, step: int, mem_name: str, action: str, tokens: int):
+        interval = self.interval_per_mem_name.get(mem_name)
+        if interval is None:
+            interval = SimMemoryOccupancyInterval(step, step)
+            self.interval_per_mem_name[mem_name] = interval
+        interval.start_step = min(interval.start_step, step)
+        interval.end_step = max(interval.end_step, step)
+
+        stored_tokens = self.__stored_tokens_per_mem_name.get(mem_name, 0)
+        if action == "write":
+            stored_tokens += tokens
+        if action == "read":
+            stored_tokens -= tokens
+        self.__stored_tokens_per_mem_name[mem_name] = stored_tokens
+        interval.max_tokens = max(interval.max_tokens, stored_tokens)
+
+    def get_occupancy_intervals_per_memory(self):
+        """
+        :return: dictionary, where key (string) = name of memory, value ([SimMemoryOccupancyInterval])
+        is the list with a single (first-in, last-out) occupancy interval of the memory
+        """
+        return {mem_name: [interval] for mem_name, interval in self.interval_per_mem_name.items()}
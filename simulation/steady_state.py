@@ -0,0 +1,250 @@
+from bisect import bisect_right, insort
+from array import array
+from models.csdf_model.csdf import CSDFGraph, check_csdfg_consistency
+from models.csdf_model.compiled_csdf import CompiledCSDFGraph
+
+"""
+Steady-state analysis of the ASAP (self-timed) execution of a CSDF graph, processing an unbounded stream
+of input samples. The execution follows the same rules as simulate_execution_asap(): the next actor to fire
+is the first ready actor that follows the last fired actor in circular order, and the execution is deterministic.
+Unlike in the simulation of a limited number of samples, an actor is only ready to fire if its output buffers
+have enough free space to store the produced data (back-pressure), otherwise the input actor could run ahead
+of the rest of the graph forever.
+Thus, the execution is fully determined by its state: phase of every actor (within a sample), number of tokens,
+stored in every buffer, and the last fired actor. The state is recorded every time the reference actor
+(e.g. the input actor) completes a sample, so the last fired actor of every recorded state is the reference actor.
+Once a recorded state repeats, the execution between the two occurrences of the state (the period) repeats forever,
+so the steady-state buffers requirements under back-pressure are derived from one period, without simulating
+every sample.
+The graph is executed on a single processor, so the period time is always the total time of the firings,
+performed within the period, i.e., the sum of the firing times of one sample, multiplied by the number of
+samples in the period. Thus, the steady-state throughput does not depend on the execution order and is not
+a result of the analysis: the periodicity detection is only needed for the buffers requirements.
+For the steady-state throughput of a DNN, executed as a pipeline on multiple processors, see the steady-state
+mode of simulate_pipeline_timed() in timed_simulation.py
+"""
+
+
+class SteadyStateAnalysis:
+    """
+    Steady state of the ASAP execution of a CSDF graph
+    Attributes:
+        transient_samples (int), transient_steps (int), transient_time (float): number of samples, processed
+            by the reference actor, number of actor firings, and time, before the periodic regime starts
+        period_samples (int), period_steps (int), period_time (float): number of samples, processed by
+            every actor, number of actor firings, and time, within one period of the periodic regime.
+            The period time is the sum of the firing times of period_samples samples
+        period_exec_order (list): ids of actors, in the order of their firing within one period
+        max_tokens_per_mem_name (dict): dictionary, where key = buffer name, value = max number of tokens,
+            stored in the buffer in the periodic regime (steady-state buffers requirements)
+        transient_max_tokens_per_mem_name (dict): dictionary, where key = buffer name, value = max number
+            of tokens, stored in the buffer during the transient regime and the first period
+    """
+    def __init__(self, transient_samples, transient_steps, transient_time,
+                 period_samples, period_steps, period_time, period_exec_order,
+                 max_tokens_per_mem_name, transient_max_tokens_per_mem_name):
+        self.transient_samples = transient_samples
+        self.transient_steps = transient_steps
+        self.transient_time = transient_time
+        self.period_samples = period_samples
+        self.period_steps = period_steps
+        self.period_time = period_time
+        self.period_exec_order = period_exec_order
+        self.max_tokens_per_mem_name = max_tokens_per_mem_name
+        self.transient_max_tokens_per_mem_name = transient_max_tokens_per_mem_name
+
+    def get_throughput(self):
+        """
+        Get steady-state throughput on a single processor. The throughput is the inverse of the sum of
+        the firing times of one sample, and does not depend on the execution order
+        :return: number of samples, processed per time unit, or None if period takes no time
+        """
+        if self.period_time <= 0:
+            return None
+        return self.period_samples / self.period_time
+
+    def get_time_per_sample(self):
+        """ Get steady-state time of processing one sample, i.e., the sum of the firing times of one sample"""
+        return self.period_time / self.period_samples
+
+    def __str__(self):
+        return "{transient: (samples: " + str(self.transient_samples) + ", steps: " + str(self.transient_steps) + \
+               ", time: " + str(self.transient_time) + "), period: (samples: " + str(self.period_samples) + \
+               ", steps: " + str(self.period_steps) + ", time: " + str(self.period_time) + \
+               "), throughput: " + str(self.get_throughput()) + "}"
+
+
+def analyze_steady_state_asap(csdfg: CSDFGraph,
+                              csdfg_buffers,
+                              max_samples=1000,
+                              ref_actor_id=0,
+                              compiled_csdfg: CompiledCSDFGraph = None):
+    """
+    Analyze steady state of the ASAP execution of CSDF graph on a single processor (see simulate_execution_asap()),
+    processing an unbounded stream of input samples
+    :param csdfg: CSDF graph
+    :param csdfg_buffers: list of CSDF graph buffers, used to store
+        data, exchanged though the CSDF graph channels. An actor only fires if its output buffers
+        have enough free space to store the produced data
+    :param max_samples: maximum number of samples, processed by the reference actor, before the periodic
+        regime should be found
+    :param ref_actor_id: id of the reference actor: the execution state is recorded every time the reference
+        actor completes a sample
+    :param compiled_csdfg: (optional) CSDF graph, compiled with csdfg_buffers. If None,
+        the CSDF graph is compiled by the analysis
+    :return: steady state of the execution (SteadyStateAnalysis) or None, if periodic regime was not found
+        within max_samples samples, if the execution deadlocks (e.g., if the buffers are too small)
+        or if the CSDF graph is inconsistent
+    """
+    if not check_csdfg_consistency(csdfg, verbose=False):
+        return None
+    if compiled_csdfg is None:
+        compiled_csdfg = CompiledCSDFGraph(csdfg, csdfg_buffers)
+    cg = compiled_csdfg
+    actors_num = cg.actors_num
+    actor_phases = cg.actor_phases
+    time_per_phase = cg.time_per_phase
+    prod_seqs = cg.prod_seqs
+    cons_seqs = cg.cons_seqs
+    channel_buf = cg.channel_buf
+    if -1 in channel_buf:
+        raise Exception("Steady-state analysis error: a channel of CSDF graph " + cg.name +
+                        " is not stored in any buffer")
+    if actor_phases[ref_actor_id] == 0:
+        raise Exception("Steady-state analysis error: reference actor " + cg.actor_names[ref_actor_id] +
+                        " of CSDF graph " + cg.name + " performs no phases")
+
+    # (buffer id, channel id) of input/output channels of every actor
+    inputs_per_actor = [[(channel_buf[channel_id], channel_id) for channel_id in cg.get_input_channel_ids(actor_id)]
+                        for actor_id in range(actors_num)]
+    outputs_per_actor = [[(channel_buf[channel_id], channel_id) for channel_id in cg.get_output_channel_ids(actor_id)]
+                         for actor_id in range(actors_num)]
+    # actors, which readiness can change after the actor fires: the actor itself and all consumers
+    # (readers) and producers (writers) of buffers, read and written by the actor
+    consumers_per_buffer = cg.get_buffer_consumers()
+    producers_per_buffer = [set() for _ in range(cg.buffers_num)]
+    for channel_id in range(cg.channels_num):
+        producers_per_buffer[channel_buf[channel_id]].add(cg.channel_src[channel_id])
+    affected_actors_per_actor = []
+    for actor_id in range(actors_num):
+        affected_actor_ids = {actor_id}
+        for buf_id, channel_id in inputs_per_actor[actor_id] + outputs_per_actor[actor_id]:
+            affected_actor_ids.update(consumers_per_buffer[buf_id])
+            affected_actor_ids.update(producers_per_buffer[buf_id])
+        affected_actors_per_actor.append(sorted(affected_actor_ids))
+    # buffers capacity (in tokens)
+    buf_sizes = array('q', [int(csdfg_buf.size) for csdfg_buf in csdfg_buffers])
+
+    # execution state: phase of every actor within a sample and tokens, stored in every buffer
+    phase_per_actor = array('q', [0 for _ in range(actors_num)])
+    stored_tokens = array('q', [0 for _ in range(cg.buffers_num)])
+    max_tokens = array('q', [0 for _ in range(cg.buffers_num)])
+
+    def is_actor_ready(actor_id):
+        if actor_phases[actor_id] == 0:
+            return False
+        phase = phase_per_actor[actor_id]
+        for buf_id, channel_id in inputs_per_actor[actor_id]:
+            if stored_tokens[buf_id] < cons_seqs[channel_id][phase]:
+                return False
+        for buf_id, channel_id in outputs_per_actor[actor_id]:
+            if stored_tokens[buf_id] + prod_seqs[channel_id][phase] > buf_sizes[buf_id]:
+                return False
+        return True
+
+    is_ready_per_actor = [is_actor_ready(actor_id) for actor_id in range(actors_num)]
+    ready_actor_ids = [actor_id for actor_id in range(actors_num) if is_ready_per_actor[actor_id]]
+
+    # recorded states: key = state, value = sample id; step, time and max tokens per sample
+    sample_per_state = {}
+    step_per_sample = []
+    time_per_sample = []
+    max_tokens_per_sample = []
+
+    exec_order = array('i')
+    time = 0.0
+    last_actor_id = -1
+    samples = 0
+    while ready_actor_ids:
+        next_ready_id = bisect_right(ready_actor_ids, last_actor_id)
+        actor_id = ready_actor_ids[next_ready_id] if next_ready_id < len(ready_actor_ids) else ready_actor_ids[0]
+
+        # fire actor: consume input data, produce output data
+        phase = phase_per_actor[actor_id]
+        for buf_id, channel_id in inputs_per_actor[actor_id]:
+            stored_tokens[buf_id] -= cons_seqs[channel_id][phase]
+        for buf_id, channel_id in outputs_per_actor[actor_id]:
+            stored_tokens[buf_id] += prod_seqs[channel_id][phase]
+            if stored_tokens[buf_id] > max_tokens[buf_id]:
+                max_tokens[buf_id] = stored_tokens[buf_id]
+        time += time_per_phase[actor_id][phase]
+        phase_per_actor[actor_id] = (phase + 1) % actor_phases[actor_id]
+        exec_order.append(actor_id)
+        last_actor_id = actor_id
+
+        # update ready actors
+        for affected_actor_id in affected_actors_per_actor[actor_id]:
+            ready = is_actor_ready(affected_actor_id)
+            if ready != is_ready_per_actor[affected_actor_id]:
+                is_ready_per_actor[affected_actor_id] = ready
+                if ready:
+                    insort(ready_actor_ids, affected_actor_id)
+                else:
+                    del ready_actor_ids[bisect_right(ready_actor_ids, affected_actor_id) - 1]
+
+        # reference actor completed a sample: record the execution state
+        if actor_id == ref_actor_id and phase_per_actor[actor_id] == 0:
+            state = phase_per_actor.tobytes() + stored_tokens.tobytes()
+            max_tokens_per_sample.append(max_tokens)
+            max_tokens = array('q', stored_tokens)
+            first_sample = sample_per_state.get(state)
+            if first_sample is not None:
+                return _get_steady_state_analysis(cg, exec_order, time, first_sample, samples,
+                                                  step_per_sample, time_per_sample, max_tokens_per_sample)
+            sample_per_state[state] = samples
+            step_per_sample.append(len(exec_order))
+            time_per_sample.append(time)
+            samples += 1
+            if samples > max_samples:
+                return None
+    return None
+
+
+def _get_steady_state_analysis(compiled_csdfg: CompiledCSDFGraph, exec_order, end_time, first_sample, repeated_sample,
+                               step_per_sample, time_per_sample, max_tokens_per_sample):
+    """
+    Get steady state of the execution, which state after sample first_sample repeats after sample repeated_sample
+    :param compiled_csdfg: compiled CSDF graph
+    :param exec_order: ids of actors, in the order of their firing
+    :param end_time: time of the end of sample repeated_sample
+    :param first_sample: id of the sample, after which the period starts
+    :param repeated_sample: id of the sample, after which the state of the execution repeats
+    :param step_per_sample: number of firings, performed before the end of every recorded sample
+    :param time_per_sample: time of the end of every recorded sample
+    :param max_tokens_per_sample: max tokens, stored in every buffer within every sample
+    :return: steady state of the execution (SteadyStateAnalysis)
+    """
+    start_step = step_per_sample[first_sample]
+    start_time = time_per_sample[first_sample]
+
+    # buffers, used by the CSDF graph channels
+    used_buf_ids = sorted(set(compiled_csdfg.channel_buf))
+    max_tokens_per_mem_name = {}
+    transient_max_tokens_per_mem_name = {}
+    for buf_id in used_buf_ids:
+        buf_name = compiled_csdfg.buf_names[buf_id]
+        max_tokens_per_mem_name[buf_name] = max(max_tokens_per_sample[sample][buf_id]
+                                                for sample in range(first_sample + 1, repeated_sample + 1))
+        transient_max_tokens_per_mem_name[buf_name] = max(max_tokens_per_sample[sample][buf_id]
+                                                          for sample in range(repeated_sample + 1))
+
+    return SteadyStateAnalysis(transient_samples=first_sample + 1,
+                               transient_steps=start_step,
+                               transient_time=start_time,
+                               period_samples=repeated_sample - first_sample,
+                               period_steps=len(exec_order) - start_step,
+                               period_time=end_time - start_time,
+                               period_exec_order=list(exec_order[start_step:]),
+                               max_tokens_per_mem_name=max_tokens_per_mem_name,
+                               transient_max_tokens_per_mem_name=transient_max_tokens_per_mem_name)
+
@@ -0,0 +1,457 @@
+from collections import deque
+from models.dnn_model.dnn import DNN
+from models.csdf_model.csdf import check_csdfg_consistency
+from models.csdf_model.compiled_csdf import CompiledCSDFGraph
+from converters.dnn_to_csdf import dnn_to_csfd_one_to_one
+from simulation.traces import SimTrace
+from fileworkers.json_fw import save_as_json
+
+"""
+Timed simulation of a DNN, mapped on multiple processors and executed as a pipeline.
+The DNN is represented as a single CSDF graph, which actors execution times are the real
+(estimated, see eval/latency/layer_latency.py) latencies of the DNN layers, processing data by parts.
+Every actor is executed on the processor, the respective DNN layer is mapped on, so the CSDF graph consists
+of the CSDF graphs of the DNN partitions (one per processor), connected by the partition-boundary channels.
+The simulation is performed at the granularity of actor phases, and every processor has its own clock
+(see SimTrace.get_proc_time()): a phase of an actor starts as soon as the processor of the actor is free
+and all the tokens, consumed by the phase, are produced, where a token is produced at the end of the phase
+that produces it. Thus, a DNN partition can start processing a part of a sample as soon as the partitions
+it receives data from have produced this part, and data processing by parts lets the processors work on
+the same sample at the same time. Input samples are available from the start of the simulation, and the
+channels have unlimited capacity. Among the phases, that can start at the same time on the same processor,
+the phase of the first actor that follows the actor, last executed on the processor, in circular order is
+executed first (as in simulate_execution_asap()).
+The simulation reports latency of the first sample, utilization of every processor, the pipeline period and
+the loss of the pipeline throughput, caused by the data processing by parts.
+In the steady-state mode, the simulation does not replay every sample. Instead, it records the execution state
+every time the reference (input) actor completes a sample: the phase of every actor (relative to the samples,
+completed by the reference actor), the tokens of every channel with their production times, the processor clocks
+and the last actor, executed on every processor, and the samples in flight, where all the times are taken relative
+to the reference completion. The execution is deterministic and invariant to a shift in time, so once a recorded
+state repeats, the execution between the two occurrences of the state (the period) repeats forever, and the
+pipeline period and throughput are derived from the detected cycle. To keep the state bounded, the input actors
+do not start a new sample while max_samples_in_flight samples are being processed (back-pressure),
+otherwise a processor, faster than the most loaded processor, would run ahead of the rest of the pipeline forever
+"""
+# number of decimal digits of the times, recorded in the execution state: the times are rounded,
+# so that float rounding errors, accumulated over the simulation, do not prevent the state from repeating
+STATE_TIME_DECIMALS = 9
+
+
+class TimedPipelineSimulation:
+    """
+    Result of the timed pipeline simulation
+    Attributes:
+        samples (int): number of simulated samples. If the periodic regime is detected, number of samples,
+            completed by the reference actor before the simulation stops
+        makespan (float): time (ms) when the last sample is processed. If the periodic regime is detected,
+            time (ms) when the last simulated job ends
+        latency (float): time (ms) of processing the first sample
+        period (float): pipeline period (ms): average interval between completion of subsequent samples
+        time_per_sample_per_processor (dict): dictionary, where key = processor name, value = time (ms)
+            of processing one sample by all the phases of actors, executed on the processor
+        utilization_per_processor (dict): dictionary, where key = processor name, value = fraction
+            of the makespan, when the processor executes jobs
+        reference_period (float): pipeline period (ms) with no data processing by parts or None if not evaluated
+        trace (SimTrace): simulation trace
+        transient_samples (int): number of samples, completed by the reference actor before the periodic
+            regime starts, or None if the period is not derived from a detected periodic regime
+        period_samples (int): number of samples, completed by the reference actor within one period
+            of the periodic regime, or None if the period is not derived from a detected periodic regime
+    """
+    def __init__(self, samples, makespan, latency, period, time_per_sample_per_processor, utilization_per_processor,
+                 trace: SimTrace, reference_period=None, transient_samples=None, period_samples=None):
+        self.samples = samples
+        self.makespan = makespan
+        self.latency = latency
+        self.period = period
+        self.time_per_sample_per_processor = time_per_sample_per_processor
+        self.utilization_per_processor = utilization_per_processor
+        self.trace = trace
+        self.reference_period = reference_period
+        self.transient_samples = transient_samples
+        self.period_samples = period_samples
+
+    def get_throughput(self):
+        """
+        Get pipeline throughput
+        :return: number of samples, processed per second, or None if period takes no time
+        """
+        if self.period <= 0:
+            return None
+        return 1000.0 / self.period
+
+    def get_throughput_loss(self):
+        """
+        Get loss of the pipeline throughput, caused by the data processing by parts
+        :return: fraction of the throughput with no data processing by parts, lost by the data processing by parts,
+            or None if the reference period is not evaluated
+        """
+        if self.reference_period is None or self.period <= 0:
+            return None
+        return 1.0 - self.reference_period / self.period
+
+    def __str__(self):
+        return "{samples: " + str(self.samples) + ", makespan: " + str(self.makespan) + \
+               ", latency: " + str(self.latency) + \
+               ", period: " + str(self.period) + ", throughput: " + str(self.get_throughput()) + \
+               ", utilization: " + str(self.utilization_per_processor) + \
+               ", throughput loss: " + str(self.get_throughput_loss()) + \
+               ", period samples: " + str(self.period_samples) + "}"
+
+
+def get_timed_time_per_layer(dnn: DNN, phases_per_layer: {}, layer_latency_func, delay_per_phase_ms=0.0005):
+    """
+    Get execution time of DNN layers, processing data by parts
+    :param dnn: DNN
+    :param phases_per_layer: dictionary where key (str) = name of a DNN layer,
+        value (int) = number of phases, performed by the layer
+    :param layer_latency_func: function (layer, layer_phases) -> latency (ms) of the layer
+        (see eval_layer_phases_latency_ms())
+    :param delay_per_phase_ms: sync. delay (ms) per one extra phase
+    :return: dictionary where key (str) = name of a DNN layer, value = execution time (ms) of the layer
+    """
+    time_per_layer = {}
+    for layer in dnn.get_layers():
+        layer_phases = phases_per_layer.get(layer.name, layer.phases)
+        extra_phases = max(layer_phases, 1) - 1
+        time_per_layer[layer.name] = layer_latency_func(layer, layer_phases) + extra_phases * delay_per_phase_ms
+    return time_per_layer
+
+
+def simulate_pipeline_timed(dnn: DNN,
+                            mapping: [],
+                            phases_per_layer: {},
+                            layer_latency_func,
+                            samples=10,
+                            delay_per_phase_ms=0.0005,
+                            proc_names=None,
+                            max_samples_in_flight=None,
+                            steady_state=False,
+                            ref_actor_id=0):
+    """
+    Simulate execution of a DNN, mapped on multiple processors and executed as a pipeline
+    :param dnn: DNN
+    :param mapping: mapping = [proc_tasks_1, proc_tasks_2, ..., proc_tasks_M] of the DNN layers (tasks)
+        on the processors (see partition_dnn_with_mapping()), where proc_tasks_j is a list of ids of
+        the layers, mapped on the j-th processor
+    :param phases_per_layer: dictionary where key (str) = name of a DNN layer,
+        value (int) = number of phases, performed by the layer
+    :param layer_latency_func: function (layer, layer_phases) -> latency (ms) of the layer
+        (see eval_layer_phases_latency_ms())
+    :param samples: number of input samples to process. In the steady-state mode, maximum number of
+        input samples to process before the periodic regime should be found
+    :param delay_per_phase_ms: sync. delay (ms) per one extra phase
+    :param proc_names: (optional) names of the processors of the mapping. If None, the j-th processor
+        of the mapping is named "proc<j>"
+    :param max_samples_in_flight: (optional) maximum number of samples, processed at the same time: the input
+        actors only start sample s after sample s - max_samples_in_flight is processed. If None, samples are
+        not limited in the finite mode, and limited by twice the number of processors in the steady-state mode
+    :param steady_state: (flag) if True, the simulation stops as soon as the periodic regime is found,
+        and the period is derived from the detected cycle. If the periodic regime is not found within
+        the given number of samples, all the samples are simulated, as in the finite mode
+    :param ref_actor_id: id of the reference actor: in the steady-state mode, the execution state is
+        recorded every time the reference actor completes a sample
+    :return: result of the simulation (TimedPipelineSimulation)
+    """
+    if samples < 1:
+        raise Exception("Timed simulation error: at least one sample should be simulated")
+    if proc_names is None:
+        proc_names = ["proc" + str(proc_id) for proc_id in range(len(mapping))]
+    if len(proc_names) != len(mapping):
+        raise Exception("Timed simulation error: " + str(len(proc_names)) + " processor names are given for " +
+                        str(len(mapping)) + " processors of the mapping")
+    if steady_state and max_samples_in_flight is None:
+        max_samples_in_flight = 2 * len(mapping)
+    if max_samples_in_flight is not None and max_samples_in_flight < 1:
+        raise Exception("Timed simulation error: at least one sample should be processed at a time")
+
+    time_per_layer = get_timed_time_per_layer(dnn, phases_per_layer, layer_latency_func, delay_per_phase_ms)
+    csdfg = dnn_to_csfd_one_to_one(dnn, phases_per_layer=phases_per_layer, time_per_layer=time_per_layer)
+    if not check_csdfg_consistency(csdfg, verbose=False):
+        raise Exception("Timed simulation error: CSDF graph of DNN " + dnn.name + " is inconsistent")
+    cg = CompiledCSDFGraph(csdfg)
+    actors_num = cg.actors_num
+    if steady_state and cg.actor_phases[ref_actor_id] == 0:
+        raise Exception("Timed simulation error: reference actor " + cg.actor_names[ref_actor_id] +
+                        " performs no phases")
+    actor_phases = cg.actor_phases
+    time_per_phase = cg.time_per_phase
+    prod_seqs = cg.prod_seqs
+    cons_seqs = cg.cons_seqs
+    proc_per_actor = _get_proc_per_actor(mapping, actors_num)
+    inputs_per_actor = [cg.get_input_channel_ids(actor_id) for actor_id in range(actors_num)]
+    outputs_per_actor = [cg.get_output_channel_ids(actor_id) for actor_id in range(actors_num)]
+    # actors, which readiness can change after the actor fires: the actor itself and consumers of its outputs
+    affected_actors_per_actor = [sorted({actor_id} | {cg.channel_dst[channel_id]
+                                                      for channel_id in outputs_per_actor[actor_id]})
+                                 for actor_id in range(actors_num)]
+    # input actors: actors, which start a new sample only after sample s - max_samples_in_flight is processed
+    input_actor_ids = [actor_id for actor_id in range(actors_num) if not inputs_per_actor[actor_id]]
+
+    # produced (not yet consumed) tokens of every channel: FIFO of [tokens, production time]
+    produced_tokens = [deque() for _ in range(cg.channels_num)]
+    stored_tokens = [0 for _ in range(cg.channels_num)]
+    # phases, performed by every actor (over all samples)
+    fired_phases = [0 for _ in range(actors_num)]
+    # time (ms) when every sample is processed and phases, left to process every sample
+    end_time_per_sample = [0.0 for _ in range(samples)]
+    phases_left_per_sample = [sum(actor_phases) for _ in range(samples)]
+
+    def get_data_ready_time(actor_id):
+        """ Time, when all the tokens, consumed by the next phase of the actor, are produced,
+        or None if the tokens are not produced yet"""
+        phases = actor_phases[actor_id]
+        if phases == 0 or fired_phases[actor_id] >= phases * samples:
+            return None
+        sample, phase = divmod(fired_phases[actor_id], phases)
+        ready_time = 0.0
+        if max_samples_in_flight is not None and not inputs_per_actor[actor_id] and sample >= max_samples_in_flight:
+            # back-pressure: the input actor waits for sample s - max_samples_in_flight to be processed
+            if phases_left_per_sample[sample - max_samples_in_flight] > 0:
+                return None
+            ready_time = end_time_per_sample[sample - max_samples_in_flight]
+        for channel_id in inputs_per_actor[actor_id]:
+            cons_rate = cons_seqs[channel_id][phase]
+            if stored_tokens[channel_id] < cons_rate:
+                return None
+            # the last consumed token is produced last
+            for tokens, production_time in produced_tokens[channel_id]:
+                if cons_rate <= 0:
+                    break
+                ready_time = max(ready_time, production_time)
+                cons_rate -= tokens
+        return ready_time
+
+    # data ready time of every actor, ready to fire, per processor
+    ready_time_per_actor_per_proc = [{} for _ in mapping]
+    for actor_id in range(actors_num):
+        data_ready_time = get_data_ready_time(actor_id)
+        if data_ready_time is not None:
+            ready_time_per_actor_per_proc[proc_per_actor[actor_id]][actor_id] = data_ready_time
+    last_actor_per_proc = [-1 for _ in mapping]
+
+    trace = SimTrace()
+    busy_time_per_proc = [0.0 for _ in mapping]
+    # recorded execution states: key = state, value = (samples, completed by the reference actor,
+    # reference completion time, busy time per processor)
+    ref_completion_per_state = {}
+    cycle = None
+    while True:
+        # next phase to execute: the phase with the earliest start time among all processors
+        next_firing = None
+        for proc_id, ready_time_per_actor in enumerate(ready_time_per_actor_per_proc):
+            proc_time = trace.get_proc_time(proc_names[proc_id])
+            for actor_id, data_ready_time in ready_time_per_actor.items():
+                start_time = max(proc_time, data_ready_time)
+                circular_distance = (actor_id - last_actor_per_proc[proc_id] - 1) % actors_num
+                firing = (start_time, circular_distance, proc_id, actor_id)
+                if next_firing is None or firing < next_firing:
+                    next_firing = firing
+        if next_firing is None:
+            break
+        start_time, _, proc_id, actor_id = next_firing
+
+        # fire actor: consume input data, produce output data
+        phases = actor_phases[actor_id]
+        sample, phase = divmod(fired_phases[actor_id], phases)
+        end_time = start_time + time_per_phase[actor_id][phase]
+        for channel_id in inputs_per_actor[actor_id]:
+            cons_rate = cons_seqs[channel_id][phase]
+            stored_tokens[channel_id] -= cons_rate
+            fifo = produced_tokens[channel_id]
+            while cons_rate > 0:
+                if fifo[0][0] <= cons_rate:
+                    cons_rate -= fifo.popleft()[0]
+                else:
+                    fifo[0][0] -= cons_rate
+                    cons_rate = 0
+        for channel_id in outputs_per_actor[actor_id]:
+            prod_rate = prod_seqs[channel_id][phase]
+            if prod_rate > 0:
+                stored_tokens[channel_id] += prod_rate
+                produced_tokens[channel_id].append([prod_rate, end_time])
+        job_desc = "sample " + str(sample) + ", phase " + str(phase + 1) + "/" + str(phases)
+        trace.add_job_record(cg.actor_names[actor_id], job_desc, proc_names[proc_id], start_time, end_time,
+                             task_id=actor_id)
+        fired_phases[actor_id] += 1
+        last_actor_per_proc[proc_id] = actor_id
+        busy_time_per_proc[proc_id] += end_time - start_time
+        end_time_per_sample[sample] = max(end_time_per_sample[sample], end_time)
+        phases_left_per_sample[sample] -= 1
+
+        # update ready actors. Once a sample is processed, input actors can start a new sample
+        affected_actor_ids = affected_actors_per_actor[actor_id]
+        if max_samples_in_flight is not None and phases_left_per_sample[sample] == 0:
+            affected_actor_ids = sorted(set(affected_actor_ids).union(input_actor_ids))
+        for affected_actor_id in affected_actor_ids:
+            ready_time_per_actor = ready_time_per_actor_per_proc[proc_per_actor[affected_actor_id]]
+            data_ready_time = get_data_ready_time(affected_actor_id)
+            if data_ready_time is None:
+                ready_time_per_actor.pop(affected_actor_id, None)
+            else:
+                ready_time_per_actor[affected_actor_id] = data_ready_time
+
+        # reference actor completed a sample: record the execution state. The states are recorded
+        # after the first sample is processed (so that its latency is known) and before any actor has
+        # processed all the samples (after that, the actor stops, and the execution is no longer periodic)
+        if steady_state and actor_id == ref_actor_id and phase == phases - 1 and phases_left_per_sample[0] == 0 \
+                and all(fired_phases[a_id] < actor_phases[a_id] * samples
+                        for a_id in range(actors_num) if actor_phases[a_id] > 0):
+            ref_samples = sample + 1
+            state = _get_timed_execution_state(fired_phases, actor_phases, ref_samples, end_time, stored_tokens,
+                                               produced_tokens, [trace.get_proc_time(proc_name)
+                                                                 for proc_name in proc_names],
+                                               last_actor_per_proc, input_actor_ids, max_samples_in_flight,
+                                               end_time_per_sample, phases_left_per_sample)
+            first_ref_completion = ref_completion_per_state.get(state)
+            if first_ref_completion is not None:
+                cycle = (first_ref_completion, (ref_samples, end_time, list(busy_time_per_proc)))
+                break
+            ref_completion_per_state[state] = (ref_samples, end_time, list(busy_time_per_proc))
+
+    latency = end_time_per_sample[0]
+    if cycle is not None:
+        # period and throughput of the detected cycle
+        (first_samples, first_time, first_busy_time_per_proc), (ref_samples, ref_time, busy_time_per_proc) = cycle
+        period_samples = ref_samples - first_samples
+        period_time = ref_time - first_time
+        makespan = max(trace.get_proc_time(proc_name) for proc_name in proc_names)
+        time_per_sample_per_processor = {
+            proc_names[proc_id]: (busy_time_per_proc[proc_id] - first_busy_time_per_proc[proc_id]) / period_samples
+            for proc_id in range(len(mapping))}
+        utilization_per_processor = {
+            proc_names[proc_id]: (busy_time_per_proc[proc_id] - first_busy_time_per_proc[proc_id]) / period_time
+            if period_time > 0 else 0.0 for proc_id in range(len(mapping))}
+        return TimedPipelineSimulation(ref_samples, makespan, latency, period_time / period_samples,
+                                       time_per_sample_per_processor, utilization_per_processor, trace,
+                                       transient_samples=first_samples, period_samples=period_samples)
+
+    for actor_id in range(actors_num):
+        if fired_phases[actor_id] != actor_phases[actor_id] * samples:
+            raise Exception("Timed simulation error: actor " + cg.actor_names[actor_id] + " performed " +
+                            str(fired_phases[actor_id]) + "/" + str(actor_phases[actor_id] * samples) + " phases")
+
+    makespan = max(end_time_per_sample)
+    period = (end_time_per_sample[-1] - end_time_per_sample[0]) / (samples - 1) if samples > 1 else makespan
+    time_per_sample_per_processor = {proc_names[proc_id]: busy_time_per_proc[proc_id] / samples
+                                     for proc_id in range(len(mapping))}
+    utilization_per_processor = {proc_names[proc_id]: busy_time_per_proc[proc_id] / makespan if makespan > 0 else 0.0
+                                 for proc_id in range(len(mapping))}
+    return TimedPipelineSimulation(samples, makespan, latency, period, time_per_sample_per_processor,
+                                   utilization_per_processor, trace)
+
+
+def simulate_dnn_pipeline_timed(dnn: DNN,
+                                mapping: [],
+                                dp_encoding: [bool],
+                                layer_latency_func,
+                                samples=10,
+                                delay_per_phase_ms=0.0005,
+                                proc_names=None,
+                                max_samples_in_flight=None,
+                                steady_state=False):
+    """
+    Simulate execution of a DNN, mapped on multiple processors and executed as a pipeline, and evaluate
+    the loss of the pipeline throughput, caused by the data processing by parts
+    :param dnn: DNN
+    :param mapping: mapping = [proc_tasks_1, proc_tasks_2, ..., proc_tasks_M] of the DNN layers (tasks)
+        on the processors (see partition_dnn_with_mapping())
+    :param dp_encoding: data processing by parts of the DNN layers, encoded in a binary string
+        (see DSE/low_memory/mms/phases_derivation.py). If None, no data processing by parts is performed
+    :param layer_latency_func: function (layer, layer_phases) -> latency (ms) of the layer
+        (see eval_layer_phases_latency_ms())
+    :param samples: number of input samples to process
+    :param delay_per_phase_ms: sync. delay (ms) per one extra phase
+    :param proc_names: (optional) names of the processors of the mapping (see simulate_pipeline_timed())
+    :param max_samples_in_flight: (optional) maximum number of samples, processed at the same time
+        (see simulate_pipeline_timed())
+    :param steady_state: (flag) if True, the period is derived from the detected periodic regime
+        (see simulate_pipeline_timed())
+    :return: result of the simulation (TimedPipelineSimulation) with evaluated reference period
+    """
+    from DSE.low_memory.mms.phases_derivation import get_phases_per_layer
+
+    no_dp_phases = {layer.name: 1 for layer in dnn.get_layers()}
+    if dp_encoding is None:
+        phases = no_dp_phases
+    else:
+        phases = get_phases_per_layer(dnn, dp_encoding)
+
+    result = simulate_pipeline_timed(dnn, mapping, phases, layer_latency_func, samples=samples,
+                                     delay_per_phase_ms=delay_per_phase_ms, proc_names=proc_names,
+                                     max_samples_in_flight=max_samples_in_flight, steady_state=steady_state)
+    reference = simulate_pipeline_timed(dnn, mapping, no_dp_phases, layer_latency_func, samples=samples,
+                                        delay_per_phase_ms=delay_per_phase_ms, proc_names=proc_names,
+                                        max_samples_in_flight=max_samples_in_flight, steady_state=steady_state)
+    result.reference_period = reference.period
+    return result
+
+
+def export_gantt_trace(trace: SimTrace, abs_path, time_scale=1000.0):
+    """
+    Export jobs of the simulation trace as a Gantt chart in the trace event format
+    (can be viewed in chrome://tracing or https://ui.perfetto.dev)
+    :param trace: simulation trace
+    :param abs_path: abs path to output .json file
+    :param time_scale: number of microseconds in one time unit of the trace (1000 for traces in ms)
+    """
+    events = []
+    for job in trace.jobs:
+        events.append({"name": job.task,
+                       "cat": job.job,
+                       "ph": "X",
+                       "ts": job.start_time * time_scale,
+                       "dur": (job.end_time - job.start_time) * time_scale,
+                       "pid": 0,
+                       "tid": job.processor_name})
+    save_as_json(abs_path, {"traceEvents": events, "displayTimeUnit": "ms"}, pretty_printing=False)
+
+
+def _get_timed_execution_state(fired_phases, actor_phases, ref_samples, ref_time, stored_tokens, produced_tokens,
+                               time_per_proc, last_actor_per_proc, input_actor_ids, max_samples_in_flight,
+                               end_time_per_sample, phases_left_per_sample):
+    """
+    Get state of the timed pipeline execution, recorded when the reference actor completes a sample.
+    All the phases and samples are taken relative to the samples, completed by the reference actor, and
+    all the times are taken relative to the reference completion time, so that the state repeats
+    every period of the periodic regime
+    :param ref_samples: number of samples, completed by the reference actor
+    :param ref_time: time (ms) when the reference actor completed the last sample
+    :param time_per_proc: clock (ms) of every processor
+    :return: execution state (tuple)
+    """
+    phases_per_actor = tuple(fired_phases[actor_id] - actor_phases[actor_id] * ref_samples
+                             for actor_id in range(len(actor_phases)))
+    tokens_per_channel = tuple(tuple((tokens, round(production_time - ref_time, STATE_TIME_DECIMALS))
+                                     for tokens, production_time in fifo) for fifo in produced_tokens)
+    proc_clocks = tuple(round(proc_time - ref_time, STATE_TIME_DECIMALS) for proc_time in time_per_proc)
+
+    # samples in flight: samples, the input actors wait for, and samples, not yet processed by all the actors
+    first_sample = min([fired_phases[actor_id] // actor_phases[actor_id] for actor_id in input_actor_ids
+                        if actor_phases[actor_id] > 0] + [ref_samples]) - max_samples_in_flight
+    last_sample = max(-(-fired_phases[actor_id] // actor_phases[actor_id])
+                      for actor_id in range(len(actor_phases)) if actor_phases[actor_id] > 0)
+    samples_in_flight = tuple((phases_left_per_sample[sample],
+                               round(end_time_per_sample[sample] - ref_time, STATE_TIME_DECIMALS))
+                              if 0 <= sample < len(phases_left_per_sample) else None
+                              for sample in range(first_sample, last_sample))
+    return (phases_per_actor, tuple(stored_tokens), tokens_per_channel, proc_clocks, tuple(last_actor_per_proc),
+            first_sample - ref_samples, samples_in_flight)
+
+
+def _get_proc_per_actor(mapping: [], actors_num: int):
+    """
+    Get id of the processor, every actor (DNN layer) is mapped on
+    """
+    proc_per_actor = [-1 for _ in range(actors_num)]
+    for proc_id, proc_tasks in enumerate(mapping):
+        for task_id in proc_tasks:
+            if task_id < 0 or task_id >= actors_num:
+                raise Exception("Timed simulation error: mapping contains unknown layer " + str(task_id))
+            if proc_per_actor[task_id] != -1:
+                raise Exception("Timed simulation error: layer " + str(task_id) + " is mapped on multiple processors")
+            proc_per_actor[task_id] = proc_id
+    if -1 in proc_per_actor:
+        raise Exception("Timed simulation error: layer " + str(proc_per_actor.index(-1)) + " is not mapped")
+    return proc_per_actor
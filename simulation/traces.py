@@ -1,3 +1,6 @@
+from array import array
+
+
 class SimJob:
     """
     Simulate job execution
@@ -6,14 +9,17 @@ class SimJob:
         job (str): description of the job
         processor_name (str): name of the processor, where task is executed
         start_time (float), end_time (float): start and end times of job, executed within task
+        task_id (int): integer id of the task (e.g. id of CSDF actor), or -1 if task has no integer id
     """
+    __slots__ = ("task", "job", "processor_name", "start_time", "end_time", "task_id")
 
-    def __init__(self, task: str, job: str, processor_name: str, start_time: float, end_time: float):
+    def __init__(self, task: str, job: str, processor_name: str, start_time: float, end_time: float, task_id=-1):
         self.task = task
         self.job = job
         self.processor_name = processor_name
         self.start_time = start_time
         self.end_time = end_time
+        self.task_id = task_id
 
     def __str__(self):
         return "{task:, " + self.task + ", job: " + self.job + \
@@ -30,6 +36,7 @@ class SimMemoryAccess:
         action (str) : "read" or "write"
         start_time, end_time (float): time, when memory access happened
     """
+    __slots__ = ("task", "job", "mem_name", "action", "tokens", "start_time", "end_time")
 
     def __init__(self, task: str, job: str, mem_name: str, action: str, tokens: int, start_time: float, end_time: float):
         self.task = task
@@ -54,6 +61,8 @@ class SimMemoryOccupancyInterval:
     start_step, end_step (int): execution steps in schedule, when memory was occupied
 
     """
+    __slots__ = ("start_step", "end_step", "max_tokens")
+
     def __init__(self, start_step: int, end_step: int, max_tokens=0):
         self.start_step = start_step
         self.end_step = end_step
@@ -67,23 +76,104 @@ class SimMemoryOccupancyInterval:
 
 
 class SimTrace:
+    """
+    Simulation trace: jobs, executed during the simulation, and memory accesses, performed by the jobs.
+    The trace is stored in columns: every attribute of jobs and memory accesses is stored in a separate
+    array, where string attributes (tasks, jobs, processors, memories and actions descriptions)
+    are encoded as integers, and the strings are kept in string tables. SimJob and SimMemoryAccess
+    objects are only created on request (e.g. by get_asap_schedule())
+    """
     def __init__(self):
-        self.jobs = []
-        self.memory_accesses = []
+        # string tables
+        self.__tasks = _StringTable()
+        self.__job_descs = _StringTable()
+        self.__proc_names = _StringTable()
+        self.__mem_names = _StringTable()
+        self.__actions = _StringTable()
+
+        # jobs (columns)
+        self.__job_task = array('i')
+        self.__job_desc = array('i')
+        self.__job_proc = array('i')
+        self.__job_start = array('d')
+        self.__job_end = array('d')
+        self.__job_task_id = array('i')
+
+        # memory accesses (columns)
+        self.__mem_task = array('i')
+        self.__mem_job_desc = array('i')
+        self.__mem_mem = array('i')
+        self.__mem_action = array('i')
+        self.__mem_tokens = array('q')
+        self.__mem_start = array('d')
+        self.__mem_end = array('d')
+
+        # dictionary, where key = processor name, value = end time of
+        # the last job, executed on the processor (processor clock)
+        self.__proc_times = {}
+        # group-by indexes of memory accesses (built on request): i-th list contains
+        # ids of memory access records with i-th memory/task, in the order of the records
+        self.__mem_records_per_mem = None
+        self.__mem_records_per_task = None
+
+    @property
+    def jobs(self):
+        """ Jobs (list of SimJob), in the order of the trace"""
+        return [self.__get_job(job_id) for job_id in range(len(self.__job_task))]
+
+    @property
+    def memory_accesses(self):
+        """ Memory accesses (list of SimMemoryAccess), in the order of the trace"""
+        return [self.__get_mem_access(record_id) for record_id in range(len(self.__mem_task))]
+
+    def get_jobs_num(self):
+        return len(self.__job_task)
+
+    def get_memory_accesses_num(self):
+        return len(self.__mem_task)
 
     def add_job(self, job: SimJob):
         """
         Add new job
         :param job: simulation job
         """
-        self.jobs.append(job)
+        self.add_job_record(job.task, job.job, job.processor_name, job.start_time, job.end_time, job.task_id)
+
+    def add_job_record(self, task: str, job: str, processor_name: str, start_time: float, end_time: float,
+                       task_id=-1):
+        """
+        Add new job, specified by its attributes (see SimJob)
+        """
+        self.__job_task.append(self.__tasks.encode(task))
+        self.__job_desc.append(self.__job_descs.encode(job))
+        self.__job_proc.append(self.__proc_names.encode(processor_name))
+        self.__job_start.append(start_time)
+        self.__job_end.append(end_time)
+        self.__job_task_id.append(task_id)
+        self.__proc_times[processor_name] = max(self.__proc_times.get(processor_name, 0.0), end_time)
 
     def add_mem_access(self, mem_access: SimMemoryAccess):
         """
         Add new memory access
         :param mem_access: memory access
         """
-        self.memory_accesses.append(mem_access)
+        self.add_mem_access_record(mem_access.task, mem_access.job, mem_access.mem_name, mem_access.action,
+                                   mem_access.tokens, mem_access.start_time, mem_access.end_time)
+
+    def add_mem_access_record(self, task: str, job: str, mem_name: str, action: str, tokens: int,
+                              start_time: float, end_time: float):
+        """
+        Add new memory access, specified by its attributes (see SimMemoryAccess)
+        """
+        self.__mem_task.append(self.__tasks.encode(task))
+        self.__mem_job_desc.append(self.__job_descs.encode(job))
+        self.__mem_mem.append(self.__mem_names.encode(mem_name))
+        self.__mem_action.append(self.__actions.encode(action))
+        self.__mem_tokens.append(tokens)
+        self.__mem_start.append(start_time)
+        self.__mem_end.append(end_time)
+        self.__mem_records_per_mem = None
+        self.__mem_records_per_task = None
 
     def get_proc_time(self, proc_name):
         """
@@ -93,29 +183,28 @@ class SimTrace:
             Otherwise, 0 is returned
         :param proc_name (str) unique name of the processor
         """
-        proc_time = 0.0
-        for job in self.jobs:
-            if job.processor_name == proc_name:
-                proc_time = max(proc_time, job.end_time)
-        return proc_time
+        return self.__proc_times.get(proc_name, 0.0)
 
     def sort_tasks_by_start_time(self):
-        self.jobs.sort(key=lambda task: task.start_time)
+        # stable sort of jobs by start time
+        job_start = self.__job_start
+        order = sorted(range(len(job_start)), key=job_start.__getitem__)
+        for column in [self.__job_task, self.__job_desc, self.__job_proc,
+                       self.__job_start, self.__job_end, self.__job_task_id]:
+            column[:] = array(column.typecode, [column[job_id] for job_id in order])
 
     def get_memory_names(self):
         """ Get descriptions of all used memory"""
-        memory_names = []
-        for mem_access in self.memory_accesses:
-            if mem_access.mem_name not in memory_names:
-                memory_names.append(mem_access.mem_name)
-        return memory_names
+        return list(self.__mem_names.strings)
 
     def get_tasks(self):
         """ Get descriptions of all executed tasks"""
+        visited = bytearray(len(self.__tasks.strings))
         tasks = []
-        for job in self.jobs:
-            if job.task not in tasks:
-                tasks.append(job.task)
+        for task_code in self.__job_task:
+            if not visited[task_code]:
+                visited[task_code] = 1
+                tasks.append(self.__tasks.strings[task_code])
         return tasks
 
     def get_task_times(self):
@@ -124,11 +213,14 @@ class SimTrace:
         :return: dictionary, where key = task (str), value = tuple (start_time, end_time),
         where start_time = time, when task started, end_time = time, when task ended
         """
-        task_times = {}
-        tasks = self.get_tasks()
-        for task in tasks:
-            start_time, end_time = self.get_task_time(task)
-            task_times[task] = (start_time, end_time)
+        times_per_task_code = {}
+        for job_id in range(len(self.__job_task)):
+            task_code = self.__job_task[job_id]
+            start_time, end_time = times_per_task_code.get(task_code, (self.__job_start[job_id],
+                                                                       self.__job_end[job_id]))
+            times_per_task_code[task_code] = (min(start_time, self.__job_start[job_id]),
+                                              max(end_time, self.__job_end[job_id]))
+        return {self.__tasks.strings[task_code]: times for task_code, times in times_per_task_code.items()}
 
     def get_task_time(self, task: str):
         """
@@ -138,24 +230,19 @@ class SimTrace:
             - start time is the time when the first job of the task is executed,
             - end time is the time when the last job of the task is executed
         """
-        start_time = -1
-        end_time = -1
-        for job in self.jobs:
-            if job.task == task:
-                if start_time == -1 or job.start_step < start_time:
-                    start_time = job.start_step
-                if end_time < job.end_step:
-                    end_time = job.end_step
-        return start_time, end_time
+        return self.get_task_times().get(task, (-1, -1))
 
     def get_task_memories(self, task):
         """ Get names of all memories, ever used by the task"""
-        used_memory_names = []
-        for memory_access in self.memory_accesses:
-            if memory_access.task == task:
-                if memory_access.mem_name not in used_memory_names:
-                    used_memory_names.append(memory_access.mem_name)
-        return used_memory_names
+        task_code = self.__tasks.find(task)
+        if task_code == -1:
+            return []
+        used_memory_codes = []
+        for record_id in self.__get_mem_records_per_task()[task_code]:
+            mem_code = self.__mem_mem[record_id]
+            if mem_code not in used_memory_codes:
+                used_memory_codes.append(mem_code)
+        return [self.__mem_names.strings[mem_code] for mem_code in used_memory_codes]
 
     def get_task_memory_use_time(self, task: str, mem_name: str):
         """
@@ -168,12 +255,16 @@ class SimTrace:
         """
         start_time = -1
         end_time = -1
-        for memory_access in self.memory_accesses:
-            if memory_access.task == task and memory_access.mem_name == mem_name:
-                if start_time == -1 or memory_access.start_time < start_time:
-                    start_time = memory_access.start_time
-                if memory_access.end_time > end_time:
-                    end_time = memory_access.end_time
+        task_code = self.__tasks.find(task)
+        mem_code = self.__mem_names.find(mem_name)
+        if task_code == -1 or mem_code == -1:
+            return start_time, end_time
+        for record_id in self.__get_mem_records_per_task()[task_code]:
+            if self.__mem_mem[record_id] == mem_code:
+                if start_time == -1 or self.__mem_start[record_id] < start_time:
+                    start_time = self.__mem_start[record_id]
+                if self.__mem_end[record_id] > end_time:
+                    end_time = self.__mem_end[record_id]
         return start_time, end_time
 
     """
@@ -190,26 +281,44 @@ class SimTrace:
         """ Get all memory access records, related to memory with specified name
         :param mem_name: memory name
         """
-        mem_access_records = []
-        for mem_access in self.memory_accesses:
-            if mem_access.mem_name == mem_name:
-                mem_access_records.append(mem_access)
-        return mem_access_records
+        return [self.__get_mem_access(record_id) for record_id in self.__get_mem_record_ids(mem_name)]
 
     def get_max_stored_tokens(self, mem_name):
         """ Get maximum amount of tokens, ever read from memory or written to it"""
-        mem_access_records = self.get_mem_access_records(mem_name)
+        write_code = self.__actions.find("write")
+        read_code = self.__actions.find("read")
         max_tokens = 0
         stored_tokens = 0
-        for record in mem_access_records:
+        for record_id in self.__get_mem_record_ids(mem_name):
             # upd number of tokens stored
-            if record.action == "write":
-                stored_tokens += record.tokens
-            if record.action == "read":
-                stored_tokens -= record.tokens
+            action_code = self.__mem_action[record_id]
+            if action_code == write_code:
+                stored_tokens += self.__mem_tokens[record_id]
+            if action_code == read_code:
+                stored_tokens -= self.__mem_tokens[record_id]
             max_tokens = max(max_tokens, stored_tokens)
         return max_tokens
 
+    def get_max_stored_tokens_per_mem_name(self):
+        """
+        Get maximum amount of tokens, ever stored in every memory (in one pass over memory access records)
+        :return: dictionary, where key = memory name, value = maximum amount of tokens, ever stored in the memory
+        """
+        write_code = self.__actions.find("write")
+        read_code = self.__actions.find("read")
+        mems_num = len(self.__mem_names.strings)
+        stored_tokens_per_mem = [0 for _ in range(mems_num)]
+        max_tokens_per_mem = [0 for _ in range(mems_num)]
+        for record_id in range(len(self.__mem_mem)):
+            mem_code = self.__mem_mem[record_id]
+            action_code = self.__mem_action[record_id]
+            if action_code == write_code:
+                stored_tokens_per_mem[mem_code] += self.__mem_tokens[record_id]
+            if action_code == read_code:
+                stored_tokens_per_mem[mem_code] -= self.__mem_tokens[record_id]
+            max_tokens_per_mem[mem_code] = max(max_tokens_per_mem[mem_code], stored_tokens_per_mem[mem_code])
+        return {self.__mem_names.strings[mem_code]: max_tokens_per_mem[mem_code] for mem_code in range(mems_num)}
+
     def get_asap_schedule(self):
         """ Get ASAP (CSDF) schedule used for data processing by parts"""
         self.sort_tasks_by_start_time()
@@ -229,6 +338,20 @@ class SimTrace:
                 return step
         return -1
 
+    def get_step_per_job(self, schedule: [SimJob]):
+        """
+        Index execution steps of jobs in schedule
+        :param schedule: schedule: set of jobs in execution order
+        :return: dictionary, where key = tuple (task, job), value = (first) execution step
+            (element id in order) of the job in schedule (see find_step_in_schedule())
+        """
+        step_per_job = {}
+        for step in range(len(schedule)):
+            key = (schedule[step].task, schedule[step].job)
+            if key not in step_per_job:
+                step_per_job[key] = step
+        return step_per_job
+
     def generate_memory_occupancy_intervals_per_memory(self, schedule):
         """
         Generate memory occupancy intervals for specific schedule
@@ -237,11 +360,12 @@ class SimTrace:
         :return: dictionary, where key (string) = name of memory, value ([SimMemoryOccupancyInterval])
         is the set of memory occupancy intervals for specific schedule
         """
-        mem_access_by_mem_name = self.mem_access_grouped_by_mem_name()
+        step_per_record = self.__get_step_per_mem_record(schedule)
+        write_code = self.__actions.find("write")
+        read_code = self.__actions.find("read")
         mem_occupancy_intervals_by_name = {}
         # traverse every memory record
-        for item in mem_access_by_mem_name.items():
-            mem_name, records = item
+        for mem_code, record_ids in enumerate(self.__get_mem_records_per_mem()):
             ##################################
             # create occupancy intervals for memory mem_name
             mem_occupancy_intervals = []
@@ -249,8 +373,8 @@ class SimTrace:
             # first occupancy interval
             cur_occupancy_interval = SimMemoryOccupancyInterval(-1, -1)
 
-            for record in records:
-                mem_access_exec_step = self.find_step_in_schedule(schedule, record.task, record.job)
+            for record_id in record_ids:
+                mem_access_exec_step = step_per_record[record_id]
                 # process new interval: change start step
                 if cur_occupancy_interval.start_step == -1 and cur_occupancy_interval.end_step == -1:
                     cur_occupancy_interval.start_step = mem_access_exec_step
@@ -259,10 +383,11 @@ class SimTrace:
                 cur_occupancy_interval.end_step = max(cur_occupancy_interval.end_step, mem_access_exec_step)
 
                 # upd number of tokens stored
-                if record.action == "write":
-                    stored_tokens += record.tokens
-                if record.action == "read":
-                    stored_tokens -= record.tokens
+                action_code = self.__mem_action[record_id]
+                if action_code == write_code:
+                    stored_tokens += self.__mem_tokens[record_id]
+                if action_code == read_code:
+                    stored_tokens -= self.__mem_tokens[record_id]
 
                 cur_occupancy_interval.max_tokens = max(cur_occupancy_interval.max_tokens, stored_tokens)
 
@@ -271,7 +396,8 @@ class SimTrace:
                     mem_occupancy_intervals.append(cur_occupancy_interval)
                     cur_occupancy_interval = SimMemoryOccupancyInterval(-1, -1)
             # add memory occupancy intervals to the output dictionary
-            mem_occupancy_intervals_by_name[mem_name] = mem_occupancy_intervals
+            if record_ids:
+                mem_occupancy_intervals_by_name[self.__mem_names.strings[mem_code]] = mem_occupancy_intervals
         return mem_occupancy_intervals_by_name
 
     def generate_memory_occupancy_intervals_per_memory_first_in_last_out(self, schedule):
@@ -283,18 +409,19 @@ class SimTrace:
         :return: dictionary, where key (string) = name of memory, value ([SimMemoryOccupancyInterval])
         is the set of memory occupancy intervals for specific schedule
         """
-        mem_access_by_mem_name = self.mem_access_grouped_by_mem_name()
+        step_per_record = self.__get_step_per_mem_record(schedule)
+        write_code = self.__actions.find("write")
+        read_code = self.__actions.find("read")
         mem_occupancy_intervals_by_name = {}
         # traverse every memory record
-        for item in mem_access_by_mem_name.items():
-            mem_name, records = item
+        for mem_code, record_ids in enumerate(self.__get_mem_records_per_mem()):
             ##################################
             # create a single occupancy interval for memory mem_name
             cur_occupancy_interval = SimMemoryOccupancyInterval(-1, -1)
             stored_tokens = 0
 
-            for record in records:
-                mem_access_exec_step = self.find_step_in_schedule(schedule, record.task, record.job)
+            for record_id in record_ids:
+                mem_access_exec_step = step_per_record[record_id]
                 # process new interval: change start step
                 if cur_occupancy_interval.start_step == -1 and cur_occupancy_interval.end_step == -1:
                     cur_occupancy_interval.start_step = mem_access_exec_step
@@ -305,17 +432,71 @@ class SimTrace:
                 cur_occupancy_interval.end_step = max(cur_occupancy_interval.end_step, mem_access_exec_step)
 
                 # upd number of tokens stored
-                if record.action == "write":
-                    stored_tokens += record.tokens
-                if record.action == "read":
-                    stored_tokens -= record.tokens
+                action_code = self.__mem_action[record_id]
+                if action_code == write_code:
+                    stored_tokens += self.__mem_tokens[record_id]
+                if action_code == read_code:
+                    stored_tokens -= self.__mem_tokens[record_id]
 
                 cur_occupancy_interval.max_tokens = max(cur_occupancy_interval.max_tokens, stored_tokens)
 
             # add single memory occupancy interval to the output dictionary
-            mem_occupancy_intervals_by_name[mem_name] = [cur_occupancy_interval]
+            if record_ids:
+                mem_occupancy_intervals_by_name[self.__mem_names.strings[mem_code]] = [cur_occupancy_interval]
         return mem_occupancy_intervals_by_name
 
+    #######################
+    # columns access
+
+    def __get_job(self, job_id):
+        return SimJob(self.__tasks.strings[self.__job_task[job_id]],
+                      self.__job_descs.strings[self.__job_desc[job_id]],
+                      self.__proc_names.strings[self.__job_proc[job_id]],
+                      self.__job_start[job_id],
+                      self.__job_end[job_id],
+                      self.__job_task_id[job_id])
+
+    def __get_mem_access(self, record_id):
+        return SimMemoryAccess(self.__tasks.strings[self.__mem_task[record_id]],
+                               self.__job_descs.strings[self.__mem_job_desc[record_id]],
+                               self.__mem_names.strings[self.__mem_mem[record_id]],
+                               self.__actions.strings[self.__mem_action[record_id]],
+                               self.__mem_tokens[record_id],
+                               self.__mem_start[record_id],
+                               self.__mem_end[record_id])
+
+    def __get_mem_records_per_mem(self):
+        if self.__mem_records_per_mem is None:
+            self.__mem_records_per_mem = _group_by(self.__mem_mem, len(self.__mem_names.strings))
+        return self.__mem_records_per_mem
+
+    def __get_mem_records_per_task(self):
+        if self.__mem_records_per_task is None:
+            self.__mem_records_per_task = _group_by(self.__mem_task, len(self.__tasks.strings))
+        return self.__mem_records_per_task
+
+    def __get_mem_record_ids(self, mem_name):
+        mem_code = self.__mem_names.find(mem_name)
+        if mem_code == -1:
+            return []
+        return self.__get_mem_records_per_mem()[mem_code]
+
+    def __get_step_per_mem_record(self, schedule):
+        """
+        Get execution step of the job, which performed every memory access record, in schedule
+        (see find_step_in_schedule())
+        """
+        step_per_job = self.get_step_per_job(schedule)
+        # step per encoded (task, job)
+        step_per_job_code = {}
+        for (task, job), step in step_per_job.items():
+            task_code = self.__tasks.find(task)
+            job_code = self.__job_descs.find(job)
+            if task_code != -1 and job_code != -1:
+                step_per_job_code[(task_code, job_code)] = step
+        return [step_per_job_code.get((self.__mem_task[record_id], self.__mem_job_desc[record_id]), -1)
+                for record_id in range(len(self.__mem_task))]
+
     """
     def merge_memory_occupancy_intervals_per_memory(self, mem_occupancy_intervals_by_name):
         
@@ -362,7 +543,7 @@ class SimTrace:
     # print functions
 
     def print_asap_schedule(self, specify_jobs=True):
-        print("schedule of", len(self.jobs), "steps")
+        print("schedule of", self.get_jobs_num(), "steps")
         step_id = 1
         schedule = self.get_asap_schedule()
         for job in schedule:
@@ -414,10 +595,10 @@ class SimTrace:
             value = list of memory access records to the memory with specified name
         """
         mem_access_by_mem_name = {}
-        for mem_access in self.memory_accesses:
-            if mem_access.mem_name not in mem_access_by_mem_name.keys():
-                mem_access_by_mem_name[mem_access.mem_name] = []
-            mem_access_by_mem_name[mem_access.mem_name].append(mem_access)
+        for mem_code, record_ids in enumerate(self.__get_mem_records_per_mem()):
+            if record_ids:
+                mem_access_by_mem_name[self.__mem_names.strings[mem_code]] = \
+                    [self.__get_mem_access(record_id) for record_id in record_ids]
         return mem_access_by_mem_name
 
     def print_proc_trace(self, proc_name):
@@ -434,7 +615,7 @@ class SimTrace:
                 for job in self.jobs:
                     if job.task == task:
                         print("job:", job.job, ", processor:", job.processor_name,
-                              "start: ", job.start_step, "end: ", job.end_time)
+                              "start: ", job.start_time, "end: ", job.end_time)
 
     def print_mem_use_per_task(self, print_time=True):
         tasks = self.get_tasks()
@@ -448,3 +629,36 @@ class SimTrace:
                 else:
                     print(" memory: ", mem_name)
 
+
+
+class _StringTable:
+    """ Table of (distinct) strings, where every string is encoded with its (integer) id in the table"""
+    __slots__ = ("strings", "codes")
+
+    def __init__(self):
+        self.strings = []
+        self.codes = {}
+
+    def encode(self, string):
+        code = self.codes.get(string)
+        if code is None:
+            code = len(self.strings)
+            self.codes[string] = code
+            self.strings.append(string)
+        return code
+
+    def find(self, string):
+        return self.codes.get(string, -1)
+
+
+def _group_by(codes: array, groups_num: int):
+    """
+    Group record ids by code
+    :param codes: code of every record
+    :param groups_num: number of codes
+    :return: list, where i-th element is the list of ids of records with code = i, in increasing order
+    """
+    record_ids_per_code = [[] for _ in range(groups_num)]
+    for record_id in range(len(codes)):
+        record_ids_per_code[codes[record_id]].append(record_id)
+    return record_ids_per_code
@@ -70,7 +70,12 @@ def run_integration_test(info_level):
              "selection_single_dnn", "selection_single_dnn_pipeline",
              "selection_multi_dnn", "selection_multi_dnn_pipeline",
              "final_app_single_dnn", "final_app_single_dnn_pipeline",
-             "final_app_multi_dnn", "final_app_multi_dnn_pipeline"]
+             "final_app_multi_dnn", "final_app_multi_dnn_pipeline",
+             "analytic_buf_eval", "steady_state", "timed_simulation",
+             "arena_planning", "optimal_buf_reuse", "lower_bound_pruning",
+             "fitness_cache", "pareto_archive", "ga_checkpoint",
+             "reuse_buffers_sorted", "reuse_buffers_among_csdf", "ga_single_dnn_direct",
+             "time_loss_closed_form", "csdf_fragments", "mms_chromosome_operators", "timed_steady_state"]
     for step in steps:
         step_executed = run_test_step(step, info_level)
         if step_executed is False:
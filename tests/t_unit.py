@@ -21,7 +21,12 @@ def main():
                              'selection_single_dnn, selection_single_dnn_pipeline, '
                              'selection_multi_dnn, selection_multi_dnn_pipeline, '
                              'final_app_single_dnn, final_app_single_dnn_pipeline, '
-                             'final_app_multi_dnn, final_app_multi_dnn_pipeline]')
+                             'final_app_multi_dnn, final_app_multi_dnn_pipeline, '
+                             'analytic_buf_eval, steady_state, timed_simulation, arena_planning, '
+                             'optimal_buf_reuse, lower_bound_pruning, fitness_cache, pareto_archive, '
+                             'ga_checkpoint, reuse_buffers_sorted, reuse_buffers_among_csdf, '
+                             'ga_single_dnn_direct, time_loss_closed_form, csdf_fragments, '
+                             'mms_chromosome_operators, timed_steady_state]')
 
     parser.add_argument('--info-level', metavar='--info-level', type=int, action='store', default=1,
                         help='Info-level, i.e., amount of information to print out during the tests run. '
@@ -95,6 +100,56 @@ def run_test_step(step: str, info_level):
         result = run_test_final_app_multi_dnn_pipeline(config, info_level)
         return result
 
+    # buffers evaluation
+    if step == "analytic_buf_eval":
+        result = run_test_analytic_buf_eval(config, info_level)
+        return result
+    if step == "steady_state":
+        result = run_test_steady_state(config, info_level)
+        return result
+    if step == "timed_simulation":
+        result = run_test_timed_simulation(config, info_level)
+        return result
+    if step == "arena_planning":
+        result = run_test_arena_planning(config, info_level)
+        return result
+    if step == "optimal_buf_reuse":
+        result = run_test_optimal_buf_reuse(config, info_level)
+        return result
+    if step == "lower_bound_pruning":
+        result = run_test_lower_bound_pruning(config, info_level)
+        return result
+    if step == "fitness_cache":
+        result = run_test_fitness_cache(config, info_level)
+        return result
+    if step == "pareto_archive":
+        result = run_test_pareto_archive(config, info_level)
+        return result
+    if step == "ga_checkpoint":
+        result = run_test_ga_checkpoint(config, info_level)
+        return result
+    if step == "reuse_buffers_sorted":
+        result = run_test_reuse_buffers_sorted(config, info_level)
+        return result
+    if step == "reuse_buffers_among_csdf":
+        result = run_test_reuse_buffers_among_csdf(config, info_level)
+        return result
+    if step == "ga_single_dnn_direct":
+        result = run_test_ga_single_dnn_direct(config, info_level)
+        return result
+    if step == "time_loss_closed_form":
+        result = run_test_time_loss_closed_form(config, info_level)
+        return result
+    if step == "csdf_fragments":
+        result = run_test_csdf_fragments(config, info_level)
+        return result
+    if step == "mms_chromosome_operators":
+        result = run_test_mms_chromosome_operators(config, info_level)
+        return result
+    if step == "timed_steady_state":
+        result = run_test_timed_steady_state(config, info_level)
+        return result
+
     raise Exception("Unknown tests step: " + step)
 
 ###################################################
@@ -579,6 +634,1461 @@ def run_test_case_final_app_generation(app_config_path,
     return test_passed
 
 
+###################################################
+#              Buffers evaluation                 #
+
+def run_test_analytic_buf_eval(config: {}, info_level):
+    """
+    Cross-check analytic buffers evaluation against the simulation for every DNN in the data folder,
+    with no data processing by parts, with max data processing by parts and with random data processing by parts
+    :param config: test app_config (see ../test_config.py)
+    :param info_level: amount of information to print out during the tests run.
+        If info-level == 0, no information is printed to console.
+        If info-level == 1, only tests information (e.g., which steps of the tests were successful)
+        is printed to console.
+        If info-level == 2, tests information (e.g., which steps of the tests were successful)
+        as well as script-specific verbose output is printed to the console
+    :return: True if tests ran successfully and False otherwise
+    """
+    import random
+    from converters.json_converters.json_to_dnn import parse_json_dnn
+    from models.data_buffers import build_naive_csdfg_buffers
+    from DSE.low_memory.mms.buf_building import build_csdf_reuse_buffers
+
+    if info_level > 0:
+        print("RUN analytic buffers evaluation cross-check")
+
+    random.seed(0)
+    test_passed = True
+    for dnn_file, dnn_path in get_test_dnn_files(config):
+        try:
+            dnn = parse_json_dnn(dnn_path)
+            for _, _, csdf in build_test_csdf_graphs(dnn, [0.0, 1.0, 0.5], skip_inconsistent=False):
+                build_csdf_reuse_buffers(csdf, build_naive_csdfg_buffers(csdf), buf_eval_mode="verify")
+            if info_level > 1:
+                print("  ", dnn_file, "- SUCCESS")
+        except Exception as e:
+            test_passed = False
+            if info_level > 0:
+                print("  ", dnn_file, "- FAILURE:", str(e))
+
+    if info_level > 0:
+        print("  -", "SUCCESS" if test_passed else "FAILURE")
+    return test_passed
+
+
+def get_test_dnn_files(config: {}):
+    """
+    Get .json DNN files in the json_dnn data folder
+    :param config: test app_config (see ../test_config.py)
+    :return: list of tuples (DNN file name, DNN file path), sorted by the file name
+    """
+    json_dnn_dir = str(os.path.join(config["input_files_folder_abs"], "json_dnn"))
+    return [(dnn_file, os.path.join(json_dnn_dir, dnn_file))
+            for dnn_file in sorted(os.listdir(json_dnn_dir)) if dnn_file.endswith(".json")]
+
+
+def build_test_csdf_graphs(dnn, dp_by_parts_probabilities: [], skip_inconsistent=True):
+    """
+    Build CSDF graphs of a DNN, where every layer processes data by parts (performs the max number of phases)
+    with a given probability, and layers have fake execution time (see get_sim_time_per_layer())
+    :param dnn: DNN
+    :param dp_by_parts_probabilities: probabilities of data processing by parts, one CSDF graph per probability
+    :param skip_inconsistent: if True, inconsistent CSDF graphs are skipped
+    :return: generator of tuples (probability of data processing by parts, phases per layer, CSDF graph)
+    """
+    import random
+    from converters.dnn_to_csdf import dnn_to_csfd_one_to_one
+    from models.csdf_model.csdf import check_csdfg_consistency
+    from DSE.low_memory.dp_by_parts import get_max_phases_per_layer
+    from DSE.low_memory.mms.buf_building import get_sim_time_per_layer
+
+    max_phases_per_layer = get_max_phases_per_layer(dnn)
+    for dp_by_parts_probability in dp_by_parts_probabilities:
+        phases_per_layer = {}
+        for layer in dnn.get_layers():
+            processes_by_parts = random.uniform(0, 1) < dp_by_parts_probability
+            phases_per_layer[layer.name] = max_phases_per_layer[layer.name] if processes_by_parts else 1
+        csdf = dnn_to_csfd_one_to_one(dnn,
+                                      phases_per_layer=phases_per_layer,
+                                      time_per_layer=get_sim_time_per_layer(dnn, phases_per_layer))
+        if skip_inconsistent and not check_csdfg_consistency(csdf, verbose=False):
+            continue
+        yield dp_by_parts_probability, phases_per_layer, csdf
+
+
+def eval_test_analytic_buffers(csdf):
+    """
+    Evaluate naive buffers of a (consistent) CSDF graph analytically in the ASAP schedule
+    :param csdf: CSDF graph
+    :return: tuple (max tokens per memory name, occupancy intervals per memory name,
+        (start, end) occupancy interval per memory name, max breadth), where the max breadth is
+        the max total size of memories, occupied at the same step
+    """
+    from models.csdf_model.compiled_csdf import CompiledCSDFGraph
+    from models.data_buffers import build_naive_csdfg_buffers
+    from DSE.low_memory.analytic_buf_eval import eval_asap_buffers_analytic
+
+    compiled_csdf = CompiledCSDFGraph(csdf, build_naive_csdfg_buffers(csdf))
+    _, max_tokens, occupancy_intervals = eval_asap_buffers_analytic(compiled_csdf)
+    intervals = {mem_name: (mem_intervals[0].start_step, mem_intervals[0].end_step)
+                 for mem_name, mem_intervals in occupancy_intervals.items()}
+    max_breadth = 0
+    for step in set(start for start, end in intervals.values()):
+        breadth = sum(max_tokens[mem_name] for mem_name, (start, end) in intervals.items() if start <= step <= end)
+        max_breadth = max(max_breadth, breadth)
+    return max_tokens, occupancy_intervals, intervals, max_breadth
+
+
+def run_test_steady_state(config: {}, info_level):
+    """
+    Check steady-state analysis of the ASAP execution for every (consistent) DNN in the data folder,
+    with no data processing by parts, with max data processing by parts and with random data processing by parts:
+    within a period, every actor should perform all its phases for every processed sample, and
+    the steady-state buffers requirements should not exceed the buffers sizes
+    :param config: test app_config (see ../test_config.py)
+    :param info_level: amount of information to print out during the tests run.
+        If info-level == 0, no information is printed to console.
+        If info-level == 1, only tests information (e.g., which steps of the tests were successful)
+        is printed to console.
+        If info-level == 2, tests information (e.g., which steps of the tests were successful)
+        as well as script-specific verbose output is printed to the console
+    :return: True if tests ran successfully and False otherwise
+    """
+    import random
+    from converters.json_converters.json_to_dnn import parse_json_dnn
+    from models.data_buffers import build_naive_csdfg_buffers
+    from simulation.steady_state import analyze_steady_state_asap
+
+    if info_level > 0:
+        print("RUN steady-state analysis check")
+
+    random.seed(0)
+    test_passed = True
+    for dnn_file, dnn_path in get_test_dnn_files(config):
+        try:
+            dnn = parse_json_dnn(dnn_path)
+            for _, _, csdf in build_test_csdf_graphs(dnn, [0.0, 1.0, 0.5]):
+                csdf_buffers = build_naive_csdfg_buffers(csdf)
+                steady_state = analyze_steady_state_asap(csdf, csdf_buffers)
+                if steady_state is None:
+                    raise Exception("periodic regime not found")
+
+                firings_per_actor = [0 for _ in csdf.get_actors()]
+                for actor_id in steady_state.period_exec_order:
+                    firings_per_actor[actor_id] += 1
+                period_time = 0
+                for actor_id, actor in enumerate(csdf.get_actors()):
+                    if firings_per_actor[actor_id] != actor.phases * steady_state.period_samples:
+                        raise Exception("actor " + actor.name + " performed " + str(firings_per_actor[actor_id]) +
+                                        " phases within a period of " + str(steady_state.period_samples) + " samples")
+                    period_time += sum(actor.time_per_phase) * steady_state.period_samples
+                if abs(period_time - steady_state.period_time) > 1e-6 * max(period_time, 1):
+                    raise Exception("period time mismatch")
+                for csdf_buf in csdf_buffers:
+                    if steady_state.max_tokens_per_mem_name.get(csdf_buf.name, 0) > csdf_buf.size:
+                        raise Exception("buffer " + csdf_buf.name + " overflow")
+            if info_level > 1:
+                print("  ", dnn_file, "- SUCCESS")
+        except Exception as e:
+            test_passed = False
+            if info_level > 0:
+                print("  ", dnn_file, "- FAILURE:", str(e))
+
+    if info_level > 0:
+        print("  -", "SUCCESS" if test_passed else "FAILURE")
+    return test_passed
+
+
+def run_test_timed_simulation(config: {}, info_level):
+    """
+    Check timed simulation of DNNs, mapped on multiple processors and executed as a pipeline,
+    for every mapping in the pipeline parallelism data folder, with FLOPs-based layers latency,
+    with no data processing by parts and with max data processing by parts:
+    every layer should be executed on the processor, it is mapped on, jobs, executed on every processor,
+    should not overlap, processors utilization should not exceed 1, and the processors should not process
+    the samples faster than the most loaded processor. With no data processing by parts, a layer should only
+    start processing a sample after the layers it receives data from have processed the sample.
+    With max data processing by parts, the processors should process parts of the same sample
+    at the same time (for at least one mapping)
+    :param config: test app_config (see ../test_config.py)
+    :param info_level: amount of information to print out during the tests run.
+        If info-level == 0, no information is printed to console.
+        If info-level == 1, only tests information (e.g., which steps of the tests were successful)
+        is printed to console.
+        If info-level == 2, tests information (e.g., which steps of the tests were successful)
+        as well as script-specific verbose output is printed to the console
+    :return: True if tests ran successfully and False otherwise
+    """
+    from functools import partial
+    from converters.json_converters.json_to_dnn import parse_json_dnn
+    from fileworkers.json_fw import read_json
+    from eval.latency.layer_latency import eval_layer_phases_latency_ms
+    from simulation.timed_simulation import simulate_dnn_pipeline_timed, export_gantt_trace
+
+    if info_level > 0:
+        print("RUN timed pipeline simulation check")
+
+    mappings_dir = str(os.path.join(config["input_files_folder_abs"], "pipeline_parallelism"))
+    json_dnn_dir = str(os.path.join(config["input_files_folder_abs"], "json_dnn"))
+    layer_latency_func = partial(eval_layer_phases_latency_ms, latency_model="flops", gops_per_sec=100)
+    samples = 5
+    test_passed = True
+    sample_parts_overlap = False
+    for mapping_file in sorted(os.listdir(mappings_dir)):
+        if not mapping_file.endswith(".json"):
+            continue
+        try:
+            dnn = parse_json_dnn(os.path.join(json_dnn_dir, mapping_file))
+            mapping = read_json(os.path.join(mappings_dir, mapping_file))
+            proc_names = ["cpu" + str(proc_id) for proc_id in range(len(mapping))]
+            proc_name_per_layer = {layer_id: proc_names[proc_id] for proc_id, proc_tasks in enumerate(mapping)
+                                   for layer_id in proc_tasks}
+            for dp_by_parts in [False, True]:
+                dp_encoding = [True for _ in dnn.get_layers()] if dp_by_parts else None
+                result = simulate_dnn_pipeline_timed(dnn, mapping, dp_encoding, layer_latency_func,
+                                                     samples=samples, proc_names=proc_names)
+                jobs = result.trace.jobs
+
+                jobs_per_proc = {}
+                for job in jobs:
+                    if job.processor_name != proc_name_per_layer[job.task_id]:
+                        raise Exception("layer " + job.task + " is executed on processor " + job.processor_name +
+                                        " instead of processor " + proc_name_per_layer[job.task_id])
+                    jobs_per_proc.setdefault(job.processor_name, []).append(job)
+                for proc_name, proc_jobs in jobs_per_proc.items():
+                    proc_jobs.sort(key=lambda job: job.start_time)
+                    for prev_job, job in zip(proc_jobs, proc_jobs[1:]):
+                        if job.start_time < prev_job.end_time - 1e-9:
+                            raise Exception("overlapping jobs on processor " + proc_name)
+                for proc_name, utilization in result.utilization_per_processor.items():
+                    if utilization > 1.0 + 1e-9:
+                        raise Exception("utilization of processor " + proc_name + " exceeds 1")
+                max_proc_time = max(result.time_per_sample_per_processor.values())
+                if result.makespan < max_proc_time * samples - 1e-9 * max(max_proc_time, 1):
+                    raise Exception("samples are processed faster than on the most loaded processor")
+
+                # (first) job per layer per sample
+                job_per_layer_per_sample = {}
+                for job in jobs:
+                    sample = int(job.job.split(",")[0].split(" ")[1])
+                    job_per_layer_per_sample.setdefault((job.task_id, sample), job)
+                if not dp_by_parts:
+                    for connection in dnn.get_connections():
+                        for sample in range(samples):
+                            src_job = job_per_layer_per_sample[(connection.src.id, sample)]
+                            dst_job = job_per_layer_per_sample[(connection.dst.id, sample)]
+                            if dst_job.start_time < src_job.end_time - 1e-9:
+                                raise Exception("layer " + dst_job.task + " started processing sample " +
+                                                str(sample) + " before layer " + src_job.task + " processed it")
+                else:
+                    first_sample_jobs = [job for job in jobs if job.job.startswith("sample 0,")]
+                    for job in first_sample_jobs:
+                        for other_job in first_sample_jobs:
+                            if job.processor_name != other_job.processor_name and \
+                                    job.start_time < other_job.end_time and other_job.start_time < job.end_time:
+                                sample_parts_overlap = True
+
+                if dp_by_parts:
+                    export_gantt_trace(result.trace, os.path.join(config["intermediate_files_folder_abs"],
+                                                                  "gantt_" + mapping_file))
+                if info_level > 1:
+                    print("  ", mapping_file, "dp by parts:" if dp_by_parts else "no dp by parts:", str(result))
+        except Exception as e:
+            test_passed = False
+            if info_level > 0:
+                print("  ", mapping_file, "- FAILURE:", str(e))
+
+    if test_passed and not sample_parts_overlap:
+        test_passed = False
+        if info_level > 0:
+            print("   FAILURE: processors never process parts of the same sample at the same time")
+
+    if info_level > 0:
+        print("  -", "SUCCESS" if test_passed else "FAILURE")
+    return test_passed
+
+
+def run_test_arena_planning(config: {}, info_level):
+    """
+    Check arena memory planning for every (consistent) DNN in the data folder,
+    with no data processing by parts and with max data processing by parts, for every arena strategy:
+    memories with overlapping occupancy intervals should be placed at non-overlapping address ranges,
+    the arena should fit all the memories and should not be smaller than the max total size of memories,
+    occupied at the same step. Offsets should be kept in the generic (DNN) buffers
+    :param config: test app_config (see ../test_config.py)
+    :param info_level: amount of information to print out during the tests run.
+        If info-level == 0, no information is printed to console.
+        If info-level == 1, only tests information (e.g., which steps of the tests were successful)
+        is printed to console.
+        If info-level == 2, tests information (e.g., which steps of the tests were successful)
+        as well as script-specific verbose output is printed to the console
+    :return: True if tests ran successfully and False otherwise
+    """
+    from converters.json_converters.json_to_dnn import parse_json_dnn
+    from converters.data_buffers_converter import csdf_reuse_buf_to_generic_dnn_buf
+    from models.data_buffers import ArenaDataBuffer
+    from DSE.low_memory.arena_planning import ARENA_STRATEGIES, plan_arena_offsets
+    from DSE.low_memory.mms.buf_building import get_mms_buffers_no_pipeline
+
+    if info_level > 0:
+        print("RUN arena memory planning check")
+
+    test_passed = True
+    for dnn_file, dnn_path in get_test_dnn_files(config):
+        try:
+            dnn = parse_json_dnn(dnn_path)
+            for _, phases_per_layer, csdf in build_test_csdf_graphs(dnn, [0.0, 1.0]):
+                max_tokens, occupancy_intervals, intervals, max_breadth = eval_test_analytic_buffers(csdf)
+
+                for strategy in ARENA_STRATEGIES:
+                    arena_size, offsets = plan_arena_offsets(occupancy_intervals, max_tokens, strategy)
+                    mem_names = [mem_name for mem_name in intervals.keys() if max_tokens[mem_name] > 0]
+                    for mem_id, mem_name in enumerate(mem_names):
+                        if offsets[mem_name] < 0 or offsets[mem_name] + max_tokens[mem_name] > arena_size:
+                            raise Exception(strategy + ": memory " + mem_name + " does not fit the arena")
+                        for other_name in mem_names[mem_id + 1:]:
+                            overlap_in_time = intervals[mem_name][0] <= intervals[other_name][1] and \
+                                intervals[other_name][0] <= intervals[mem_name][1]
+                            overlap_in_space = offsets[mem_name] < offsets[other_name] + max_tokens[other_name] and \
+                                offsets[other_name] < offsets[mem_name] + max_tokens[mem_name]
+                            if overlap_in_time and overlap_in_space:
+                                raise Exception(strategy + ": memories " + mem_name + " and " + other_name +
+                                                " overlap in the arena")
+                    if arena_size < max_breadth:
+                        raise Exception(strategy + ": arena is smaller than the max breadth")
+
+                # offsets in the generic (DNN) buffers
+                arena_buffers, _ = get_mms_buffers_no_pipeline(dnn, phases_per_layer,
+                                                               memory_planner="arena_greedy_by_size")
+                for buf in csdf_reuse_buf_to_generic_dnn_buf(arena_buffers, [dnn]):
+                    if not isinstance(buf, ArenaDataBuffer) or len(buf.offset_per_user) != len(buf.users):
+                        raise Exception("offsets are not specified in buffer " + buf.name)
+            if info_level > 1:
+                print("  ", dnn_file, "- SUCCESS")
+        except Exception as e:
+            test_passed = False
+            if info_level > 0:
+                print("  ", dnn_file, "- FAILURE:", str(e))
+
+    if info_level > 0:
+        print("  -", "SUCCESS" if test_passed else "FAILURE")
+    return test_passed
+
+
+def run_test_optimal_buf_reuse(config: {}, info_level):
+    """
+    Check optimal buffers reuse for every (consistent) small DNN in the data folder,
+    with no data processing by parts and with max data processing by parts:
+    every memory should be stored in exactly one buffer, memories with overlapping occupancy intervals should never
+    share a buffer, and the total size of buffers should not be larger than the total size of greedy buffers
+    and not smaller than the max total size of memories, occupied at the same step.
+    Optimal buffers reuse among the DNNs should not be worse than the greedy reuse. For a crafted instance,
+    where the greedy reuse is suboptimal, optimal buffers reuse should find the optimal solution
+    :param config: test app_config (see ../test_config.py)
+    :param info_level: amount of information to print out during the tests run.
+        If info-level == 0, no information is printed to console.
+        If info-level == 1, only tests information (e.g., which steps of the tests were successful)
+        is printed to console.
+        If info-level == 2, tests information (e.g., which steps of the tests were successful)
+        as well as script-specific verbose output is printed to the console
+    :return: True if tests ran successfully and False otherwise
+    """
+    from converters.json_converters.json_to_dnn import parse_json_dnn
+    from DSE.low_memory.buf_reuse_from_simulation import build_reuse_buffers
+    from simulation.traces import SimMemoryOccupancyInterval
+    from DSE.low_memory.optimal_buf_reuse import build_optimal_reuse_buffers
+    from DSE.low_memory.mms.buf_building import get_mms_buffers_multi
+
+    if info_level > 0:
+        print("RUN optimal buffers reuse check")
+
+    test_passed = True
+    # crafted instance: the greedy reuse stores the first memory in a buffer together with the second memory,
+    # so the third memory, that overlaps with the first one, needs another buffer (total size 10 + 10 = 20).
+    # Optimally, the first memory is stored separately, and the second and third memories share a buffer (5 + 10)
+    try:
+        occupancy_intervals = {"a0_a1": [SimMemoryOccupancyInterval(0, 0)],
+                               "a1_a2": [SimMemoryOccupancyInterval(1, 1)],
+                               "a2_a3": [SimMemoryOccupancyInterval(0, 0)]}
+        max_tokens = {"a0_a1": 5, "a1_a2": 10, "a2_a3": 10}
+        greedy_size = sum(buf.size for buf in build_reuse_buffers(occupancy_intervals, max_tokens))
+        optimal_buffers = build_optimal_reuse_buffers(occupancy_intervals, max_tokens)
+        optimal_size = sum(buf.size for buf in optimal_buffers)
+        if greedy_size != 20:
+            raise Exception("greedy buffers size " + str(greedy_size) + " instead of 20")
+        if optimal_size != 15:
+            raise Exception("optimal buffers size " + str(optimal_size) + " instead of 15")
+        stored_memories = []
+        for buf in optimal_buffers:
+            stored_memories.extend(buf.users)
+            if any(max_tokens[mem_name] > buf.size for mem_name in buf.users):
+                raise Exception("a memory does not fit buffer " + buf.name)
+            if "a0_a1" in buf.users and "a2_a3" in buf.users:
+                raise Exception("memories with overlapping occupancy intervals share buffer " + buf.name)
+        if sorted(stored_memories) != sorted(occupancy_intervals.keys()):
+            raise Exception("every memory should be stored in exactly one buffer")
+        if info_level > 1:
+            print("   crafted instance greedy buffers size:", greedy_size, "optimal buffers size:", optimal_size)
+    except Exception as e:
+        test_passed = False
+        if info_level > 0:
+            print("   crafted instance - FAILURE:", str(e))
+
+    # max number of memories in a tested DNN
+    max_memories = 40
+    small_dnns = []
+    for dnn_file, dnn_path in get_test_dnn_files(config):
+        try:
+            dnn = parse_json_dnn(dnn_path)
+            for dp_by_parts_probability, _, csdf in build_test_csdf_graphs(dnn, [0.0, 1.0]):
+                dp_by_parts = dp_by_parts_probability > 0
+                max_tokens, occupancy_intervals, intervals, max_breadth = eval_test_analytic_buffers(csdf)
+                if len(occupancy_intervals) > max_memories:
+                    continue
+
+                greedy_size = sum(buf.size for buf in build_reuse_buffers(occupancy_intervals, max_tokens))
+                optimal_buffers = build_optimal_reuse_buffers(occupancy_intervals, max_tokens)
+                optimal_size = sum(buf.size for buf in optimal_buffers)
+                stored_memories = []
+                for buf in optimal_buffers:
+                    for user_id, mem_name in enumerate(buf.users):
+                        stored_memories.append(mem_name)
+                        if max_tokens[mem_name] > buf.size:
+                            raise Exception("memory " + mem_name + " does not fit buffer " + buf.name)
+                        for other_name in buf.users[user_id + 1:]:
+                            if intervals[mem_name][0] <= intervals[other_name][1] and \
+                                    intervals[other_name][0] <= intervals[mem_name][1]:
+                                raise Exception("memories " + mem_name + " and " + other_name +
+                                                " with overlapping occupancy intervals share buffer " + buf.name)
+                if sorted(stored_memories) != sorted(intervals.keys()):
+                    raise Exception("every memory should be stored in exactly one buffer")
+                if optimal_size > greedy_size:
+                    raise Exception("optimal buffers are larger than greedy buffers")
+                if optimal_size < max_breadth:
+                    raise Exception("optimal buffers are smaller than the max breadth")
+                if info_level > 1:
+                    print("  ", dnn_file, "dp by parts:" if dp_by_parts else "no dp by parts:",
+                          "greedy buffers size:", greedy_size, "optimal buffers size:", optimal_size)
+                if not dp_by_parts:
+                    small_dnns.append(dnn)
+            if info_level > 1:
+                print("  ", dnn_file, "- SUCCESS")
+        except Exception as e:
+            test_passed = False
+            if info_level > 0:
+                print("  ", dnn_file, "- FAILURE:", str(e))
+
+    # reuse among the DNNs
+    try:
+        phases_per_layer_per_dnn = {dnn.name: {layer.name: 1 for layer in dnn.get_layers()} for dnn in small_dnns}
+        greedy_buffers, _ = get_mms_buffers_multi(small_dnns, phases_per_layer_per_dnn)
+        optimal_buffers, _ = get_mms_buffers_multi(small_dnns, phases_per_layer_per_dnn,
+                                                   memory_planner="buffers_optimal")
+        greedy_size = sum(buf.size for buf in greedy_buffers)
+        optimal_size = sum(buf.size for buf in optimal_buffers)
+        if optimal_size > greedy_size:
+            raise Exception("optimal buffers, shared among DNNs, are larger than greedy buffers")
+        if sum(len(buf.channels) for buf in optimal_buffers) != sum(len(buf.channels) for buf in greedy_buffers):
+            raise Exception("every channel should be stored in exactly one buffer")
+        if info_level > 1:
+            print("   multi-DNN greedy buffers size:", greedy_size, "optimal buffers size:", optimal_size)
+    except Exception as e:
+        test_passed = False
+        if info_level > 0:
+            print("   multi-DNN - FAILURE:", str(e))
+
+    if info_level > 0:
+        print("  -", "SUCCESS" if test_passed else "FAILURE")
+    return test_passed
+
+
+def run_test_lower_bound_pruning(config: {}, info_level):
+    """
+    Check lower-bound pruning of MMS GA chromosomes for every DNN in the pipeline parallelism data folder, mapped
+    as a pipeline and together with a single-partition DNN (multi-DNN application): the lower bound on buffers size
+    should not exceed the buffers size for random chromosomes, and the GA with pruning should return the same
+    pareto front as the GA without pruning
+    :param config: test app_config (see ../test_config.py)
+    :param info_level: amount of information to print out during the tests run.
+        If info-level == 0, no information is printed to console.
+        If info-level == 1, only tests information (e.g., which steps of the tests were successful)
+        is printed to console.
+        If info-level == 2, tests information (e.g., which steps of the tests were successful)
+        as well as script-specific verbose output is printed to the console
+    :return: True if tests ran successfully and False otherwise
+    """
+    import random
+    from DSE.low_memory.mms.ga_based.MMS_ga_eval import eval_genes_buffers_size_multi_pipelined_mb
+    from DSE.low_memory.mms.ga_based.multi_thread.MMSgaParallelMultiPipeline import MMSgaParallelMultiPipeline
+
+    if info_level > 0:
+        print("RUN lower-bound pruning check")
+
+    mappings_dir = str(os.path.join(config["input_files_folder_abs"], "pipeline_parallelism"))
+    test_passed = True
+    for mapping_file in sorted(os.listdir(mappings_dir)):
+        if not mapping_file.endswith(".json"):
+            continue
+        try:
+            partitions_per_dnn = build_test_partitions_per_dnn(config, [mapping_file, "CNN1.json"],
+                                                               [mapping_file, None])
+
+            pareto_per_pruning = []
+            for prune_dominated in [False, True]:
+                random.seed(0)
+                ga = MMSgaParallelMultiPipeline(partitions_per_dnn, epochs=5, population_start_size=40,
+                                                selection_percent=30, mutation_probability=0.5, mutation_percent=20,
+                                                verbose=False, prune_dominated=prune_dominated)
+                with ga.eval_pool:
+                    if prune_dominated:
+                        for _ in range(10):
+                            chromosome = ga.generate_random_chromosome()
+                            lower_bound = ga.buf_size_lower_bound_func(chromosome.genes)
+                            buf_size = eval_genes_buffers_size_multi_pipelined_mb(
+                                chromosome.genes, partitions_per_dnn,
+                                ga.max_phases_per_layer_per_partition_per_dnn,
+                                csdf_fragments_per_partition_per_dnn=ga.csdf_fragments_per_partition_per_dnn)
+                            if lower_bound > buf_size:
+                                raise Exception("lower bound " + str(lower_bound) + " on buffers size exceeds " +
+                                                "buffers size " + str(buf_size))
+                        random.seed(0)
+                    ga.init_with_random_population()
+                    pareto = ga.run()
+                pareto_per_pruning.append([(chromosome.genes, chromosome.buf_size, chromosome.time_loss)
+                                           for chromosome in pareto])
+                if prune_dominated and info_level > 1:
+                    print("  ", mapping_file, "skipped evaluations per epoch:", ga.skipped_evals_per_epoch)
+            if pareto_per_pruning[0] != pareto_per_pruning[1]:
+                raise Exception("pruning changed the GA pareto front")
+            if info_level > 1:
+                print("  ", mapping_file, "- SUCCESS")
+        except Exception as e:
+            test_passed = False
+            if info_level > 0:
+                print("  ", mapping_file, "- FAILURE:", str(e))
+
+    if info_level > 0:
+        print("  -", "SUCCESS" if test_passed else "FAILURE")
+    return test_passed
+
+
+def run_test_fitness_cache(config: {}, info_level):
+    """
+    Check the MMS GA fitness cache: fitness of stored genotypes should be found in the cache,
+    new records should be saved in the cache file even if the cache is closed by an exception,
+    and a GA rerun for the same application should find the fitness of its initial population in the cache file,
+    evaluate no new genotypes and return the same pareto front as the first run
+    :param config: test app_config (see ../test_config.py)
+    :param info_level: amount of information to print out during the tests run.
+        If info-level == 0, no information is printed to console.
+        If info-level == 1, only tests information (e.g., which steps of the tests were successful)
+        is printed to console.
+        If info-level == 2, tests information (e.g., which steps of the tests were successful)
+        as well as script-specific verbose output is printed to the console
+    :return: True if tests ran successfully and False otherwise
+    """
+    import random
+    from DSE.low_memory.mms.ga_based.MMSFitnessCache import MMSFitnessCache
+    from DSE.low_memory.mms.ga_based.multi_thread.MMSgaParallelMultiPipeline import MMSgaParallelMultiPipeline
+
+    if info_level > 0:
+        print("RUN fitness cache check")
+
+    cache_path = str(os.path.join(config["intermediate_files_folder_abs"], "fitness_cache.sqlite"))
+    test_passed = True
+    try:
+        if os.path.exists(cache_path):
+            os.remove(cache_path)
+
+        # hits and misses
+        cache = MMSFitnessCache("test_app")
+        if cache.lookup(5) is not None or cache.misses != 1:
+            raise Exception("genotype that was never stored is found in the cache")
+        cache.store(5, 1.0, 0.5)
+        if cache.lookup(5) != (1.0, 0.5) or cache.hits != 1:
+            raise Exception("stored genotype is not found in the cache")
+
+        # records are saved when the cache is closed by an exception
+        try:
+            with MMSFitnessCache("test_app", cache_path) as cache:
+                cache.store(5, 1.0, 0.5)
+                raise InterruptedError("GA interrupted")
+        except InterruptedError:
+            pass
+        with MMSFitnessCache("test_app", cache_path) as cache:
+            if cache.lookup(5) != (1.0, 0.5):
+                raise Exception("record is not saved in the cache file when the cache is closed by an exception")
+
+        # GA reruns
+        partitions_per_dnn = build_test_partitions_per_dnn(config, ["CNN1.json", "mobilenetv2.json"],
+                                                           [None, "mobilenetv2.json"])
+        records_per_run = []
+        pareto_per_run = []
+        for run_id in range(2):
+            random.seed(0)
+            ga = MMSgaParallelMultiPipeline(partitions_per_dnn, epochs=3, population_start_size=20,
+                                            selection_percent=30, mutation_probability=0.5, mutation_percent=20,
+                                            verbose=False, fitness_cache_path=cache_path)
+            stored_records = len(ga.fitness_cache)
+            with ga.eval_pool, ga.fitness_cache:
+                ga.init_with_random_population()
+                init_hits, init_misses = ga.fitness_cache.hits, ga.fitness_cache.misses
+                pareto = ga.run()
+            if run_id > 0:
+                if stored_records != records_per_run[0]:
+                    raise Exception("GA rerun loaded " + str(stored_records) + " records from the cache file, " +
+                                    "while the first run stored " + str(records_per_run[0]) + " records")
+                if init_misses > 0 or init_hits == 0:
+                    raise Exception("initial population of GA rerun is not found in the cache file")
+                if len(ga.fitness_cache) != stored_records:
+                    raise Exception("GA rerun evaluated genotypes, already evaluated by the first run")
+            records_per_run.append(len(ga.fitness_cache))
+            pareto_per_run.append([(chromosome.genes, chromosome.buf_size, chromosome.time_loss)
+                                   for chromosome in pareto])
+            if info_level > 1:
+                print("   run", run_id, "cache records:", len(ga.fitness_cache), "initial population hits:",
+                      init_hits, "misses:", init_misses)
+        if pareto_per_run[0] != pareto_per_run[1]:
+            raise Exception("GA rerun with the cache file returned another pareto front")
+    except Exception as e:
+        test_passed = False
+        if info_level > 0:
+            print("   FAILURE:", str(e))
+
+    if info_level > 0:
+        print("  -", "SUCCESS" if test_passed else "FAILURE")
+    return test_passed
+
+
+def build_test_partitions_per_dnn(config: {}, dnn_files: [], mapping_files=None):
+    """
+    Parse DNNs from the data folder and partition them with pipeline mappings
+    :param config: test app_config (see ../test_config.py)
+    :param dnn_files: names of .json DNN files in the json_dnn data folder
+    :param mapping_files: names of .json mapping files in the pipeline_parallelism data folder, one per DNN.
+        If None is given instead of a mapping file name (or instead of the whole list),
+        the DNN is represented as a single partition
+    :return: list [partitions_1, partitions_2, ..., partitionsN] where partitions_i is a list of partitions
+        of the i-th DNN, where external DNN inputs and outputs are represented as data layers
+    """
+    from converters.json_converters.json_to_dnn import parse_json_dnn
+    from converters.json_converters.json_app_config_parser import partition_dnns_with_mapping
+    from fileworkers.json_fw import read_json
+    from models.dnn_model.transformation.external_ios_processor import external_ios_to_data_layers
+
+    json_dnn_dir = str(os.path.join(config["input_files_folder_abs"], "json_dnn"))
+    mappings_dir = str(os.path.join(config["input_files_folder_abs"], "pipeline_parallelism"))
+    if mapping_files is None:
+        mapping_files = [None for _ in dnn_files]
+    dnns = [parse_json_dnn(os.path.join(json_dnn_dir, dnn_file)) for dnn_file in dnn_files]
+    mappings = [None if mapping_file is None else read_json(os.path.join(mappings_dir, mapping_file))
+                for mapping_file in mapping_files]
+    partitions_per_dnn = partition_dnns_with_mapping(dnns, mappings)
+    for partitions in partitions_per_dnn:
+        for partition in partitions:
+            external_ios_to_data_layers(partition)
+    return partitions_per_dnn
+
+
+def run_test_pareto_archive(config: {}, info_level):
+    """
+    Check the incremental pareto archive of MMS chromosomes: dominated chromosomes should be rejected
+    or evicted by new chromosomes, chromosomes with the fitness of an archived chromosome should not be added,
+    and the front should be kept sorted by buffers size. For random chromosomes, the archive should
+    contain the same points as the pareto front, selected from all the chromosomes at once
+    :param config: test app_config (see ../test_config.py)
+    :param info_level: amount of information to print out during the tests run.
+        If info-level == 0, no information is printed to console.
+        If info-level == 1, only tests information (e.g., which steps of the tests were successful)
+        is printed to console.
+        If info-level == 2, tests information (e.g., which steps of the tests were successful)
+        as well as script-specific verbose output is printed to the console
+    :return: True if tests ran successfully and False otherwise
+    """
+    import random
+    from DSE.low_memory.mms.ga_based.MMSChromosome import MMSChromosome
+    from DSE.low_memory.mms.ga_based.MMSParetoArchive import MMSParetoArchive
+    from DSE.low_memory.mms.ga_based.MMSParetoSelection import select_pareto
+
+    def annotated_chromosome(buf_size, time_loss):
+        chromosome = MMSChromosome(8)
+        chromosome.set_fitness(buf_size, time_loss)
+        return chromosome
+
+    def fitness_list(chromosomes):
+        return [(chromosome.buf_size, chromosome.time_loss) for chromosome in chromosomes]
+
+    if info_level > 0:
+        print("RUN pareto archive check")
+
+    test_passed = True
+    try:
+        pareto = MMSParetoArchive()
+        if not pareto.insert(annotated_chromosome(2, 2)):
+            raise Exception("first chromosome is not added")
+        if pareto.insert(annotated_chromosome(3, 3)):
+            raise Exception("dominated chromosome is added")
+        if pareto.insert(annotated_chromosome(2, 2)):
+            raise Exception("chromosome with the same fitness is added")
+        if not pareto.insert(annotated_chromosome(3, 1)) or not pareto.insert(annotated_chromosome(2, 3)):
+            raise Exception("non-dominated chromosome is not added")
+        if not pareto.insert(annotated_chromosome(1, 1.5)):
+            raise Exception("dominating chromosome is not added")
+        if fitness_list(pareto.get_pareto_sorted()) != [(1, 1.5), (3, 1)]:
+            raise Exception("dominated chromosomes are not evicted: " + str(fitness_list(pareto.get_pareto_sorted())))
+        if not pareto.is_dominated(2, 2) or pareto.is_dominated(1, 2) or pareto.is_dominated(2, 1):
+            raise Exception("wrong dominance check")
+
+        random.seed(0)
+        for _ in range(20):
+            chromosomes = [annotated_chromosome(random.randint(1, 30), random.randint(1, 30) * 0.5)
+                           for _ in range(200)]
+            pareto = MMSParetoArchive()
+            for chromosome_id, chromosome in enumerate(chromosomes):
+                pareto.insert(chromosome)
+                if fitness_list(pareto.get_pareto()) != fitness_list(select_pareto(chromosomes[:chromosome_id + 1])):
+                    raise Exception("archive differs from the pareto front, selected from all the chromosomes")
+                sorted_fitness = fitness_list(pareto.get_pareto_sorted())
+                if sorted_fitness != sorted(sorted_fitness) or len(set(sorted_fitness)) != len(sorted_fitness):
+                    raise Exception("archive is not sorted by buffers size or has duplicates")
+                if len(pareto) != len(sorted_fitness):
+                    raise Exception("archive size " + str(len(pareto)) + " differs from the number of points " +
+                                    str(len(sorted_fitness)))
+        if info_level > 1:
+            print("   last random archive:", fitness_list(pareto.get_pareto_sorted()))
+    except Exception as e:
+        test_passed = False
+        if info_level > 0:
+            print("   FAILURE:", str(e))
+
+    if info_level > 0:
+        print("  -", "SUCCESS" if test_passed else "FAILURE")
+    return test_passed
+
+
+def run_test_ga_checkpoint(config: {}, info_level):
+    """
+    Check checkpoint and resume of MMS GA: a GA run, interrupted in the middle and resumed from the checkpoint,
+    should return the same pareto front as an uninterrupted GA run. The state, reached after the last GA epoch,
+    should be saved in the checkpoint, so that a GA resumed from it runs no more epochs
+    :param config: test app_config (see ../test_config.py)
+    :param info_level: amount of information to print out during the tests run.
+        If info-level == 0, no information is printed to console.
+        If info-level == 1, only tests information (e.g., which steps of the tests were successful)
+        is printed to console.
+        If info-level == 2, tests information (e.g., which steps of the tests were successful)
+        as well as script-specific verbose output is printed to the console
+    :return: True if tests ran successfully and False otherwise
+    """
+    import random
+    from DSE.low_memory.mms.ga_based.mms_ga_checkpoint import load_checkpoint
+    from DSE.low_memory.mms.ga_based.multi_thread.MMSgaParallelMultiPipeline import MMSgaParallelMultiPipeline
+
+    if info_level > 0:
+        print("RUN GA checkpoint check")
+
+    checkpoint_path = str(os.path.join(config["intermediate_files_folder_abs"], "ga_checkpoint.json"))
+    epochs = 6
+    interrupted_epoch = 3
+    test_passed = True
+    try:
+        if os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+        partitions_per_dnn = build_test_partitions_per_dnn(config, ["CNN1.json", "mobilenetv2.json"],
+                                                           [None, "mobilenetv2.json"])
+
+        def create_ga(path=None):
+            return MMSgaParallelMultiPipeline(partitions_per_dnn, epochs=epochs, population_start_size=100,
+                                              selection_percent=30, mutation_probability=0.5, mutation_percent=20,
+                                              verbose=False, checkpoint_path=path)
+
+        def fitness_list(chromosomes):
+            return [(chromosome.genes, chromosome.buf_size, chromosome.time_loss) for chromosome in chromosomes]
+
+        # uninterrupted run
+        random.seed(0)
+        ga = create_ga()
+        with ga.eval_pool:
+            ga.init_with_random_population()
+            pareto = fitness_list(ga.run())
+
+        # run, interrupted in the middle of an epoch
+        random.seed(0)
+        ga = create_ga(checkpoint_path)
+        make_iteration = ga.make_iteration
+
+        def make_interrupted_iteration(chromosomes_to_select):
+            if ga.cur_epoch == interrupted_epoch:
+                raise InterruptedError("GA interrupted")
+            make_iteration(chromosomes_to_select)
+
+        ga.make_iteration = make_interrupted_iteration
+        try:
+            with ga.eval_pool:
+                ga.init_with_random_population()
+                ga.run()
+            raise Exception("GA was not interrupted")
+        except InterruptedError:
+            pass
+
+        # resumed run
+        random.seed(1)
+        ga = create_ga(checkpoint_path)
+        with ga.eval_pool:
+            ga.restore_from_checkpoint(load_checkpoint(checkpoint_path))
+            if ga.cur_epoch != interrupted_epoch:
+                raise Exception("GA is resumed from epoch " + str(ga.cur_epoch) + " instead of epoch " +
+                                str(interrupted_epoch))
+            resumed_pareto = fitness_list(ga.run())
+        if resumed_pareto != pareto:
+            raise Exception("resumed GA returned another pareto front")
+
+        # resume after the last epoch
+        last_epoch = ga.cur_epoch
+        random.seed(2)
+        ga = create_ga(checkpoint_path)
+        with ga.eval_pool:
+            ga.restore_from_checkpoint(load_checkpoint(checkpoint_path))
+            if ga.cur_epoch != last_epoch:
+                raise Exception("GA state after the last epoch is not saved")
+            final_pareto = fitness_list(ga.run())
+        if ga.cur_epoch != last_epoch or final_pareto != pareto:
+            raise Exception("GA, resumed after the last epoch, continued execution")
+        if info_level > 1:
+            print("   pareto front of", len(pareto), "points after", last_epoch, "epochs")
+    except Exception as e:
+        test_passed = False
+        if info_level > 0:
+            print("   FAILURE:", str(e))
+
+    if info_level > 0:
+        print("  -", "SUCCESS" if test_passed else "FAILURE")
+    return test_passed
+
+
+def run_test_reuse_buffers_sorted(config: {}, info_level):
+    """
+    Check buffers reuse for memories, sorted by the start of their (single) occupancy intervals,
+    on random occupancy intervals, with and without mapping of actors onto processors:
+    every memory should be stored in exactly one buffer, large enough to store the memory,
+    memories with overlapping occupancy intervals or mapped on different processors should never
+    share a buffer, and the total size of buffers should not be larger than the total size of greedy buffers
+    :param config: test app_config (see ../test_config.py)
+    :param info_level: amount of information to print out during the tests run.
+        If info-level == 0, no information is printed to console.
+        If info-level == 1, only tests information (e.g., which steps of the tests were successful)
+        is printed to console.
+        If info-level == 2, tests information (e.g., which steps of the tests were successful)
+        as well as script-specific verbose output is printed to the console
+    :return: True if tests ran successfully and False otherwise
+    """
+    import random
+    from simulation.traces import SimMemoryOccupancyInterval
+    from DSE.low_memory.buf_reuse_from_simulation import _build_reuse_buffers_sorted, _build_reuse_buffers_greedy, \
+        get_proc_per_mem_name, DIFFERENT_PROCS
+
+    if info_level > 0:
+        print("RUN sorted buffers reuse check")
+
+    actors_num = 12
+    procs_num = 3
+    test_passed = True
+    random.seed(0)
+    for test_case in range(200):
+        try:
+            # memories, sorted by the start of their occupancy intervals
+            occupancy_intervals = {}
+            max_tokens = {}
+            start_step = 0
+            for _ in range(random.randint(1, 30)):
+                start_step += random.randint(0, 3)
+                src_actor_id, dst_actor_id = random.sample(range(actors_num), 2)
+                mem_name = "a" + str(src_actor_id) + "_a" + str(dst_actor_id)
+                if mem_name in occupancy_intervals:
+                    continue
+                occupancy_intervals[mem_name] = [SimMemoryOccupancyInterval(start_step,
+                                                                            start_step + random.randint(0, 10))]
+                max_tokens[mem_name] = random.randint(0, 100)
+            mapping = [[] for _ in range(procs_num)]
+            for actor_id in range(actors_num):
+                mapping[random.randrange(procs_num)].append(actor_id)
+
+            for test_mapping in [None, mapping]:
+                sorted_buffers = _build_reuse_buffers_sorted(occupancy_intervals, max_tokens, test_mapping)
+                greedy_buffers = _build_reuse_buffers_greedy(occupancy_intervals, max_tokens, test_mapping)
+                proc_per_mem_name = get_proc_per_mem_name(occupancy_intervals.keys(), test_mapping, None)
+                stored_memories = []
+                for buf in sorted_buffers:
+                    for user_id, mem_name in enumerate(buf.users):
+                        stored_memories.append(mem_name)
+                        if max_tokens[mem_name] > buf.size:
+                            raise Exception("memory " + mem_name + " does not fit buffer " + buf.name)
+                        if proc_per_mem_name[mem_name] is DIFFERENT_PROCS and len(buf.users) > 1:
+                            raise Exception("memory " + mem_name + ", mapped on different processors, " +
+                                            "shares buffer " + buf.name)
+                        interval = occupancy_intervals[mem_name][0]
+                        for other_name in buf.users[user_id + 1:]:
+                            other_interval = occupancy_intervals[other_name][0]
+                            if proc_per_mem_name[mem_name] != proc_per_mem_name[other_name]:
+                                raise Exception("memories " + mem_name + " and " + other_name +
+                                                ", mapped on different processors, share buffer " + buf.name)
+                            if interval.start_step <= other_interval.end_step and \
+                                    other_interval.start_step <= interval.end_step:
+                                raise Exception("memories " + mem_name + " and " + other_name +
+                                                " with overlapping occupancy intervals share buffer " + buf.name)
+                if sorted(stored_memories) != sorted(occupancy_intervals.keys()):
+                    raise Exception("every memory should be stored in exactly one buffer")
+                sorted_size = sum(buf.size for buf in sorted_buffers)
+                greedy_size = sum(buf.size for buf in greedy_buffers)
+                if sorted_size > greedy_size:
+                    raise Exception("sorted buffers are larger than greedy buffers: " + str(sorted_size) +
+                                    " > " + str(greedy_size))
+                if info_level > 1:
+                    print("   test case", test_case, "with mapping:" if test_mapping else "no mapping:",
+                          "greedy buffers size:", greedy_size, "sorted buffers size:", sorted_size)
+        except Exception as e:
+            test_passed = False
+            if info_level > 0:
+                print("   test case", test_case, "- FAILURE:", str(e))
+
+    if info_level > 0:
+        print("  -", "SUCCESS" if test_passed else "FAILURE")
+    return test_passed
+
+
+def run_test_reuse_buffers_among_csdf(config: {}, info_level):
+    """
+    Check buffers reuse among multiple DNNs (CSDF models): for DNNs, taken in different orders, with
+    and without data processing by parts, the shared buffers, selected via the CSDF models bitmasks and the
+    max segment tree, should be the same as the shared buffers, selected by a linear scan over all shared buffers
+    :param config: test app_config (see ../test_config.py)
+    :param info_level: amount of information to print out during the tests run.
+        If info-level == 0, no information is printed to console.
+        If info-level == 1, only tests information (e.g., which steps of the tests were successful)
+        is printed to console.
+        If info-level == 2, tests information (e.g., which steps of the tests were successful)
+        as well as script-specific verbose output is printed to the console
+    :return: True if tests ran successfully and False otherwise
+    """
+    import random
+    from converters.json_converters.json_to_dnn import parse_json_dnn
+    from DSE.low_memory.dp_by_parts import get_max_phases_per_layer
+    from DSE.low_memory.buf_reuse_from_simulation import reuse_buffers_among_csdf
+    from DSE.low_memory.mms.buf_building import get_mms_buffers_no_pipeline
+
+    def reuse_buffers_among_csdf_linear(csdf_buffers_per_csdf):
+        """
+        Reference reuse among CSDF models: every shared buffer is checked for every CSDF buffer. Returns
+        (size, channels) of every shared buffer
+        """
+        shared_buffers = []
+        for csdf_model_id, csdf_buffers in enumerate(csdf_buffers_per_csdf):
+            for buf in csdf_buffers:
+                best_buffer = None
+                min_cost = buf.size
+                for shared_buf in shared_buffers:
+                    if csdf_model_id in shared_buf["models"]:
+                        continue
+                    cost = max(buf.size - shared_buf["size"], 0)
+                    if cost < min_cost:
+                        min_cost = cost
+                        best_buffer = shared_buf
+                if best_buffer is None:
+                    best_buffer = {"size": buf.size, "channels": [], "models": set()}
+                    shared_buffers.append(best_buffer)
+                best_buffer["size"] = max(best_buffer["size"], buf.size)
+                best_buffer["channels"].extend(buf.channels)
+                best_buffer["models"].add(csdf_model_id)
+        return [(shared_buf["size"], shared_buf["channels"]) for shared_buf in shared_buffers]
+
+    if info_level > 0:
+        print("RUN buffers reuse among CSDF models check")
+
+    dnn_files = ["CNN1.json", "CNN2.json", "mnist.json", "mobilenetv2.json", "resnet18v1.json", "squeezenet.json"]
+    json_dnn_dir = str(os.path.join(config["input_files_folder_abs"], "json_dnn"))
+    test_passed = True
+    try:
+        dnns = [parse_json_dnn(os.path.join(json_dnn_dir, dnn_file)) for dnn_file in dnn_files]
+        buffers_per_dnn = []
+        for dnn in dnns:
+            max_phases_per_layer = get_max_phases_per_layer(dnn)
+            for dp_by_parts in [False, True]:
+                phases_per_layer = {layer.name: max_phases_per_layer[layer.name] if dp_by_parts else 1
+                                    for layer in dnn.get_layers()}
+                dnn_buffers, _ = get_mms_buffers_no_pipeline(dnn, phases_per_layer)
+                buffers_per_dnn.append((dnn.name, dnn_buffers))
+
+        random.seed(0)
+        for test_case in range(20):
+            test_buffers_per_dnn = random.sample(buffers_per_dnn, random.randint(2, len(buffers_per_dnn)))
+            csdf_buffers_per_csdf = [dnn_buffers for _, dnn_buffers in test_buffers_per_dnn]
+            shared_buffers = reuse_buffers_among_csdf(csdf_buffers_per_csdf,
+                                                      [dnn_name for dnn_name, _ in test_buffers_per_dnn])
+            reference_buffers = reuse_buffers_among_csdf_linear(csdf_buffers_per_csdf)
+            if [(buf.size, buf.channels) for buf in shared_buffers] != reference_buffers:
+                raise Exception("test case " + str(test_case) +
+                                ": shared buffers differ from the shared buffers, selected by the linear scan")
+            if info_level > 1:
+                print("   test case", test_case, ":", len(csdf_buffers_per_csdf), "CSDF models,",
+                      len(shared_buffers), "shared buffers of total size", sum(buf.size for buf in shared_buffers))
+    except Exception as e:
+        test_passed = False
+        if info_level > 0:
+            print("   FAILURE:", str(e))
+
+    if info_level > 0:
+        print("  -", "SUCCESS" if test_passed else "FAILURE")
+    return test_passed
+
+
+def run_test_ga_single_dnn_direct(config: {}, info_level):
+    """
+    Run the single-DNN MMS GA (run_ga()) directly, with a fitness cache file: the GA should write its pareto
+    front into the output file, and a GA rerun should find all the evaluated genotypes in the cache file
+    and return the same pareto front
+    :param config: test app_config (see ../test_config.py)
+    :param info_level: amount of information to print out during the tests run.
+        If info-level == 0, no information is printed to console.
+        If info-level == 1, only tests information (e.g., which steps of the tests were successful)
+        is printed to console.
+        If info-level == 2, tests information (e.g., which steps of the tests were successful)
+        as well as script-specific verbose output is printed to the console
+    :return: True if tests ran successfully and False otherwise
+    """
+    import random
+    import sqlite3
+    from fileworkers.json_fw import read_json, save_as_json
+    from DSE.low_memory.mms.ga_based.multi_thread.mms_ga import run_ga
+
+    if info_level > 0:
+        print("RUN single-DNN GA check")
+
+    dnn_path = str(os.path.join(config["input_files_folder_abs"], "json_dnn", "mobilenetv2.json"))
+    ga_conf_path = str(os.path.join(config["intermediate_files_folder_abs"], "single_dnn_ga_conf.json"))
+    cache_path = str(os.path.join(config["intermediate_files_folder_abs"], "single_dnn_fitness_cache.sqlite"))
+    output_path = str(os.path.join(config["intermediate_files_folder_abs"], "single_dnn_ga_direct.json"))
+    test_passed = True
+    try:
+        ga_conf = read_json(os.path.join(config["input_files_folder_abs"], "test", "test_mms_ga_conf.json"))
+        ga_conf["epochs"] = 3
+        ga_conf["verbose"] = info_level > 1
+        save_as_json(ga_conf_path, ga_conf)
+        if os.path.exists(cache_path):
+            os.remove(cache_path)
+
+        pareto_per_run = []
+        records_per_run = []
+        for run_id in range(2):
+            if os.path.exists(output_path):
+                os.remove(output_path)
+            random.seed(0)
+            run_ga(dnn_path, ga_conf_path, config["cpu_threads"], output_path, fitness_cache_path=cache_path)
+            if not os.path.exists(output_path):
+                raise Exception("GA run " + str(run_id) + " did not write the output file")
+            pareto_per_run.append(read_json(output_path))
+            with sqlite3.connect(cache_path) as db:
+                records_per_run.append(db.execute("SELECT COUNT(*) FROM fitness").fetchone()[0])
+            if info_level > 1:
+                print("   run", run_id, "pareto front of", len(pareto_per_run[-1]), "chromosomes,",
+                      records_per_run[-1], "cache records")
+        if len(pareto_per_run[0]) == 0:
+            raise Exception("GA returned an empty pareto front")
+        if records_per_run[0] == 0 or records_per_run[1] != records_per_run[0]:
+            raise Exception("GA rerun evaluated genotypes, already evaluated by the first run")
+        if pareto_per_run[0] != pareto_per_run[1]:
+            raise Exception("GA rerun with the cache file returned another pareto front")
+    except Exception as e:
+        test_passed = False
+        if info_level > 0:
+            print("   FAILURE:", str(e))
+
+    if info_level > 0:
+        print("  -", "SUCCESS" if test_passed else "FAILURE")
+    return test_passed
+
+
+def run_test_time_loss_closed_form(config: {}, info_level):
+    """
+    Check the closed-form evaluation of the MMS chromosomes time loss, used by the GA, for every DNN
+    in the data folder and for every DNN in the pipeline parallelism data folder, mapped as a pipeline and together with
+    a single-partition DNN (multi-DNN application): for random chromosomes, the closed-form time loss
+    (for a chromosome and for the whole population) should be equal to the time loss, evaluated from the
+    phases per layer, derived from the chromosome
+    :param config: test app_config (see ../test_config.py)
+    :param info_level: amount of information to print out during the tests run.
+        If info-level == 0, no information is printed to console.
+        If info-level == 1, only tests information (e.g., which steps of the tests were successful)
+        is printed to console.
+        If info-level == 2, tests information (e.g., which steps of the tests were successful)
+        as well as script-specific verbose output is printed to the console
+    :return: True if tests ran successfully and False otherwise
+    """
+    import random
+    from converters.json_converters.json_to_dnn import parse_json_dnn
+    from DSE.low_memory.mms.ga_based.MMSChromosome import MMSChromosome
+    from DSE.low_memory.mms.ga_based.MMSPopulation import get_genes_mask_per_weight
+    from DSE.low_memory.mms.ga_based.MMS_ga_eval import eval_chromosome_time_loss_ms, \
+        eval_chromosome_time_loss_ms_multi_pipeline, eval_chromosome_time_loss_ms_closed_form, \
+        eval_population_time_loss_ms
+    from DSE.low_memory.mms.phases_derivation import get_phases_per_layer, get_max_extra_phases_per_gene, \
+        get_phases_per_layer_per_partition_per_dnn, get_max_extra_phases_per_gene_multi_pipeline
+
+    def check_time_loss(layers_num, extra_phases_per_gene, time_loss_from_phases_func):
+        """ Compare closed-form time loss with the time loss, evaluated from phases, for random chromosomes"""
+        extra_phases_mask_per_weight = get_genes_mask_per_weight(extra_phases_per_gene)
+        population = []
+        for dp_by_parts_probability in [0.0, 1.0, 0.1, 0.5, 0.9]:
+            for _ in range(10):
+                chromosome = MMSChromosome(layers_num)
+                chromosome.init_random(dp_by_parts_probability)
+                population.append(chromosome)
+        population_time_loss = eval_population_time_loss_ms(population, extra_phases_mask_per_weight)
+        for chromosome, population_time_loss_ms in zip(population, population_time_loss):
+            time_loss_ms = time_loss_from_phases_func(chromosome.dp_by_parts)
+            closed_form_time_loss_ms = eval_chromosome_time_loss_ms_closed_form(chromosome.genes,
+                                                                                extra_phases_mask_per_weight)
+            if abs(closed_form_time_loss_ms - time_loss_ms) > 1e-9 or \
+                    population_time_loss_ms != closed_form_time_loss_ms:
+                raise Exception("closed-form time loss " + str(closed_form_time_loss_ms) + " (population: " +
+                                str(population_time_loss_ms) + ") differs from the time loss " + str(time_loss_ms) +
+                                ", evaluated from phases")
+
+    if info_level > 0:
+        print("RUN closed-form time loss check")
+
+    random.seed(0)
+    test_passed = True
+    for dnn_file, dnn_path in get_test_dnn_files(config):
+        try:
+            dnn = parse_json_dnn(dnn_path)
+            check_time_loss(len(dnn.get_layers()), get_max_extra_phases_per_gene(dnn),
+                            lambda dp_by_parts: eval_chromosome_time_loss_ms(get_phases_per_layer(dnn, dp_by_parts)))
+            if info_level > 1:
+                print("  ", dnn_file, "- SUCCESS")
+        except Exception as e:
+            test_passed = False
+            if info_level > 0:
+                print("  ", dnn_file, "- FAILURE:", str(e))
+
+    mappings_dir = str(os.path.join(config["input_files_folder_abs"], "pipeline_parallelism"))
+    for mapping_file in sorted(os.listdir(mappings_dir)):
+        if not mapping_file.endswith(".json"):
+            continue
+        try:
+            partitions_per_dnn = build_test_partitions_per_dnn(config, [mapping_file, "CNN1.json"],
+                                                               [mapping_file, None])
+            layers_num = sum(len(partition.get_layers()) for partitions in partitions_per_dnn
+                             for partition in partitions)
+            check_time_loss(layers_num, get_max_extra_phases_per_gene_multi_pipeline(partitions_per_dnn),
+                            lambda dp_by_parts: eval_chromosome_time_loss_ms_multi_pipeline(
+                                get_phases_per_layer_per_partition_per_dnn(partitions_per_dnn, dp_by_parts)))
+            if info_level > 1:
+                print("   pipeline", mapping_file, "- SUCCESS")
+        except Exception as e:
+            test_passed = False
+            if info_level > 0:
+                print("   pipeline", mapping_file, "- FAILURE:", str(e))
+
+    if info_level > 0:
+        print("  -", "SUCCESS" if test_passed else "FAILURE")
+    return test_passed
+
+
+def run_test_csdf_fragments(config: {}, info_level):
+    """
+    Check assembly of CSDF graphs from prebuilt CSDF fragments for every DNN in the data folder and for every
+    partition of every DNN in the pipeline parallelism data folder, with and without fused self-loops:
+    for random phases per layer, the assembled CSDF graph should have the same actors (names, phases and
+    execution time per phase), channels (source and destination actors and layers, production and consumption
+    sequences) and input channels of every actor as the CSDF graph, built by dnn_to_csfd_one_to_one().
+    Fragments are also checked after pickling, as they are sent to the GA worker processes
+    :param config: test app_config (see ../test_config.py)
+    :param info_level: amount of information to print out during the tests run.
+        If info-level == 0, no information is printed to console.
+        If info-level == 1, only tests information (e.g., which steps of the tests were successful)
+        is printed to console.
+        If info-level == 2, tests information (e.g., which steps of the tests were successful)
+        as well as script-specific verbose output is printed to the console
+    :return: True if tests ran successfully and False otherwise
+    """
+    import pickle
+    import random
+    from converters.json_converters.json_to_dnn import parse_json_dnn
+    from converters.dnn_to_csdf import dnn_to_csfd_one_to_one
+    from converters.csdf_fragments import CSDFFragments
+    from DSE.low_memory.dp_by_parts import get_max_phases_per_layer
+    from DSE.low_memory.mms.buf_building import get_sim_time_per_layer, get_sim_layer_time
+
+    def csdf_desc(csdf):
+        """ Description of CSDF graph actors, channels and input channels of every actor"""
+        actors = [(actor.name, actor.phases, list(actor.exec_seq), list(actor.time_per_phase))
+                  for actor in csdf.get_actors()]
+        channels = [(channel.src.name, channel.dst.name, channel.src_id, channel.dst_id,
+                     list(channel.prod_seq), list(channel.cons_seq)) for channel in csdf.get_channels()]
+        channel_ids = {id(channel): channel_id for channel_id, channel in enumerate(csdf.get_channels())}
+        input_channels = [[channel_ids[id(channel)] for channel in csdf.get_input_channels(actor)]
+                          for actor in csdf.get_actors()]
+        return actors, channels, input_channels
+
+    def check_fragments(dnn):
+        """ Compare CSDF graphs, assembled from fragments, with CSDF graphs, built by dnn_to_csfd_one_to_one()"""
+        max_phases_per_layer = get_max_phases_per_layer(dnn)
+        for fuse_self_loops in [True, False]:
+            fragments = CSDFFragments(dnn, max_phases_per_layer, fuse_self_loops=fuse_self_loops,
+                                      time_per_layer_phases=get_sim_layer_time)
+            for csdf_fragments in [fragments, pickle.loads(pickle.dumps(fragments))]:
+                for dp_by_parts_probability in [0.0, 1.0, 0.5, 0.5, None]:
+                    if dp_by_parts_probability is None:
+                        # layers, that perform neither one phase nor max phases
+                        phases_per_layer = {layer.name: random.randint(1, max_phases_per_layer[layer.name])
+                                            for layer in dnn.get_layers()}
+                    else:
+                        phases_per_layer = {layer.name: max_phases_per_layer[layer.name]
+                                            if random.uniform(0, 1) < dp_by_parts_probability else 1
+                                            for layer in dnn.get_layers()}
+                    csdf = dnn_to_csfd_one_to_one(dnn, fuse_self_loops=fuse_self_loops,
+                                                  phases_per_layer=phases_per_layer,
+                                                  time_per_layer=get_sim_time_per_layer(dnn, phases_per_layer))
+                    if csdf_desc(csdf_fragments.assemble(phases_per_layer)) != csdf_desc(csdf):
+                        raise Exception("CSDF graph, assembled from fragments " +
+                                        ("with" if fuse_self_loops else "without") + " fused self-loops, " +
+                                        "differs from the CSDF graph, built by dnn_to_csfd_one_to_one()")
+
+    if info_level > 0:
+        print("RUN CSDF fragments assembly check")
+
+    random.seed(0)
+    test_passed = True
+    for dnn_file, dnn_path in get_test_dnn_files(config):
+        try:
+            check_fragments(parse_json_dnn(dnn_path))
+            if info_level > 1:
+                print("  ", dnn_file, "- SUCCESS")
+        except Exception as e:
+            test_passed = False
+            if info_level > 0:
+                print("  ", dnn_file, "- FAILURE:", str(e))
+
+    mappings_dir = str(os.path.join(config["input_files_folder_abs"], "pipeline_parallelism"))
+    for mapping_file in sorted(os.listdir(mappings_dir)):
+        if not mapping_file.endswith(".json"):
+            continue
+        try:
+            for partitions in build_test_partitions_per_dnn(config, [mapping_file], [mapping_file]):
+                for partition in partitions:
+                    check_fragments(partition)
+            if info_level > 1:
+                print("   pipeline", mapping_file, "- SUCCESS")
+        except Exception as e:
+            test_passed = False
+            if info_level > 0:
+                print("   pipeline", mapping_file, "- FAILURE:", str(e))
+
+    if info_level > 0:
+        print("  -", "SUCCESS" if test_passed else "FAILURE")
+    return test_passed
+
+
+def run_test_mms_chromosome_operators(config: {}, info_level):
+    """
+    Check GA operators of the MMS chromosome, used by the GA: crossover should take the first half of
+    genes from the first parent and the second half of genes from the second parent, every mutation
+    should invert exactly one gene, and random initialization should set every gene with the
+    init probability, independently of other genes
+    :param config: test app_config (see ../test_config.py)
+    :param info_level: amount of information to print out during the tests run.
+        If info-level == 0, no information is printed to console.
+        If info-level == 1, only tests information (e.g., which steps of the tests were successful)
+        is printed to console.
+        If info-level == 2, tests information (e.g., which steps of the tests were successful)
+        as well as script-specific verbose output is printed to the console
+    :return: True if tests ran successfully and False otherwise
+    """
+    import random
+    from DSE.low_memory.mms.ga_based.MMSChromosome import MMSChromosome
+
+    def check_crossover(layers_num):
+        """ Compare crossover of random parents with the crossover of dp by parts flags lists"""
+        for _ in range(100):
+            parent1 = MMSChromosome(layers_num)
+            parent1.init_random(0.5)
+            parent2 = MMSChromosome(layers_num)
+            parent2.init_random(0.5)
+            child = parent1.crossover(parent2)
+            half = int(layers_num / 2)
+            expected_dp_by_parts = parent1.dp_by_parts[:half] + parent2.dp_by_parts[half:]
+            if child.dp_by_parts != expected_dp_by_parts or child.genes >> layers_num != 0:
+                raise Exception("crossover of " + str(parent1.dp_by_parts) + " and " + str(parent2.dp_by_parts) +
+                                " produced " + str(child.dp_by_parts))
+            if not child.needs_eval:
+                raise Exception("child chromosome is not marked for evaluation")
+
+    def check_mutation(layers_num):
+        """ Check that every mutation inverts exactly one gene and every gene can be inverted"""
+        chromosome = MMSChromosome(layers_num)
+        chromosome.init_random(0.5)
+        mutated_genes = 0
+        for _ in range(100 * layers_num):
+            genes = chromosome.genes
+            chromosome.needs_eval = False
+            chromosome.mutate()
+            inverted_genes = genes ^ chromosome.genes
+            if bin(inverted_genes).count("1") != 1 or inverted_genes >> layers_num != 0:
+                raise Exception("mutation changed genes " + bin(genes) + " into " + bin(chromosome.genes))
+            if not chromosome.needs_eval:
+                raise Exception("mutated chromosome is not marked for evaluation")
+            mutated_genes |= inverted_genes
+        if mutated_genes != (1 << layers_num) - 1:
+            raise Exception("genes " + bin(((1 << layers_num) - 1) ^ mutated_genes) + " were never mutated")
+
+    def check_init_probability(layers_num, samples=2000):
+        """ Check frequency of genes set by random initialization, for every gene and over all genes"""
+        for dp_by_parts_probability in [p / 10 for p in range(11)]:
+            set_per_gene = [0 for _ in range(layers_num)]
+            for _ in range(samples):
+                chromosome = MMSChromosome(layers_num)
+                chromosome.init_random(dp_by_parts_probability)
+                if chromosome.genes >> layers_num != 0:
+                    raise Exception("random genes " + bin(chromosome.genes) + " exceed " + str(layers_num) +
+                                    " layers")
+                for gene_id in range(layers_num):
+                    set_per_gene[gene_id] += (chromosome.genes >> gene_id) & 1
+            if dp_by_parts_probability in [0.0, 1.0] and \
+                    set_per_gene != [int(dp_by_parts_probability * samples) for _ in range(layers_num)]:
+                raise Exception("init with probability " + str(dp_by_parts_probability) +
+                                " set genes " + str(set_per_gene) + " times")
+            # frequency of n genes, set with probability p, deviates from p by more than
+            # 5 standard deviations (5 * sqrt(p * (1 - p) / n) <= 5 * sqrt(0.25 / n)) very rarely
+            total_frequency = sum(set_per_gene) / (samples * layers_num)
+            if abs(total_frequency - dp_by_parts_probability) > 5 * (0.25 / (samples * layers_num)) ** 0.5:
+                raise Exception("init with probability " + str(dp_by_parts_probability) +
+                                " set genes with frequency " + str(total_frequency))
+            for gene_id in range(layers_num):
+                gene_frequency = set_per_gene[gene_id] / samples
+                if abs(gene_frequency - dp_by_parts_probability) > 5 * (0.25 / samples) ** 0.5:
+                    raise Exception("init with probability " + str(dp_by_parts_probability) + " set gene " +
+                                    str(gene_id) + " with frequency " + str(gene_frequency))
+
+    if info_level > 0:
+        print("RUN MMS chromosome operators check")
+
+    random.seed(0)
+    test_passed = True
+    checks = [("crossover", check_crossover), ("mutation", check_mutation),
+              ("init probability", check_init_probability)]
+    for check_name, check_func in checks:
+        for layers_num in [1, 2, 3, 16, 53]:
+            try:
+                check_func(layers_num)
+                if info_level > 1:
+                    print("  ", check_name, "for", layers_num, "layers - SUCCESS")
+            except Exception as e:
+                test_passed = False
+                if info_level > 0:
+                    print("   FAILURE:", check_name, "for", layers_num, "layers:", e)
+
+    if info_level > 0:
+        print("  -", "SUCCESS" if test_passed else "FAILURE")
+    return test_passed
+
+
+def run_test_timed_steady_state(config: {}, info_level):
+    """
+    Check steady-state mode of the timed simulation of DNNs, mapped on multiple processors and executed as
+    a pipeline, for every mapping in the pipeline parallelism data folder and for the single-processor mapping,
+    with FLOPs-based layers latency, with no data processing by parts and with max data processing by parts,
+    and for random mappings on three and four processors with random data processing by parts:
+    the periodic regime should be found, and the period should match the intervals between the completion of the
+    samples, simulated one by one (with the same number of samples in flight) after the transient regime.
+    The time of processing a sample by every processor should not depend on the simulation mode,
+    and on a single processor, the period should be the time of processing a sample by the processor
+    :param config: test app_config (see ../test_config.py)
+    :param info_level: amount of information to print out during the tests run.
+        If info-level == 0, no information is printed to console.
+        If info-level == 1, only tests information (e.g., which steps of the tests were successful)
+        is printed to console.
+        If info-level == 2, tests information (e.g., which steps of the tests were successful)
+        as well as script-specific verbose output is printed to the console
+    :return: True if tests ran successfully and False otherwise
+    """
+    import random
+    from functools import partial
+    from converters.json_converters.json_to_dnn import parse_json_dnn
+    from fileworkers.json_fw import read_json
+    from eval.latency.layer_latency import eval_layer_phases_latency_ms
+    from simulation.timed_simulation import simulate_dnn_pipeline_timed
+
+    if info_level > 0:
+        print("RUN timed pipeline simulation steady-state check")
+
+    random.seed(0)
+
+    mappings_dir = str(os.path.join(config["input_files_folder_abs"], "pipeline_parallelism"))
+    json_dnn_dir = str(os.path.join(config["input_files_folder_abs"], "json_dnn"))
+    layer_latency_func = partial(eval_layer_phases_latency_ms, latency_model="flops", gops_per_sec=100)
+    test_passed = True
+    for mapping_file in sorted(os.listdir(mappings_dir)):
+        if not mapping_file.endswith(".json"):
+            continue
+        try:
+            dnn = parse_json_dnn(os.path.join(json_dnn_dir, mapping_file))
+            layers_num = len(dnn.get_layers())
+            pipeline_mapping = read_json(os.path.join(mappings_dir, mapping_file))
+            single_proc_mapping = [[layer_id for layer_id in range(layers_num)]]
+            # tuples (mapping, dp encoding), where dp encoding = None means no data processing by parts
+            test_cases = [(pipeline_mapping, None), (pipeline_mapping, [True for _ in range(layers_num)]),
+                          (single_proc_mapping, None), (single_proc_mapping, [True for _ in range(layers_num)])]
+            # random mappings of subsequent layers on three and four processors
+            for procs_num in [3, 4]:
+                bounds = [0] + sorted(random.sample(range(1, layers_num), procs_num - 1)) + [layers_num]
+                random_mapping = [[layer_id for layer_id in range(bounds[proc_id], bounds[proc_id + 1])]
+                                  for proc_id in range(procs_num)]
+                test_cases.append((random_mapping, [random.uniform(0, 1) < 0.5 for _ in range(layers_num)]))
+            for mapping, dp_encoding in test_cases:
+                max_samples_in_flight = 2 * len(mapping)
+                result = simulate_dnn_pipeline_timed(dnn, mapping, dp_encoding, layer_latency_func,
+                                                     samples=500, steady_state=True)
+                if result.period_samples is None:
+                    raise Exception("periodic regime not found")
+
+                # simulate the samples one by one, until the tail of the simulation
+                # (where the input actors stop) does not affect the samples after the transient regime
+                period_samples = result.period_samples
+                last_sample = result.transient_samples + period_samples
+                samples = last_sample + 4 * max_samples_in_flight + 1
+                finite_result = simulate_dnn_pipeline_timed(dnn, mapping, dp_encoding, layer_latency_func,
+                                                            samples=samples,
+                                                            max_samples_in_flight=max_samples_in_flight)
+                end_time_per_sample = [0.0 for _ in range(samples)]
+                for job in finite_result.trace.jobs:
+                    sample = int(job.job.split(",")[0].split(" ")[1])
+                    end_time_per_sample[sample] = max(end_time_per_sample[sample], job.end_time)
+                period = (end_time_per_sample[last_sample] -
+                          end_time_per_sample[last_sample - period_samples]) / period_samples
+                if abs(period - result.period) > 1e-6 * max(period, 1):
+                    raise Exception("period " + str(result.period) + " differs from the interval " + str(period) +
+                                    " between samples, simulated one by one")
+                if abs(result.latency - finite_result.latency) > 1e-9:
+                    raise Exception("latency mismatch")
+                for proc_name, proc_time in finite_result.time_per_sample_per_processor.items():
+                    if abs(result.time_per_sample_per_processor[proc_name] - proc_time) > 1e-6 * max(proc_time, 1):
+                        raise Exception("time of processing a sample by processor " + proc_name + " mismatch")
+                if len(mapping) == 1 and abs(result.period - proc_time) > 1e-6 * max(proc_time, 1):
+                    raise Exception("period on a single processor differs from the time of processing a sample")
+                if info_level > 1:
+                    print("  ", mapping_file, "on", len(mapping), "processors,",
+                          "dp by parts:" if dp_encoding is not None else "no dp by parts:", str(result))
+        except Exception as e:
+            test_passed = False
+            if info_level > 0:
+                print("  ", mapping_file, "- FAILURE:", str(e))
+
+    if info_level > 0:
+        print("  -", "SUCCESS" if test_passed else "FAILURE")
+    return test_passed
+
+
 if __name__ == "__main__":
     main()
 